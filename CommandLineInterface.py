@@ -5,78 +5,269 @@ AUTHOR:				Keenan Burnett
 
 PURPOSE:			This class shall house the Command Line Interface and all related methods.
 
-FILE REFERENCES:
+FILE REFERENCES:	GroundPacketRouter.py (commandTable, validateCommand()), LinkContext.py
 
-LIBRARIES USED:		os, multiprocessing
+LIBRARIES USED:		os, sys
 
 SUPERCLASS:			Process
 
-ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					A command script with invalid commands in it is rejected as a whole, nothing is sent.
+					In batch mode, the exit code is 0 if every command was EXECUTED (or COMPLETED without sending
+					a TC), 1 otherwise.
 
-ASSUMPTIONS, CONSTRAINTS, CONDITIONS: None.
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: The GPR of the link must be running. Only one CLI should be used per link
+					at a time (the acknowledgements from the GPR go to whichever CLI reads them first).
 
 NOTES:
-					...
+					Interactive mode: commands (or the name of a command script) are typed in one at a time.
+					ex: python CommandLineInterface.py
+						python CommandLineInterface.py SAT2				(CLI for the GPR of the SAT2 link)
+
+					Batch mode: the commands of a script (or of stdin with "-") are all validated against the
+					GPR's commandTable before anything is sent, then they are submitted without waiting on each
+					other: up to pipelineDepth commands may be waiting on the GPR at any time. Every command is
+					reported as FORWARDED once the GPR handed it to its service, then its outcome is printed once
+					its service is done with it and its TCs are finished (as reported by the GPR's TC tracker):
+					EXECUTED (every TC was executed), COMPLETED (no TC was sent), FAILED (rejected by the GPR, or a
+					TC failed acceptance / execution) or TIMED OUT (a TC, or the GPR, did not answer in time).
+					ex: python CommandLineInterface.py --batch passPlan.txt
+						cat passPlan.txt | python CommandLineInterface.py SAT2 --batch -
+
+					Command scripts hold one command per line, blank lines and everything after a '#' are ignored:
+					DUMP_REQUEST 1 0x00001000 0x00000080		# memoryID, address, length
+					REQUEST_SCHEDULE_REPORT
+
+					Every command sent to the GPR is numbered: [sequence number, command], the GPR answers with
+					[sequence number, status, message, TC status], status 1 = forwarded to the service, -1 = rejected
+					and, once the command is finished, 2 with the TC status of the command (see TCVerificationTracker.py,
+					0 = no TC was sent).
 REQUIREMENTS:
 
 DEVELOPMENT HISTORY:
 
 11/28/2015			Created.
 
+10/19/2026			The CLI can be pointed at the GPR of a given link (see LinkContext.py), ex:
+					python CommandLineInterface.py SAT2
+
+10/19/2026			Added the batch mode (--batch), commands are now numbered and acknowledged by the GPR.
+					Commands used to be written to the FIFO one character at a time.
+
+10/19/2026			Commands acknowledged by the GPR are reported as FORWARDED, not OK: the acknowledgement is
+					sent when the command reaches its service, not when it completes.
+
+10/19/2026			The outcome of every command (EXECUTED, COMPLETED, FAILED, TIMED OUT) is reported once the GPR
+					sends it back, the exit code of the batch mode is based on it. The interactive mode uses input()
+					under Python 3 (raw_input() does not exist there).
 """
 from FifoObject import *
+from LinkContext import LinkContext
+from GroundPacketRouter import groundPacketRouter
+from GroundClock import monotonic
+from TCVerificationTracker import TCVerificationTracker
 import os
+import sys
+
+try:
+    input = raw_input       # Python 2, where input() evaluates what is typed in.
+except NameError:
+    pass
 
 class CommandLineInterface():
     """
-    This class is meant to represent the PUS FDIR Service.
+    This class is meant to represent the Command Line Interface of the ground station.
     """
     GPRToCLIFifo    = None
     CLIToGPRFifo    = None
     processID       = 0x16
+    pipelineDepth   = 16        # Commands which may be waiting on the GPR at once.
+    ackTimeOut      = 10.0      # Seconds to wait for the acknowledgement of a command.
+    completionTimeOut = 300.0   # Seconds to wait for the outcome of a forwarded command (its service may be busy).
+    sequenceNumber  = 0
+    pending         = None      # sequence number -> [line number, command, time it was sent / forwarded, forwarded]
+    # Outcome of a finished command by its TC status, anything else is FAILED.
+    outcomes        = {
+        0                                       :   "COMPLETED",
+        TCVerificationTracker.statusExecuted    :   "EXECUTED",
+        TCVerificationTracker.statusTimedOut    :   "TIMED OUT"
+    }
 
-    @classmethod
-    def run(cls):
+    def run(self):
         """
-        @purpose:   Used to house the program for the command line interface.
-        @Note:		Since this class is a subclass of Process, when self.start() is executed on an
-                    instance of this class, a process will be created with the contents of run() as the
-                    main program.
+        @purpose:   Used to house the program for the command line interface (interactive mode).
         """
         while 1:
-            commandString = raw_input("Enter a command / command file: ")
+            commandString = input("Enter a command / command file: ").strip()
             print("\nYou entered: %s\n" %commandString)
-            if cls.execCommands(cls, commandString) < 0:
+            if commandString == "kill":
                 return
+            if not commandString:
+                continue
+            if os.path.isfile(commandString):
+                script = open(commandString, "r")
+                self.runBatch(script.readlines())
+                script.close()
+            else:
+                self.runBatch([commandString])
 
-    @classmethod
-    def stop(cls):
+    def stop(self):
         try:
-            cls.GPRToCLIFifo.close()
-            cls.CLIToGPRFifo.close()
+            self.GPRToCLIFifo.close()
+            self.CLIToGPRFifo.close()
         except:
             pass
         return
 
     @staticmethod
-    def execCommands(self, command):
-        # If the user entered the command "kill", then we should halt the operation of the CLI.
-        if command == "kill":
-            self.CLIToGPRFifo.writeCommandToFifo(command, 1)
+    def parseScript(lines):
+        """
+        @purpose:   Validates every command of a command script (see validateCommand() in GroundPacketRouter.py).
+        @return:    (commands, errors): commands = [(line number, command)],
+                    errors = [(line number, command, what is wrong with it)]
+        """
+        commands = []
+        errors = []
+        for lineNumber, line in enumerate(lines, 1):
+            commandString = line.split("#", 1)[0].strip()
+            if not commandString:
+                continue
+            error = groundPacketRouter.validateCommand(groundPacketRouter, commandString)
+            if error is not None:
+                errors.append((lineNumber, commandString, error))
+            else:
+                commands.append((lineNumber, " ".join(commandString.split())))
+        return (commands, errors)
+
+    def runBatch(self, lines):
+        """
+        @purpose:   Validates all the commands in 'lines' and then submits them to the GPR (pipelined).
+        @return:    1 if every command was executed (or completed without sending a TC), -1 otherwise.
+        """
+        commands, errors = self.parseScript(lines)
+        if errors:
+            for lineNumber, commandString, error in errors:
+                print("LINE %d: %s\n    %s" %(lineNumber, commandString, error))
+            print("%d INVALID COMMAND(S), NOTHING WAS SENT" %len(errors))
+            return -1
+        results = {"EXECUTED": 0, "COMPLETED": 0, "FAILED": 0, "TIMED OUT": 0}
+        nextCommand = 0
+        while (nextCommand < len(commands)) or self.pending:
+            while (nextCommand < len(commands)) and (len(self.pending) < self.pipelineDepth):
+                lineNumber, commandString = commands[nextCommand]
+                if self.submit(lineNumber, commandString) < 0:
+                    self.report(results, "FAILED", lineNumber, commandString, "Could not write to the GPR")
+                nextCommand += 1
+            if self.readAcknowledgement(results) == 0:
+                waitForFifos([self.GPRToCLIFifo], 0.1)
+            now = monotonic()
+            for sequenceNumber in list(self.pending):
+                lineNumber, commandString, sentTime, forwarded = self.pending[sequenceNumber]
+                if (not forwarded) and (now - sentTime > self.ackTimeOut):
+                    del self.pending[sequenceNumber]
+                    self.report(results, "TIMED OUT", lineNumber, commandString, "No answer from the GPR")
+                elif forwarded and (now - sentTime > self.completionTimeOut):
+                    del self.pending[sequenceNumber]
+                    self.report(results, "TIMED OUT", lineNumber, commandString, "No outcome from the GPR")
+        print("%d COMMAND(S): %d EXECUTED, %d COMPLETED, %d FAILED, %d TIMED OUT" %(len(commands), results["EXECUTED"],
+              results["COMPLETED"], results["FAILED"], results["TIMED OUT"]))
+        if results["EXECUTED"] + results["COMPLETED"] != len(commands):
             return -1
-        # Otherwise, we can simply forward the command which was just received to the GPR.
-        self.CLIToGPRFifo.writeCommandToFifo(command, 1)
         return 1
 
+    def submit(self, lineNumber, commandString):
+        """
+        @purpose:   Sends a (valid) command to the GPR, its acknowledgement is waited on by runBatch().
+        """
+        self.sequenceNumber += 1
+        try:
+            self.CLIToGPRFifo.writeCommandToFifo([self.sequenceNumber, commandString], groundPacketRouter.cliCommandLength)
+        except IOError:
+            return -1
+        self.pending[self.sequenceNumber] = [lineNumber, commandString, monotonic(), 0]
+        return 1
+
+    def readAcknowledgement(self, results):
+        """
+        @purpose:   Reads the acknowledgements and outcomes which have come back from the GPR and prints them.
+        @return:    The number of frames which were read.
+        """
+        count = 0
+        while 1:
+            self.GPRToCLIFifo.readCommandFromFifo(groundPacketRouter.cliAckLength)
+            if not self.GPRToCLIFifo.commandReady:
+                return count
+            sequenceNumber, status, message, tcStatus = self.GPRToCLIFifo.command[0:4]
+            self.GPRToCLIFifo.commandReady = 0
+            if sequenceNumber not in self.pending:
+                continue                # Left over from a previous CLI.
+            count += 1
+            entry = self.pending[sequenceNumber]
+            if status == groundPacketRouter.cliForwarded:
+                entry[2] = monotonic()  # The outcome is waited on from now on.
+                entry[3] = 1
+                print("[FORWARDED] LINE %d: %s (%s)" %(entry[0], entry[1], str(message)))
+                continue
+            del self.pending[sequenceNumber]
+            outcome = "FAILED"
+            if status == groundPacketRouter.cliFinished:
+                outcome = self.outcomes.get(tcStatus, "FAILED")
+            self.report(results, outcome, entry[0], entry[1], message)
+
+    @staticmethod
+    def report(results, outcome, lineNumber, commandString, message):
+        results[outcome] += 1
+        print("[%s] LINE %d: %s (%s)" %(outcome, lineNumber, commandString, str(message)))
+        return
+
     def __init__(self, path1, path2):
+        """
+        @param:     path1, path2: paths of the GPRToCLI and CLIToGPR FIFOs of the link (see LinkContext.fifoPath()).
+        @Note:      The FIFOs are created by the GPR, IOError is raised if they do not exist (the GPR is not running).
+        """
         # FIFOs for communication with the Ground Packet Router
-		# Inverse Parameter dictionary of the one shown above
         self.currentPath        = os.path.dirname(os.path.realpath(__file__))
-        self.GPRToCLIFifo 		= FifoObject(self.currentPath + path1, 0)
-        self.CLIToGPRFifo 		= FifoObject(self.currentPath + path2, 1)
+        self.pending            = {}
+        for path in (path1, path2):
+            if not os.path.exists(path):
+                raise IOError("%s does not exist, is the GPR running?" %path)
+        self.GPRToCLIFifo 		= FifoObject(path1, 0, 1)
+        self.CLIToGPRFifo 		= FifoObject(path2, 1, 1)
+        # Throw away whatever a previous CLI left behind.
+        while self.GPRToCLIFifo.readLine():
+            pass
 
 if __name__ == '__main__':
-    CLI = CommandLineInterface("/fifos/GPRToCLI.fifo", "/fifos/CLIToGPR.fifo")
+    arguments = sys.argv[1:]
+    batchFile = None
+    if "--batch" in arguments:
+        position = arguments.index("--batch")
+        if position + 1 >= len(arguments):
+            print("usage: python CommandLineInterface.py [link] [--batch script.txt | --batch -]")
+            sys.exit(1)
+        batchFile = arguments[position + 1]
+        del arguments[position:position + 2]
+    links = LinkContext.fromArguments(arguments[0:1])       # Default link unless a link name is given
+    if links == -1:
+        print("Link names may only contain letters, digits, '-' and '_'")
+        sys.exit(1)
+    try:
+        CLI = CommandLineInterface(links[0].fifoPath("GPRToCLI"), links[0].fifoPath("CLIToGPR"))
+    except IOError as e:
+        print(str(e))
+        sys.exit(1)
+    if batchFile is not None:
+        if batchFile == "-":
+            lines = sys.stdin.readlines()
+        else:
+            script = open(batchFile, "r")
+            lines = script.readlines()
+            script.close()
+        status = CLI.runBatch(lines)
+        CLI.stop()
+        if status < 0:
+            sys.exit(1)
+        sys.exit(0)
     CLI.run()
     CLI.stop()
     print("THE COMMAND LINE INTERFACE HAS STOPPED")
@@ -0,0 +1,91 @@
+"""
+FILE_NAME:			DuplicateFilter.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the filter used by the GPR to drop copies of telemetry packets which it has
+					already decoded (retransmissions, overlapping passes from several antennas).
+
+FILE REFERENCES:	Used by GroundPacketRouter.py
+
+LIBRARIES USED:		zlib
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Packets are checked before they are verified (so that a copy is not logged
+					twice either), a corrupted copy never hides a good one since its CRC is different.
+
+NOTES:
+					A packet is identified by its PacketID, its PSC and the CRC32 of its data array. The PSC alone
+					is not enough: the sequence count wraps around after 256 packets, the CRC tells a new packet with
+					a recycled PSC apart from a copy of an old one.
+
+					The filter remembers the last windowSize packets it let through: a ring buffer holds them in
+					arrival order and a set of the same keys is used for the lookups, so checking a packet is O(1)
+					and the memory used is bounded no matter how long the pass lasts. A duplicate which arrives
+					more than windowSize packets after the original is let through.
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import zlib
+
+class DuplicateFilter:
+	"""
+	Author: agent
+	Sliding window of the (PacketID, PSC, CRC32) of the last telemetry packets which were let through.
+	"""
+	windowSize		= 1024
+	ring			= None			# Keys in arrival order, the oldest one is overwritten first
+	position		= 0
+	keys			= None			# Same keys as the ring, for the lookups
+	passed			= 0				# Number of packets which were let through
+	suppressed		= 0				# Number of duplicates which were dropped
+
+	@staticmethod
+	def packetKey(packetID, psc, data):
+		return (packetID, psc, zlib.crc32(bytes(bytearray([x & 0xFF for x in data]))) & 0xFFFFFFFF)
+
+	def isDuplicate(self, packetID, psc, data):
+		"""
+		@purpose:	Checks whether a packet was already let through within the window, remembers it if it was not.
+		@param:		data: the data array of the packet (ints).
+		@return:	1 if the packet is a duplicate and should be dropped, 0 otherwise.
+		"""
+		key = self.packetKey(packetID, psc, data)
+		if key in self.keys:
+			self.suppressed += 1
+			return 1
+		oldest = self.ring[self.position]
+		if oldest is not None:
+			self.keys.discard(oldest)
+		self.ring[self.position] = key
+		self.position = (self.position + 1) % self.windowSize
+		self.keys.add(key)
+		self.passed += 1
+		return 0
+
+	def clear(self):
+		self.ring = [None] * self.windowSize
+		self.position = 0
+		self.keys = set()
+		return
+
+	def __len__(self):
+		return len(self.keys)
+
+	def __init__(self, windowSize=None):
+		"""
+		@param:		windowSize: number of packets which are remembered, defaults to DuplicateFilter.windowSize.
+		"""
+		if windowSize is not None:
+			self.windowSize = max(int(windowSize), 1)
+		self.clear()
+
+if __name__ == '__main__':
+	pass
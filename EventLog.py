@@ -0,0 +1,268 @@
+"""
+FILE_NAME:			EventLog.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the binary event log which is written alongside the eventLog*.csv files,
+					as well as a small command line tool for querying it.
+
+FILE REFERENCES:	Written by LogWriterService.py (events/eventLog*.evt), GroundClock.py (parseTime())
+
+LIBRARIES USED:		os, struct, calendar, datetime, argparse
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: There must only be one writer (the LogWriterService of the link) so that the
+					record, message and index files stay consistent with one another.
+
+NOTES:
+					Every event is stored as a fixed-width record in <name>.evt:
+
+					TIME		SEV		REPORTID	SOURCE		NPARAMS		PARAM1		PARAM0		MSGOFFSET	MSGLEN
+					uint32		uint8	uint8		uint8		uint8		uint32		uint32		uint32		uint16
+
+					(little-endian, padded to 24 bytes). TIME is in seconds since 1970 (UTC), SOURCE is the processID
+					of the service which logged the event and MSGOFFSET/MSGLEN point into <name>.msg where the
+					free text of the event is kept.
+
+					Every recordsPerBlock records, a summary of the block is appended to <name>.idx:
+
+					MINTIME		MAXTIME		SEVMASK		REPORTID BITMAP
+					uint32		uint32		uint8		32 bytes (one bit per reportID)
+
+					Queries only read the blocks whose summary could contain a match, plus the (partial)
+					block at the end of the file which has not been indexed yet.
+
+					Usage: python EventLog.py events/eventLog2026-10-19.evt --severity 3 --report 0x0B
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			The log is now only written by the log writer of the link (see LogWriterService.py).
+
+10/19/2026			The command line tool uses GroundClock.parseTime() instead of a copy of it.
+"""
+
+import os
+import struct
+import calendar
+from datetime import datetime
+from GroundClock import parseTime
+
+class EventRecordLog:
+	"""
+	Author: agent
+	Fixed-width binary event log with a sparse block index.
+	"""
+	recordFormat		= "<IBBBBIIIH2x"
+	recordSize			= struct.calcsize(recordFormat)
+	indexFormat			= "<IIB32s3x"
+	indexSize			= struct.calcsize(indexFormat)
+	recordsPerBlock		= 256
+	recordPath			= None
+	messagePath			= None
+	indexPath			= None
+	recordFD			= None
+	messageFD			= None
+	indexFD				= None
+
+	@staticmethod
+	def timeToSeconds(absTime):
+		"""
+		@purpose:	Converts a datetime (ground absTime) into seconds since 1970 for storage in a record.
+		"""
+		return calendar.timegm(absTime.timetuple())
+
+	def append(self, absTime, severity, reportID, source, param1=0, param0=0, message=None, numParams=0):
+		"""
+		@purpose:	Appends a single event record (and its message) to the log.
+		@param:		absTime: datetime at which the event occured.
+		@param:		severity: 1 = Normal, 2-4 = different levels of failure
+		@param:		reportID: Unique to the event report, ex: PUSService.bitFlipDetected
+		@param:		source: processID of the service which is logging the event.
+		@param:		param1,0: extra information sent from the satellite.
+		@Note:		Only called by the log writer (see LogWriterService.py).
+		"""
+		msgOffset = 0
+		msgLength = 0
+		if message is not None:
+			text = str(message).encode("ascii", "replace")[:0xFFFF]
+			msgOffset = os.fstat(self.messageFD).st_size
+			msgLength = len(text)
+			os.write(self.messageFD, text)
+		record = struct.pack(self.recordFormat, self.timeToSeconds(absTime) & 0xFFFFFFFF, severity & 0xFF,
+							 reportID & 0xFF, source & 0xFF, numParams & 0xFF, param1 & 0xFFFFFFFF,
+							 param0 & 0xFFFFFFFF, msgOffset, msgLength)
+		os.write(self.recordFD, record)
+		numRecords = os.fstat(self.recordFD).st_size // self.recordSize
+		if (numRecords % self.recordsPerBlock) == 0:
+			self.indexBlock(numRecords // self.recordsPerBlock - 1)
+		return 1
+
+	def indexBlock(self, blockNum):
+		"""
+		@purpose:	Computes the summary for block 'blockNum' and writes it into the index file.
+		@Note:		The index entry is written at its own offset so that a crash between writing the last
+					record of a block and its summary can be repaired by simply re-indexing that block.
+		"""
+		blockSize = self.recordSize * self.recordsPerBlock
+		with open(self.recordPath, "rb") as f:
+			f.seek(blockNum * blockSize)
+			block = f.read(blockSize)
+		if len(block) != blockSize:
+			return -1
+		minTime = 0xFFFFFFFF
+		maxTime = 0
+		sevMask = 0
+		bitmap = bytearray(32)
+		for i in range(0, blockSize, self.recordSize):
+			fields = struct.unpack_from(self.recordFormat, block, i)
+			minTime = min(minTime, fields[0])
+			maxTime = max(maxTime, fields[0])
+			sevMask |= 1 << (fields[1] & 0x07)
+			bitmap[fields[2] >> 3] |= 1 << (fields[2] & 0x07)
+		entry = struct.pack(self.indexFormat, minTime, maxTime, sevMask, bytes(bitmap))
+		os.lseek(self.indexFD, blockNum * self.indexSize, os.SEEK_SET)
+		os.write(self.indexFD, entry)
+		return 1
+
+	def close(self):
+		for fd in (self.recordFD, self.messageFD, self.indexFD):
+			if fd is not None:
+				os.close(fd)
+		self.recordFD = None
+		self.messageFD = None
+		self.indexFD = None
+		return
+
+	def __init__(self, recordPath):
+		"""
+		@purpose:	Opens (or creates) the record, message and index files for the log at 'recordPath'.
+		@param:		recordPath: path to the .evt file, the .msg and .idx files are placed beside it.
+		"""
+		base = os.path.splitext(recordPath)[0]
+		self.recordPath = recordPath
+		self.messagePath = base + ".msg"
+		self.indexPath = base + ".idx"
+		self.recordFD = os.open(self.recordPath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+		self.messageFD = os.open(self.messagePath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+		self.indexFD = os.open(self.indexPath, os.O_WRONLY | os.O_CREAT, 0o644)
+
+class EventLogReader:
+	"""
+	Author: agent
+	Read-only access to an EventRecordLog, used by the query tool.
+	"""
+	recordPath			= None
+	messagePath			= None
+	indexPath			= None
+
+	def query(self, startTime=None, stopTime=None, minSeverity=None, reportIDs=None):
+		"""
+		@purpose:	Generator which yields every record matching the given filters as a tuple:
+					(time, severity, reportID, source, numParams, param1, param0, message)
+		@param:		startTime, stopTime: inclusive bounds in seconds since 1970 (None = unbounded)
+		@param:		minSeverity: only records with severity >= minSeverity are returned.
+		@param:		reportIDs: iterable of reportIDs to return (None = all)
+		"""
+		recordSize = EventRecordLog.recordSize
+		recordFormat = EventRecordLog.recordFormat
+		blockSize = recordSize * EventRecordLog.recordsPerBlock
+		if startTime is None:
+			startTime = 0
+		if stopTime is None:
+			stopTime = 0xFFFFFFFF
+		sevMask = 0xFF
+		if minSeverity is not None:
+			sevMask = 0xFF & ~((1 << minSeverity) - 1)
+		wanted = None
+		if reportIDs is not None:
+			wanted = set(reportIDs)
+
+		if not os.path.exists(self.recordPath):
+			return
+		numRecords = os.path.getsize(self.recordPath) // recordSize
+		numBlocks = numRecords // EventRecordLog.recordsPerBlock
+		candidates = self.candidateBlocks(numBlocks, startTime, stopTime, sevMask, wanted)
+		# The tail of the file has not been indexed yet, so it always has to be read.
+		if numRecords % EventRecordLog.recordsPerBlock:
+			candidates.append(numBlocks)
+
+		messages = None
+		if os.path.exists(self.messagePath):
+			messages = open(self.messagePath, "rb")
+		with open(self.recordPath, "rb") as f:
+			for blockNum in candidates:
+				f.seek(blockNum * blockSize)
+				block = f.read(blockSize)
+				for i in range(0, len(block) - recordSize + 1, recordSize):
+					fields = struct.unpack_from(recordFormat, block, i)
+					if (fields[0] < startTime) or (fields[0] > stopTime):
+						continue
+					if not ((1 << (fields[1] & 0x07)) & sevMask):
+						continue
+					if (wanted is not None) and (fields[2] not in wanted):
+						continue
+					message = ""
+					if messages is not None and fields[8]:
+						messages.seek(fields[7])
+						message = messages.read(fields[8]).decode("ascii", "replace")
+					yield fields[:7] + (message,)
+		if messages is not None:
+			messages.close()
+
+	def candidateBlocks(self, numBlocks, startTime, stopTime, sevMask, wanted):
+		"""
+		@purpose:	Uses the block index to figure out which blocks could contain matching records.
+		@Note:		Blocks without an index entry (ex: the writer crashed before indexing) are always read.
+		"""
+		candidates = []
+		entries = b""
+		if os.path.exists(self.indexPath):
+			with open(self.indexPath, "rb") as f:
+				entries = f.read(numBlocks * EventRecordLog.indexSize)
+		for blockNum in range(0, numBlocks):
+			offset = blockNum * EventRecordLog.indexSize
+			if offset + EventRecordLog.indexSize > len(entries):
+				candidates.append(blockNum)
+				continue
+			minTime, maxTime, blockMask, bitmap = struct.unpack_from(EventRecordLog.indexFormat, entries, offset)
+			if (maxTime < startTime) or (minTime > stopTime) or not (blockMask & sevMask):
+				continue
+			if wanted is not None:
+				bitmap = bytearray(bitmap)
+				if not [r for r in wanted if bitmap[(r >> 3) & 0x1F] & (1 << (r & 0x07))]:
+					continue
+			candidates.append(blockNum)
+		return candidates
+
+	def __init__(self, recordPath):
+		base = os.path.splitext(recordPath)[0]
+		self.recordPath = recordPath
+		self.messagePath = base + ".msg"
+		self.indexPath = base + ".idx"
+
+def main(argv=None):
+	import argparse
+	parser = argparse.ArgumentParser(description="Query the binary ground station event log.")
+	parser.add_argument("logs", nargs="+", help=".evt file(s) to query")
+	parser.add_argument("--start", type=parseTime, default=None, help="earliest time (YYYY-MM-DDTHH:MM:SS or seconds)")
+	parser.add_argument("--stop", type=parseTime, default=None, help="latest time (YYYY-MM-DDTHH:MM:SS or seconds)")
+	parser.add_argument("--severity", type=int, default=None, help="minimum severity (1-4)")
+	parser.add_argument("--report", type=lambda x: int(x, 0), action="append", default=None,
+						help="reportID to match, may be given more than once (ex: 0x0B)")
+	args = parser.parse_args(argv)
+	for path in args.logs:
+		reader = EventLogReader(path)
+		for fields in reader.query(args.start, args.stop, args.severity, args.report):
+			timeString = datetime.utcfromtimestamp(fields[0]).strftime("%Y-%m-%d %H:%M:%S")
+			print("%s\tSEV %s\tREPORT %s\tSOURCE %s\t%s\t%s\t%s" %(timeString, fields[1], hex(fields[2]),
+																	hex(fields[3]), hex(fields[5]), hex(fields[6]), fields[7]))
+	return 0
+
+if __name__ == '__main__':
+	main()
@@ -23,6 +23,16 @@ DEVELOPMENT HISTORY:
 
 11/17/2015			Created.
 
+10/19/2026			Sends heartbeats to the GPR's ServiceSupervisor from its main loop.
+
+10/19/2026			FIFOs are opened non-blocking (see FifoObject.py), the main loop now waits on the FIFO from
+					the GPR instead of spinning.
+
+10/19/2026			Limit alarms from the HK service (hkLimitViolation) are logged as event reports.
+
+10/19/2026			The commands from the GPR which the FDIR service does not act on yet are reported as done
+					(see PUSService.finishCLICommand()), so that the CLI does not wait for them.
+
 """
 
 import os
@@ -46,6 +56,9 @@ class FDIRService(PUSService):
 	path6				= None
 	path7				= None
 	path8				= None
+	# Severity of the event logged when a parameter goes to level 0 (nominal), 1 (yellow) or 2 (red)
+	limitSeverities		= [1, 2, 3]
+	limitLevelNames		= ["NOMINAL", "YELLOW", "RED"]
 
 	@staticmethod
 	def run1(self):
@@ -57,34 +70,63 @@ class FDIRService(PUSService):
 		"""
 		print("The path in fdir run: %s" %str(self.p1))
 		self.initializePUS(self)
-		self.initialize()
+		self.tracer.installSignalHandler()					# kill -USR1 <pid> dumps the trace
+		self.initialize(self)
+		self.watchFifos()									# The FIFOs send heartbeats while they wait
+		while 1:
+			self.heartbeat()
+			command = self.takeGPRCommand()		# Waits for the GPR, FDIR does not act on its commands yet.
+			if command is not None:
+				self.finishCLICommand(command[141])
+			self.checkHKAlarms(self)
+
+	@staticmethod
+	def checkHKAlarms(self):
+		"""
+		@purpose:   Logs the limit alarms which were sent by the HK service (see HKService.checkLimits()).
+		"""
 		while 1:
-			pass
+			self.hktoFDIRFifo.readCommandFromFifo()
+			if not self.hktoFDIRFifo.commandReady:
+				return
+			alarm = list(self.hktoFDIRFifo.command)
+			self.hktoFDIRFifo.commandReady = 0
+			if alarm[146] != self.hkLimitViolation:
+				continue
+			paramID = alarm[145]
+			newLevel = min(alarm[144], 2)
+			oldLevel = min(alarm[143], 2)
+			value = (alarm[1] << 8) + alarm[0]
+			self.logEventReport(self.limitSeverities[newLevel], self.hkLimitViolation, paramID, value,
+								"%s went from %s to %s (raw value %d)" %(self.parameters.get(paramID, hex(paramID)),
+								self.limitLevelNames[oldLevel], self.limitLevelNames[newLevel], value))
 
-	@classmethod
-	def initialize(cls):
+	@staticmethod
+	def initialize(self):
 		# FIFOs for communication with the FDIR service
-		cls.hktoFDIRFifo		= FifoObject(cls.path3, 0)
-		cls.memtoFDIRFifo		= FifoObject(cls.path4, 0)
-		cls.schedtoFDIRFifo		= FifoObject(cls.path5, 0)
-		cls.FDIRtohkFifo		= FifoObject(cls.path6, 1)
-		cls.FDIRtomemFifo		= FifoObject(cls.path7, 1)
-		cls.FDIRtoschedFifo		= FifoObject(cls.path8, 1)
+		self.hktoFDIRFifo		= FifoObject(self.path3, 0, 1)
+		self.memtoFDIRFifo		= FifoObject(self.path4, 0, 1)
+		self.schedtoFDIRFifo	= FifoObject(self.path5, 0, 1)
+		self.FDIRtohkFifo		= FifoObject(self.path6, 1, 1)
+		self.FDIRtomemFifo		= FifoObject(self.path7, 1, 1)
+		self.FDIRtoschedFifo	= FifoObject(self.path8, 1, 1)
 		return
 
 	@staticmethod
 	def initializePUS(self):
 		# FIFOs Required for communication with the Ground Packet Router:
-		self.fifoFromGPR			= FifoObject(self.p2, 0)
-		self.fifoToGPR				= FifoObject(self.p1, 1)
+		self.fifoFromGPR			= FifoObject(self.p2, 0, 1)
+		self.fifoToGPR				= FifoObject(self.p1, 1, 1)
 		self.fifoToGPRPath			= self.p1
 		self.wait					= 1
 		self.fifoFromGPRPath		= self.p2
 		return
 
-	def __init__(self, path1, path2, path3, path4, path5, path6, path7, path8, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock, cliLock, errorLock, day, hour, minute, second):
+	def __init__(self, path1, path2, path3, path4, path5, path6, path7, path8, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock=None,
+				 heartbeatBoard=None, heartbeatSlot=0, metrics=None):
 		# Inititalize this instance as a PUS service
-		super(FDIRService, self).__init__(path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock, cliLock, errorLock, day, hour, minute, second)
+		super(FDIRService, self).__init__(path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock,
+										  heartbeatBoard, heartbeatSlot, metrics)
 		# self.processID = 0x10
 		# self.serviceType = 3
 		self.p1 = path1
@@ -100,7 +142,7 @@ class FDIRService(PUSService):
 			self.pID = pID
 			return
 		else:
-			self.run1(self)
+			self.runForked()
 
 if __name__ == '__main__':
 	pass
@@ -7,7 +7,7 @@ PURPOSE:			This file houses the class which is meant to define the Fifo Object C
 
 FILE REFERENCES: 	None
 
-LIBRARIES USED:		time
+LIBRARIES USED:		os, stat, errno, select, time
 
 SUPERCLASS:			Process
 
@@ -17,102 +17,313 @@ ASSUMPTIONS, CONSTRAINTS, CONDITIONS: None.
 
 NOTES:              This class was created in order to make the use of fifos more organized.
 
-REQUIREMENTS:
+                    Non-blocking FIFOs (nonBlocking=1) are opened O_RDWR | O_NONBLOCK, which never blocks on Linux
+                    no matter whether the other end has been opened yet, so the GPR and the services can open their
+                    FIFOs in any order. Reads return right away when there is nothing to read and every command is
+                    written with a single write() (well under PIPE_BUF, so it is never interleaved with another one).
+                    Use waitForFifos() to sleep until one of them has something to read.
+
+                    A command may carry a payload of any length (ex: a reassembled memory dump), which is written
+                    between the command and the STOP code:
+                    START / 147 lines of the command / PAYLOAD / one line per value of the payload / STOP
+                    The payload is stored in self.payload when the command is read (None if there was none).
+                    Frames which are larger than PIPE_BUF are only safe on FIFOs which have a single writer.
+
+                    As both ends are opened O_RDWR, a writer never gets EPIPE when the reader has died (it waits up to
+                    writeTimeOut seconds for room and then gets EAGAIN) and what the reader did not read stays in the
+                    fifo. drain() throws it away, ex: before a restarted service opens the fifo of the one which died.
+
+                    A service which is supervised sets heartbeat on its fifos (see PUSService.watchFifos()), it is
+                    called at least every heartbeatInterval seconds while a write waits for room in the fifo and
+                    while a blocking read retries, so that the service is not taken for hung.
+
+REQUIREMENTS:       Linux (opening a FIFO O_RDWR is not defined by POSIX)
 
 DEVELOPMENT HISTORY:
 12/02/2015      Created.
 
+10/19/2026      The attributes are now per instance (they were class attributes changed by classmethods, so every
+                FifoObject shared the same command buffers and file descriptor). Added the non-blocking mode,
+                ensureFifo() and waitForFifos(). writeCommandToFifo() now respects its length parameter.
+
+10/19/2026      Commands can carry a payload. A command is now only ready once its STOP code has been read.
+
+10/19/2026      Added drain() and the timeOut parameter of writeCommandToFifo().
+
+10/19/2026      Writes which wait for room in the fifo and blocking reads call heartbeat (if it is set) while they
+                wait.
 """
+import os
+import stat
+import errno
+import select
 import time
 
+def ensureFifo(path):
+    """
+    @purpose:   Creates the FIFO 'path' if it does not exist yet, an existing FIFO is reused as is
+                (ex: left behind when the ground station crashed).
+    @Note:      Anything else which is in the way (ex: a regular file) is replaced by a FIFO.
+    """
+    try:
+        if stat.S_ISFIFO(os.stat(path).st_mode):
+            return
+        os.remove(path)
+    except OSError:
+        pass
+    os.mkfifo(path)
+    return
+
+def waitForFifos(fifos, timeOut):
+    """
+    @purpose:   Waits up to 'timeOut' seconds for one of the (receiving) FIFOs in 'fifos' to have something to read.
+    @return:    1 if one of them is ready, 0 if the wait timed out.
+    """
+    fds = []
+    for fifo in fifos:
+        if fifo is None:
+            continue
+        if fifo.hasBufferedLine():
+            return 1
+        fds.append(fifo.fd)
+    try:
+        readable = select.select(fds, [], [], timeOut)[0]
+    except (select.error, OSError, IOError):
+        return 0
+    if readable:
+        return 1
+    return 0
+
 class FifoObject:
     """
     Author: Keenan Burnett
     Acts as fifo object for either receiving for sending commands with the Ground Station Software.
     """
     fifoPath = None     # Path to the FIFO at hand
-    fifoFD   = None     # Open file descriptor to the fifo at hand.
-    tempCommand = []
-    command = []
+    fifoFD   = None     # Open file object for the fifo at hand (blocking mode only).
+    fd = None           # Open file descriptor to the fifo at hand.
+    nonBlocking = 0
+    readBuffer = ""     # Data read from a non-blocking fifo which does not make up a whole line yet.
+    tempCommand = None
+    command = None
+    tempPayload = None  # Payload of the command being read, None until the PAYLOAD code has been read.
+    payload = None      # Payload of the command which is ready, None if it did not have one.
     reading = 0
     writing = 0
     commandReady = 0
     numLines = 0
     type = 0            # 1 = This Fifo is to be used for sending commands, 0 = receiving commands.
     dataLength = 137
+    maxTries = 10       # Number of times an empty read is retried in blocking mode.
+    maxPayload = 1 << 20    # Longest payload accepted (in values).
+    writeTimeOut = 5.0  # Seconds a non-blocking write may wait for the reader to make room in the fifo.
+    heartbeat = None    # Called while waiting on the fifo (ex: PUSService.heartbeat), None = nothing to call.
+    heartbeatInterval = 0.1     # Longest wait between two calls to heartbeat (< ServiceSupervisor.hangTimeOut)
 
-    @classmethod
-    def writeCommandToFifo(cls, commandArray, len=147):
+    def writeCommandToFifo(self, commandArray, length=147, payload=None, timeOut=None):
         """
         @purpose:   This method takes what is contained in commandArray[] and
         then place it in the given fifo defined by this object.
+        @param: payload: optional list of values which is sent along with the command.
+        @param: timeOut: seconds to wait for room in a non-blocking fifo (writeTimeOut if None, 0 = don't wait).
         @Note: We use a "START\n" code and "STOP\n" code to indicate where commands stop and start.
         @Note: Each subsequent byte is then placed in the fifo followed by a newline character.
+        @Note: In non-blocking mode, IOError(EAGAIN) is raised if the fifo is full (the reader is not keeping up)
+            for more than writeTimeOut seconds.
         """
-        if not cls.type:
+        if not self.type:
             return -1           # Writing to a receiving Fifo is not allowed.
-        if len(commandArray) < len:
+        if len(commandArray) < length:
             return -1           # Length of the given commandArray was too short.
 
-        cls.writing = 1
-        cls.fifoFD.write("START\n")
-        for i in range(0, cls.dataLength + 10):
-            tempString = str(commandArray[i]) + "\n"
-            cls.fifoFD.write(tempString)
-        cls.fifoFD.write("STOP\n")
-        cls.fifoFD.flush()
-        cls.writing = 0
+        self.writing = 1
+        lines = ["START"]
+        for i in range(0, length):
+            lines.append(str(commandArray[i]))
+        if payload is not None:
+            lines.append("PAYLOAD")
+            for value in payload:
+                lines.append(str(value))
+        lines.append("STOP\n")
+        frame = "\n".join(lines)
+        try:
+            if self.nonBlocking:
+                self.writeAll(frame.encode("ascii"), timeOut)
+            else:
+                self.fifoFD.write(frame)
+                self.fifoFD.flush()
+        except OSError as e:
+            raise IOError(e.errno, e.strerror)
+        finally:
+            self.writing = 0
         return 1
 
-    @classmethod
-    def readCommandFromFifo(cls, len=147):
+    def writeAll(self, data, timeOut=None):
+        """
+        @purpose:   Writes all of 'data' to the (non-blocking) fifo, waiting for the reader when the fifo is full.
+        @Note: A frame which fits in PIPE_BUF is written with a single write(), or not at all.
+        """
+        if timeOut is None:
+            timeOut = self.writeTimeOut
+        deadline = time.time() + timeOut
+        while data:
+            try:
+                written = os.write(self.fd, data)
+            except OSError as e:
+                if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    raise
+                if not self.waitForRoom(deadline):
+                    raise
+                continue
+            data = data[written:]
+        return
+
+    def waitForRoom(self, deadline):
         """
-        @purpose:   This method reads a single line from the FIFO that this object represents and if an entire command
+        @purpose:   Waits until there is room in the (non-blocking) fifo or time.time() reaches 'deadline', calling
+            heartbeat at least every heartbeatInterval seconds.
+        @return: 1 if there is room, 0 if the deadline was reached.
+        """
+        while 1:
+            if self.heartbeat is not None:
+                self.heartbeat()
+            timeLeft = deadline - time.time()
+            if timeLeft <= 0:
+                return 0
+            if select.select([], [self.fd], [], min(timeLeft, self.heartbeatInterval))[1]:
+                return 1
+
+    def drain(self):
+        """
+        @purpose:   Throws away everything which is waiting in the (non-blocking) fifo, as well as the command which
+            was being read, so that the next command read or written starts from a clean fifo.
+        @Note: A command which is already ready (commandReady) is kept.
+        @return: The number of bytes thrown away.
+        """
+        if not self.nonBlocking:
+            return 0
+        drained = len(self.readBuffer)
+        self.readBuffer = ""
+        self.reading = 0
+        self.numLines = 0
+        self.tempPayload = None
+        while 1:
+            try:
+                data = os.read(self.fd, 65536)
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not data:
+                break
+            drained += len(data)
+        return drained
+
+    def hasBufferedLine(self):
+        return "\n" in self.readBuffer
+
+    def readLine(self):
+        """
+        @purpose:   Returns the next line in the fifo (including the newline), "" if there is nothing to read.
+        """
+        if not self.nonBlocking:
+            s = self.fifoFD.readline()
+            tries = self.maxTries
+            while (s == "") and tries:
+                if self.heartbeat is not None:
+                    self.heartbeat()
+                time.sleep(0.0001)
+                tries -= 1
+                s = self.fifoFD.readline()
+            return s
+        while "\n" not in self.readBuffer:
+            try:
+                data = os.read(self.fd, 4096)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    return ""
+                raise
+            if not data:
+                return ""
+            self.readBuffer += data.decode("ascii")
+        s, self.readBuffer = self.readBuffer.split("\n", 1)
+        return s + "\n"
+
+    def readCommandFromFifo(self, length=147):
+        """
+        @purpose:   This method reads from the FIFO that this object represents and if an entire command
             has been received, it sets commandReady to 1.
         @Note: We use a "START\n" code and "STOP\n" code to indicate where commands stop and start.
+        @Note: In blocking mode, a single line is read per call. In non-blocking mode, everything which is available
+            is read, up to the end of the next command.
         @return: -2 is returned, a failure report should be sent to the FDIR task and printed to the command line.
-            -1 usually means a usage error, 1 means it worked as intended.
+            -1 usually means a usage error, 1 means it worked as intended, 0 means there was nothing to read.
         """
-        maxTries = 10
-        if cls.type:
+        if self.type:
             return -1           # Reading from a writing Fifo is not allowed
-        if cls.commandReady:
+        if self.commandReady:
             return -1           # The commandReady flag should be cleared by the user before attempting to read again.
-        # Read a line from the FIFO.
-        s = cls.fifoFD.readline()
-        while (s == "") and maxTries:
-            time.sleep(0.0001)
-            maxTries -= 1
-            s = cls.fifoFD.readline()
-        if s == "":
-            return 0
+        ret = 0
+        while 1:
+            s = self.readLine()
+            if s == "":
+                return ret
+            ret = self.readCommandLine(s, length)
+            if (ret < 0) or self.commandReady or not self.nonBlocking:
+                return ret
+
+    def readCommandLine(self, s, length):
         if s == "START\n":
-            cls.reading = 1
-            cls.clearTempCommand(cls)
+            self.reading = 1
+            self.numLines = 0
+            self.tempPayload = None
+            self.clearTempCommand(self)
             return 1
-        if cls.reading and (s == "STOP\n"):
-            if cls.numLines != len:
-               cls.reading  = 0
-               return -2
-            else:
-                cls.reading = 0
-                return 1
-        if cls.reading:
+        if self.reading and (s == "STOP\n"):
+            self.reading = 0
+            if self.numLines != length:
+                return -2
+            for i in range(0, length):
+                self.command[i] = self.tempCommand[i]
+            self.payload = self.tempPayload
+            self.tempPayload = None
+            self.commandReady = 1
+            return 1
+        if self.reading and (s == "PAYLOAD\n") and (self.numLines == length) and (self.tempPayload is None):
+            self.tempPayload = []
+            return 1
+        if self.reading:
             s = s.rstrip()
-            cls.numLines += 1
-            cls.tempCommand[cls.numLines - 1] = int(s)
-            if cls.numLines == len:
-                for i in range(0, len):
-                    cls.command[i] = cls.tempCommand[i]
-                cls.clearTempCommand(cls)
-                cls.commandReady = 1
+            if self.tempPayload is not None:
+                if len(self.tempPayload) >= self.maxPayload:
+                    self.reading = 0
+                    self.tempPayload = None
+                    return -2       # Missing STOP, drop everything up to the next START.
+                try:
+                    self.tempPayload.append(int(s))
+                except ValueError:
+                    self.tempPayload.append(s)
+                return 1
+            if self.numLines >= length:
+                self.reading = 0
+                return -2           # Missing STOP, drop everything up to the next START.
+            self.numLines += 1
+            try:
+                self.tempCommand[self.numLines - 1] = int(s)
+            except ValueError:
+                self.tempCommand[self.numLines - 1] = s
             return 1
         return 0
 
-    @classmethod
-    def close(cls):
-        if cls.fifoFD:
-            cls.fifoFD.close()
+    def close(self):
+        if self.fifoFD:
+            self.fifoFD.close()
+        elif self.fd is not None:
+            os.close(self.fd)
+        self.fifoFD = None
+        self.fd = None
         return
 
     @staticmethod
@@ -127,13 +338,25 @@ class FifoObject:
             self.command[i] = 0
         return
 
-    def __init__(self, FifoPath, Type):
+    def __init__(self, FifoPath, Type, nonBlocking=0):
+        """
+        @param:     FifoPath: path to the fifo (see ensureFifo()).
+        @param:     Type: 1 = sending commands, 0 = receiving commands.
+        @param:     nonBlocking: 1 = open the fifo without waiting for the other end and never block on it.
+        """
         self.fifoPath = FifoPath
         self.type = Type
-        if Type:
+        self.nonBlocking = nonBlocking
+        self.tempCommand = []
+        self.command = []
+        if nonBlocking:
+            self.fd = os.open(FifoPath, os.O_RDWR | os.O_NONBLOCK)
+        elif Type:
             self.fifoFD = open(FifoPath, "wb")
-        if not Type:
+            self.fd = self.fifoFD.fileno()
+        else:
             self.fifoFD = open(FifoPath, "rb", 0)
+            self.fd = self.fifoFD.fileno()
         for i in range(0, 147):
             self.tempCommand.append(0)
             self.command.append(0)
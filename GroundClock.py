@@ -0,0 +1,161 @@
+"""
+FILE_NAME:			GroundClock.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the ground clock which is shared between the GPR and all the PUS services.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py, PUSService.py, parseTime() by the command line tools
+					(HKArchive.py, HKStatistics.py, EventLog.py)
+
+LIBRARIES USED:		mmap, struct, ctypes, time, calendar, datetime
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: The clock must be created by the GPR before the services are forked so that
+					they all share the same (anonymous) memory mapping. Only the GPR should call set().
+
+NOTES:
+					The clock lives in a small shared memory segment protected by a sequence lock:
+
+					SEQ			ABSTIME			REFERENCE
+					uint32		double			double
+
+					ABSTIME is the ground absolute time (seconds since 1970) when it was last set and REFERENCE
+					is the value of monotonic() at that moment, so the clock keeps ticking between updates.
+
+					The writer makes SEQ odd while it is updating the segment and even once it is done.
+					Readers never lock, they simply retry if SEQ was odd or changed while they were reading.
+
+REQUIREMENTS:		Linux (CLOCK_MONOTONIC is used when time.monotonic() is not available, ex: Python 2.7)
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			parseTime() (times given on the command line) moved here from HKArchive.py, it doesn't need numpy.
+"""
+
+import mmap
+import struct
+import time
+import calendar
+from datetime import datetime, timedelta
+
+def loadMonotonic():
+	"""
+	@purpose:	Returns a function giving the time in seconds from a monotonic clock which is shared by every
+				process on this machine.
+	"""
+	if hasattr(time, "monotonic"):
+		return time.monotonic
+	try:
+		import ctypes
+		import ctypes.util
+
+		class timespec(ctypes.Structure):
+			_fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+		librt = ctypes.CDLL(ctypes.util.find_library("rt") or ctypes.util.find_library("c"), use_errno=True)
+		clock_gettime = librt.clock_gettime
+		clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+		CLOCK_MONOTONIC = 1
+		ts = timespec()
+
+		def monotonic():
+			clock_gettime(CLOCK_MONOTONIC, ctypes.byref(ts))
+			return ts.tv_sec + ts.tv_nsec * 1e-9
+		monotonic()
+		return monotonic
+	except (OSError, AttributeError, TypeError):
+		return time.time
+
+monotonic = loadMonotonic()
+
+class GroundClock:
+	"""
+	Author: agent
+	Seqlock-protected ground clock in shared memory.
+	"""
+	seqFormat			= "<I4x"
+	timeFormat			= "<dd"
+	timeOffset			= struct.calcsize(seqFormat)
+	segmentSize			= timeOffset + struct.calcsize(timeFormat)
+	epoch				= datetime(1970, 1, 1)
+	segment				= None
+	# Cached copy of the last values read, only refreshed when the sequence number changes.
+	lastSeq				= -1
+	lastAbsTime			= 0.0
+	lastReference		= 0.0
+
+	def set(self, absTime):
+		"""
+		@purpose:	Sets the ground absolute time, to be used by the GPR only.
+		@param:		absTime: datetime which is "now" on the ground.
+		"""
+		seconds = calendar.timegm(absTime.timetuple()) + absTime.microsecond * 1e-6
+		seq = struct.unpack_from(self.seqFormat, self.segment, 0)[0]
+		struct.pack_into(self.seqFormat, self.segment, 0, (seq + 1) & 0xFFFFFFFF)		# Odd: write in progress
+		struct.pack_into(self.timeFormat, self.segment, self.timeOffset, seconds, monotonic())
+		struct.pack_into(self.seqFormat, self.segment, 0, (seq + 2) & 0xFFFFFFFF)
+		return
+
+	def readSeconds(self):
+		"""
+		@purpose:	Returns the current ground absolute time in seconds since 1970.
+		@Note:		Lock-free, the segment is only unpacked again if the GPR has set the clock since the last read.
+		"""
+		while 1:
+			seq = struct.unpack_from(self.seqFormat, self.segment, 0)[0]
+			if seq == self.lastSeq:
+				break
+			if seq & 1:
+				continue				# The GPR is in the middle of an update.
+			absTime, reference = struct.unpack_from(self.timeFormat, self.segment, self.timeOffset)
+			if struct.unpack_from(self.seqFormat, self.segment, 0)[0] == seq:
+				self.lastSeq = seq
+				self.lastAbsTime = absTime
+				self.lastReference = reference
+				break
+		return self.lastAbsTime + (monotonic() - self.lastReference)
+
+	def now(self):
+		"""
+		@purpose:	Returns the current ground absolute time as a datetime.
+		"""
+		return self.epoch + timedelta(seconds=self.readSeconds())
+
+	def close(self):
+		if self.segment is not None:
+			self.segment.close()
+			self.segment = None
+		return
+
+	def __init__(self, absTime=None):
+		"""
+		@purpose:	Creates the shared memory segment for the clock.
+		@param:		absTime: initial ground absolute time (datetime), defaults to the current UTC time.
+		"""
+		self.segment = mmap.mmap(-1, self.segmentSize)
+		if absTime is None:
+			absTime = datetime.utcnow()
+		self.set(absTime)
+
+def parseTime(timeString):
+	"""
+	@purpose:	Parses a time given on the command line, either as seconds since 1970 or as YYYY-MM-DDTHH:MM:SS
+	"""
+	try:
+		return float(timeString)
+	except ValueError:
+		pass
+	for timeFormat in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+		try:
+			return calendar.timegm(datetime.strptime(timeString, timeFormat).timetuple())
+		except ValueError:
+			pass
+	raise ValueError("Could not parse time: %s" %timeString)
+
+if __name__ == '__main__':
+	pass
@@ -0,0 +1,245 @@
+"""
+FILE_NAME:			GroundMetrics.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the metrics registry (counters, gauges and latency histograms) which is shared by
+					the GPR and every PUS service, along with the local HTTP endpoint used to read it.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py, PUSService.py
+
+LIBRARIES USED:		mmap, struct, bisect, threading, BaseHTTPServer (http.server)
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: The registry must be created by the GPR before the services are forked, and
+					every metric has to be declared when the registry is created.
+
+NOTES:
+					Every process (GPR, HK, MEM, ...) gets its own row in a shared memory segment:
+
+					COUNTERS			GAUGES			HISTOGRAMS
+					uint64 x N			double x N		(uint64 x numBuckets, double sum, uint64 count) x N
+
+					A process only ever writes to its own row (through the MetricsView it was given), so no
+					locks are needed. Rows are summed up when the metrics are read, gauges are reported per process.
+
+					The endpoint serves the Prometheus text format on http://127.0.0.1:<port>/metrics, ex:
+					curl http://127.0.0.1:9150/metrics
+
+					A process forked by the GPR inherits the listening socket of the endpoint (but not its thread),
+					it must call closeInheritedServers() right after the fork so that the port is only held by the
+					GPR (a service left running after the GPR crashed would otherwise keep it bound).
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Added closeInheritedServers() for the processes forked by the GPR.
+"""
+
+import mmap
+import struct
+import bisect
+import threading
+try:
+	from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+	from http.server import HTTPServer, BaseHTTPRequestHandler
+
+openServers			= []			# MetricsServers started by this process (or the one it was forked from)
+
+def closeInheritedServers():
+	"""
+	@purpose:	Closes the listening sockets of the MetricsServers inherited from the parent process, to be called in
+				a child right after fork() (the thread which served them was not inherited).
+	"""
+	for metricsServer in openServers:
+		metricsServer.server.socket.close()
+		metricsServer.server = None
+	del openServers[:]
+	return
+
+class MetricsRegistry:
+	"""
+	Author: agent
+	Shared memory table of counters, gauges and histograms with one row per process.
+	"""
+	prefix			= "groundstation_"
+	# Upper bounds (in seconds) of the latency histogram buckets, the last bucket is +Inf.
+	buckets			= [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+						1.0, 2.5, 5.0, 10.0, 30.0]
+	counterNames	= None
+	gaugeNames		= None
+	histogramNames	= None
+	processNames	= None
+	rowSize			= 0
+	histogramSize	= 0
+	segment			= None
+
+	def view(self, processName):
+		"""
+		@purpose:	Returns the MetricsView which the process 'processName' should use to update its metrics.
+		"""
+		return MetricsView(self, self.processNames.index(processName))
+
+	def counterOffset(self, row, i):
+		return row * self.rowSize + i * 8
+
+	def gaugeOffset(self, row, i):
+		return row * self.rowSize + (len(self.counterNames) + i) * 8
+
+	def histogramOffset(self, row, i):
+		return row * self.rowSize + (len(self.counterNames) + len(self.gaugeNames)) * 8 + i * self.histogramSize
+
+	def collect(self):
+		"""
+		@purpose:	Reads every row and returns the metrics as text in the Prometheus exposition format.
+		"""
+		lines = []
+		numBuckets = len(self.buckets) + 1
+		for i, name in enumerate(self.counterNames):
+			total = 0
+			for row in range(0, len(self.processNames)):
+				total += struct.unpack_from("<Q", self.segment, self.counterOffset(row, i))[0]
+			lines.append("# TYPE %s%s counter" %(self.prefix, name))
+			lines.append("%s%s %d" %(self.prefix, name, total))
+		for i, name in enumerate(self.gaugeNames):
+			lines.append("# TYPE %s%s gauge" %(self.prefix, name))
+			for row, processName in enumerate(self.processNames):
+				value = struct.unpack_from("<d", self.segment, self.gaugeOffset(row, i))[0]
+				lines.append('%s%s{process="%s"} %r' %(self.prefix, name, processName, value))
+		for i, name in enumerate(self.histogramNames):
+			counts = [0] * numBuckets
+			total = 0.0
+			count = 0
+			for row in range(0, len(self.processNames)):
+				offset = self.histogramOffset(row, i)
+				rowCounts = struct.unpack_from("<%dQ" %numBuckets, self.segment, offset)
+				for j in range(0, numBuckets):
+					counts[j] += rowCounts[j]
+				rowSum, rowCount = struct.unpack_from("<dQ", self.segment, offset + numBuckets * 8)
+				total += rowSum
+				count += rowCount
+			lines.append("# TYPE %s%s histogram" %(self.prefix, name))
+			cumulative = 0
+			for j in range(0, numBuckets):
+				cumulative += counts[j]
+				if j < len(self.buckets):
+					bound = repr(self.buckets[j])
+				else:
+					bound = "+Inf"
+				lines.append('%s%s_bucket{le="%s"} %d' %(self.prefix, name, bound, cumulative))
+			lines.append("%s%s_sum %r" %(self.prefix, name, total))
+			lines.append("%s%s_count %d" %(self.prefix, name, count))
+		return "\n".join(lines) + "\n"
+
+	def __init__(self, processNames, counterNames, gaugeNames, histogramNames):
+		self.processNames = list(processNames)
+		self.counterNames = list(counterNames)
+		self.gaugeNames = list(gaugeNames)
+		self.histogramNames = list(histogramNames)
+		self.histogramSize = (len(self.buckets) + 1) * 8 + 16
+		self.rowSize = (len(self.counterNames) + len(self.gaugeNames)) * 8 + len(self.histogramNames) * self.histogramSize
+		self.segment = mmap.mmap(-1, max(self.rowSize * len(self.processNames), 1))
+
+class MetricsView:
+	"""
+	Author: agent
+	A single process' row of a MetricsRegistry, used to update the metrics of that process.
+	"""
+	registry		= None
+	segment			= None
+	counters		= None		# name -> offset in the segment
+	gauges			= None
+	histograms		= None
+	buckets			= None
+
+	def increment(self, name, amount=1):
+		offset = self.counters[name]
+		value = struct.unpack_from("<Q", self.segment, offset)[0]
+		struct.pack_into("<Q", self.segment, offset, (value + amount) & 0xFFFFFFFFFFFFFFFF)
+		return
+
+	def setGauge(self, name, value):
+		struct.pack_into("<d", self.segment, self.gauges[name], value)
+		return
+
+	def observe(self, name, value):
+		"""
+		@purpose:	Adds 'value' (ex: a latency in seconds) to the histogram 'name'.
+		"""
+		offset = self.histograms[name]
+		bucketOffset = offset + bisect.bisect_left(self.buckets, value) * 8
+		struct.pack_into("<Q", self.segment, bucketOffset, struct.unpack_from("<Q", self.segment, bucketOffset)[0] + 1)
+		sumOffset = offset + (len(self.buckets) + 1) * 8
+		total, count = struct.unpack_from("<dQ", self.segment, sumOffset)
+		struct.pack_into("<dQ", self.segment, sumOffset, total + value, count + 1)
+		return
+
+	def __init__(self, registry, row):
+		self.registry = registry
+		self.segment = registry.segment
+		self.buckets = registry.buckets
+		self.counters = {}
+		self.gauges = {}
+		self.histograms = {}
+		for i, name in enumerate(registry.counterNames):
+			self.counters[name] = registry.counterOffset(row, i)
+		for i, name in enumerate(registry.gaugeNames):
+			self.gauges[name] = registry.gaugeOffset(row, i)
+		for i, name in enumerate(registry.histogramNames):
+			self.histograms[name] = registry.histogramOffset(row, i)
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+	"""
+	Author: agent
+	Serves the contents of the registry on GET /metrics.
+	"""
+	registry		= None
+
+	def do_GET(self):
+		if self.path.split("?")[0] not in ("/", "/metrics"):
+			self.send_error(404)
+			return
+		body = self.registry.collect().encode("ascii")
+		self.send_response(200)
+		self.send_header("Content-Type", "text/plain; version=0.0.4")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+		return
+
+	def log_message(self, format, *args):
+		return				# Don't clutter the CLI with every scrape.
+
+class MetricsServer:
+	"""
+	Author: agent
+	Local HTTP endpoint for the metrics registry, runs in a background thread of the GPR.
+	"""
+	server			= None
+	thread			= None
+
+	def stop(self):
+		if self.server is not None:
+			self.server.shutdown()
+			self.server.server_close()
+			self.server = None
+		if self in openServers:
+			openServers.remove(self)
+		return
+
+	def __init__(self, registry, port, host="127.0.0.1"):
+		handler = type("BoundMetricsRequestHandler", (MetricsRequestHandler, object), {"registry": registry})
+		self.server = HTTPServer((host, port), handler)
+		self.thread = threading.Thread(target=self.server.serve_forever)
+		self.thread.daemon = True
+		self.thread.start()
+		openServers.append(self)
+
+if __name__ == '__main__':
+	pass
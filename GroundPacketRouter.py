@@ -19,7 +19,9 @@ ASSUMPTIONS, CONSTRAINTS, CONDITIONS: None.
 
 NOTES:
 		- My subsidiary services need to wait for TC Acceptance verification before
-		  proceeding on with other things. I will add in this code later.
+		  proceeding on with other things. Every TC that is sent is registered with tcTracker, the owning
+		  service is told which packets were sent for it (tcSent) and about the outcome of each of them
+		  (accepted/executed/failed/timed out) through its FIFO.
 		- 
 
 REQUIREMENTS:
@@ -27,6 +29,8 @@ REQUIREMENTS:
 	-Linux Operating system (Ubuntu 14 was used)
 	-This class should be called via a normal terminal in Linux
 	-ex: python GroundPacketRouter.py
+	-ex: python GroundPacketRouter.py SAT1 SAT2		(one GPR + services per link, see LinkContext.py)
+	-Commands are entered with the CLI: python CommandLineInterface.py [link] [--batch script.txt]
 	-For the time being, we will have a serial connection to an Arduino Uno
 	which will allow us to connect to the transceiver remotely.
 	-We are using the CC1120 dev board as our "transceiver" for the groundstation
@@ -47,17 +51,128 @@ DEVELOPMENT HISTORY:
 
 11/28/2015			I decided it makes more sense to have a separate process which shall monitor the command line
 					interface.
+
+10/19/2026			Event reports are now also written to the binary event log (see EventLog.py) and the
+					text event log includes the severity column, same as the one written by PUSService.
+
+10/19/2026			TC verification is now tracked centrally by tcTracker (see TCVerificationTracker.py)
+					instead of writing tcAcceptVerification on the (forked) service objects.
+					Each TC now gets its own sequence count so that its PacketID/PSC is unique.
+
+10/19/2026			Ground time now lives in a shared memory clock (see GroundClock.py) which the GPR sets
+					and every service reads, updateServiceTime() used to assign absTime on the parent's
+					copies of the (forked) services which had no effect.
+
+10/19/2026			The subsidiary services are now started through a ServiceSupervisor (see ServiceSupervisor.py)
+					which watches their PIDs and heartbeats and restarts any service which crashes or hangs,
+					re-opening the GPR's side of its FIFOs.
+
+10/19/2026			Added a metrics registry shared with every service (see GroundMetrics.py) and a local HTTP
+					endpoint (http://127.0.0.1:9150/metrics) to read it: packet counts, verification failures,
+					queue depths, TC round trip times and log write latencies.
+
+10/19/2026			The stages of the telemetry path (parseDataArray, fletcher16, verifyTelemetry, logEventReport,
+					decodeTelemetryH, FIFO writes) can be traced with a PipelineTracer (see PipelineTracer.py),
+					enabled with GROUNDSTATION_TRACE=N and dumped on SIGUSR1 and at shutdown.
+
+10/19/2026			Startup is now idempotent and fast: existing FIFOs are reused (ensureFifo()), logs are opened
+					for appending, every FIFO is opened non-blocking by the GPR before the services are started
+					(so they no longer have to open them in a fixed order) and a startup timeline is printed.
+					The wildcard imports were replaced by explicit ones. The raw_input() loop which kept the GPR from
+					reaching its main loop is gone, the GPR is stopped with Ctrl-C. decodeTelemetry() skips packets which
+					were never received (ex: the empty packet created at startup) and the logs are opened in text mode.
+
+10/19/2026			The router's state now belongs to the instance and everything which is specific to a link (FIFOs,
+					logs, metrics port) comes from its LinkContext (see LinkContext.py), so several spacecraft /
+					transceivers can be served at once, one GPR process (with its own services) per link:
+					python GroundPacketRouter.py SAT1 SAT2
+
+10/19/2026			Copies of telemetry packets which were already received (retransmissions, overlapping passes)
+					are dropped by a DuplicateFilter (see DuplicateFilter.py) before they are verified and routed.
+
+10/19/2026			Segmented telemetry (memory dumps, schedule reports) is put back together by a ReassemblyBuffer
+					(see ReassemblyBuffer.py), which tolerates packets arriving out of order, and handed to the
+					service as a single command with a payload. Transfers which time out are reported along with
+					their missing segments.
+
+10/19/2026			Commands from the CLI are now checked in the main loop (checkCLI()). Every command from the CLI
+					carries a sequence number and is validated (validateCommand()) before it is routed, the CLI is
+					told about the outcome of each one so that command scripts can be pipelined (see
+					CommandLineInterface.py).
+
+10/19/2026			Link quality is now measured by a LinkStatistics object (see LinkStatistics.py): packets received,
+					corrupted (by reason) and missing (sequence count gaps), throughput and loss for the last minute
+					(metrics) and for every pass (one line per pass in /telemetry/passLog*.csv).
+
+10/19/2026			All the logs of a link are now written by a single LogWriterService process (see
+					LogWriterService.py) which the GPR and the services send their records to, instead of each
+					process opening the logs and taking turns with the event, hk and error locks.
+
+10/19/2026			Logs are named after the UTC date (ex: eventLog2026-10-19.csv) instead of month + day, and are
+					rotated, compressed and cleaned up by the log writer.
+
+10/19/2026			The HK service keeps a columnar archive of the housekeeping reports in /housekeeping/archive
+					(see HKArchive.py).
+
+10/19/2026			The housekeeping archive is split into /housekeeping/archive/hk and /housekeeping/archive/diag
+					(diagnostics reports), both with a time index and a query tool (python HKArchive.py).
+
+10/19/2026			The HK service keeps the latest value of every parameter in /housekeeping/hkValues.bin
+					(see HKValueCache.py).
+
+10/19/2026			Per-orbit and per-day statistics of the housekeeping parameters are written to
+					/housekeeping/archive/hkStats and /housekeeping/archive/diagStats (see HKStatistics.py).
+
+10/19/2026			Both housekeeping archives get downsampled tiers (tier10, tier100, tier1000) for plotting long
+					ranges (see HKArchiveTiers in HKArchive.py).
+
+10/19/2026			The FIFOs between the GPR and a service are drained before the service is restarted, so the new
+					service does not get the frames which were meant for the one which died. Commands for a service
+					which has not sent a heartbeat for a while (or was given up on) are dropped if its FIFO is full
+					instead of holding up the main loop for writeTimeOut seconds.
+
+10/19/2026			The acknowledgements sent to the CLI are documented as what they are: the command was forwarded
+					to its service, not completed.
+
+10/19/2026			decodeTelemetry() moves on from rejected packets, so they aren't counted twice in the link
+					statistics.
+
+10/19/2026			The log writer is supervised (and restarted) by the ServiceSupervisor like the services, under
+					the name LOG. It is left running when the services are stopped so that it can write what is left.
+
+10/19/2026			The service which requested a TC is sent the PacketID/PSC of every packet of it as soon as they are
+					registered with tcTracker (tcSent, see notifyTCSent()), so that it waits for the reports of those
+					packets only.
+
+10/19/2026			Segmented transfers which are longer than the sequence count allows (see ReassemblyBuffer.py) are
+					reported like the ones which time out.
+
+10/19/2026			The outcome of a CLI command is sent back to the CLI once its service is done with it and its TCs
+					are finished (see reportCLICommand()): the TCs are tagged with the sequence number of the command,
+					which the services pass back in [141] of their commands.
 """
-from HKService import *
-from FDIRService import *
-from MemoryService import *
-from SchedulingService import *
-from PUSPacket import *
-from FifoObject import *
+import os
+from HKService import hkService
+from FDIRService import FDIRService
+from MemoryService import MemoryService
+from SchedulingService import schedulingService
+from PUSPacket import Puspacket
+from FifoObject import FifoObject, ensureFifo, waitForFifos
+from LogWriterService import LogWriterService
+from TCVerificationTracker import TCVerificationTracker
+from GroundClock import GroundClock, monotonic
+from ServiceSupervisor import ServiceSupervisor
+from GroundMetrics import MetricsRegistry, MetricsServer
+from PipelineTracer import PipelineTracer
+from LinkContext import LinkContext
+from DuplicateFilter import DuplicateFilter
+from ReassemblyBuffer import ReassemblyBuffer
+from LinkStatistics import LinkStatistics
+import sys
+import signal
+from time import sleep
 from datetime import datetime
-from multiprocessing import *
-from sys import executable
-from subprocess import Popen
+from multiprocessing import Process, Lock
 
 class groundPacketRouter(Process):
 	"""
@@ -146,6 +261,13 @@ class groundPacketRouter(Process):
 	scheduleCleared			= 0xEE
 	schedCommandCompleted   = 0xED
 	numCommandsWrong		= 0xEC
+	serviceRestarted		= 0xE8
+	serviceFailed			= 0xE7
+	# TC Verification (GPR -> ground services)
+	tcVerificationReceived	= 0x81
+	tcSent					= 0x82
+	# Ground services -> GPR: the service is done with the CLI command in [141] (see PUSService.executeGPRCommand())
+	cliCommandDone			= 0x83
 	# IDs for Communication:
 	comsID					= 0x00
 	epsID					= 0x01
@@ -177,17 +299,54 @@ class groundPacketRouter(Process):
 	GPRTofdirFifo			= None
 	schedToGPRFifo			= None
 	GPRToschedFifo			= None
+	GPRtoCLIFifo			= None
+	CLIToGPRFifo			= None
+	# Link served by this router (see LinkContext.py)
+	link					= None
+	# Every FIFO used by the ground station (in the link's /fifos, see fifoPath())
+	fifoNames				= ["GPRtohk", "GPRtomem", "GPRtofdir", "GPRtosched", "hkToGPR", "memToGPR", "schedToGPR",
+							   "fdirToGPR", "hktoFDIR", "memtoFDIR", "schedtoFDIR", "FDIRtohk", "FDIRtomem", "FDIRtosched",
+							   "GPRToCLI", "CLIToGPR"]
+	# Startup timeline: (milestone, seconds since initialize() started)
+	startupBegin			= 0
+	startupTimeline			= None
+	idleWait				= 0.01			# Seconds the main loop sleeps when there is nothing to do
 	# Subsidiary services are attributes to this class
 	hkGroundService			= None
 	memoryGroundService		= None
 	FDIRGround				= None
 	schedulingGround		= None
+	supervisor				= None
+	serviceFifos			= None			# Service name -> (FIFO to the service, FIFO from the service)
 	# Packet object
 	currentPacket			= Puspacket()
 	lastPacket				= currentPacket
 	sendPacket				= Puspacket()
 	lastSendPacket			= sendPacket
 	sendPacketCount			= 0
+	# Telemetry packets which were already received are dropped (see DuplicateFilter.py)
+	duplicateFilter			= None
+	duplicateWindow			= 1024			# Number of packets remembered by the filter
+	# Segmented telemetry being put back together (see ReassemblyBuffer.py)
+	reassembly				= None
+	# Link quality, rolling and per pass (see LinkStatistics.py)
+	linkStats				= None
+	# Log writer of the link and the channel used to send it records (see LogWriterService.py)
+	logWriter				= None
+	logs					= None
+	# Outstanding telecommands waiting on TC verification
+	tcTracker				= None
+	tcSequenceCount			= 0
+	cliSequence				= 0				# CLI command which led to the service command being executed (see execCommands())
+	# Shared ground clock, set here and read by every service
+	groundClock				= None
+	# Metrics shared with every service, metricsView is the GPR's own row.
+	metrics					= None
+	metricsView				= None
+	metricsServer			= None
+	metricsPort				= 9150
+	# Optional tracing of the telemetry path (see PipelineTracer.py)
+	tracer					= None
 	# Counting Attributes for the different Telecommand packets that can be sent
 	clearHKCount			= 0
 	newHKCount				= 0
@@ -195,7 +354,7 @@ class groundPacketRouter(Process):
 	disableParamCount		= 0
 	requestDefReportCount	= 0
 	memoryLoadCount			= 0
-	DumpRequestCount		= 0
+	dumpRequestCount		= 0
 	checkMemCount			= 0
 	addScheduleCount		= 0
 	clearScheduleCount		= 0
@@ -241,30 +400,57 @@ class groundPacketRouter(Process):
 		"PAUSE_SSM_OPERATIONS"      :	0x703
 	}
 	invCommandTable = None
-
-	@classmethod
-	def run(cls):
+	# Number of arguments taken by the commands which have some (see validateCommand())
+	commandArguments={
+		"MEMORY_LOAD"               :   1,			# file name
+		"DUMP_REQUEST"              :   3,			# memoryID, address (hex), length (hex)
+		"CHECK_MEMORY"              :   3,			# memoryID, address (hex), length (hex)
+		"ADD_SCHEDULE"              :   1,			# file name
+		"PAUSE_SSM_OPERATIONS"      :	1
+	}
+	# Frames exchanged with the CLI: [sequence number, command] and [sequence number, status, message, TC status]
+	cliCommandLength		= 2
+	cliAckLength			= 4
+	cliForwarded			= 1				# The command was forwarded to its service
+	cliRejected				= -1
+	cliFinished				= 2				# The service is done with the command, the TC status is its outcome
+	cliBatchSize			= 32			# Commands from the CLI handled per iteration of the main loop
+
+	def run(self):
 		"""
 		@purpose: Represents the main program for the ground packet router and Command-Line Interface.
+		@Note:		When several links are served, each router is start()ed in its own process and run() is
+					the main program of that process, the router stops itself on SIGTERM.
 		"""
-		cls.initialize(cls)
-
-		#os.system("gnome-terminal --disable-factory -e {python CommandLineInterface.py}")
-		while 1:
-			response = raw_input("Enter something to kill this process")
-			if response:
-				return
-
-		while 1:
-			# Check the transceiver for an incoming packet THIS NEEDS TO PUT INCOMING TELEMETRY INTO PACKET OBJECTS
-			if cls.decodeTelemetry(cls, cls.currentPacket) < 0:
-				# Send an error message to FDIRGround
-				pass
-			cls.execCommands(cls)
-			# Check the CLI for required action
-			cls.updateServiceTime(cls)
-			# Make sure all the subsidiary services are still running, restart them if necessary.
-			# Check if the satellite is in reach, then send commands if it is.
+		try:
+			self.initialize(self)
+
+			while 1:
+				# Check the transceiver for an incoming packet THIS NEEDS TO PUT INCOMING TELEMETRY INTO PACKET OBJECTS
+				if self.decodeTelemetry(self, self.currentPacket) < 0:
+					# Send an error message to FDIRGround
+					pass
+				self.execCommands(self)
+				# Let the services know about any of their TCs which have timed out.
+				self.checkTCTimeouts(self)
+				# Report the segmented transfers which are not going to complete.
+				self.checkReassembly(self)
+				# Close the pass once the satellite has gone quiet.
+				self.checkLinkStatistics(self)
+				# Make sure all the subsidiary services are still running, restart them if necessary.
+				self.superviseServices(self)
+				self.updateMetrics(self)
+				if self.tracer.dumpRequested:
+					self.dumpTrace(self)
+				# Check the CLI for required action
+				self.checkCLI(self)
+				self.updateServiceTime(self)
+				# Check if the satellite is in reach, then send commands if it is.
+				# Sleep until one of the services or the CLI has something for us (or idleWait seconds have passed).
+				waitForFifos([self.hkToGPRFifo, self.memToGPRFifo, self.schedToGPRFifo, self.fdirToGPRFifo,
+							  self.CLIToGPRFifo], self.idleWait)
+		finally:
+			self.stop()
 
 	@staticmethod
 	def initialize(self):
@@ -277,120 +463,137 @@ class groundPacketRouter(Process):
 		self.absTime = datetime(2015, 1, 1, 0, 0, 0)# Set the absolute time to zero. (for now)
 		self.oldAbsTime = self.absTime
 		self.currentTime = datetime(2015, 11, 21)
+		self.startupBegin = monotonic()
+		self.startupTimeline = []
+		self.groundClock = GroundClock(self.absTime)
 
 		self.initCurrentCommand(self)
+		self.tcTracker = TCVerificationTracker()
+		self.duplicateFilter = DuplicateFilter(self.duplicateWindow)
+		self.reassembly = ReassemblyBuffer()
+		self.linkStats = LinkStatistics()
 
 		"""Get the absolute time from the satellite and update ours."""
 		self.currentPath = os.path.dirname(os.path.realpath(__file__))
 		os.chdir(self.currentPath)
 		print("Current Working Directory: %s" %self.currentPath)
-
-		# Create all the required FIFOs for to send information to the PUS services.
-		os.mkfifo(self.currentPath + "/fifos/GPRtohk.fifo")
-		os.mkfifo(self.currentPath + "/fifos/GPRtomem.fifo")
-		os.mkfifo(self.currentPath + "/fifos/GPRtofdir.fifo")
-		os.mkfifo(self.currentPath + "/fifos/GPRtosched.fifo")
-		os.mkfifo(self.currentPath + "/fifos/hkToGPR.fifo")
-		os.mkfifo(self.currentPath + "/fifos/memToGPR.fifo")
-		os.mkfifo(self.currentPath + "/fifos/schedToGPR.fifo")
-		os.mkfifo(self.currentPath + "/fifos/fdirToGPR.fifo")
-		# Create all the required FIFOs for the FDIR service
-		path1 = self.currentPath + "/fifos/hktoFDIR.fifo"
-		path2 = self.currentPath + "/fifos/memtoFDIR.fifo"
-		path3 = self.currentPath + "/fifos/schedtoFDIR.fifo"
-		path4 = self.currentPath + "/fifos/FDIRtohk.fifo"
-		path5 = self.currentPath + "/fifos/FDIRtomem.fifo"
-		path6 = self.currentPath + "/fifos/FDIRtosched.fifo"
-		os.mkfifo(path1)
-		os.mkfifo(path2)
-		os.mkfifo(path3)
-		os.mkfifo(path4)
-		os.mkfifo(path5)
-		os.mkfifo(path6)
-		# Create all the files required for logging
-		self.eventLog = None
-		self.hkLog = None
-		self.hkDefLog = None
-		self.errorLog = None
-		self.diagLog = None
-		self.diagDefLog = None
-		print(self.currentTime.month)
-		print(self.currentTime.day)
-		eventPath = self.currentPath + "/events/eventLog%s.csv" %(str(self.currentTime.month) + str(self.currentTime.day))
-		if os.path.exists(eventPath):
-			self.eventLog = open(eventPath, "rb+")
-		else:
-			self.eventLog = open(eventPath, "wb")
-		hkPath = self.currentPath + "/housekeeping/logs/hkLog%s.csv" %(str(self.currentTime.month) + str(self.currentTime.day))
-		if os.path.exists(hkPath):
-			self.hkLog = open(hkPath, "rb+")
-		else:
-			self.hkLog = open(hkPath, "wb")
-		hkDefPath = self.currentPath + "/housekeeping/logs/hkDefLog%s.txt" %(str(self.currentTime.month) + str(self.currentTime.day))
-		if os.path.exists(hkDefPath):
-			self.hkDefLog = open(hkDefPath, "rb+")
-		else:
-			self.hkDefLog  = open(hkDefPath, "wb")
-		errorPath = self.currentPath + "/ground_errors/errorLog%s.txt" %(str(self.currentTime.month) + str(self.currentTime.day))
-		if os.path.exists(errorPath):
-			self.errorLog = open(errorPath, "rb+")
-		else:
-			self.errorLog = open(errorPath, "wb")
-		diagPath = self.currentPath + "/housekeeping/logs/diagLog%s.csv" %(str(self.currentTime.month) + str(self.currentTime.day))
-		if os.path.exists(diagPath):
-			self.diagLog = open(diagPath, "rb+")
-		else:
-			self.diagLog = open(diagPath, "wb")
-		diagDefPath = self.currentPath + "/housekeeping/logs/diagDefLog%s.csv" %(str(self.currentTime.month) + str(self.currentTime.day))
-		if os.path.exists(diagDefPath):
-			self.diagDefLog = open(diagDefPath, "rb+")
-		else:
-			self.diagDefLog - open(diagDefPath, "wb")
-
-
-		# Create Mutex locks for accessing logs and printing to the CLI.
-		self.hkLock 		= Lock()
-		self.eventLock 		= Lock()
+		print("Link: %s (%s)" %(self.link.label(), self.link.basePath))
+		self.link.ensureDirectories()
+		self.link.pinToCPU()
+		signal.signal(signal.SIGTERM, self.terminate)
+
+		# Create all the required FIFOs, the ones left behind by a previous run (ex: after a crash) are reused.
+		for name in self.fifoNames:
+			ensureFifo(self.fifoPath(self, name))
+		path1 = self.fifoPath(self, "hktoFDIR")
+		path2 = self.fifoPath(self, "memtoFDIR")
+		path3 = self.fifoPath(self, "schedtoFDIR")
+		path4 = self.fifoPath(self, "FDIRtohk")
+		path5 = self.fifoPath(self, "FDIRtomem")
+		path6 = self.fifoPath(self, "FDIRtosched")
+		# Open the GPR's side of every FIFO right away, this never blocks (see FifoObject.py) so the services
+		# can open their side whenever they are ready.
+		self.GPRTohkFifo = FifoObject(self.fifoPath(self, "GPRtohk"), 1, 1)
+		self.GPRTomemFifo = FifoObject(self.fifoPath(self, "GPRtomem"), 1, 1)
+		self.GPRTofdirFifo = FifoObject(self.fifoPath(self, "GPRtofdir"), 1, 1)
+		self.GPRToschedFifo = FifoObject(self.fifoPath(self, "GPRtosched"), 1, 1)
+		self.hkToGPRFifo = FifoObject(self.fifoPath(self, "hkToGPR"), 0, 1)
+		self.memToGPRFifo = FifoObject(self.fifoPath(self, "memToGPR"), 0, 1)
+		self.fdirToGPRFifo = FifoObject(self.fifoPath(self, "fdirToGPR"), 0, 1)
+		self.schedToGPRFifo = FifoObject(self.fifoPath(self, "schedToGPR"), 0, 1)
+		self.GPRtoCLIFifo = FifoObject(self.fifoPath(self, "GPRToCLI"), 1, 1)
+		self.CLIToGPRFifo = FifoObject(self.fifoPath(self, "CLIToGPR"), 0, 1)
+		self.GPRtoCLIFifo.writeTimeOut = 0			# Never wait on a CLI which is not reading its acknowledgements.
+		self.serviceFifos = {"HK": (self.GPRTohkFifo, self.hkToGPRFifo), "MEM": (self.GPRTomemFifo, self.memToGPRFifo),
+							 "SCHED": (self.GPRToschedFifo, self.schedToGPRFifo), "FDIR": (self.GPRTofdirFifo, self.fdirToGPRFifo)}
+		self.markStartup(self, "FIFOs ready")
+
+		# The supervisor restarts the log writer and the services if they crash or hang.
+		self.supervisor = ServiceSupervisor(5)
+
+		# Start the log writer, which opens all the logs for appending (a restart on the same day keeps adding to
+		# the same logs) and rotates them by UTC date and size. It is started before the services so that they all
+		# inherit its channel, a restarted log writer takes over the pipe of the one which died.
+		logSpecs = {
+			"event"		: (self.link.path("events"), "eventLog", ".csv"),
+			"hk"		: (self.link.path("housekeeping", "logs"), "hkLog", ".csv"),
+			"hkDef"		: (self.link.path("housekeeping", "logs"), "hkDefLog", ".txt"),
+			"error"		: (self.link.path("ground_errors"), "errorLog", ".txt"),
+			"diag"		: (self.link.path("housekeeping", "logs"), "diagLog", ".csv"),
+			"diagDef"	: (self.link.path("housekeeping", "logs"), "diagDefLog", ".csv"),
+			"pass"		: (self.link.path("telemetry"), "passLog", ".csv")}
+		self.logWriter = self.supervisor.register("LOG", lambda slot: LogWriterService(logSpecs, self.supervisor.board,
+											slot, self.logWriter), lambda service: self.reconnectService(self, "LOG", service))
+		self.logs = self.logWriter.channel
+		self.markStartup(self, "Log writer started")
+
+		# Create Mutex locks for printing to the CLI.
 		self.cliLock 		= Lock()
-		self.errorLock 		= Lock()
 		self.hkTCLock		= Lock()
 		self.memTCLock		= Lock()
 		self.schedTCLock	= Lock()
 		self.fdirTCLock		= Lock()
 
-		# Create all the required PUS Services
-		self.hkGroundService 		= hkService(self.currentPath + "/fifos/hkToGPR.fifo", self.currentPath + "/fifos/GPRtohk.fifo", path1, path4,
-											self.hkTCLock, eventPath, hkPath, errorPath, self.eventLock, self.hkLock,
-											self.cliLock, self.errorLock, self.absTime.day, self.absTime.hour,
-											self.absTime.minute, self.absTime.second, hkDefPath, diagPath, diagDefPath)
-		self.memoryGroundService 	= MemoryService(self.currentPath + "/fifos/memToGPR.fifo", self.currentPath + "/fifos/GPRtomem.fifo", path2, path5,
-											self.memTCLock, eventPath, hkPath, errorPath, self.eventLock, self.hkLock,
-											self.cliLock, self.errorLock, self.absTime.day, self.absTime.hour,
-											self.absTime.minute, self.absTime.second)
-		self.schedulingGround		= schedulingService(self.currentPath + "/fifos/schedToGPR.fifo", self.currentPath + "/fifos/GPRtosched.fifo", path3, path6,
-											self.schedTCLock, eventPath, hkPath, errorPath, self.eventLock, self.hkLock,
-											self.cliLock, self.errorLock, self.absTime.day, self.absTime.hour,
-											self.absTime.minute, self.absTime.second)
-		self.FDIRGround 			= FDIRService(self.currentPath + "/fifos/fdirToGPR.fifo", self.currentPath + "/fifos/GPRtofdir.fifo", path1, path2, path3,
-											path4, path5, path6, self.fdirTCLock, eventPath, hkPath, errorPath,
-											self.eventLock, self.hkLock, self.cliLock, self.errorLock, self.absTime.day,
-											self.absTime.hour, self.absTime.minute, self.absTime.second)
+		# Create the metrics registry before the services are forked so that they all share it.
+		self.metrics = MetricsRegistry(["GPR", "HK", "MEM", "SCHED", "FDIR"],
+						["packets_received_total", "packets_rejected_total", "telecommands_sent_total",
+						 "tc_verification_failures_total", "tc_timeouts_total", "service_restarts_total",
+						 "commands_processed_total", "events_logged_total", "hk_reports_logged_total",
+						 "duplicates_suppressed_total", "transfers_reassembled_total", "transfers_expired_total",
+						 "transfers_rejected_total", "packets_missing_total", "checksum_errors_total"],
+						["tc_outstanding", "send_queue_depth", "transfers_pending", "link_packets_per_second",
+						 "link_bytes_per_second", "link_corrupt_ratio", "link_quality"],
+						["tc_round_trip_seconds", "command_handling_seconds", "log_write_seconds"])
+		self.metricsView = self.metrics.view("GPR")
+		# Set up tracing before the services are forked, they inherit the SIGUSR1 handler until they install their own.
+		self.tracer = PipelineTracer("GPR")
+		self.tracer.installSignalHandler()
+		Puspacket.tracer = self.tracer
+		try:
+			self.metricsServer = MetricsServer(self.metrics, self.link.metricsPort)
+		except (IOError, OSError) as e:
+			self.logError(self, "Could not start the metrics endpoint on port %d: %s" %(self.link.metricsPort, str(e)))
+
+		# Create all the required PUS Services, the supervisor restarts them if they crash or hang.
+		# A write to the FIFO of a service which just died should not take the GPR down with it.
+		signal.signal(signal.SIGPIPE, signal.SIG_IGN)
+		self.hkGroundService 		= self.supervisor.register("HK", lambda slot: hkService(self.fifoPath(self, "hkToGPR"), self.fifoPath(self, "GPRtohk"), path1, path4,
+											self.hkTCLock, self.logs, self.cliLock, self.absTime.day, self.absTime.hour,
+											self.absTime.minute, self.absTime.second,
+											groundClock=self.groundClock, heartbeatBoard=self.supervisor.board, heartbeatSlot=slot,
+											metrics=self.metrics.view("HK"), archivePath=self.link.path("housekeeping", "archive"),
+											valueCachePath=self.link.path("housekeeping", "hkValues.bin")),
+											lambda service: self.reconnectService(self, "HK", service),
+											lambda: self.resetServiceFifos(self, "HK"))
+		self.memoryGroundService 	= self.supervisor.register("MEM", lambda slot: MemoryService(self.fifoPath(self, "memToGPR"), self.fifoPath(self, "GPRtomem"), path2, path5,
+											self.memTCLock, self.logs, self.cliLock, self.absTime.day, self.absTime.hour,
+											self.absTime.minute, self.absTime.second, groundClock=self.groundClock,
+											heartbeatBoard=self.supervisor.board, heartbeatSlot=slot,
+											metrics=self.metrics.view("MEM")),
+											lambda service: self.reconnectService(self, "MEM", service),
+											lambda: self.resetServiceFifos(self, "MEM"))
+		self.schedulingGround		= self.supervisor.register("SCHED", lambda slot: schedulingService(self.fifoPath(self, "schedToGPR"), self.fifoPath(self, "GPRtosched"), path3, path6,
+											self.schedTCLock, self.logs, self.cliLock, self.absTime.day, self.absTime.hour,
+											self.absTime.minute, self.absTime.second, groundClock=self.groundClock,
+											heartbeatBoard=self.supervisor.board, heartbeatSlot=slot,
+											metrics=self.metrics.view("SCHED")),
+											lambda service: self.reconnectService(self, "SCHED", service),
+											lambda: self.resetServiceFifos(self, "SCHED"))
+		self.FDIRGround 			= self.supervisor.register("FDIR", lambda slot: FDIRService(self.fifoPath(self, "fdirToGPR"), self.fifoPath(self, "GPRtofdir"), path1, path2, path3,
+											path4, path5, path6, self.fdirTCLock, self.logs, self.cliLock, self.absTime.day,
+											self.absTime.hour, self.absTime.minute, self.absTime.second,
+											groundClock=self.groundClock, heartbeatBoard=self.supervisor.board, heartbeatSlot=slot,
+											metrics=self.metrics.view("FDIR")),
+											lambda service: self.reconnectService(self, "FDIR", service),
+											lambda: self.resetServiceFifos(self, "FDIR"))
+
+		self.markStartup(self, "Services started")
 
 		print("HK PID: %s" %str(self.hkGroundService.pID))
 		print("mem PID: %s" %str(self.memoryGroundService.pID))
 		print("Sched PID: %s" %str(self.schedulingGround.pID))
 		print("FDIR PID: %s" %str(self.FDIRGround.pID))
 
-		# Open all the FIFOs TO the subsidiary services for writing
-		self.GPRTohkFifo = FifoObject(self.currentPath + "/fifos/GPRtohk.fifo", 1)
-		self.GPRTomemFifo = FifoObject(self.currentPath + "/fifos/GPRtomem.fifo", 1)
-		self.GPRTofdirFifo = FifoObject(self.currentPath + "/fifos/GPRtofdir.fifo", 1)
-		self.GPRToschedFifo = FifoObject(self.currentPath + "/fifos/GPRtosched.fifo", 1)
-		# Open all the FIFOs for receiving information from the PUS services, (created by them as well)
-		self.hkToGPRFifo = FifoObject(self.currentPath + "/fifos/hkToGPR.fifo", 0)
-		self.memToGPRFifo = FifoObject(self.currentPath + "/fifos/memToGPR.fifo", 0)
-		self.fdirToGPRFifo = FifoObject(self.currentPath + "/fifos/fdirToGPR.fifo", 0)
-		self.schedToGPRFifo = FifoObject(self.currentPath + "/fifos/schedToGPR.fifo", 0)
 		# These are the actual Linux process IDs of the services which were just created.
 		self.HKPID = self.hkGroundService.pid
 		self.memPID = self.memoryGroundService.pid
@@ -398,13 +601,118 @@ class groundPacketRouter(Process):
 		self.schedPID = self.schedulingGround.pid
 		# Create stuff for communication with the CommandLineInterface
 		self.invCommandTable    = {v : k for k,v in self.commandTable.items()}
-		# Create the required FIFOs for the CLI
-		os.mkfifo(self.currentPath + "/fifos/GPRToCLI.fifo")
-		#self.GPRToCLIFifo = open(self.currentPath + "/fifos/GPRToCLI.fifo", "w")
-		os.mkfifo(self.currentPath + "/fifos/CLIToGPR.fifo")
-		#self.CLIToGPRFifo = open(self.currentPath + "/fifos/CLIToGPR.fifo", "r")
-		self.GPRtoCLIFifo = FifoObject(cls.currentPath + "/fifos/GPRToCLI.fifo", 1)
-		self.CLIToGPRFifo = FifoObject(cls.currentPath + "/fifos/CLIToGPR.fifo", 0)
+		self.markStartup(self, "Ready")
+		self.printToCLI(self, self.startupReport(self))
+		return
+
+	@staticmethod
+	def fifoPath(self, name):
+		return self.link.fifoPath(name)
+
+	def terminate(self, signum, frame):
+		"""
+		@purpose:   SIGTERM handler, unwinds run() so that the router stops its services and cleans up.
+		"""
+		sys.exit(0)
+
+	@staticmethod
+	def markStartup(self, milestone):
+		"""
+		@purpose:   Records the time at which a milestone of the startup was reached (see startupReport()).
+		"""
+		self.startupTimeline.append((milestone, monotonic() - self.startupBegin))
+		return
+
+	@staticmethod
+	def startupReport(self):
+		"""
+		@return:	The startup timeline as text, ex: "Logs open            +0.004s (0.001s)"
+		"""
+		lines = ["STARTUP TIMELINE:"]
+		previous = 0
+		for milestone, elapsed in self.startupTimeline:
+			lines.append("%-20s +%.3fs (%.3fs)" %(milestone, elapsed, elapsed - previous))
+			previous = elapsed
+		return "\n".join(lines) + "\n"
+
+	@staticmethod
+	def superviseServices(self):
+		"""
+		@purpose:   Lets the supervisor restart any subsidiary service which has crashed or hung and reports it.
+		"""
+		for name, reason in self.supervisor.check():
+			self.metricsView.increment("service_restarts_total")
+			if reason == "failed":
+				self.printToCLI(self, "%s SERVICE KEEPS FAILING, NO LONGER RESTARTING IT\n" %name)
+				self.logError(self, "%s service keeps failing, no longer restarting it" %name)
+				self.logEventReport(self, 4, self.serviceFailed, 0, "%s service keeps failing" %name)
+			else:
+				self.printToCLI(self, "%s SERVICE %s, RESTARTED\n" %(name, reason.upper()))
+				self.logError(self, "%s service %s and was restarted" %(name, reason))
+				self.logEventReport(self, 3, self.serviceRestarted, 0, "%s service %s and was restarted" %(name, reason))
+		return
+
+	@staticmethod
+	def updateMetrics(self):
+		"""
+		@purpose:   Refreshes the GPR's gauges in the metrics registry (the counters are updated as things happen).
+		"""
+		self.metricsView.setGauge("tc_outstanding", len(self.tcTracker))
+		self.metricsView.setGauge("send_queue_depth", self.sendPacketCount)
+		self.metricsView.setGauge("transfers_pending", len(self.reassembly))
+		packetRate, byteRate, corruptRatio = self.linkStats.rollingRates()
+		self.metricsView.setGauge("link_packets_per_second", packetRate)
+		self.metricsView.setGauge("link_bytes_per_second", byteRate)
+		self.metricsView.setGauge("link_corrupt_ratio", corruptRatio)
+		self.metricsView.setGauge("link_quality", 1.0 - corruptRatio)
+		return
+
+	@staticmethod
+	def dumpTrace(self):
+		"""
+		@purpose:   Prints the per-stage breakdown of the GPR's tracer and asks the services to print theirs.
+		"""
+		if not self.tracer.sampleEvery:
+			return
+		self.printToCLI(self, self.tracer.report())
+		for watched in self.supervisor.services:
+			if not watched.failed:
+				try:
+					os.kill(watched.pid, signal.SIGUSR1)
+				except OSError:
+					pass
+		return
+
+	@staticmethod
+	def reconnectService(self, name, service):
+		"""
+		@purpose:   Called by the supervisor after it has restarted a service.
+		@Note:		The GPR's side of the FIFOs is opened read/write (see FifoObject.py), so they survive the service
+					which was on the other end and the restarted service simply opens them again (they were drained
+					by resetServiceFifos() first).
+		"""
+		if name == "HK":
+			self.hkGroundService = service
+		if name == "MEM":
+			self.memoryGroundService = service
+		if name == "SCHED":
+			self.schedulingGround = service
+		if name == "FDIR":
+			self.FDIRGround = service
+		if name == "LOG":
+			self.logWriter = service
+		return
+
+	@staticmethod
+	def resetServiceFifos(self, name):
+		"""
+		@purpose:   Called by the supervisor before it restarts a service: throws away what is left in the FIFOs
+					between the GPR and the service which died (see FifoObject.drain()).
+		"""
+		for fifo in self.serviceFifos[name]:
+			drained = fifo.drain()
+			if drained:
+				self.logError(self, "%d byte(s) left in %s by the %s service were dropped" %(drained, fifo.fifoPath, name))
 		return
 
 	@staticmethod
@@ -412,55 +720,159 @@ class groundPacketRouter(Process):
 		"""
 		@purpose:   Whenever possible, GroundPacketRouter should update the time stored in the subsidiary services
 					so that everything stays in sync.
+		@Note:		The services read the shared ground clock themselves, so all that's left to do here is to
+					refresh the GPR's own copy of absTime (used for time stamping TCs and logs).
 		"""
-		self.hkGroundService.absTime = self.absTime
-		self.memoryGroundService.absTime = self.absTime
-		self.FDIRGround.absTime = self.absTime
-		self.schedulingGround.absTime = self.absTime
+		self.absTime = self.groundClock.now()
 		return
 
 	@staticmethod
-	def tcVerificationDecode(self):
+	def tcVerificationDecode(self, currentPacket):
 		"""
 		@purpose:   This function is used when the PUS packet which was received is a TC
 					verification packet.
 					The intent here is to route the packet to the subsidiary service that
 					it is intended for (TC Acceptance Report) OR to log the verification
 					to the Event Log / Alert FDIR (TC Execution Report)
-		@Note:		If the TC verification is a success, then we set the corresponding tc verification
-					attribute for that service, otherwise we send an alert to the FDIR task (and set nothing for the service)
+		@Note:		The TC is looked up in tcTracker by its PacketID/PSC, the service which sent it is told about
+					the outcome through its FIFO. Failures are also sent to the FDIR task.
 		"""
 		verificationPacketID = self.currentCommand[135] << 8
 		verificationPacketID += self.currentCommand[134]
 		verificationPSC	= self.currentCommand[133] << 8
 		verificationPSC += self.currentCommand[132]
-		if (self.serviceSubType == 1) or (self.serviceSubType == 7):				# TC verification is a successful type.
-			verificationAPID = self.currentCommand[135]
-			self.currentCommand[146] = 1
-			if verificationAPID == self.hkTaskID:
-				self.hkTCLock.acquire()
-				self.hkGroundService.tcAcceptVerification = (verificationPacketID << 16) & verificationPSC
-				self.hkTCLock.release()
-			if verificationAPID == self.MemoryTaskID:
-				self.memTCLock.acquire()
-				self.memoryGroundService.tcAcceptVerification = (verificationPacketID << 16) & verificationPSC
-				self.memTCLock.release()
-			if verificationAPID == self.schedulingTaskID:
-				self.schedTCLock.acquire()
-				self.schedulingGround.tcAcceptVerification = (verificationPacketID << 16) & verificationPSC
-				self.schedTCLock.release()
-			if verificationAPID == self.FDIRGroundID:
-				self.fdirTCLock.acquire()
-				self.FDIRGround.tcAcceptVerification = (verificationPacketID << 16) & verificationPSC
-				self.fdirTCLock.release()
-		if (self.serviceSubType == 2) or (self.serviceSubType == 8):				# Tc verification is a failure type.
-			self.logEventReport(2, self.TMExecutionFailed, 0, "Telecommand Execution Failed. for PacketID: %s, PSC: %s" %str(verificationPacketID) % str(verificationPSC))
+		subType = currentPacket.serviceSubType
+		tc = None
+		if (subType == 1) or (subType == 2):				# TC Acceptance Report
+			tc = self.tcTracker.accept(verificationPacketID, verificationPSC, subType == 1)
+		if (subType == 7) or (subType == 8):				# TC Execution Report
+			tc = self.tcTracker.execute(verificationPacketID, verificationPSC, subType == 7)
+		if (tc is not None) and ((subType == 7) or (subType == 8)):
+			self.metricsView.observe("tc_round_trip_seconds", monotonic() - tc.sentTime)
+		if tc is None:
+			self.logError(self, "TC verification received for unknown PacketID: %s, PSC: %s" %(str(verificationPacketID), str(verificationPSC)))
+		if (subType == 2) or (subType == 8):				# Tc verification is a failure type.
+			self.metricsView.increment("tc_verification_failures_total")
+			self.logEventReport(self, 2, self.TMExecutionFailed, 0, "Telecommand Execution Failed. for PacketID: %s, PSC: %s" %(str(verificationPacketID), str(verificationPSC)))
 			self.currentCommand[146] = self.TMExecutionFailed
-			self.currentCommand[146] = 3
-			self.sendCurrentCommandToFifo(self.GPRTofdirFifo)		# Alert FDIR that something is going wrong.
+			self.currentCommand[145] = 3
+			self.sendCurrentCommandToFifo(self, self.GPRTofdirFifo)		# Alert FDIR that something is going wrong.
+		if tc is not None:
+			self.notifyTCOwner(self, tc)
+		return
 
+	@staticmethod
+	def checkTCTimeouts(self):
+		"""
+		@purpose:   Pulls every TC whose deadline has passed out of tcTracker, lets the service which sent it know
+					and alerts the FDIR task.
+		"""
+		for tc in self.tcTracker.expire():
+			self.metricsView.increment("tc_timeouts_total")
+			self.logError(self, "TC PacketID: %s, PSC: %s timed out waiting on TC verification" %(str(tc.packetID), str(tc.psc)))
+			self.notifyTCOwner(self, tc)
+			self.clearCurrentCommand(self)
+			self.currentCommand[146] = self.TMExecutionFailed
+			self.currentCommand[145] = 3
+			self.sendCurrentCommandToFifo(self, self.GPRTofdirFifo)
+		for command in self.tcTracker.takeFinishedCommands():
+			self.reportCLICommand(self, command)
+		return
+
+	@staticmethod
+	def reportCLICommand(self, command):
+		"""
+		@purpose:   Sends the outcome of a CLI command which is finished (see TCVerificationTracker.closeCommand())
+					to the CLI: [sequence number, cliFinished, message, TC status].
+		@Note:		TC status: 0 = no TC was sent, otherwise the status of the command (see TCVerificationTracker).
+		"""
+		messages = {
+			0												:	"Completed, no TC was sent",
+			TCVerificationTracker.statusAccepted			:	"TC accepted",
+			TCVerificationTracker.statusAcceptFailed		:	"TC acceptance failed",
+			TCVerificationTracker.statusExecuted			:	"TC executed",
+			TCVerificationTracker.statusExecuteFailed		:	"TC execution failed",
+			TCVerificationTracker.statusTimedOut			:	"TC timed out"
+		}
+		try:
+			self.GPRtoCLIFifo.writeCommandToFifo([command.tag, self.cliFinished, messages.get(command.status, ""),
+												  command.status], self.cliAckLength)
+		except (IOError, OSError):
+			self.logError(self, "Could not send the outcome of CLI command %s" %str(command.tag))
 		return
 
+	@staticmethod
+	def notifyTCOwner(self, tc):
+		"""
+		@purpose:   Sends a tcVerificationReceived command to the service which sent the TC 'tc'.
+		@Note:		currentCommand[145] = status (see TCVerificationTracker), [144] = operation,
+					[140]-[137] = PacketID/PSC of the TC.
+		"""
+		fifo = self.ownerFifo(self, tc.owner)
+		if fifo is None:
+			return -1
+		self.clearCurrentCommand(self)
+		self.currentCommand[146] = self.tcVerificationReceived
+		self.currentCommand[145] = tc.status
+		self.currentCommand[144] = tc.operation
+		self.currentCommand[140] = (tc.packetID & 0xFF00) >> 8
+		self.currentCommand[139] = tc.packetID & 0x00FF
+		self.currentCommand[138] = (tc.psc & 0xFF00) >> 8
+		self.currentCommand[137] = tc.psc & 0x00FF
+		self.sendCurrentCommandToFifo(self, fifo)
+		return 1
+
+	@staticmethod
+	def notifyTCSent(self, owner, operation, keys):
+		"""
+		@purpose:   Sends a tcSent command to the service which requested a TC, so that it knows which packets
+					it has to wait for (see PUSService.waitForTCReport()).
+		@param:		keys: (PacketID, PSC) of every packet of the TC, in the order they were sent.
+		@Note:		currentCommand[145] = number of packets, [144] = operation, the payload holds the PacketID
+					and PSC of each packet one after the other.
+		"""
+		fifo = self.ownerFifo(self, owner)
+		if fifo is None:
+			return -1
+		payload = []
+		for packetID, psc in keys:
+			payload.append(packetID)
+			payload.append(psc)
+		self.clearCurrentCommand(self)
+		self.currentCommand[146] = self.tcSent
+		self.currentCommand[145] = len(keys)
+		self.currentCommand[144] = operation
+		self.sendCurrentCommandToFifo(self, fifo, payload)
+		return 1
+
+	@staticmethod
+	def ownerFifo(self, owner):
+		"""
+		@return:	The FIFO to the ground service 'owner' (ex: HKGroundID), None if there is no such service.
+		"""
+		owners = {
+			self.HKGroundID		:	self.GPRTohkFifo,
+			self.MemGroundID	:	self.GPRTomemFifo,
+			self.schedGroundID	:	self.GPRToschedFifo,
+			self.FDIRGroundID	:	self.GPRTofdirFifo
+		}
+		return owners.get(owner)
+
+	@staticmethod
+	def registerTC(self, packet, owner, operation):
+		"""
+		@purpose:   Registers a TC packet which was just formatted with tcTracker.
+		@param:		owner: the ground service which requested the TC (ex: HKGroundID)
+		@param:		operation: service subtype of the TC.
+		@return:	(PacketID, PSC) of the packet.
+		@Note:		The TC is tagged with the CLI command which led to it, if any (cliSequence).
+		"""
+		packetID = (packet.data[151] << 8) | packet.data[150]
+		psc = (packet.data[149] << 8) | packet.data[148]
+		self.tcTracker.register(packetID, psc, owner, operation, tag=self.cliSequence)
+		self.metricsView.increment("telecommands_sent_total")
+		return (packetID, psc)
+
 	@staticmethod
 	def checkTransceiver(self):
 		# Do some stuff with the serial ports & communicating with the transceiver through the Arduino.
@@ -476,18 +888,52 @@ class groundPacketRouter(Process):
 					(located in tmToDecode[]). It will either send the appropriate commands
 					to the subsidiary services or it will act on the telemetry itself (if it is valid).
 					For now, we will log all telemetry for safe-keeping / debugging.
+		@return:	-1 = the packet was rejected, 0 = it was a duplicate (or was never received), 1 = it was decoded.
 		"""
 		if not currentPacket:
 			return -1
+		if not currentPacket.received:
+			# Not filled in by the transceiver (ex: the empty packet created at startup).
+			if currentPacket.nextPacket is not None:
+				self.currentPacket = currentPacket.nextPacket
+			return 0
 
 		# This parses through the data array and places the appropriate
 		# information in the attributes of this packet.
+		self.tracer.beginPacket()
+		span = self.tracer.start()
 		currentPacket.parseDataArray()
-
-		if self.verifyTelemetry(currentPacket) < 0:
+		self.tracer.stop("parseDataArray", span)
+		self.metricsView.increment("packets_received_total")
+
+		span = self.tracer.start()
+		if self.duplicateFilter.isDuplicate(currentPacket.packetID, currentPacket.psc, currentPacket.data):
+			self.metricsView.increment("duplicates_suppressed_total")
+			self.currentPacket = self.currentPacket.nextPacket		# Drop the copy, move on to the next packet.
+			return 0
+		self.tracer.stop("duplicateFilter", span)
+		self.linkStats.recordPacket(currentPacket.packetLengthRx)
+
+		span = self.tracer.start()
+		if self.verifyTelemetry(self, currentPacket) < 0:
+			self.metricsView.increment("packets_rejected_total")
+			if currentPacket.packetLengthRx != self.packetLength:
+				self.linkStats.recordCorrupt("length")
+			elif currentPacket.pec0 != currentPacket.pec1:
+				self.linkStats.recordCorrupt("checksum")
+				self.metricsView.increment("checksum_errors_total")
+			else:
+				self.linkStats.recordCorrupt("header")
+			self.currentPacket = self.currentPacket.nextPacket		# Drop the packet, move on to the next one.
 			return -1
-		if self.decodeTelemetryH(currentPacket) < 0:
+		self.tracer.stop("verifyTelemetry", span)
+		missing = self.linkStats.recordSequence(currentPacket.apid, currentPacket.sequenceCount)
+		if missing:
+			self.metricsView.increment("packets_missing_total", missing)
+		span = self.tracer.start()
+		if self.decodeTelemetryH(self, currentPacket) < 0:
 			return -1
+		self.tracer.stop("decodeTelemetryH", span)
 		return 1
 
 	@staticmethod
@@ -500,7 +946,7 @@ class groundPacketRouter(Process):
 		if not currentPacket:	# Method executed out of turn
 			return -1
 
-		self.clearCurrentCommand()
+		self.clearCurrentCommand(self)
 		for i in range(2, self.dataLength + 2):
 			self.currentCommand[i - 2] = currentPacket.data[i]
 
@@ -510,33 +956,118 @@ class groundPacketRouter(Process):
 		self.currentCommand[137] = self.psc & 0x000000FF
 
 		if currentPacket.serviceType == self.tcVerifyService:
-			self.tcVerificationDecode()
+			self.tcVerificationDecode(self, currentPacket)
 		if currentPacket.serviceType == self.hkService:
 			self.currentCommand[146] = currentPacket.serviceSubType
 			self.currentCommand[145] = self.currentCommand[135]
 			self.currentCommand[144] = self.currentCommand[134]
-			self.sendCurrentCommandToFifo(self.GPRTohkFifo)
+			self.sendCurrentCommandToFifo(self, self.GPRTohkFifo)
 		if currentPacket.serviceType == self.timeService:
-			self.syncWithIncomingTime()
+			self.syncWithIncomingTime(self)
 		if currentPacket.serviceType == self.kService:
 			self.currentCommand[146] = currentPacket.serviceSubType
-			self.sendCurrentCommandToFifo(self.GPRtoschedFifo)
+			if currentPacket.serviceSubType == self.schedReport:
+				self.reassembleTelemetry(self, currentPacket, self.GPRToschedFifo)
+			else:
+				self.sendCurrentCommandToFifo(self, self.GPRToschedFifo)
 		if currentPacket.serviceType == self.eventReportService:
-			self.checkIncomingEventReport()
-		if currentPacket.serviceType == self.memService:
-			self.currentCommand[146] = self.memService
+			self.checkIncomingEventReport(self)
+		if (currentPacket.serviceType == self.memService) and (currentPacket.serviceSubType == self.memoryDumpABS):
+			self.currentCommand[146] = self.memoryDumpABS
+			self.reassembleTelemetry(self, currentPacket, self.GPRTomemFifo)
+		elif currentPacket.serviceType == self.memService:
+			self.currentCommand[146] = currentPacket.serviceSubType
 			self.currentCommand[145] = currentPacket.packetID
 			self.currentCommand[144] = currentPacket.psc
 			self.currentCommand[143] = currentPacket.sequenceFlags
 			self.currentCommand[142] = currentPacket.sequenceCount
-			self.sendCurrentCommandToFifo(self.GPRTomemFifo)
+			self.sendCurrentCommandToFifo(self, self.GPRTomemFifo)
 		if currentPacket.serviceType == self.fdirService:
 			self.currentCommand[146] = self.fdirService
-			self.sendCurrentCommandToFifo(self.GPRTofdirFifo)
+			self.sendCurrentCommandToFifo(self, self.GPRTofdirFifo)
 
 		self.currentPacket = self.currentPacket.nextPacket		# Move to the next packet in the linked list, may be None.
 		return
 
+	@staticmethod
+	def reassembleTelemetry(self, currentPacket, fifo):
+		"""
+		@purpose:   Adds the packet which is in currentCommand[] to its segmented transfer (see ReassemblyBuffer.py)
+					and, once the transfer is complete, sends it to 'fifo' as a single command.
+		@Note:		currentCommand[146] must already be set. The command sent holds the application data of the first
+					packet in [0]-[136] and the number of packets in [145], the payload is the application data of
+					every packet, in order (dataLength values per packet).
+		@return:	1 if the transfer was completed and sent, 0 if more packets are needed.
+		"""
+		segments = self.reassembly.add(currentPacket.apid, currentPacket.sequenceFlags, currentPacket.sequenceCount,
+									   self.currentCommand[0:self.dataLength])
+		if segments is None:
+			return 0
+		payload = []
+		for segment in segments:
+			payload.extend(segment)
+		for i in range(0, self.dataLength):
+			self.currentCommand[i] = segments[0][i]
+		self.currentCommand[145] = len(segments)
+		self.metricsView.increment("transfers_reassembled_total")
+		self.sendCurrentCommandToFifo(self, fifo, payload)
+		return 1
+
+	@staticmethod
+	def checkReassembly(self):
+		"""
+		@purpose:   Gives up on the segmented transfers which stopped receiving packets, lets the operator know which
+					packets are missing (so they can be requested again) and alerts the FDIR task.
+					Transfers which were dropped for being too long are reported the same way.
+		"""
+		for apid, received in self.reassembly.takeRejected():
+			self.metricsView.increment("transfers_rejected_total")
+			self.printToCLI(self, "SEGMENTED TRANSFER FROM APID %s IS LONGER THAN %s PACKETS, DROPPED\n" %(str(apid), str(self.reassembly.sequenceModulo)))
+			self.logError(self, "Segmented transfer from APID %s dropped after %s packets, it is longer than the sequence count allows"
+						  %(str(apid), str(received)))
+			self.clearCurrentCommand(self)
+			self.currentCommand[146] = self.dumpPacketWrong
+			self.currentCommand[145] = 2	# Severity
+			self.currentCommand[144] = apid
+			self.sendCurrentCommandToFifo(self, self.GPRTofdirFifo)
+		for apid, missing, received in self.reassembly.expire():
+			self.metricsView.increment("transfers_expired_total")
+			self.printToCLI(self, "SEGMENTED TRANSFER FROM APID %s TIMED OUT, MISSING SEQUENCE COUNTS: %s\n" %(str(apid), str(missing)))
+			self.logError(self, "Segmented transfer from APID %s timed out after %s packets, missing sequence counts: %s"
+						  %(str(apid), str(received), str(missing)))
+			self.clearCurrentCommand(self)
+			self.currentCommand[146] = self.dumpPacketWrong
+			self.currentCommand[145] = 2	# Severity
+			self.currentCommand[144] = apid
+			self.sendCurrentCommandToFifo(self, self.GPRTofdirFifo)
+		return
+
+	@staticmethod
+	def checkLinkStatistics(self):
+		"""
+		@purpose:   Once nothing has been received for a while (see LinkStatistics.passGap), closes the current pass
+					and writes its statistics to the pass log.
+		"""
+		finished = self.linkStats.checkPass()
+		if finished is not None:
+			self.logPass(self, finished)
+		return
+
+	@staticmethod
+	def logPass(self, finished):
+		"""
+		@purpose:   Writes the statistics of a pass to the pass log, one line per pass:
+					start (UTC), duration (s), received, corrupt, checksum errors, length errors, header errors,
+					missing, late, bytes, throughput (B/s), loss (%)
+		"""
+		self.printToCLI(self, finished.summary() + "\n")
+		self.logs.write("pass", "%s\t,\t%.1f\t,\t%d\t,\t%d\t,\t%d\t,\t%d\t,\t%d\t,\t%d\t,\t%d\t,\t%d\t,\t%.1f\t,\t%.2f\n"
+						   %(datetime.utcfromtimestamp(finished.startWallTime).strftime("%Y-%m-%d %H:%M:%S"),
+							 finished.duration(), finished.received, finished.corrupt, finished.checksumErrors,
+							 finished.lengthErrors, finished.headerErrors, finished.missing, finished.late,
+							 finished.numBytes, finished.throughput(), finished.lossRate() * 100))
+		return
+
 	@staticmethod
 	def checkIncomingEventReport(self):
 		"""
@@ -547,12 +1078,12 @@ class groundPacketRouter(Process):
 		reportID = self.currentCommand[136]
 		numParams = self.currentCommand[135]
 
-		self.logEventReport(severity, reportID, numParams, "Satellite event report received.")
+		self.logEventReport(self, severity, reportID, numParams, "Satellite event report received.")
 		# If the event report was a failure, forward it to the FDIR task.
 		if self.serviceSubType > 1:
 			self.currentCommand[146] = reportID
 			self.currentCommand[145] = severity
-			self.sendCurrentCommandToFifo(self.GPRTofdirFifo)
+			self.sendCurrentCommandToFifo(self, self.GPRTofdirFifo)
 		return
 
 	@staticmethod
@@ -568,37 +1099,50 @@ class groundPacketRouter(Process):
 		incomDay = self.currentCommand[0]
 		incomHour = self.currentCommand[1]
 		incomMinute = self.currentCommand[2]
-		self.logEventReport(1, self.timeReportReceived, 0, "Time Report Received. D: %s H: %s M: %s" %str(incomDay) %incomHour %incomMinute)
+		self.logEventReport(self, 1, self.timeReportReceived, 0, "Time Report Received. D: %s H: %s M: %s" %(str(incomDay), incomHour, incomMinute))
 		incomAbsMinutes = (incomDay * 24 * 60) + (incomHour * 60) + incomMinute
 		localAbsMinutes = (self.absTime.day * 24 * 60) + (self.absTime.hour * 60) + self.absTime.minute
 
 		timeDelta = abs(localAbsMinutes - incomAbsMinutes)	# Difference in minutes between ground time and satellite time
 
 		if timeDelta > 90:		# If the difference in time is greater than one -approximate- orbit, something is wrong.
-			self.printToCLI("Satellite time is currently out of sync.\n")
+			self.printToCLI(self, "Satellite time is currently out of sync.\n")
 			# Store the current ground time.
 			self.oldAbsTime = self.absTime
-			# Adopt the satellite's time
-			self.absTime.day = incomDay
-			self.absTime.hour = incomHour
-			self.absTime.minute = incomMinute
+			# Adopt the satellite's time (datetime objects are immutable, replace it and publish it to the services)
+			self.absTime = self.absTime.replace(day=incomDay, hour=incomHour, minute=incomMinute)
+			self.groundClock.set(self.absTime)
 			# Send a command to the FDIR task in order to resolve this issue
 			self.currentCommand[146] = self.timeOutOfSync
 			self.currentCommand[145] = 2	# Severity
-			self.sendCurrentCommandToFifo(self.GPRTofdirFifo)
+			self.sendCurrentCommandToFifo(self, self.GPRTofdirFifo)
 		return
 
 	@staticmethod
-	def sendCurrentCommandToFifo(self, fifo):
+	def sendCurrentCommandToFifo(self, fifo, payload=None):
 		"""
 		@purpose:   This method is takes what is contained in currentCommand[] and
 		then place it in the given fifo "fifo".
 		We use a "START\n" code and "STOP\n" code to indicate where commands stop and start.
 		Each subsequent byte is then placed in the fifo followed by a newline character.
 		@param:		fifo: an instance of the FifoObject class.
+		@param:		payload: optional list of values sent along with the command (see FifoObject.py).
+		@Note:		If the service on the other end has died, the command is dropped (the supervisor restarts it).
+		@Note:		The GPR only waits for room in the FIFO of a service which is responsive (see ServiceSupervisor.py).
 		"""
-		fifo.writeCommandToFifo(self.currentCommand)
-		return
+		span = self.tracer.start()
+		timeOut = None
+		if self.supervisor is not None:
+			for name in self.serviceFifos:
+				if (self.serviceFifos[name][0] is fifo) and not self.supervisor.responsive(name):
+					timeOut = 0
+		try:
+			fifo.writeCommandToFifo(self.currentCommand, payload=payload, timeOut=timeOut)
+			self.tracer.stop("fifoWrite", span)
+		except (IOError, OSError):
+			self.logError(self, "Could not write to %s, the service may have died" %str(fifo.fifoPath))
+			return -1
+		return 1
 
 	@staticmethod
 	def verifyTelemetry(self, currentPacket):
@@ -613,46 +1157,46 @@ class groundPacketRouter(Process):
 			return -1
 
 		if currentPacket.packetLengthRx != self.packetLength:
-			self.printToCLI("Incoming Telemetry Packet Failed\n")
-			self.logError("TM PacketID: %s, PSC: %s had an incorrect packet length" %str(currentPacket.packetID) %str(currentPacket.psc))
+			self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+			self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect packet length" %(str(currentPacket.packetID), str(currentPacket.psc)))
 			return -1
 
 		if currentPacket.pec0 != currentPacket.pec1:
-			self.printToCLI("Incoming Telemetry Packet Failed\n")
-			self.logError("TM PacketID: %s, PSC: %s failed the checksum test. PEC1: %s, PEC0: %s"
-							%str(currentPacket.packetID) %str(currentPacket.psc) %str(currentPacket.pec1) %str(currentPacket.pec0))
+			self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+			self.logError(self, "TM PacketID: %s, PSC: %s failed the checksum test. PEC1: %s, PEC0: %s"
+							%(str(currentPacket.packetID), str(currentPacket.psc), str(currentPacket.pec1), str(currentPacket.pec0)))
 			return -1
 
 		if((currentPacket.serviceType != 1) and (currentPacket.serviceType != 3) and (currentPacket.serviceType != 5)
 		and (currentPacket.serviceType != 6) and (currentPacket.serviceType != 9) and (currentPacket.serviceType != 69)):
-			self.printToCLI("Incoming Telemetry Packet Failed\n")
-			self.logError("TM PacketID: %s, PSC: %s had an incorrect serviceType" %str(currentPacket.packetID) %str(currentPacket.psc))
+			self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+			self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect serviceType" %(str(currentPacket.packetID), str(currentPacket.psc)))
 			return -1
 
 		if currentPacket.serviceType == self.tcVerifyService:
 			if (currentPacket.serviceSubType != 1) and (currentPacket.serviceSubType != 2) and (currentPacket.serviceSubType != 7) and (currentPacket.serviceSubType != 8):
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 
 		if currentPacket.serviceType == self.hkService:
 			if (currentPacket.serviceSubType != 10) and (currentPacket.serviceSubType != 12) and (currentPacket.serviceSubType != 25) and (currentPacket.serviceSubType != 26):
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 			if(currentPacket.apid != self.HKGroundID) and (currentPacket.apid != self.FDIRGroundID):
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an invalid APID" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an invalid APID" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 
 		if currentPacket.serviceType == self.memService:
 			if(currentPacket.serviceSubType != 6) and (currentPacket.serviceSubType != 10):
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 			if currentPacket.apid != self.MemGroundID:
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an invalid APID" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an invalid APID" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 			address = currentPacket.data[137] << 24
 			address += currentPacket.data[136] << 16
@@ -660,75 +1204,80 @@ class groundPacketRouter(Process):
 			address += currentPacket.data[134]
 
 			if currentPacket.data[138] > 1:
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an incorrect memoryID" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect memoryID" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 			if (currentPacket.data[138] == 1) and (address > 0xFFFFF):
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an invalid address" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an invalid address" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 
 		if currentPacket.serviceType == self.timeService:
 			if currentPacket.serviceSubType != 2:
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 			if currentPacket.apid != self.TimeGroundID:
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an invalid APID" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an invalid APID" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 		if currentPacket.serviceType == self.kService:
 			if currentPacket.serviceSubType != 4:
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect serviceSubType" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 			if currentPacket.apid != self.schedGroundID:
-				self.printToCLI("Incoming Telemetry Packet Failed\n")
-				self.logError("TM PacketID: %s, PSC: %s had an invalid APID" %str(currentPacket.packetID) %str(currentPacket.psc))
+				self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+				self.logError(self, "TM PacketID: %s, PSC: %s had an invalid APID" %(str(currentPacket.packetID), str(currentPacket.psc)))
 				return -1
 
 		if currentPacket.version != 1:
-			self.printToCLI("Incoming Telemetry Packet Failed\n")
-			self.logError("TM PacketID: %s, PSC: %s had an incorrect version" %str(currentPacket.packetID) %str(currentPacket.psc))
+			self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+			self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect version" %(str(currentPacket.packetID), str(currentPacket.psc)))
 			return -1
 		if currentPacket.ccsdsFlag != 1:
-			self.printToCLI("Incoming Telemetry Packet Failed\n")
-			self.logError("TM PacketID: %s, PSC: %s had an incorrect ccsdsFlag" %str(currentPacket.packetID) %str(currentPacket.psc))
+			self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+			self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect ccsdsFlag" %(str(currentPacket.packetID), str(currentPacket.psc)))
 			return -1
 		if currentPacket.packetVersion != 1:
-			self.printToCLI("Incoming Telemetry Packet Failed\n")
-			self.logError("TM PacketID: %s, PSC: %s had an incorrect packet version" %str(currentPacket.packetID) %str(currentPacket.psc))
+			self.printToCLI(self, "Incoming Telemetry Packet Failed\n")
+			self.logError(self, "TM PacketID: %s, PSC: %s had an incorrect packet version" %(str(currentPacket.packetID), str(currentPacket.psc)))
 			return -1
 
-		self.logEventReport(1, self.incomTMSuccess, 0, "Incoming Telemetry Packet Succeeded")
+		self.logEventReport(self, 1, self.incomTMSuccess, 0, "Incoming Telemetry Packet Succeeded")
 		return 1
 
-	@classmethod
-	def stop(cls):
+	def stop(self):
+		# Print the trace before the services are gone.
+		if (self.tracer is not None) and self.tracer.sampleEvery:
+			self.dumpTrace(self)
+			sleep(0.2)
+		# Stop the subsidiary services, the log writer is left to write what they sent it (see below).
+		if self.supervisor is not None:
+			self.supervisor.stop(keep=["LOG"])
+			self.supervisor = None
+		if self.metricsServer is not None:
+			self.metricsServer.stop()
+			self.metricsServer = None
+		# The pass in progress (if any) is cut short.
+		if (self.linkStats is not None) and (self.linkStats.currentPass is not None) and (self.logs is not None):
+			self.logPass(self, self.linkStats.checkPass(self.linkStats.currentPass.endTime + self.linkStats.passGap))
+		# The services are gone, the log writer stops once it has written everything it was sent.
+		if self.logWriter is not None:
+			self.logWriter.stop()
+			self.logWriter = None
+			self.logs = None
 		# Close all the files which were opened
-		cls.hkToGPRFifo.close()
-		cls.GPRTohkFifo.close()
-		cls.memToGPRFifo.close()
-		cls.GPRTomemFifo.close()
-		cls.fdirToGPRFifo.close()
-		cls.GPRTofdirFifo.close()
+		for fifo in (self.hkToGPRFifo, self.GPRTohkFifo, self.memToGPRFifo, self.GPRTomemFifo, self.fdirToGPRFifo,
+					 self.GPRTofdirFifo, self.schedToGPRFifo, self.GPRToschedFifo, self.GPRtoCLIFifo, self.CLIToGPRFifo):
+			if fifo is not None:
+				fifo.close()
 		# Delete all the FIFO files that were created
-		os.remove(cls.currentPath + "/fifos/hkToGPR.fifo")
-		os.remove(cls.currentPath + "/fifos/GPRtohk.fifo")
-		os.remove(cls.currentPath + "/fifos/memToGPR.fifo")
-		os.remove(cls.currentPath + "/fifos/GPRtomem.fifo")
-		os.remove(cls.currentPath + "/fifos/fdirToGPR.fifo")
-		os.remove(cls.currentPath + "/fifos/GPRtofdir.fifo")
-		os.remove(cls.currentPath + "/fifos/GPRtosched.fifo")
-		os.remove(cls.currentPath + "/fifos/schedToGPR.fifo")
-		os.remove(cls.currentPath + "/fifos/hktoFDIR.fifo")
-		os.remove(cls.currentPath + "/fifos/memtoFDIR.fifo")
-		os.remove(cls.currentPath + "/fifos/schedtoFDIR.fifo")
-		os.remove(cls.currentPath + "/fifos/FDIRtohk.fifo")
-		os.remove(cls.currentPath + "/fifos/FDIRtomem.fifo")
-		os.remove(cls.currentPath + "/fifos/FDIRtosched.fifo")
-		os.remove(cls.currentPath + "/fifos/CLIToGPR.fifo")
-		os.remove(cls.currentPath + "/fifos/GPRToCLI.fifo")
+		for name in self.fifoNames:
+			try:
+				os.remove(self.fifoPath(self, name))
+			except OSError:
+				pass
 		return
 
 	@staticmethod
@@ -749,26 +1298,37 @@ class groundPacketRouter(Process):
 			tempString = "ERROR  REPORT (SEV 3)\t"
 		if severity == 4:
 			tempString = "ERROR  REPORT (SEV 4)\t"
-		self.eventLock.acquire()
-		self.eventLog.write(tempString)
-		self.eventLog.write(str(self.absTime.day) + "/" + str(self.absTime.hour) + "/" + str(self.absTime.minute) + "\t,\t")
-		self.eventLog.write(str(reportID) + "\t,\t")
+		startTime = monotonic()
+		span = self.tracer.start()
+		record = tempString
+		record += str(self.absTime.day) + "/" + str(self.absTime.hour) + "/" + str(self.absTime.minute) + "\t,\t"
+		record += str(severity) + "\t,\t"
+		record += str(reportID) + "\t,\t"
+		params = [0, 0]
 		for i in range(0,numParams):
 			temp = int(self.currentCommand[134 - (i * 4)]) << 24
 			temp += int(self.currentCommand[134 - (i * 4) - 1]) << 16
 			temp += int(self.currentCommand[134 - (i * 4) - 1]) << 8
 			temp += int(self.currentCommand[134 - (i * 4) - 1])
-			self.eventLog.write(str(hex(temp)) + "\t,\t")
+			record += str(hex(temp)) + "\t,\t"
+			if i < 2:
+				params[i] = temp
 		if message is not None:
-			self.eventLog.write(str(message) + "\n")
+			record += str(message) + "\n"
 		if message is None:
-			self.eventLog.write("\n")
-		self.eventLock.release()
+			record += "\n"
+		self.logs.write("event", record)
+		self.logs.appendEvent(self.absTime, severity, reportID, self.GroundPacketRouterID, params[0], params[1],
+							  message, numParams)
+		self.tracer.stop("logEventReport", span)
+		self.metricsView.increment("events_logged_total")
+		self.metricsView.observe("log_write_seconds", monotonic() - startTime)
 		return
 
 	@staticmethod
 	def execCommands(self):
-		self.clearCurrentCommand()
+		self.clearCurrentCommand(self)
+		self.cliSequence = 0
 		self.hkToGPRFifo.readCommandFromFifo()
 		self.memToGPRFifo.readCommandFromFifo()
 		self.schedToGPRFifo.readCommandFromFifo()
@@ -778,101 +1338,119 @@ class groundPacketRouter(Process):
 			for i in range(0, 147):
 				self.currentCommand[i] = self.hkToGPRFifo.command[i]
 			self.hkToGPRFifo.commandReady = 0
+			self.checkCLIDone(self)
 
 			if self.currentCommand[146] == self.clearHKDefinition:
 				self.clearHKCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.hkTaskID, self.hkService, self.clearHKDefinition,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.hkTaskID, self.hkService, self.clearHKDefinition,
 											  self.clearHKCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.newHKDefinition:
 				self.newHKCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.hkTaskID, self.hkService, self.newHKDefinition,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.hkTaskID, self.hkService, self.newHKDefinition,
 											  self.newHKCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.enableParamReport:
 				self.enableParamCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.hkTaskID, self.hkService, self.enableParamReport,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.hkTaskID, self.hkService, self.enableParamReport,
 											  self.enableParamCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.disableParamReport:
 				self.disableParamCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.hkTaskID, self.hkService, self.disableParamReport,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.hkTaskID, self.hkService, self.disableParamReport,
 											  self.disableParamCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.reportHKDefinitions:
 				self.requestDefReportCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.hkTaskID, self.hkService, self.reportHKDefinitions,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.hkTaskID, self.hkService, self.reportHKDefinitions,
 											  self.requestDefReportCount, 1, self.currentCommand)
 			#DIAGNOSTICS
 			if self.currentCommand[146] == self.clearDiagDefinition:
 				self.clearDiagCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.FDIRTaskID, self.hkService, self.clearDiagDefinition,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.FDIRTaskID, self.hkService, self.clearDiagDefinition,
 											  self.clearDiagCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.newDiagDefinition:
 				self.newDiagCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.FDIRTaskID, self.hkService, self.newDiagDefinition,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.FDIRTaskID, self.hkService, self.newDiagDefinition,
 											  self.newDiagCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.enableDiagParamReport:
 				self.enableDiagParamCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.FDIRTaskID, self.hkService, self.enableDiagParamReport,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.FDIRTaskID, self.hkService, self.enableDiagParamReport,
 											  self.enableDiagParamCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.disableParamReport:
 				self.disableDiagParamCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.FDIRTaskID, self.hkService, self.disableParamReport,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.FDIRTaskID, self.hkService, self.disableParamReport,
 											  self.disableDiagParamCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.reportDiagDefinitions:
 				self.requestDiagDefReportCount += 1
-				self.packetizeSendTelecommand(self.HKGroundID, self.FDIRTaskID, self.hkService, self.reportDiagDefinitions,
+				self.packetizeSendTelecommand(self, self.HKGroundID, self.FDIRTaskID, self.hkService, self.reportDiagDefinitions,
 											  self.requestDiagDefReportCount, 1, self.currentCommand)
 
 		if self.memToGPRFifo.commandReady:
 			for i in range(0, 147):
 				self.currentCommand[i] = self.memToGPRFifo.command[i]
 			self.memToGPRFifo.commandReady = 0
+			self.checkCLIDone(self)
 			if self.currentCommand[146] == self.memoryLoadABS:
 				self.memoryLoadCount += 1
-				self.packetizeSendTelecommand(self.MemGroundID, self.MemoryTaskID, self.memService, self.memoryLoadABS,
+				self.packetizeSendTelecommand(self, self.MemGroundID, self.MemoryTaskID, self.memService, self.memoryLoadABS,
 											  self.memoryLoadCount, self.currentCommand[145], self.currentCommand)
 			if self.currentCommand[146] == self.dumpRequestABS:
 				self.dumpRequestCount += 1
-				self.packetizeSendTelecommand(self.MemGroundID, self.MemoryTaskID, self.memService, self.dumpRequestABS,
+				self.packetizeSendTelecommand(self, self.MemGroundID, self.MemoryTaskID, self.memService, self.dumpRequestABS,
 											  self.dumpRequestCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.checkMemRequest:
 				self.checkMemCount += 1
-				self.packetizeSendTelecommand(self.MemGroundId, self.MemoryTaskID, self.memService, self.checkMemRequest,
+				self.packetizeSendTelecommand(self, self.MemGroundID, self.MemoryTaskID, self.memService, self.checkMemRequest,
 											  self.checkMemCount, 1, self.currentCommand)
 		if self.fdirToGPRFifo.commandReady:
 			# Deal with incoming commands from the FDIR task
 			for i in range(0, 147):
 				self.currentCommand[i] = self.fdirToGPRFifo.command[i]
 			self.fdirToGPRFifo.commandReady = 0
-			pass
+			self.checkCLIDone(self)
 		if self.schedToGPRFifo.commandReady:
 			for i in range(0, 147):
 				self.currentCommand[i] = self.schedToGPRFifo.command[i]
 			self.schedToGPRFifo.commandReady = 0
+			self.checkCLIDone(self)
 			if self.currentCommand[146] == self.addSchedule:
 				self.addScheduleCount += 1
-				self.packetizeSendTelecommand(self.SchedGroundId, self.SchedulingTaskID, self.kService, self.addSchedule,
+				self.packetizeSendTelecommand(self, self.schedGroundID, self.schedulingTaskID, self.kService, self.addSchedule,
 											  self.addScheduleCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.clearSchedule:
 				self.clearScheduleCount += 1
-				self.packetizeSendTelecommand(self.SchedGroundId, self.SchedulingTaskID, self.kService, self.clearSchedule,
+				self.packetizeSendTelecommand(self, self.schedGroundID, self.schedulingTaskID, self.kService, self.clearSchedule,
 											  self.clearScheduleCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.schedReportRequest:
 				self.reportRequestCount += 1
-				self.packetizeSendTelecommand(self.SchedGroundId, self.SchedulingTaskID, self.kService, self.schedReportRequest,
+				self.packetizeSendTelecommand(self, self.schedGroundID, self.schedulingTaskID, self.kService, self.schedReportRequest,
 											  self.reportRequestCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.pauseScheduling:
 				self.pauseScheduleCount += 1
-				self.packetizeSendTelecommand(self.SchedGroundId, self.SchedulingTaskID, self.kService, self.pauseScheduling,
+				self.packetizeSendTelecommand(self, self.schedGroundID, self.schedulingTaskID, self.kService, self.pauseScheduling,
 											  self.pauseScheduleCount, 1, self.currentCommand)
 			if self.currentCommand[146] == self.resumeScheduling:
 				self.resumeScheduleCount += 1
-				self.packetizeSendTelecommand(self.SchedGroundId, self.SchedulingTaskID, self.kService, self.resumeScheduling,
+				self.packetizeSendTelecommand(self, self.schedGroundID, self.schedulingTaskID, self.kService, self.resumeScheduling,
 											  self.resumeScheduleCount, 1, self.currentCommand)
 		return
 
+	@staticmethod
+	def checkCLIDone(self):
+		"""
+		@purpose:   Looks at the command from a service which was just copied into currentCommand[]: sets cliSequence
+					to the CLI command it is for ([141], 0 = none) and, if the service is done with that CLI command
+					(cliCommandDone), reports it to the CLI once its TCs are finished.
+		"""
+		self.cliSequence = self.currentCommand[141]
+		if self.currentCommand[146] != self.cliCommandDone:
+			return
+		command = self.tcTracker.closeCommand(self.cliSequence)
+		if command is not None:
+			self.reportCLICommand(self, command)
+		return
+
 	@staticmethod
 	def packetizeSendTelecommand(self, sender, dest, serviceType, serviceSubType, packetSubCounter, numPackets, appDataArray):
 
-		sequenceCount = 1
+		sequenceCount = (self.tcSequenceCount + 1) & 0xFF
 		packetTime =  self.absTime.day << 12
 		packetTime += self.absTime.hour << 8
 		packetTime += self.absTime.minute << 4
@@ -920,12 +1498,17 @@ class groundPacketRouter(Process):
 		newSendPacket.formatDataArray()
 
 		if numPackets == 1:
+			keys = [self.registerTC(self, newSendPacket, sender, serviceSubType)]
+			self.tcSequenceCount = sequenceCount
+			self.notifyTCSent(self, sender, serviceSubType, keys)
 			return 1
 
 		# numPackets != 1
+		keys = []
 		for i in range(0, numPackets):
 			newSendPacket.data[148] = sequenceCount
-			sequenceCount += 1
+			self.tcSequenceCount = sequenceCount
+			sequenceCount = (sequenceCount + 1) & 0xFF
 			if i > 1:
 				sequenceFlags = 0x00
 			if i == (numPackets - 1):
@@ -935,6 +1518,7 @@ class groundPacketRouter(Process):
 				newSendPacket.data[j] = appDataArray[j + i * 128]
 			# Format the packet again.
 			newSendPacket.formatDataArray()
+			keys.append(self.registerTC(self, newSendPacket, sender, serviceSubType))
 			# Insert the new packet into the linked list for sending
 			self.lastSendPacket.nextPacket = newSendPacket
 			newSendPacket.prevPacket = self.lastSendPacket
@@ -942,115 +1526,118 @@ class groundPacketRouter(Process):
 			self.sendPacketCount += 1
 			# Create a new pus packet object to work with
 			newSendPacket = Puspacket()
+		self.notifyTCSent(self, sender, serviceSubType, keys)
 		return
 
 	@staticmethod
 	def checkCLI(self):
-		self.CLIToGPRFifo.readCommandFromFifo(1)
-		if self.CLIToGPRFifo.commandReady:
-			self.clearCurrentCommand()
-			command = self.CLIToGPRFifo.command[0]	# There should only be one line here anyways.
-			commandItems = command.split()
-			commandID = self.invCommandTable[commandItems[0]] & 0x0F
-			serviceType = self.invCommandTable[commandItems[0]] >> 4
-			if serviceType == self.hkService:
-				if commandID == self.newHKDefinition:
-					self.currentCommand[146] = self.newHKDefinition
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.clearHkDefinition:
-					self.currentCommand[146] = self.clearHKDefinition
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.enableParamReport:
-					self.currentCommand[146] = self.enableParamReport
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.disableParamReport:
-					self.currentCommand[146] = self.disableParamReport
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.reportHKDefinitions:
-					self.currentCommand[146] = self.reportHKDefinitions
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				#DIAGNOSTICS
-				if commandID == self.newDiagDefinition:
-					self.currentCommand[146] = self.newDiagDefinition
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.clearDiagDefinition:
-					self.currentCommand[146] = self.clearDiagDefinition
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.enableDiagParamReport:
-					self.currentCommand[146] = self.enableDiagParamReport
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.disableDiagParamReport:
-					self.currentCommand[146] = self.disableDiagParamReport
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.reportDiagDefinitions:
-					self.currentCommand[146] = self.reportDiagDefinitions
-					self.GPRTohkFifo.writeCommandToFifo(self.currentCommand)
-
-			if serviceType == self.memService:
-				if commandID == self.memoryLoadABS:
-					self.currentCommand[146] = self.memoryLoadABS
-					self.currentCommand[0] = commandItems[1]		# Should be a file name
-					self.GPRTomemFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.dumpRequestABS:
-					self.currentCommand[146] = self.dumpRequestABS
-					memoryID 	= int(commandItems[1])
-					address		= int(commandItems[2], 16)
-					length		= int(commandItems[3], 16)
-					self.currentCommand[136] = memoryID
-					self.currentCommand[135] = (address & 0xFF000000) >> 24
-					self.currentCommand[134] = (address & 0x00FF0000) >> 16
-					self.currentCommand[133] = (address & 0x0000FF00) >> 8
-					self.currentCommand[132] = address & 0x000000FF
-					self.currentCommand[131] = (length & 0xFF000000) >> 24
-					self.currentCommand[130] = (length & 0x00FF0000) >> 16
-					self.currentCommand[129] = (length & 0x0000FF00) >> 8
-					self.currentCommand[128] = length & 0x000000FF
-					self.GPRTomemFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.checkMemRequest:
-					self.currentCommand[146] = self.checkMemRequest
-					memoryID 	= int(commandItems[1])
-					address		= int(commandItems[2], 16)
-					length		= int(commandItems[3], 16)
-					self.currentCommand[136] = memoryID
-					self.currentCommand[135] = (address & 0xFF000000) >> 24
-					self.currentCommand[134] = (address & 0x00FF0000) >> 16
-					self.currentCommand[133] = (address & 0x0000FF00) >> 8
-					self.currentCommand[132] = address & 0x000000FF
-					self.currentCommand[131] = (length & 0xFF000000) >> 24
-					self.currentCommand[130] = (length & 0x00FF0000) >> 16
-					self.currentCommand[129] = (length & 0x0000FF00) >> 8
-					self.currentCommand[128] = length & 0x000000FF
-					self.GPRTomemFifo.writeCommandToFifo(self.currentCommand)
-			if serviceType == self.kService:
-				if commandID == self.addSchedule:
-					self.currentCommand[146] = self.addSchedule
-					self.currentCommand[0] = commandItems[1]	# Should be a filename
-					self.GPRToschedFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.clearSchedule:
-					self.currentCommand[146] = self.clearSchedule
-					self.GPRToschedFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.schedReportRequest:
-					self.currentCommand[146] = self.schedReportRequest
-					self.GPRToschedFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.pauseScheduling:
-					self.currentCommand[146] = self.pauseScheduling
-					self.GPRToschedFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.resumeScheduling:
-					self.currentCommand[146] = self.resumeScheduling
-					self.GPRToschedFifo.writeCommandToFifo(self.currentCommand)
-			if serviceType == self.fdirService:
-				if commandID == self.enterLowPowerMode:
-					self.currentCommand[146] = self.enterLowPowerMode
-					self.GPRTofdirFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.enterSafeMode:
-					self.currentCommand[146] = self.enterSafeMode
-					self.GPRTofdirFifo.writeCommandToFifo(self.currentCommand)
-				if commandID == self.pauseSSMOperations:
-					self.currentCommand[146] = self.pauseSSMOperations
-					self.currentCommand[0] = commandItems[1]
-					self.GPRTofdirFifo.writeCommandToFifo(self.currentCommand)
+		"""
+		@purpose:   Executes the commands which were sent by the CLI (up to cliBatchSize of them) and lets the CLI
+					know about the outcome of each one.
+		@Note:		Frames from the CLI: [sequence number, command string], acknowledgements sent back:
+					[sequence number, status (cliForwarded / cliRejected), message, 0]
+					The acknowledgement goes out as soon as the command is in the service's FIFO. Once the service is
+					done with the command and its TCs are finished, a second frame with status cliFinished gives the
+					outcome reported by the TC tracker (see reportCLICommand()).
+		"""
+		for i in range(0, self.cliBatchSize):
+			self.CLIToGPRFifo.readCommandFromFifo(self.cliCommandLength)
+			if not self.CLIToGPRFifo.commandReady:
+				return
+			sequenceNumber = self.CLIToGPRFifo.command[0]
+			commandString = str(self.CLIToGPRFifo.command[1])
+			self.CLIToGPRFifo.commandReady = 0
+			status, message = self.execCLICommand(self, commandString, sequenceNumber)
+			try:
+				self.GPRtoCLIFifo.writeCommandToFifo([sequenceNumber, status, message, 0], self.cliAckLength)
+			except (IOError, OSError):
+				self.logError(self, "Could not acknowledge CLI command %s: %s" %(str(sequenceNumber), commandString))
 		return
 
+	@staticmethod
+	def validateCommand(self, commandString):
+		"""
+		@purpose:   Checks a command string (ex: "DUMP_REQUEST 1 0x1000 0x80") against commandTable and
+					commandArguments.
+		@Note:		Also used by the CLI to check a command script before anything is sent.
+		@return:	None if the command is valid, a description of what is wrong with it otherwise.
+		"""
+		commandItems = commandString.split()
+		if not commandItems:
+			return "Empty command"
+		name = commandItems[0].upper()
+		if name not in self.commandTable:
+			return "Unknown command %s" %commandItems[0]
+		numArguments = self.commandArguments.get(name, 0)
+		if len(commandItems) - 1 != numArguments:
+			return "%s takes %d argument(s), %d given" %(name, numArguments, len(commandItems) - 1)
+		if (name == "DUMP_REQUEST") or (name == "CHECK_MEMORY"):
+			try:
+				memoryID = int(commandItems[1])
+				int(commandItems[2], 16)
+				int(commandItems[3], 16)
+			except ValueError:
+				return "%s takes a memoryID (decimal), an address and a length (hex)" %name
+			if (memoryID != 0) and (memoryID != 1):
+				return "Invalid memoryID %s" %commandItems[1]
+		return None
+
+	@staticmethod
+	def execCLICommand(self, commandString, sequenceNumber=0):
+		"""
+		@purpose:   Validates a command from the CLI and forwards it to the service it is meant for.
+		@param:		sequenceNumber: sequence number of the command, passed on to the service in [141] so that the
+					TCs it leads to are tagged with it (see TCVerificationTracker.openCommand()).
+		@Note:		The codes in commandTable are the service type followed by the command (service subtype)
+					in the last hex digit, ex: 0x691 = K-Service (69), subtype 1.
+		@return:	(status, message), status = 1 if the command was forwarded (not executed), -1 otherwise.
+		"""
+		error = self.validateCommand(self, commandString)
+		if error is not None:
+			return (-1, error)
+		commandItems = commandString.split()
+		code = self.commandTable[commandItems[0].upper()]
+		commandID = code & 0x0F
+		serviceType = int("%x" %(code >> 4))
+		self.clearCurrentCommand(self)
+		self.currentCommand[146] = commandID
+		self.currentCommand[141] = sequenceNumber
+		fifo = None
+		if serviceType == self.hkService:
+			fifo = self.GPRTohkFifo
+		if serviceType == self.memService:
+			fifo = self.GPRTomemFifo
+			if commandID == self.memoryLoadABS:
+				self.currentCommand[0] = commandItems[1]		# Should be a file name
+			if (commandID == self.dumpRequestABS) or (commandID == self.checkMemRequest):
+				memoryID 	= int(commandItems[1])
+				address		= int(commandItems[2], 16)
+				length		= int(commandItems[3], 16)
+				self.currentCommand[136] = memoryID
+				self.currentCommand[135] = (address & 0xFF000000) >> 24
+				self.currentCommand[134] = (address & 0x00FF0000) >> 16
+				self.currentCommand[133] = (address & 0x0000FF00) >> 8
+				self.currentCommand[132] = address & 0x000000FF
+				self.currentCommand[131] = (length & 0xFF000000) >> 24
+				self.currentCommand[130] = (length & 0x00FF0000) >> 16
+				self.currentCommand[129] = (length & 0x0000FF00) >> 8
+				self.currentCommand[128] = length & 0x000000FF
+		if serviceType == self.kService:
+			fifo = self.GPRToschedFifo
+			if commandID == self.addSchedule:
+				self.currentCommand[0] = commandItems[1]		# Should be a filename
+		if serviceType == self.fdirService:
+			fifo = self.GPRTofdirFifo
+			if commandID == self.pauseSSMOperations:
+				self.currentCommand[0] = commandItems[1]
+		if fifo is None:
+			return (-1, "No service handles %s" %commandItems[0])
+		if sequenceNumber:
+			self.tcTracker.openCommand(sequenceNumber)
+		if self.sendCurrentCommandToFifo(self, fifo) < 0:
+			return (-1, "Could not forward %s, the service may have died" %commandItems[0])
+		return (1, "Forwarded to %s" %os.path.basename(fifo.fifoPath))
+
 	@staticmethod
 	def sendPusPacketTC(self):
 		# To be implemented later.
@@ -1058,10 +1645,9 @@ class groundPacketRouter(Process):
 
 	@staticmethod
 	def logError(self, errorString):
-		self.errorLock.acquire()
-		self.errorLog.write("******************ERROR START****************\n")
-		self.errorLog.write("ERROR: " + str(errorString) + " \n")
-		self.errorLog.write("******************ERROR STOP****************\n")
+		self.logs.write("error", "******************ERROR START****************\n" +
+						"ERROR: " + str(errorString) + " \n" +
+						"******************ERROR STOP****************\n")
 		return
 
 	@staticmethod
@@ -1083,15 +1669,53 @@ class groundPacketRouter(Process):
 			self.currentCommand.append(0)
 		return
 
-	def __init__(self):
+	def __init__(self, link=None):
 		"""
 		@purpose: Initialization method for the Ground Packet Router Class
+		@param:		link: the LinkContext of the link served by this router, None for the default link.
 		"""
 		super(groundPacketRouter, self).__init__()
+		if link is None:
+			link = LinkContext()
+		self.link = link
+		self.currentCommand = []						# Per router, see initCurrentCommand()
 		self.currentPacket = Puspacket()				# Create an empty PUS Packet.
 		self.lastPacket = self.currentPacket
+		self.sendPacket = Puspacket()
+		self.lastSendPacket = self.sendPacket
+
+def runShards(links):
+	"""
+	@purpose:   Starts one ground packet router (with its own services) per link and waits for all of them.
+	@Note:		SIGINT / SIGTERM stop every shard.
+	"""
+	routers = []
+	for link in links:
+		router = groundPacketRouter(link)
+		router.start()
+		print("Link %s: GPR PID %d, metrics on port %d" %(link.label(), router.pid, link.metricsPort))
+		routers.append(router)
+
+	def stopShards(signum, frame):
+		for router in routers:
+			if router.is_alive():
+				os.kill(router.pid, signal.SIGTERM)
+	signal.signal(signal.SIGTERM, stopShards)
+	signal.signal(signal.SIGINT, stopShards)
+	for router in routers:
+		while router.is_alive():
+			router.join(1)
+	return
 
 if __name__ == '__main__':
-	x = groundPacketRouter()
-	x.run()
-	x.stop()
+	links = LinkContext.fromArguments(sys.argv[1:])
+	if links == -1:
+		print("Link names may only contain letters, digits, '-' and '_'")
+		sys.exit(1)
+	try:
+		if len(links) == 1:
+			groundPacketRouter(links[0]).run()
+		else:
+			runShards(links)
+	except KeyboardInterrupt:
+		pass
@@ -0,0 +1,560 @@
+"""
+FILE_NAME:			HKArchive.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the housekeeping archive, a columnar store of the housekeeping reports:
+					one memory-mapped array of 16-bit values per parameter plus a shared column of timestamps,
+					with a sparse time index, its downsampled tiers, as well as a small command line tool for
+					querying it.
+
+FILE REFERENCES:	Written by HKService.py (/housekeeping/archive/hk, /housekeeping/archive/diag),
+					parameter names from PUSService.parameters, GroundClock.py (parseTime())
+
+LIBRARIES USED:		os, datetime, threading, traceback, argparse, numpy
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: There is a single writer (the housekeeping service of the link), any number of
+					readers. Reports are appended in time order, range reads rely on it.
+
+NOTES:
+					Layout of an archive directory:
+					count.i8				number of rows in the archive (int64)
+					time.f8					timestamp of every row, seconds since 1970 UTC (float64)
+					index.f8				[earliest, latest] timestamp of every block of blockSize rows (float64)
+					<parameter>.u2			value of the parameter in every row (uint16), ex: BATT_V.u2
+
+					Row N of every column belongs to the same report. A parameter which was not in a report (it was
+					not part of the housekeeping definition at the time) is stored as 'missing' (0xFFFF). A column
+					which appears after the first rows were written is filled with 'missing' for those rows.
+					'missing' is also a valid raw value (a saturated 16-bit sensor reads 0xFFFF), so a saturated
+					reading can't be told apart from a missing one once it is archived. Live reports are checked
+					against the limits before they are archived, where 0xFFFF is still a reading.
+
+					The files grow by growBy rows at a time and the row count is only updated once the whole row
+					has been written, so an append costs one write per column and readers never see half a row.
+
+					Range lookups first search the (small) time index for the first and last blocks which may
+					hold rows in the range, then those two blocks for the first and last rows, so a lookup costs
+					O(log n) and only touches a few pages of the archive. The index is updated with every append
+					and rebuilt from the timestamps if it is missing.
+
+					read() and query() return slices of the memory maps themselves (no copy), ex:
+					archive = HKArchive("housekeeping/archive/hk", readOnly=1)
+					times, values = archive.read("BATT_V", startTime, stopTime)
+					times, columns = archive.query(["BATT_V", "EPS_TEMP"], startTime, stopTime)
+
+					Tiers (HKArchiveTiers): every tier is an archive of its own (<archive>/tier10, tier100,
+					tier1000) in which each row sums up 'factor' rows of the archive: the time of the first of those
+					rows and, for every parameter, <parameter>.min, <parameter>.max and <parameter>.mean (rounded to
+					the nearest count, 'missing' if the parameter was missing from every row). Tiers are built from
+					the archive by a background thread of the HK service, one full bucket at a time, so the last few
+					reports (less than 'factor') are only in the archive itself. A query with a resolution (seconds
+					between points) is answered from the coarsest tier which is at least that fine in the range,
+					so plotting months of data only touches a few thousand rows:
+					tiers = HKArchiveTiers("housekeeping/archive/hk", readOnly=1)
+					factor, times, columns = tiers.query(["BATT_V"], startTime, stopTime, resolution=3600)
+					minimums, maximums, means = columns["BATT_V"]
+
+					Usage: python HKArchive.py housekeeping/archive/hk BATT_V EPS_TEMP --start 2026-10-19T10:00
+							--stop 2026-10-19T12:00
+							python HKArchive.py housekeeping/archive/diag --list
+							python HKArchive.py housekeeping/archive/hk BATT_V --calibration calibration.txt
+							python HKArchive.py housekeeping/archive/hk BATT_V --resolution 3600
+							python HKArchive.py housekeeping/archive/hk --build-tiers
+					(--calibration prints engineering units instead of raw values, see HKCalibration.py,
+					--resolution prints min / max / mean from the tiers)
+
+REQUIREMENTS:		numpy
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			The query tool can convert the values to engineering units (--calibration).
+
+10/19/2026			Added the downsampled tiers (HKArchiveTiers) and extend() to append many rows at once.
+
+10/19/2026			Documented that 'missing' is also the value of a saturated sensor.
+
+10/19/2026			parseTime() moved to GroundClock.py, so that tools which don't need numpy can use it.
+"""
+
+import os
+import threading
+import traceback
+from datetime import datetime
+import numpy
+from GroundClock import parseTime
+
+class HKArchive:
+	"""
+	Author: agent
+	Columnar, memory-mapped store of housekeeping reports.
+	"""
+	missing			= 0xFFFF		# Value stored for a parameter which was not in the report (see NOTES)
+	growBy			= 1 << 16		# Rows added to the files when they are full (a multiple of blockSize)
+	blockSize		= 1024			# Rows per entry of the time index
+	directory		= None
+	readOnly		= 0
+	countMap		= None			# numpy.memmap of the row count
+	times			= None			# numpy.memmap of the timestamps
+	index			= None			# numpy.memmap of the [earliest, latest] timestamp of each block
+	columns			= None			# parameter name -> numpy.memmap of its values
+	capacity		= 0				# Rows which fit in the files as they are
+
+	def path(self, name, extension):
+		return os.path.join(self.directory, name + extension)
+
+	def mapFile(self, path, dtype, rows):
+		"""
+		@purpose:	Maps the first 'rows' rows of the file at 'path', the file is created / extended if necessary.
+		"""
+		if self.readOnly:
+			return numpy.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+		size = numpy.dtype(dtype).itemsize * rows
+		if not os.path.exists(path):
+			open(path, "wb").close()
+		if os.path.getsize(path) < size:
+			f = open(path, "r+b")
+			f.truncate(size)
+			f.close()
+		return numpy.memmap(path, dtype=dtype, mode="r+", shape=(rows,))
+
+	def mapIndex(self):
+		"""
+		@purpose:	Maps the time index for the current capacity, as a (blocks, 2) array.
+		"""
+		numBlocks = self.capacity // self.blockSize
+		return self.mapFile(self.path("index", ".f8"), numpy.float64, numBlocks * 2).reshape((numBlocks, 2))
+
+	def buildIndex(self):
+		"""
+		@purpose:	Recomputes the time index from the timestamps (ex: for an archive which was written without one).
+		"""
+		count = len(self)
+		for block in range(0, (count + self.blockSize - 1) // self.blockSize):
+			times = self.times[block * self.blockSize:min((block + 1) * self.blockSize, count)]
+			self.index[block, 0] = times.min()
+			self.index[block, 1] = times.max()
+		return
+
+	def __len__(self):
+		return int(self.countMap[0])
+
+	def names(self):
+		"""
+		@return:	The names of the parameters in the archive.
+		"""
+		self.refresh()
+		return sorted(self.columns)
+
+	def refresh(self):
+		"""
+		@purpose:	Maps the columns which were added and the rows which were appended since the archive was opened
+					(readers only, the writer is always up to date).
+		"""
+		if not self.readOnly:
+			return
+		# While the writer grows the archive the files do not all have the same size yet, only the rows which
+		# every file has are mapped.
+		capacity = os.path.getsize(self.path("time", ".f8")) // 8
+		capacity = min(capacity, os.path.getsize(self.path("index", ".f8")) // 16 * self.blockSize)
+		names = []
+		for fileName in os.listdir(self.directory):
+			name, extension = os.path.splitext(fileName)
+			if extension != ".u2":
+				continue
+			size = os.path.getsize(self.path(name, ".u2")) // 2
+			if size:					# Just created by the writer otherwise.
+				names.append(name)
+				capacity = min(capacity, size)
+		capacity -= capacity % self.blockSize
+		if capacity != self.capacity:
+			self.capacity = capacity
+			self.times = self.mapFile(self.path("time", ".f8"), numpy.float64, capacity)
+			self.index = self.mapIndex()
+			self.columns = {}
+		for name in names:
+			if name not in self.columns:
+				self.columns[name] = self.mapFile(self.path(name, ".u2"), numpy.uint16, self.capacity)
+		return
+
+	def grow(self):
+		"""
+		@purpose:	Makes room for growBy more rows in every column.
+		"""
+		self.capacity += self.growBy
+		self.times.flush()
+		self.times = self.mapFile(self.path("time", ".f8"), numpy.float64, self.capacity)
+		self.index.flush()
+		self.index = self.mapIndex()
+		for name in self.columns:
+			self.columns[name].flush()
+			self.columns[name] = self.mapFile(self.path(name, ".u2"), numpy.uint16, self.capacity)
+		return
+
+	def addColumn(self, name):
+		column = self.mapFile(self.path(name, ".u2"), numpy.uint16, self.capacity)
+		column[0:len(self)] = self.missing
+		self.columns[name] = column
+		return column
+
+	def append(self, timestamp, values):
+		"""
+		@purpose:	Appends a report to the archive.
+		@param:		timestamp: seconds since 1970 UTC.
+		@param:		values: parameter name -> 16 bit value.
+		@return:	The number of the row which was written.
+		"""
+		row = len(self)
+		if row >= self.capacity:
+			self.grow()
+		for name in values:
+			if name not in self.columns:
+				self.addColumn(name)
+		for name in self.columns:
+			self.columns[name][row] = values.get(name, self.missing) & 0xFFFF
+		self.times[row] = timestamp
+		block = row // self.blockSize
+		if (row % self.blockSize == 0) or (timestamp < self.index[block, 0]):
+			self.index[block, 0] = timestamp
+		if (row % self.blockSize == 0) or (timestamp > self.index[block, 1]):
+			self.index[block, 1] = timestamp
+		self.countMap[0] = row + 1
+		return row
+
+	def extend(self, timestamps, values):
+		"""
+		@purpose:	Appends many rows to the archive at once.
+		@param:		timestamps: array of the timestamps of the rows (seconds since 1970 UTC).
+		@param:		values: parameter name -> array of 16 bit values (one per row).
+		"""
+		row = len(self)
+		numRows = len(timestamps)
+		if numRows == 0:
+			return
+		while row + numRows > self.capacity:
+			self.grow()
+		for name in values:
+			if name not in self.columns:
+				self.addColumn(name)
+		for name in self.columns:
+			if name in values:
+				self.columns[name][row:row + numRows] = values[name]
+			else:
+				self.columns[name][row:row + numRows] = self.missing
+		self.times[row:row + numRows] = timestamps
+		for block in range(row // self.blockSize, (row + numRows - 1) // self.blockSize + 1):
+			times = self.times[block * self.blockSize:min((block + 1) * self.blockSize, row + numRows)]
+			self.index[block, 0] = times.min()
+			self.index[block, 1] = times.max()
+		self.countMap[0] = row + numRows
+		return
+
+	def rowRange(self, startTime=None, stopTime=None):
+		"""
+		@return:	(first row, last row + 1) of the rows between startTime and stopTime (included).
+		@Note:		The time index gives the first block whose latest timestamp is >= startTime and the last block
+					whose earliest timestamp is <= stopTime, only those two blocks are searched for the rows.
+		"""
+		count = min(len(self), self.capacity)
+		numBlocks = (count + self.blockSize - 1) // self.blockSize
+		start = 0
+		stop = count
+		if startTime is not None:
+			block = int(numpy.searchsorted(self.index[0:numBlocks, 1], startTime, side="left"))
+			if block >= numBlocks:
+				return (count, count)
+			first = block * self.blockSize
+			last = min(first + self.blockSize, count)
+			start = first + int(numpy.searchsorted(self.times[first:last], startTime, side="left"))
+		if stopTime is not None:
+			block = int(numpy.searchsorted(self.index[0:numBlocks, 0], stopTime, side="right")) - 1
+			if block < 0:
+				return (0, 0)
+			first = block * self.blockSize
+			last = min(first + self.blockSize, count)
+			stop = first + int(numpy.searchsorted(self.times[first:last], stopTime, side="right"))
+		return (start, max(start, stop))
+
+	def read(self, name, startTime=None, stopTime=None):
+		"""
+		@purpose:	Reads the values of a single parameter between startTime and stopTime (seconds since 1970 UTC).
+		@return:	(timestamps, values), views of the archive's memory maps (no copy is made), None if the
+					parameter is not in the archive. Missing values are 'missing'.
+		"""
+		self.refresh()
+		if name not in self.columns:
+			return None
+		start, stop = self.rowRange(startTime, stopTime)
+		return (self.times[start:stop], self.columns[name][start:stop])
+
+	def query(self, names, startTime=None, stopTime=None):
+		"""
+		@purpose:	Reads the values of several parameters between startTime and stopTime (seconds since 1970 UTC).
+		@return:	(timestamps, parameter name -> values), views of the archive's memory maps (no copy is made).
+					Parameters which are not in the archive are left out.
+		"""
+		self.refresh()
+		start, stop = self.rowRange(startTime, stopTime)
+		columns = {}
+		for name in names:
+			if name in self.columns:
+				columns[name] = self.columns[name][start:stop]
+		return (self.times[start:stop], columns)
+
+	def flush(self):
+		"""
+		@purpose:	Writes the archive to disk (the memory maps are written back by the OS in any case).
+		"""
+		if self.readOnly:
+			return
+		for name in self.columns:
+			self.columns[name].flush()
+		self.times.flush()
+		self.index.flush()
+		self.countMap.flush()
+		return
+
+	def __init__(self, directory, readOnly=0):
+		"""
+		@param:		directory: directory which houses the archive, created if it does not exist (unless readOnly).
+		"""
+		self.directory = directory
+		self.readOnly = readOnly
+		self.columns = {}
+		if readOnly:
+			self.countMap = self.mapFile(self.path("count", ".i8"), numpy.int64, 1)
+			self.refresh()
+			return
+		if not os.path.isdir(directory):
+			os.makedirs(directory)
+		self.countMap = self.mapFile(self.path("count", ".i8"), numpy.int64, 1)
+		self.capacity = self.growBy
+		timePath = self.path("time", ".f8")
+		if os.path.exists(timePath):
+			self.capacity = max(self.capacity, os.path.getsize(timePath) // numpy.dtype(numpy.float64).itemsize)
+		self.times = self.mapFile(timePath, numpy.float64, self.capacity)
+		indexMissing = not os.path.exists(self.path("index", ".f8"))
+		self.index = self.mapIndex()
+		if indexMissing:
+			self.buildIndex()
+		for fileName in os.listdir(directory):
+			name, extension = os.path.splitext(fileName)
+			if extension == ".u2":
+				self.columns[name] = self.mapFile(self.path(name, ".u2"), numpy.uint16, self.capacity)
+
+class HKArchiveTiers:
+	"""
+	Author: agent
+	Downsampled tiers of a housekeeping archive (min / max / mean of every 'factor' rows).
+	"""
+	factors			= [10, 100, 1000]
+	chunkSize		= 1 << 16		# Rows of the archive summed up at a time
+	interval		= 60.0			# Seconds between two updates of the background thread
+	directory		= None
+	readOnly		= 0
+	archive			= None			# The archive itself (always opened read only, the HK service writes to it)
+	tiers			= None			# [(factor, HKArchive)], finest first
+	thread			= None
+	stopEvent		= None
+
+	def update(self):
+		"""
+		@purpose:	Adds the full buckets of rows which were appended to the archive since the last update to every
+					tier (writer only).
+		@return:	The number of tier rows which were added.
+		"""
+		self.archive.refresh()
+		count = min(len(self.archive), self.archive.capacity)
+		added = 0
+		for factor, tier in self.tiers:
+			while 1:
+				start = len(tier) * factor
+				numBuckets = min(count - start, self.chunkSize) // factor
+				if numBuckets <= 0:
+					break
+				stop = start + numBuckets * factor
+				values = {}
+				for name in self.archive.columns:
+					rows = numpy.array(self.archive.columns[name][start:stop]).reshape((numBuckets, factor))
+					present = rows != self.archive.missing
+					numPresent = present.sum(axis=1)
+					total = numpy.where(present, rows, 0).sum(axis=1, dtype=numpy.float64)
+					means = numpy.rint(total / numpy.maximum(numPresent, 1)).astype(numpy.uint16)
+					maximums = numpy.where(present, rows, 0).max(axis=1).astype(numpy.uint16)
+					absent = numPresent == 0
+					means[absent] = self.archive.missing
+					maximums[absent] = self.archive.missing
+					values[name + ".min"] = rows.min(axis=1)			# 'missing' is larger than every value
+					values[name + ".max"] = maximums
+					values[name + ".mean"] = means
+				tier.extend(self.archive.times[start:stop:factor], values)
+				added += numBuckets
+		return added
+
+	def run(self):
+		"""
+		@purpose:	Main program of the background thread, updates the tiers every 'interval' seconds.
+		"""
+		while not self.stopEvent.is_set():
+			try:
+				self.update()
+			except Exception:
+				traceback.print_exc()		# Tried again at the next interval
+			self.stopEvent.wait(self.interval)
+		return
+
+	def start(self):
+		"""
+		@purpose:	Starts updating the tiers in a background thread (writer only).
+		"""
+		self.stopEvent = threading.Event()
+		self.thread = threading.Thread(target=self.run)
+		self.thread.daemon = True
+		self.thread.start()
+		return
+
+	def stop(self):
+		if self.thread is not None:
+			self.stopEvent.set()
+			self.thread.join()
+			self.thread = None
+		return
+
+	def query(self, names, startTime=None, stopTime=None, resolution=None):
+		"""
+		@purpose:	Reads several parameters between startTime and stopTime (seconds since 1970 UTC) from the
+					coarsest tier whose rows are, on average, at most 'resolution' seconds apart in that range
+					(the archive itself if no tier is fine enough or resolution is None).
+		@return:	(factor, timestamps, parameter name -> (minimums, maximums, means)), factor = 1 for the archive
+					itself (minimums, maximums and means are then all the values). Parameters which are not in
+					the archive are left out.
+		"""
+		if resolution is not None:
+			for factor, tier in reversed(self.tiers):
+				tier.refresh()
+				start, stop = tier.rowRange(startTime, stopTime)
+				if stop - start < 2:
+					continue
+				if (tier.times[stop - 1] - tier.times[start]) / (stop - start - 1) > resolution:
+					continue
+				columns = {}
+				for name in names:
+					if name + ".min" in tier.columns:
+						columns[name] = (tier.columns[name + ".min"][start:stop], tier.columns[name + ".max"][start:stop],
+										 tier.columns[name + ".mean"][start:stop])
+				return (factor, tier.times[start:stop], columns)
+		times, values = self.archive.query(names, startTime, stopTime)
+		columns = {}
+		for name in values:
+			columns[name] = (values[name], values[name], values[name])
+		return (1, times, columns)
+
+	def __init__(self, directory, readOnly=0, factors=None):
+		"""
+		@param:		directory: directory of the archive, the tiers are in subdirectories of it.
+		@param:		readOnly: 1 for readers, tiers which do not exist yet are left out.
+		"""
+		self.directory = directory
+		self.readOnly = readOnly
+		if factors is not None:
+			self.factors = factors
+		self.archive = HKArchive(directory, readOnly=1)
+		self.tiers = []
+		for factor in self.factors:
+			tierPath = os.path.join(directory, "tier%d" %factor)
+			if readOnly and not os.path.exists(os.path.join(tierPath, "count.i8")):
+				continue
+			self.tiers.append((factor, HKArchive(tierPath, readOnly)))
+
+def printTiers(args, calibration):
+	"""
+	@purpose:	Prints min / max / mean of the parameters args.names from the tier which fits args.resolution.
+	"""
+	factor, times, columns = HKArchiveTiers(args.archive, readOnly=1).query(args.names, args.start, args.stop,
+																			args.resolution)
+	names = [name for name in args.names if name in columns]
+	for name in args.names:
+		if name not in columns:
+			print("%s is not in the archive" %name)
+	print("%d rows per point" %factor)
+	print("TIME\t,\t" + "\t,\t".join(["%s min\t,\t%s max\t,\t%s mean" %(name, name, name) for name in names]))
+	for name in names:
+		if calibration is not None:
+			columns[name] = [calibration.convert(name, column) for column in columns[name]]
+	for row in range(0, len(times)):
+		values = []
+		for name in names:
+			for column in columns[name]:
+				if calibration is not None:
+					value = float(column[row])
+					values.append("" if numpy.isnan(value) else "%g" %value)
+				elif int(column[row]) == HKArchive.missing:
+					values.append("")
+				else:
+					values.append(str(int(column[row])))
+		print(datetime.utcfromtimestamp(times[row]).strftime("%Y-%m-%d %H:%M:%S") + "\t,\t" + "\t,\t".join(values))
+	return 0
+
+def main(argv=None):
+	import argparse
+	parser = argparse.ArgumentParser(description="Query a housekeeping / diagnostics archive.")
+	parser.add_argument("archive", help="archive directory (ex: housekeeping/archive/hk)")
+	parser.add_argument("names", nargs="*", help="parameters to print (ex: BATT_V EPS_TEMP)")
+	parser.add_argument("--start", type=parseTime, default=None, help="earliest time (YYYY-MM-DDTHH:MM:SS or seconds)")
+	parser.add_argument("--stop", type=parseTime, default=None, help="latest time (YYYY-MM-DDTHH:MM:SS or seconds)")
+	parser.add_argument("--list", action="store_true", help="list the parameters in the archive")
+	parser.add_argument("--calibration", default=None, help="calibration file, prints engineering units (ex: "
+						"housekeeping/definitions/calibration.txt)")
+	parser.add_argument("--resolution", type=float, default=None, help="seconds between points, prints min / max / "
+						"mean from the coarsest tier which is fine enough")
+	parser.add_argument("--build-tiers", action="store_true", help="brings the tiers up to date with the archive")
+	args = parser.parse_args(argv)
+	if args.build_tiers:
+		print("%d tier rows added" %HKArchiveTiers(args.archive).update())
+		return 0
+	archive = HKArchive(args.archive, readOnly=1)
+	calibration = None
+	if args.calibration is not None:
+		from PUSService import PUSService
+		from HKCalibration import HKCalibration
+		calibration = HKCalibration(PUSService.parameters, args.calibration)
+	if args.list or not args.names:
+		print("%d rows: %s" %(len(archive), " ".join(archive.names())))
+		return 0
+	if args.resolution is not None:
+		return printTiers(args, calibration)
+	times, columns = archive.query(args.names, args.start, args.stop)
+	names = [name for name in args.names if name in columns]
+	for name in args.names:
+		if name not in columns:
+			print("%s is not in the archive" %name)
+	headings = names
+	if calibration is not None:
+		engineering = calibration.convertColumns(columns)
+		headings = []
+		for name in names:
+			if calibration.unit(name):
+				headings.append("%s (%s)" %(name, calibration.unit(name)))
+			else:
+				headings.append(name)
+	print("TIME\t,\t" + "\t,\t".join(headings))
+	for row in range(0, len(times)):
+		values = []
+		for name in names:
+			value = int(columns[name][row])
+			if value == HKArchive.missing:
+				values.append("")
+			elif calibration is not None:
+				values.append("%g" %engineering[name][row])
+			else:
+				values.append(str(value))
+		print(datetime.utcfromtimestamp(times[row]).strftime("%Y-%m-%d %H:%M:%S") + "\t,\t" + "\t,\t".join(values))
+	return 0
+
+if __name__ == '__main__':
+	main()
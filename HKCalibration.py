@@ -0,0 +1,211 @@
+"""
+FILE_NAME:			HKCalibration.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the calibration of the housekeeping / diagnostics parameters: the conversion of the
+					raw 16-bit values sent by the satellite (ADC counts) to engineering units, for whole reports or
+					whole archive columns at a time.
+
+FILE REFERENCES:	housekeeping/definitions/calibration.txt, parameter names and IDs from PUSService.parameters,
+					used by HKArchive.py (--calibration)
+
+LIBRARIES USED:		numpy
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					ValueError (with the line number) for a line of the calibration file which can't be parsed.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Parameter IDs are 8 bits (see PUSService.parameters).
+
+NOTES:
+					Every line of the calibration file gives the conversion of one parameter (by name or by ID),
+					blank lines and everything after a '#' are ignored:
+
+					BATT_V		poly	V		0.0 0.00122			# c0 + c1 * raw + c2 * raw^2 ...
+					BATT_TEMP	lut		C		0:-40.0 2048:25.0 4095:85.0		# raw:value, linear in between
+
+					A lookup table is interpolated linearly between its points and clamped at both ends.
+					A parameter which is not in the file is left as is (the raw value, as a float).
+
+					The polynomials are kept in a single table (one row of coefficients per parameter ID, the
+					identity for parameters without one) so that a whole report, or many reports, can be converted
+					with a handful of array operations whatever parameters are in it:
+					engineering = calibration.convertFrame(paramIDs, raws)
+
+					Archive columns are converted one parameter at a time (one polynomial evaluation or one
+					interpolation over the whole column), values which are HKArchive.missing become NaN:
+					times, columns = archive.query(["BATT_V", "BATT_TEMP"], startTime, stopTime)
+					engineering = calibration.convertColumns(columns)
+
+					0xFFFF only means 'missing' in the archive. It is also the value of a saturated 16-bit sensor, so
+					the values of a live report, which are all readings, are converted with markMissing=False.
+
+REQUIREMENTS:		numpy
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			convert() and convertFrame() take markMissing, so that a live report with a saturated sensor
+					(0xFFFF) is converted instead of turning into NaN.
+"""
+
+import numpy
+
+class HKCalibration:
+	"""
+	Author: agent
+	Raw to engineering unit conversions of the housekeeping parameters.
+	"""
+	numIDs			= 256
+	missing			= 0xFFFF		# See HKArchive.missing (also the value of a saturated sensor)
+	coefficients	= None			# numpy array (numIDs x degree + 1), c0 first, identity for uncalibrated IDs
+	tables			= None			# paramID -> (raw values, engineering values) of its lookup table
+	units			= None			# paramID -> unit
+	ids				= None			# parameter name -> paramID
+
+	def paramID(self, parameter):
+		"""
+		@return:	The ID of 'parameter' (a name or an ID), None if it is unknown.
+		"""
+		if parameter in self.ids:
+			return self.ids[parameter]
+		if isinstance(parameter, int) and (0 <= parameter < self.numIDs):
+			return parameter
+		return None
+
+	def setPolynomial(self, paramID, coefficients):
+		degree = len(coefficients)
+		if degree > self.coefficients.shape[1]:
+			grown = numpy.zeros((self.numIDs, degree))
+			grown[:, 0:self.coefficients.shape[1]] = self.coefficients
+			self.coefficients = grown
+		self.coefficients[paramID, :] = 0.0
+		self.coefficients[paramID, 0:degree] = coefficients
+		self.tables.pop(paramID, None)
+		return
+
+	def setTable(self, paramID, raws, values):
+		order = numpy.argsort(raws)
+		self.tables[paramID] = (numpy.asarray(raws, dtype=numpy.float64)[order],
+								numpy.asarray(values, dtype=numpy.float64)[order])
+		self.coefficients[paramID, :] = 0.0
+		self.coefficients[paramID, 1] = 1.0
+		return
+
+	def load(self, path):
+		"""
+		@purpose:	Reads the calibration file 'path' (see NOTES), adding to / replacing what is already loaded.
+		"""
+		calibrationFile = open(path, "r")
+		try:
+			lines = calibrationFile.readlines()
+		finally:
+			calibrationFile.close()
+		for lineNumber, line in enumerate(lines, 1):
+			fields = line.split("#", 1)[0].split()
+			if not fields:
+				continue
+			if len(fields) < 4:
+				raise ValueError("%s line %d: expected <parameter> <poly|lut> <unit> <values>" %(path, lineNumber))
+			parameter = fields[0]
+			if parameter not in self.ids:
+				try:
+					parameter = int(parameter, 0)
+				except ValueError:
+					pass
+			paramID = self.paramID(parameter)
+			if paramID is None:
+				raise ValueError("%s line %d: unknown parameter %s" %(path, lineNumber, fields[0]))
+			try:
+				if fields[1] == "poly":
+					self.setPolynomial(paramID, [float(field) for field in fields[3:]])
+				elif fields[1] == "lut":
+					points = [field.split(":") for field in fields[3:]]
+					for point in points:
+						if len(point) != 2:
+							raise ValueError("lookup table points are raw:value, not %s" %":".join(point))
+					self.setTable(paramID, [float(point[0]) for point in points], [float(point[1]) for point in points])
+				else:
+					raise ValueError("unknown conversion %s" %fields[1])
+			except ValueError as e:
+				raise ValueError("%s line %d: %s" %(path, lineNumber, str(e)))
+			self.units[paramID] = fields[2]
+		return
+
+	def convert(self, parameter, raws, markMissing=True):
+		"""
+		@purpose:	Converts the raw values of a single parameter (ex: an archive column) to engineering units.
+		@param:		markMissing: True if 'missing' values are missing (archive columns), False if every value is a
+					reading (a live report, where 0xFFFF is a saturated sensor).
+		@return:	numpy array of float64, NaN where the value was 'missing' (with markMissing).
+		"""
+		raws = numpy.asarray(raws)
+		values = raws.astype(numpy.float64)
+		paramID = self.paramID(parameter)
+		if paramID in self.tables:
+			tableRaws, tableValues = self.tables[paramID]
+			values = numpy.interp(values, tableRaws, tableValues)
+		elif paramID is not None:
+			coefficients = self.coefficients[paramID]
+			converted = numpy.zeros(values.shape) + coefficients[-1]
+			for coefficient in coefficients[-2::-1]:
+				converted *= values
+				converted += coefficient
+			values = converted
+		if markMissing:
+			values[raws == self.missing] = numpy.nan
+		return values
+
+	def convertColumns(self, columns):
+		"""
+		@purpose:	Converts every column of 'columns' (parameter name -> raw values, see HKArchive.query()).
+		@return:	parameter name -> numpy array of engineering values.
+		"""
+		converted = {}
+		for name in columns:
+			converted[name] = self.convert(name, columns[name])
+		return converted
+
+	def convertFrame(self, paramIDs, raws, markMissing=True):
+		"""
+		@purpose:	Converts the values of whole reports at once, raws[i] is a value of parameter paramIDs[i].
+		@param:		markMissing: see convert().
+		@Note:		paramIDs and raws may be of any (matching) shape, ex: one report (numParameters values) or
+					a day of reports (numReports x numParameters).
+		@return:	numpy array of float64 with the shape of raws, NaN where the value was 'missing' (with markMissing).
+		"""
+		paramIDs = numpy.asarray(paramIDs, dtype=numpy.intp) & (self.numIDs - 1)
+		raws = numpy.asarray(raws)
+		values = raws.astype(numpy.float64)
+		converted = self.coefficients[paramIDs, -1]
+		for i in range(self.coefficients.shape[1] - 2, -1, -1):
+			converted *= values
+			converted += self.coefficients[paramIDs, i]
+		for paramID in self.tables:
+			selected = paramIDs == paramID
+			if selected.any():
+				converted[selected] = self.convert(paramID, raws[selected], markMissing)
+		if markMissing:
+			converted[raws == self.missing] = numpy.nan
+		return converted
+
+	def unit(self, parameter):
+		return self.units.get(self.paramID(parameter), "")
+
+	def __init__(self, parameters, path=None):
+		"""
+		@param:		parameters: paramID -> name (PUSService.parameters)
+		@param:		path: calibration file to load, None = no calibration (every parameter is left as is).
+		"""
+		self.ids = dict((name, paramID) for paramID, name in parameters.items())
+		self.coefficients = numpy.zeros((self.numIDs, 2))
+		self.coefficients[:, 1] = 1.0
+		self.tables = {}
+		self.units = {}
+		if path is not None:
+			self.load(path)
+
+if __name__ == '__main__':
+	pass
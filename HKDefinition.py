@@ -0,0 +1,367 @@
+"""
+FILE_NAME:			HKDefinition.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the housekeeping / diagnostics definitions: reading the definition files and
+					compiling every definition into a decoder which turns a report into its values in a single call.
+
+FILE REFERENCES:	housekeeping/definitions (hkDefinition1.txt, diagDefinition1.txt, ...), used by HKService.py and
+					HKLogConverter.py, parameter names from PUSService.parameters
+
+LIBRARIES USED:		os, struct, select, threading, traceback, ctypes (inotify), numpy (optional)
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					ValueError for a definition file which can't be parsed or names an unknown parameter.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: None.
+
+NOTES:
+					Definition files hold the sID, the collection interval (minutes) and the number of parameters,
+					one per line, followed by the parameter names in the order in which they are logged (every
+					name once, or twice in a row: once per byte of the parameter), ex: hkdefinition1.txt
+
+					In a report (currentCommand[]), parameter j of the definition is 16 bits at [2j + 1] (MSB) and
+					[2j] (LSB), the report is logged from the last parameter to the first. A decoder keeps the
+					struct format of the whole report and the parameter IDs in the order in which they are logged,
+					so decoding is a single struct.unpack (of the report read backwards):
+						decoder = definitions.get("hk", 1)
+					values = decoder.decode(currentCommand)			# values[k] belongs to decoder.paramIDs[k]
+
+					When numpy is available, reports are decoded with numpy instead (decodeFrames()): the bytes of
+					the report are viewed as little endian 16 bit values (numpy.frombuffer, no Python object per
+					value) and reversed into log order. A stack of reports (ex: raw frames for an archive rebuild)
+					is decoded at once into a reports x numParameters array:
+					values = decoder.decodeFrames(frames, frameLength)	# values[:, k] belongs to decoder.paramIDs[k]
+					archive.extend(timestamps, decoder.columns(values, parameters))
+
+						HKDefinitionCache compiles every definition (kind "hk" / "diag", sID 0 / 1) once. The decoder
+					of a definition file is only compiled again when the file changes (its size or modification
+					time), the default definitions (sID 0) are set with setDefault().
+
+					Once start() is called, the definition files are compiled by a background thread which watches
+					the definitions directory (inotify, or every pollInterval seconds where inotify is not
+					available) and get() only returns what is ready: the new decoder replaces the old one in a
+					single assignment once it is compiled, and a file which can't be used is remembered with its
+					error, so a command never waits for a file to be parsed.
+
+					File names are looked up regardless of case (ex: hkDefinition1.txt finds hkdefinition1.txt).
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Reports are decoded with numpy when it is available, stacks of reports as well.
+
+10/19/2026			Definition files can be watched and compiled in the background (start() / stop()).
+"""
+
+import os
+import struct
+import select
+import threading
+import traceback
+try:
+	import numpy
+except ImportError:				# Reports are decoded with struct.
+	numpy = None
+
+def readDefinition(path):
+	"""
+	@purpose:	Reads a definition file (see NOTES).
+	@return:	(sID, collection interval in minutes, [parameter names in the order in which they are logged])
+	"""
+	definitionFile = open(path, "r")
+	try:
+		lines = [line.strip() for line in definitionFile if line.strip()]
+	finally:
+		definitionFile.close()
+	if len(lines) < 3:
+		raise ValueError("%s is not a definition file" %path)
+	try:
+		sID = int(lines[0])
+		interval = int(lines[1])
+		numParameters = int(lines[2])
+	except ValueError:
+		raise ValueError("%s does not start with the sID, collection interval and number of parameters" %path)
+	names = lines[3:]
+	if len(names) == numParameters * 2:
+		names = names[0::2]
+	if len(names) != numParameters:
+		raise ValueError("%s holds %d parameter names, %d parameters were expected" %(path, len(names), numParameters))
+	return (sID, interval, names)
+
+def writeDefinition(path, sID, interval, names):
+	"""
+	@purpose:	Writes a definition file (see NOTES), every name twice.
+	"""
+	lines = [str(sID), str(interval), str(len(names))]
+	for name in names:
+		lines.append(name)
+		lines.append(name)
+	definitionFile = open(path, "w")
+	try:
+		definitionFile.write("\n".join(lines) + "\n")
+	finally:
+		definitionFile.close()
+	return
+
+def loadInotify():
+	"""
+	@purpose:	Returns (inotify_init, inotify_add_watch) from the C library, None if inotify is not available.
+	"""
+	try:
+		import ctypes
+		import ctypes.util
+		libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+		inotifyInit = libc.inotify_init
+		inotifyInit.argtypes = []
+		inotifyAddWatch = libc.inotify_add_watch
+		inotifyAddWatch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+		return (inotifyInit, inotifyAddWatch)
+	except (OSError, AttributeError, TypeError):
+		return None
+
+class HKDecoder:
+	"""
+	Author: agent
+	A definition compiled into the struct format of its reports.
+	"""
+	sID				= 0
+	interval		= 0				# Collection interval (minutes)
+	numParameters	= 0
+	paramIDs		= None			# In the order in which the values are logged (last parameter of the report first)
+	definition		= None			# paramID of parameter j of the report, ex: for the definition TC
+	reportStruct	= None
+	signature		= None			# (size, modification time) of the definition file it was compiled from
+
+	frameDtype		= "<u2"			# A parameter of a report, see NOTES
+
+	def decode(self, command):
+		"""
+		@return:	The values of the report in 'command' (a list of bytes), in the order of paramIDs: a numpy
+					array of uint16 if numpy is available (see decodeFrames()), a tuple otherwise.
+		"""
+		if numpy is not None:
+			return self.decodeFrames(command)
+		return self.reportStruct.unpack(bytearray(command[0:self.numParameters * 2][::-1]))
+
+	def decodeFrames(self, frames, frameLength=None):
+		"""
+		@purpose:	Decodes one report or a stack of reports with numpy.
+		@param:		frames: one report (a list of bytes, bytes or bytearray), or a stack of reports: a numpy array of
+					bytes (reports x bytes per report) or bytes / bytearray of reports which are frameLength bytes apart.
+		@return:	numpy array of uint16 (numParameters, or reports x numParameters), in the order of paramIDs.
+		@Note:		The array may be a read-only view of 'frames'.
+		"""
+		reportLength = self.numParameters * 2
+		if not isinstance(frames, numpy.ndarray):
+			if not isinstance(frames, (bytes, bytearray)):
+				frames = bytearray(frames[0:reportLength])
+			frames = numpy.frombuffer(frames, dtype=numpy.uint8)
+			if frameLength is not None:
+				frames = frames[0:len(frames) // frameLength * frameLength].reshape(-1, frameLength)
+		frames = numpy.ascontiguousarray(frames[..., 0:reportLength], dtype=numpy.uint8)
+		return frames.view(self.frameDtype)[..., ::-1]
+
+	def columns(self, values, parameters):
+		"""
+		@purpose:	Splits decoded reports into archive columns (see HKArchive.extend()).
+		@param:		values: see decodeFrames(), parameters: paramID -> name (PUSService.parameters)
+		@return:	parameter name -> the values of that parameter (one per report).
+		"""
+		columns = {}
+		for k, paramID in enumerate(self.paramIDs):
+			if paramID in parameters:
+				columns[parameters[paramID]] = values[..., k]
+		return columns
+
+	def __init__(self, sID, interval, definition, signature=None):
+		"""
+		@param:		definition: paramID of parameter j of the report, for every j.
+		"""
+		self.sID = sID
+		self.interval = interval
+		self.numParameters = len(definition)
+		self.definition = list(definition)
+		self.paramIDs = self.definition[::-1]
+		self.signature = signature
+		# The parameters are little endian, read backwards they are big endian and come out in log order.
+		self.reportStruct = struct.Struct(">%dH" %self.numParameters)
+
+class HKDefinitionCache:
+	"""
+	Author: agent
+	The compiled definitions of the HK service, per kind ("hk" / "diag") and sID.
+	"""
+	fileNames		= {"hk": "hkDefinition%d.txt", "diag": "diagDefinition%d.txt"}
+	fileSIDs		= [1]			# sIDs of the definitions which are read from files
+	maxParameters	= 64
+	pollInterval	= 2.0			# Seconds between two checks of the files when inotify is not available
+	watchInterval	= 60.0			# Seconds between two checks of the files when inotify is (in case of a lost event)
+	# IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+	watchMask		= 0x00000004 | 0x00000008 | 0x00000040 | 0x00000080 | 0x00000100 | 0x00000200
+	definitionsPath	= None
+	invParameters	= None			# name -> paramID
+	decoders		= None			# (kind, sID) -> HKDecoder
+	errors			= None			# (kind, sID) -> why the definition file can't be used
+	thread			= None
+	stopEvent		= None
+
+	def path(self, fileName):
+		"""
+		@return:	The path of 'fileName' in the definitions directory, whatever the case of the file on disk.
+		"""
+		path = os.path.join(self.definitionsPath, fileName)
+		if os.path.exists(path) or not os.path.isdir(self.definitionsPath):
+			return path
+		for existing in os.listdir(self.definitionsPath):
+			if existing.lower() == fileName.lower():
+				return os.path.join(self.definitionsPath, existing)
+		return path
+
+	def definitionPath(self, kind, sID):
+		return self.path(self.fileNames[kind] %sID)
+
+	def setDefault(self, kind, interval, definition):
+		"""
+		@purpose:	Compiles the default definition (sID 0) of 'kind'.
+		"""
+		self.decoders[(kind, 0)] = HKDecoder(0, interval, definition)
+		return self.decoders[(kind, 0)]
+
+	def get(self, kind, sID):
+		"""
+		@return:	The decoder of definition 'sID' of 'kind', compiled again if its file changed (by the background
+					thread if it is running, see start()), None if there is no such definition.
+		@Note:		ValueError is raised if the definition file can't be used.
+		"""
+		if (sID == 0) or (self.thread is None):
+			return self.refresh(kind, sID)
+		error = self.errors.get((kind, sID))
+		if error is not None:
+			raise ValueError(error)
+		return self.decoders.get((kind, sID))
+
+	def refresh(self, kind, sID):
+		"""
+		@purpose:	Compiles definition 'sID' of 'kind' again if its file changed.
+		@return:	Its decoder, None if there is no such definition.
+		@Note:		ValueError is raised (and kept for get()) if the definition file can't be used.
+		"""
+		decoder = self.decoders.get((kind, sID))
+		if sID == 0:
+			return decoder
+		path = self.definitionPath(kind, sID)
+		try:
+			status = os.stat(path)
+		except OSError:
+			self.decoders.pop((kind, sID), None)
+			self.errors.pop((kind, sID), None)
+			return None
+		signature = (status.st_size, status.st_mtime)
+		if (decoder is not None) and (decoder.signature == signature):
+			return decoder
+		try:
+			decoder = self.compile(kind, sID, path, signature)
+		except (IOError, ValueError) as e:
+			self.decoders.pop((kind, sID), None)
+			self.errors[(kind, sID)] = str(e)
+			raise ValueError(str(e))
+		self.decoders[(kind, sID)] = decoder
+		self.errors.pop((kind, sID), None)
+		return decoder
+
+	def compile(self, kind, sID, path, signature):
+		"""
+		@return:	The decoder of the definition file at 'path'.
+		"""
+		fileSID, interval, names = readDefinition(path)
+		if fileSID != sID:
+			raise ValueError("sID in %s was not %d" %(os.path.basename(path), sID))
+		if len(names) > self.maxParameters:
+			raise ValueError("%s has more than %d parameters" %(os.path.basename(path), self.maxParameters))
+		paramIDs = []
+		for name in names:
+			if name not in self.invParameters:
+				raise ValueError("%s: unknown parameter %s" %(os.path.basename(path), name))
+			paramIDs.append(self.invParameters[name])
+		# The names are in log order (last parameter of the report first).
+		return HKDecoder(sID, interval, paramIDs[::-1], signature)
+
+	def refreshAll(self):
+		"""
+		@purpose:	Compiles every definition file which changed (the errors are kept for get()).
+		"""
+		for kind in self.fileNames:
+			for sID in self.fileSIDs:
+				try:
+					self.refresh(kind, sID)
+				except ValueError:
+					pass
+		return
+
+	def run(self):
+		"""
+		@purpose:	Main program of the background thread, compiles the definition files as they change.
+		"""
+		inotify = loadInotify()
+		fd = -1
+		if (inotify is not None) and os.path.isdir(self.definitionsPath):
+			fd = inotify[0]()
+			if (fd >= 0) and (inotify[1](fd, self.definitionsPath.encode("utf-8"), self.watchMask) < 0):
+				os.close(fd)
+				fd = -1
+		try:
+			while not self.stopEvent.is_set():
+				try:
+					self.refreshAll()
+				except Exception:
+					traceback.print_exc()		# Tried again at the next change / interval
+				if fd < 0:
+					self.stopEvent.wait(self.pollInterval)
+					continue
+				# Wait for a change, waking up every second to see if the thread was stopped.
+				waited = 0.0
+				while (waited < self.watchInterval) and not self.stopEvent.is_set():
+					if select.select([fd], [], [], 1.0)[0]:
+						os.read(fd, 65536)			# The events themselves don't matter, every file is checked
+						break
+					waited += 1.0
+		finally:
+			if fd >= 0:
+				os.close(fd)
+		return
+
+	def start(self):
+		"""
+		@purpose:	Compiles the definition files, then keeps them compiled in a background thread (see NOTES).
+		"""
+		self.refreshAll()
+		self.stopEvent = threading.Event()
+		self.thread = threading.Thread(target=self.run)
+		self.thread.daemon = True
+		self.thread.start()
+		return
+
+	def stop(self):
+		if self.thread is not None:
+			self.stopEvent.set()
+			self.thread.join()
+			self.thread = None
+		return
+
+	def __init__(self, definitionsPath, parameters):
+		"""
+		@param:		parameters: paramID -> name (PUSService.parameters)
+		"""
+		self.definitionsPath = definitionsPath
+		self.invParameters = dict((name, paramID) for paramID, name in parameters.items())
+		self.decoders = {}
+		self.errors = {}
+
+if __name__ == '__main__':
+	pass
@@ -0,0 +1,187 @@
+"""
+FILE_NAME:			HKLimitMonitor.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the limit checking of the housekeeping / diagnostics parameters: yellow (soft) and
+					red (hard) limits per parameter, with persistence and hysteresis, evaluated on whole reports.
+
+FILE REFERENCES:	housekeeping/definitions/limits.txt, parameter names and IDs from PUSService.parameters,
+					used by HKService.py (alarms go to FDIRService.py)
+
+LIBRARIES USED:		numpy
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					ValueError (with the line number) for a line of the limits file which can't be parsed.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Limits are in engineering units (see HKCalibration.py), which are the raw
+					values for a parameter which is not calibrated.
+
+NOTES:
+					Every line of the limits file gives the limits of one parameter (by name or by ID), blank lines
+					and everything after a '#' are ignored, '-' = no limit:
+
+					# parameter	redLow	yellowLow	yellowHigh	redHigh	persistence	hysteresis
+					BATT_V		6.0		6.5			8.4			8.6		3			0.05
+					BATT_TEMP	-		0.0			40.0		50.0	2			1.0
+
+					The level of a parameter is 0 (nominal), 1 (yellow: outside its yellow limits) or 2 (red:
+					outside its red limits). A parameter only changes level once the new level has been seen in
+					'persistence' reports in a row (1 = right away). Once out of limits, a parameter only comes back
+					to a lower level when it is 'hysteresis' inside the limit, so a value sitting on a limit does not
+					raise an alarm with every report.
+
+					The state of every parameter ID is kept in arrays, a report is checked with a few array
+					operations (no branching per parameter), only the parameters which changed level come back:
+					for paramID, oldLevel, newLevel, value in monitor.check(paramIDs, values):
+
+					Missing values (NaN) leave the parameter where it is. A raw value of 0xFFFF (HKArchive.missing)
+					is a reading in a live report (a saturated sensor), HKService converts it with
+					markMissing=False (see HKCalibration.py) so that it is checked like any other value.
+
+REQUIREMENTS:		numpy
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Documented how saturated sensors (0xFFFF) are checked.
+"""
+
+import numpy
+
+class HKLimitMonitor:
+	"""
+	Author: agent
+	Yellow / red limit checking of housekeeping reports, with persistence and hysteresis.
+	"""
+	numIDs			= 256
+	nominal			= 0
+	yellow			= 1
+	red				= 2
+	levelNames		= ["NOMINAL", "YELLOW", "RED"]
+	ids				= None			# parameter name -> paramID
+	monitored		= None			# For every paramID: 1 if it has limits
+	limits			= None			# numIDs x 4: redLow, yellowLow, yellowHigh, redHigh
+	persistence		= None			# Reports in a row needed to change level
+	hysteresis		= None
+	levels			= None			# Current level of every paramID
+	pendingLevels	= None			# Level seen in the last report (which the parameter may be moving to)
+	pendingCounts	= None			# Reports in a row in which pendingLevels was seen
+
+	def paramID(self, parameter):
+		if parameter in self.ids:
+			return self.ids[parameter]
+		try:
+			paramID = int(parameter, 0)
+		except ValueError:
+			return None
+		if (paramID < 0) or (paramID >= self.numIDs):
+			return None
+		return paramID
+
+	def setLimits(self, paramID, redLow, yellowLow, yellowHigh, redHigh, persistence=1, hysteresis=0.0):
+		"""
+		@purpose:	Sets the limits of 'paramID', None = no limit.
+		"""
+		limits = [redLow, yellowLow, yellowHigh, redHigh]
+		defaults = [-numpy.inf, -numpy.inf, numpy.inf, numpy.inf]
+		for i in range(0, 4):
+			if limits[i] is None:
+				limits[i] = defaults[i]
+		self.limits[paramID] = limits
+		self.persistence[paramID] = max(int(persistence), 1)
+		self.hysteresis[paramID] = hysteresis
+		self.monitored[paramID] = 1
+		self.reset(paramID)
+		return
+
+	def reset(self, paramID=None):
+		"""
+		@purpose:	Brings 'paramID' (every parameter if None) back to nominal.
+		"""
+		if paramID is None:
+			paramID = slice(None)
+		self.levels[paramID] = self.nominal
+		self.pendingLevels[paramID] = self.nominal
+		self.pendingCounts[paramID] = 0
+		return
+
+	def load(self, path):
+		"""
+		@purpose:	Reads the limits file 'path' (see NOTES), adding to / replacing the limits already set.
+		"""
+		limitsFile = open(path, "r")
+		try:
+			lines = limitsFile.readlines()
+		finally:
+			limitsFile.close()
+		for lineNumber, line in enumerate(lines, 1):
+			fields = line.split("#", 1)[0].split()
+			if not fields:
+				continue
+			if len(fields) != 7:
+				raise ValueError("%s line %d: expected <parameter> <redLow> <yellowLow> <yellowHigh> <redHigh> "
+								 "<persistence> <hysteresis>" %(path, lineNumber))
+			paramID = self.paramID(fields[0])
+			if paramID is None:
+				raise ValueError("%s line %d: unknown parameter %s" %(path, lineNumber, fields[0]))
+			try:
+				limits = [None if field == "-" else float(field) for field in fields[1:5]]
+				self.setLimits(paramID, limits[0], limits[1], limits[2], limits[3], int(fields[5]), float(fields[6]))
+			except ValueError as e:
+				raise ValueError("%s line %d: %s" %(path, lineNumber, str(e)))
+		return
+
+	def check(self, paramIDs, values):
+		"""
+		@purpose:	Checks a report against the limits.
+		@param:		paramIDs, values: the parameters of the report and their values (engineering units).
+		@return:	[(paramID, old level, new level, value)] for the parameters which changed level.
+		"""
+		paramIDs = numpy.asarray(paramIDs, dtype=numpy.intp) & (self.numIDs - 1)
+		values = numpy.asarray(values, dtype=numpy.float64)
+		# A parameter may appear more than once in a report, it is only checked once.
+		paramIDs, first = numpy.unique(paramIDs, return_index=True)
+		values = values[first]
+		selected = self.monitored[paramIDs] & ~numpy.isnan(values)
+		paramIDs = paramIDs[selected]
+		values = values[selected]
+		limits = self.limits[paramIDs]
+		hysteresis = self.hysteresis[paramIDs]
+		levels = self.levels[paramIDs]
+		# Level of every value, and the level it is at when the limits are moved 'hysteresis' inwards.
+		outerLevels = ((values < limits[:, 1]) | (values > limits[:, 2])).astype(numpy.int8)
+		outerLevels += (values < limits[:, 0]) | (values > limits[:, 3])
+		innerLevels = ((values < limits[:, 1] + hysteresis) | (values > limits[:, 2] - hysteresis)).astype(numpy.int8)
+		innerLevels += (values < limits[:, 0] + hysteresis) | (values > limits[:, 3] - hysteresis)
+		newLevels = numpy.where(outerLevels >= levels, outerLevels, numpy.minimum(innerLevels, levels))
+		# Persistence: the new level has to be seen in enough reports in a row.
+		counts = numpy.where(newLevels == self.pendingLevels[paramIDs], self.pendingCounts[paramIDs] + 1, 1)
+		self.pendingLevels[paramIDs] = newLevels
+		self.pendingCounts[paramIDs] = counts
+		changed = (newLevels != levels) & (counts >= self.persistence[paramIDs])
+		self.levels[paramIDs[changed]] = newLevels[changed]
+		return list(zip(paramIDs[changed].tolist(), levels[changed].tolist(), newLevels[changed].tolist(),
+						values[changed].tolist()))
+
+	def __init__(self, parameters, path=None):
+		"""
+		@param:		parameters: paramID -> name (PUSService.parameters)
+		@param:		path: limits file to load, None = no limits.
+		"""
+		self.ids = dict((name, paramID) for paramID, name in parameters.items())
+		self.monitored = numpy.zeros(self.numIDs, dtype=numpy.bool_)
+		self.limits = numpy.empty((self.numIDs, 4))
+		self.limits[:] = [-numpy.inf, -numpy.inf, numpy.inf, numpy.inf]
+		self.persistence = numpy.ones(self.numIDs, dtype=numpy.int32)
+		self.hysteresis = numpy.zeros(self.numIDs)
+		self.levels = numpy.zeros(self.numIDs, dtype=numpy.int8)
+		self.pendingLevels = numpy.zeros(self.numIDs, dtype=numpy.int8)
+		self.pendingCounts = numpy.zeros(self.numIDs, dtype=numpy.int32)
+		if path is not None:
+			self.load(path)
+
+if __name__ == '__main__':
+	pass
@@ -0,0 +1,311 @@
+"""
+FILE_NAME:			HKLogConverter.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the converter of the housekeeping / diagnostics logs (hkLog*.csv, diagLog*.csv)
+					into the binary housekeeping archive (see HKArchive.py), for the history which was logged before
+					the archive existed.
+
+FILE REFERENCES:	HKArchive.py, HKDefinition.py (definitions like housekeeping/definitions/hkdefinition1.txt),
+					parameter names from PUSService.parameters
+
+LIBRARIES USED:		os, re, gzip, time, calendar, datetime, multiprocessing, argparse, numpy
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					Malformed lines (wrong prefix, a number of values which does not match the definition, values
+					which are not 16 bit numbers) are reported with their file and line number and skipped.
+					Reports which are not later than the last one in the archive are skipped (logs of days which
+					ended before it are not read at all), so a day which is partly in the archive is completed.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: The HK service must not be writing to the archive while it is converted to
+					(the archive has a single writer). Every log was written with the definition which is given.
+					The logs of a day hold at most a day of reports.
+
+NOTES:
+					A log line holds one report, the values in the order of the definition:
+					HKLOG:\\t19/19/19\\t,\\t<value>\\t,\\t<value>\\t,\\t ... \\t,\\t
+
+					The lines do not hold the time of the report (only the day of the month), so the time of a
+					report is rebuilt from the date in the name of the log plus collectionInterval minutes per
+					report before it in that day's logs. Log names are either:
+					hkLog2026-10-19.csv, hkLog2026-10-19.1.csv, hkLog2026-10-19.csv.gz		(see LogWriterService.py)
+					hkLog1019.csv				(older logs, <month><day>, the year comes from --year or the date
+												the file was last modified, which also settles names like
+												hkLog111.csv: January 11th or November 1st)
+
+					Files are split into chunks of chunkSize bytes (at line boundaries) which are parsed in
+					parallel by a pool of worker processes, a compressed log is a single chunk (segments are at most
+					64MB, see LogWriterService.py). Chunks are written to the archive in order as they come back and
+					at most 2 chunks per worker are in flight at any time, so memory use does not depend on the size
+					of the history.
+
+					ex: python HKLogConverter.py housekeeping/archive/hk housekeeping/logs/hkLog*.csv*
+							--definition housekeeping/definitions/hkdefinition1.txt --workers 8
+
+					To convert while the HK service is running, convert into a separate archive directory, which
+					is queried like any other (see HKArchive.py):
+					python HKLogConverter.py housekeeping/archive/hk-history housekeeping/logs/hkLog*.csv*
+
+REQUIREMENTS:		numpy
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Definition files are read by HKDefinition.readDefinition().
+
+10/19/2026			Reports are skipped one by one when they are not later than the end of the archive, instead of
+					skipping every log whose day started before it (which lost the rest of that day).
+"""
+
+import os
+import re
+import gzip
+import time
+import calendar
+import multiprocessing
+from datetime import datetime
+import numpy
+from HKArchive import HKArchive
+from HKDefinition import readDefinition
+
+chunkSize			= 8 << 20		# Bytes of a log parsed by a worker at a time
+separator			= "\t,\t"
+datedName			= re.compile(r"^(hkLog|diagLog)(\d{4})-(\d{2})-(\d{2})(?:\.(\d+))?\.csv(\.gz)?$")
+legacyName			= re.compile(r"^(hkLog|diagLog)(\d{2,4})\.csv$")
+
+def logDate(path, year=None):
+	"""
+	@purpose:	Finds the date and segment of a log from its name (see NOTES).
+	@return:	(datetime of the start of the day, segment number, warning or None), None if the name is not one of
+				a housekeeping / diagnostics log.
+	"""
+	name = os.path.basename(path)
+	match = datedName.match(name)
+	if match:
+		return (datetime(int(match.group(2)), int(match.group(3)), int(match.group(4))), int(match.group(5) or 0), None)
+	match = legacyName.match(name)
+	if not match:
+		return None
+	digits = match.group(2)
+	modified = datetime.utcfromtimestamp(os.path.getmtime(path))
+	if year is None:
+		year = modified.year
+	candidates = []
+	for split in range(1, len(digits)):
+		if digits[split] == "0":
+			continue								# str(day) never starts with a 0
+		try:
+			candidates.append(datetime(year, int(digits[0:split]), int(digits[split:])))
+		except ValueError:
+			pass
+	if not candidates:
+		return None
+	warning = None
+	if len(candidates) > 1:
+		# The latest date which is not after the last modification (the log was written on that day).
+		candidates.sort(key=lambda date: (date > modified, abs((modified - date).days)))
+		warning = "%s could be %s, taken as %s" %(name, " or ".join([date.strftime("%Y-%m-%d") for date in
+					sorted(candidates)]), candidates[0].strftime("%Y-%m-%d"))
+	return (candidates[0], 0, warning)
+
+def parseLines(lines, prefix, numColumns):
+	"""
+	@return:	(numpy array (reports x numColumns) of the values, [(line number within 'lines', what is wrong)])
+	"""
+	values = numpy.zeros((len(lines), numColumns), dtype=numpy.uint16)
+	errors = []
+	row = 0
+	for lineNumber, line in enumerate(lines, 1):
+		fields = line.rstrip("\r\n").split(separator)
+		if fields and (fields[-1] == ""):
+			fields.pop()
+		if not fields:
+			continue
+		if not fields[0].startswith(prefix):
+			errors.append((lineNumber, "does not start with %s" %prefix))
+			continue
+		if len(fields) - 1 != numColumns:
+			errors.append((lineNumber, "%d values, the definition has %d" %(len(fields) - 1, numColumns)))
+			continue
+		try:
+			report = [int(field) for field in fields[1:]]
+		except ValueError:
+			errors.append((lineNumber, "values are not numbers"))
+			continue
+		if (min(report) < 0) or (max(report) > 0xFFFF):
+			errors.append((lineNumber, "values are not 16 bit numbers"))
+			continue
+		values[row] = report
+		row += 1
+	return (values[0:row], errors)
+
+def parseChunk(task):
+	"""
+	@purpose:	Parses the lines of a log which start between byte 'start' and byte 'stop' (worker processes).
+	@param:		task: (path, start, stop, prefix, numColumns), stop = None for the whole file.
+	@return:	(number of lines, values, errors), see parseLines().
+	"""
+	path, start, stop, prefix, numColumns = task
+	if path.endswith(".gz"):
+		logFile = gzip.open(path, "rb")
+	else:
+		logFile = open(path, "rb")
+	lines = []
+	try:
+		if start > 0:
+			logFile.seek(start - 1)
+			logFile.readline()						# The line which started before 'start' is the previous chunk's
+		position = logFile.tell()
+		while (stop is None) or (position < stop):
+			line = logFile.readline()
+			if not line:
+				break
+			position += len(line)
+			lines.append(line.decode("ascii", "replace"))
+	finally:
+		logFile.close()
+	values, errors = parseLines(lines, prefix, numColumns)
+	return (len(lines), values, errors)
+
+def chunks(path, prefix, numColumns):
+	"""
+	@return:	The tasks (see parseChunk()) which make up the log at 'path'.
+	"""
+	if path.endswith(".gz"):
+		return [(path, 0, None, prefix, numColumns)]
+	size = os.path.getsize(path)
+	tasks = []
+	for start in range(0, max(size, 1), chunkSize):
+		tasks.append((path, start, min(start + chunkSize, size), prefix, numColumns))
+	return tasks
+
+def printMessage(message):
+	print(message)
+
+def convert(archive, paths, names, interval, workers=None, year=None, report=None):
+	"""
+	@purpose:	Appends the reports of the logs at 'paths' to 'archive' (an HKArchive opened for writing).
+	@param:		names: the parameters of the definition, in the order of the values of a report.
+	@param:		interval: minutes between two reports.
+	@param:		report: function called with every message (warnings, malformed lines), print by default.
+	@Note:		Reports which are not later than the last one in the archive (or converted before them) are skipped.
+	@return:	(reports converted, malformed lines)
+	"""
+	if report is None:
+		report = printMessage
+	logs = []
+	for path in paths:
+		date = logDate(path, year)
+		if date is None:
+			report("%s: not a housekeeping / diagnostics log, skipped" %path)
+			continue
+		if date[2] is not None:
+			report(date[2])
+		logs.append((date[0], date[1], path))
+	logs.sort()
+	lastTime = None
+	if len(archive):
+		lastTime = float(archive.times[len(archive) - 1])
+	tasks = []
+	days = {}											# path -> start of the day of the log
+	for date, segment, path in logs:
+		dayStart = calendar.timegm(date.timetuple())
+		if (lastTime is not None) and (dayStart + 86400 <= lastTime):
+			report("%s: older than the end of the archive (%s), skipped" %(path,
+					datetime.utcfromtimestamp(lastTime).strftime("%Y-%m-%d %H:%M:%S")))
+			continue
+		prefix = "HKLOG:"
+		if os.path.basename(path).startswith("diagLog"):
+			prefix = "DIAGLOG:"
+		days[path] = dayStart
+		tasks.extend(chunks(path, prefix, len(names)))
+	if workers is None:
+		workers = multiprocessing.cpu_count()
+	pool = None
+	if workers > 1:
+		pool = multiprocessing.Pool(workers)
+	converted = 0
+	malformed = 0
+	skipped = {}										# path -> reports already in the archive
+	lineNumbers = {}									# path -> lines read so far
+	reportNumbers = {}									# date -> reports so far (every segment of the day)
+	pending = []
+	try:
+		nextTask = 0
+		while (nextTask < len(tasks)) or pending:
+			while (nextTask < len(tasks)) and (len(pending) < 2 * max(workers, 1)):
+				if pool is not None:
+					pending.append((tasks[nextTask], pool.apply_async(parseChunk, (tasks[nextTask],))))
+				else:
+					pending.append((tasks[nextTask], None))
+				nextTask += 1
+			task, result = pending.pop(0)
+			if result is None:
+				numLines, values, errors = parseChunk(task)
+			else:
+				numLines, values, errors = result.get()
+			path = task[0]
+			firstLine = lineNumbers.get(path, 0)
+			lineNumbers[path] = firstLine + numLines
+			for lineNumber, error in errors:
+				report("%s line %d: %s" %(path, firstLine + lineNumber, error))
+			malformed += len(errors)
+			dayStart = days[path]
+			first = reportNumbers.get(dayStart, 0)
+			reportNumbers[dayStart] = first + len(values)
+			timestamps = dayStart + (first + numpy.arange(len(values))) * interval * 60.0
+			if lastTime is not None:
+				later = timestamps > lastTime
+				if not later.all():
+					skipped[path] = skipped.get(path, 0) + len(values) - int(later.sum())
+					timestamps = timestamps[later]
+					values = values[later]
+			if not len(values):
+				continue
+			columns = {}
+			for j, name in enumerate(names):
+				columns[name] = values[:, j]
+			archive.extend(timestamps, columns)
+			lastTime = float(timestamps[-1])
+			converted += len(values)
+	finally:
+		if pool is not None:
+			pool.terminate()
+			pool.join()
+	archive.flush()
+	for path in sorted(skipped):
+		report("%s: %d report(s) not later than the end of the archive, skipped" %(path, skipped[path]))
+	return (converted, malformed)
+
+def main(argv=None):
+	import argparse
+	from PUSService import PUSService
+	parser = argparse.ArgumentParser(description="Convert housekeeping / diagnostics logs to the housekeeping archive.")
+	parser.add_argument("archive", help="archive directory (ex: housekeeping/archive/hk)")
+	parser.add_argument("logs", nargs="+", help="logs to convert (ex: housekeeping/logs/hkLog*.csv*)")
+	parser.add_argument("--definition", default=os.path.join(os.path.dirname(os.path.realpath(__file__)),
+						"housekeeping", "definitions", "hkdefinition1.txt"), help="definition the logs were written with")
+	parser.add_argument("--interval", type=float, default=None, help="minutes between reports (default: the "
+						"collection interval of the definition)")
+	parser.add_argument("--year", type=int, default=None, help="year of the logs named <month><day>")
+	parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+	args = parser.parse_args(argv)
+	sID, interval, names = readDefinition(args.definition)
+	for name in names:
+		if name not in PUSService.parameters.values():
+			print("%s is not in PUSService.parameters, it is archived under that name anyway" %name)
+	if args.interval is not None:
+		interval = args.interval
+	startTime = time.time()
+	converted, malformed = convert(HKArchive(args.archive), args.logs, names, interval, args.workers, args.year)
+	print("%d REPORT(S) CONVERTED, %d MALFORMED LINE(S) SKIPPED (%.1fs)" %(converted, malformed,
+			time.time() - startTime))
+	if malformed:
+		return 1
+	return 0
+
+if __name__ == '__main__':
+	main()
@@ -18,7 +18,7 @@ ASSUMPTIONS, CONSTRAINTS, CONDITIONS: None.
 NOTES:				When parameter reports are enabled, one is automatically generated
 					every time 
 
-REQUIREMENTS:
+REQUIREMENTS:		numpy (optional, for the housekeeping archive, statistics and limit checking)
 
 DEVELOPMENT HISTORY:
 
@@ -31,12 +31,83 @@ DEVELOPMENT HISTORY:
 
 1/23/2016			Bill: Adding in diagnostics functions.
 
+10/19/2026			waitForTCVerification() now waits on the TC verification reports sent by the GPR.
+					The main loop sends heartbeats to the GPR's ServiceSupervisor.
+
+10/19/2026			Reports are now time stamped with the shared ground clock.
+
+10/19/2026			FIFOs are opened non-blocking (see FifoObject.py) so that the services no longer wait for
+					each other or the GPR, the main loop waits on the FIFO from the GPR instead of spinning.
+					The default HK definition file is written to housekeeping/definitions next to this file (it
+					was looked for in /housekeeping/definitions), one value per line, and sent to fifoToGPR (fifotoGPR
+					does not exist). The default definition no longer resets paramNum inside its loop.
+
+10/19/2026			The housekeeping, diagnostics and definition reports are sent to the log writer (see
+					LogWriterService.py) as a single record each instead of being written piece by piece.
+
+10/19/2026			Housekeeping reports are also stored in the columnar housekeeping archive (see HKArchive.py),
+					one memory-mapped column per parameter, when numpy is available.
+
+10/19/2026			Diagnostics reports are archived as well (<archivePath>/diag, housekeeping reports go to
+					<archivePath>/hk). The diagnostics definitions are now initialized like the housekeeping ones,
+					diagDefinition2 was meant to be diagDefinition1.
+
+10/19/2026			Every parameter reported is also stored in the latest-value table (see HKValueCache.py), which
+					other processes can read without parsing the HK log.
+
+10/19/2026			Reports are checked against the limits in housekeeping/definitions/limits.txt (see
+					HKLimitMonitor.py, values are calibrated with calibration.txt first). A parameter which changes
+					limit level is reported to the FDIR service (hkLimitViolation).
+
+10/19/2026			Per-orbit and per-day statistics of every parameter are kept as the reports come in and written
+					to <archivePath>/hkStats and <archivePath>/diagStats (see HKStatistics.py).
+
+10/19/2026			The downsampled tiers of both archives are kept up to date by a background thread (see
+					HKArchiveTiers in HKArchive.py).
+
+10/19/2026			Definitions are compiled into decoders (see HKDefinition.py) which are kept until their file
+					changes: a report is decoded in a single call instead of a loop over its parameters. Definition
+					files are read from housekeeping/definitions next to this file (they used to be looked for in
+					/housekeeping/definitions) regardless of the case of their names, in the format they are written
+					in (one value per line). The default HK definition no longer resets paramNum inside its loop,
+					the definition methods send to fifoToGPR (fifotoGPR does not exist) and reports are decoded with the
+					alternate definition once it has been sent.
+
+10/19/2026			Reports are decoded with numpy when it is available and go to the archive, the statistics and the
+					limit checking as arrays (see HKDefinition.py).
+
+10/19/2026			The definition files are watched and compiled in the background, a definition command takes the
+					compiled definition which is ready. Reports are decoded with the definition which was last sent
+					to the satellite (hkDecoder, diagDecoder), whatever happens to its file afterwards.
+
+10/19/2026			HK and diagnostics reports are checked by a limit monitor each (hkLimitMonitor, diagLimitMonitor):
+					the levels and persistence counts of a parameter found in both kinds of report no longer mix.
+
+10/19/2026			A saturated sensor (raw value 0xFFFF) is checked against the limits instead of being taken as
+					a missing value.
+
+10/19/2026			A definition update which is denied is reported on the CLI again (printToCLI() was misspelled).
+
 """
 
 import os
+import calendar
 from multiprocessing import *
 from PUSService import *
 from FifoObject import *
+from HKValueCache import HKValueCache
+from HKDefinition import HKDefinitionCache, writeDefinition
+try:
+	from HKArchive import HKArchive, HKArchiveTiers
+	from HKStatistics import HKStatistics
+	from HKCalibration import HKCalibration
+	from HKLimitMonitor import HKLimitMonitor
+except ImportError:				# numpy is not installed, reports are neither archived nor checked against limits.
+	HKArchive = None
+	HKArchiveTiers = None
+	HKStatistics = None
+	HKCalibration = None
+	HKLimitMonitor = None
 
 class hkService(PUSService):
 	"""
@@ -56,14 +127,33 @@ class hkService(PUSService):
 	numParameters1 			= 41
 	numSensors1 			= 27
 	numVars1 				= 14
-	# Log for Housekeeping Parameter Reports
-	hkDefLog 				= None
-
+	# Columnar archives of the housekeeping and diagnostics reports (see HKArchive.py)
+	hkArchive				= None
+	diagArchive				= None
+	archivePath				= None
+	# Downsampled tiers of the archives, updated in the background (see HKArchiveTiers in HKArchive.py)
+	hkTiers					= None
+	diagTiers				= None
+	# Per-orbit and per-day statistics of the reports (see HKStatistics.py)
+	hkStatistics			= None
+	diagStatistics			= None
+	# Latest value of every parameter, shared with other processes (see HKValueCache.py)
+	valueCache				= None
+	valueCachePath			= None
+	# Compiled HK / diagnostics definitions (see HKDefinition.py)
+	definitionsPath			= None
+	definitions				= None
+	hkDecoder				= None	# Definition which the satellite is using (the one reports are decoded with)
+	diagDecoder				= None
+	# Limit checking of the reports (see HKCalibration.py, HKLimitMonitor.py)
+	calibration				= None
+	hkLimitMonitor			= None	# One per kind of report, so the levels (and persistence) of the two don't mix
+	diagLimitMonitor		= None
 
 	#DIAGNOSTICS ATTRIBUTES
 	currentDiag				= []
 	diagDefinition0			= []
-	diagDefinition2			= []
+	diagDefinition1			= []
 	currentDiagDefinition	= []
 	currentDiagDefinitionf	= 0
 	diagCollectionInterval0 = 15	#Diagnostics collection interval in minutes (default is 15)
@@ -74,9 +164,6 @@ class hkService(PUSService):
 	diagNumParameters1		= 41
 	diagNumSensors1			= 27
 	diagNumVars1			= 14
-	# Logs for diagnostics
-	diagLog 				= None
-	diagDefLog				= None
 
 	# FIFOs for communication with the FDIR service
 	fifotoFDIR 				= None
@@ -106,25 +193,27 @@ class hkService(PUSService):
 
 		print("The path in hk run: %s" %str(self.p1))
 		self.initializePUS(self)
+		self.watchFifos()									# The FIFOs send heartbeats while they wait
+		self.tracer.installSignalHandler()					# kill -USR1 <pid> dumps the trace
 		self.initialize(self)
 
 		while 1:
-			self.fifoFromGPR.readCommandFromFifo()		# If command in FIFO, places it in self.currentCommand[]
-			if self.fifofromFDIR.commandReady:
-				self.execCommands(self)								# Deals with commands from GPR
-				self.fifofromFDIR.commandReady = 0
+			self.heartbeat()
+			command = self.takeGPRCommand()		# Next command from the GPR (deferred commands first)
+			if command is not None:
+				self.executeGPRCommand(command)						# Deals with commands from GPR
 		return				# This should never be reached.
 
 	@staticmethod
 	def initializePUS(self):
 		# FIFOs Required for communication with the Ground Packet Router:
-		self.fifoFromGPR			= FifoObject(self.p2, 0)
-		self.fifoToGPR				= FifoObject(self.p1, 1)
+		self.fifoFromGPR			= FifoObject(self.p2, 0, 1)
+		self.fifoToGPR				= FifoObject(self.p1, 1, 1)
 		self.fifoToGPRPath			= self.p1
 		self.wait					= 1
 		self.fifoFromGPRPath		= self.p2
-		self.fifotoFDIR				= FifoObject(self.FDIROutPath, 1)
-		self.fifofromFDIR			= FifoObject(self.FDIRInPath, 0)
+		self.fifotoFDIR				= FifoObject(self.FDIROutPath, 1, 1)
+		self.fifofromFDIR			= FifoObject(self.FDIRInPath, 0, 1)
 		return
 
 	@staticmethod
@@ -133,14 +222,48 @@ class hkService(PUSService):
 		@purpose:   - Initializes arrays to 0.
 					- Sets current HK definition to default.
 		"""
-		for i in range(0, self.dataLength):
-			self.currentHK[i] = 0
-			self.currentHKDefinition[i] = 0
-			self.hkDefinition0[i] = 0
-			self.hkDefinition1[i] = 0
+		self.currentHK = [0] * self.dataLength
+		self.currentHKDefinition = [0] * self.dataLength
+		self.hkDefinition0 = [0] * self.dataLength
+		self.hkDefinition1 = [0] * self.dataLength
+		self.currentDiag = [0] * self.dataLength
+		self.currentDiagDefinition = [0] * self.dataLength
+		self.diagDefinition0 = [0] * self.dataLength
+		self.diagDefinition1 = [0] * self.dataLength
 		self.clearCurrentCommand()
-
-		self.setHKDefinitionsDefault()
+		if (self.archivePath is not None) and (HKArchive is not None):
+			try:
+				self.hkArchive = HKArchive(os.path.join(self.archivePath, "hk"))
+				self.diagArchive = HKArchive(os.path.join(self.archivePath, "diag"))
+				self.hkTiers = HKArchiveTiers(os.path.join(self.archivePath, "hk"))
+				self.hkTiers.start()
+				self.diagTiers = HKArchiveTiers(os.path.join(self.archivePath, "diag"))
+				self.diagTiers.start()
+				self.hkStatistics = HKStatistics(os.path.join(self.archivePath, "hkStats"), self.parameters)
+				self.diagStatistics = HKStatistics(os.path.join(self.archivePath, "diagStats"), self.parameters)
+			except (IOError, OSError) as e:
+				self.logError("Could not open the housekeeping archive %s: %s" %(self.archivePath, str(e)))
+		if self.valueCachePath is not None:
+			try:
+				self.valueCache = HKValueCache(self.valueCachePath)
+			except (IOError, OSError) as e:
+				self.logError("Could not open the latest-value table %s: %s" %(self.valueCachePath, str(e)))
+		if HKLimitMonitor is not None:
+			try:
+				self.calibration = HKCalibration(self.parameters)
+				if os.path.isfile(os.path.join(self.definitionsPath, "calibration.txt")):
+					self.calibration.load(os.path.join(self.definitionsPath, "calibration.txt"))
+				if os.path.isfile(os.path.join(self.definitionsPath, "limits.txt")):
+					self.hkLimitMonitor = HKLimitMonitor(self.parameters, os.path.join(self.definitionsPath, "limits.txt"))
+					self.diagLimitMonitor = HKLimitMonitor(self.parameters, os.path.join(self.definitionsPath, "limits.txt"))
+			except (IOError, ValueError) as e:
+				self.logError("Could not load the housekeeping limits: %s" %str(e))
+
+		self.definitions = HKDefinitionCache(self.definitionsPath, self.parameters)
+		self.diagDecoder = self.definitions.setDefault("diag", self.diagCollectionInterval0,
+													   self.defaultDefinition(self.diagNumVars0, self.diagNumParameters0))
+		self.definitions.start()
+		self.setHKDefinitionsDefault(self)
 		self.logEventReport(1, self.hkgroundinitialized, 0, 0, "Ground Housekeeping Service Initialized Correctly.")
 		return
 
@@ -151,35 +274,35 @@ class hkService(PUSService):
 					and performs different actions based on what is received.
 		"""
 		if self.currentCommand[146] == self.hkDefinitionReport:
-			self.logHkParameterReport()
+			self.logHkParameterReport(self)
 		if self.currentCommand[146] == self.hkReport:
-			self.logHKReport()
+			self.logHKReport(self)
 		if self.currentCommand[146] == self.newHKDefinition:
-			self.setAlternateHKDefinition()
+			self.setAlternateHKDefinition(self)
 		if self.currentCommand[146] == self.clearHKDefinition:
-			self.setHKDefinitionsDefault()
+			self.setHKDefinitionsDefault(self)
 		if self.currentCommand[146] == self.enableParamReport:
-			self.enableParamReport()
+			self.enableParamReport(self)
 		if self.currentCommand[146] == self.disableParamReport:
-			self.disableParamReport()
+			self.disableParamReport(self)
 		if self.currentCommand[146] == self.reportHKDefinitions:
-			self.requestHKParamReport()
+			self.requestHKParamReport(self)
 
 		#DIAGNOSTICS
 		if self.currentCommand[146] == self.diagDefinitionReport:
-			self.logDiagnosticsDefinitionReport()
+			self.logDiagnosticsDefinitionReport(self)
 		if self.currentCommand[146] == self.diagReport:
-			self.logDiagnosticsReport()
+			self.logDiagnosticsReport(self)
 		if self.currentCommand[146] == self.newDiagDefinition:
-			self.setAlternateDiagDefinition()
+			self.setAlternateDiagDefinition(self)
 		if self.currentCommand[146] == self.clearDiagDefinition:
-			self.setDiagnosticsDefinitionsDefault()
+			self.setDiagnosticsDefinitionsDefault(self)
 		if self.currentCommand[146] == self.enableDiagParamReport:
-			self.enableDiagParamReport()
+			self.enableDiagParamReport(self)
 		if self.currentCommand[146] == self.disableDiagParamReport:
-			self.disableDiagParamReport()
+			self.disableDiagParamReport(self)
 		if self.currentCommand[146] == self.reportDiagDefinitions:
-			self.requestDiagParamReport()
+			self.requestDiagParamReport(self)
 
 		self.clearCurrentCommand()
 		return
@@ -226,40 +349,37 @@ class hkService(PUSService):
 				self.sendCurrentCommandToFifo(self.fifotoFDIR)
 
 
-		self.diagDefLog.write("DIAG PARAMETER REPORT:\t")
-		self.diagDefLog.write(str(self.absTime.day) + "/" + str(self.absTime.day) + "/" + str(self.absTime.day) + "\t,\n")
+		record = "DIAG PARAMETER REPORT:\t"
+		absTime = self.getAbsTime()
+		record += str(absTime.day) + "/" + str(absTime.day) + "/" + str(absTime.day) + "\t,\n"
 		for i in range(diagNumParameters - 1, -1, -1):
 			byte = self.currentCommand[i] & 0x000000FF
-			tempString = self.parameters(byte)
+			tempString = self.parameters.get(byte, hex(byte))
 			if not sID:
-				self.diagDefLog.write(tempString + "\n")
+				record += tempString + "\n"
 			if sID:
-				self.diagDefLog.write(tempString + "\n")
+				record += tempString + "\n"
+		self.logs.write("diagDef", record)
 		return
 
 	@staticmethod
 	def logDiagnosticsReport(self):
 		"""
 		@purpose:   Used to log the diagnostics report which was received.
-		@Note:		Contains a mutex lock for exclusive access.
 		@Note:		Diagnostics reports are created in a manner that is more convenient
 					for excel or Matlab to parse but not really that great for human consumption.
 		@Note:		Each parameter in a diagnostics report gets 2 entries in the array,
 					which corresponds to being 16 bits on the satellite.
 		@Note:		We expect diagnostics report to located in currentCommand[] at this point.
+		@Note:		The report is decoded by the compiled current diagnostics definition (see HKDefinition.py).
 		"""
-		if self.currentDiagDefinitionf:
-			diagNumParameters = self.diagNumParameters1
-		else:
-			diagNumParameters = self.diagNumParameters0
-
-		self.diagLog.write("DIAGLOG:\t")
-		self.diagLog.write(str(self.absTime.day) + "/" + str(self.absTime.day) + "/" + str(self.absTime.day) + "\t,\t")
-		for i in range(diagNumParameters * 2 - 1, -1, -2):
-			param = self.currentCommand[i] << 8
-			param += self.currentCommand[i - 1]
-			self.diagLog.write(str(param) + "\t,\t")
-		self.diagLog.write("\n")
+		decoder = self.diagDecoder
+		values = decoder.decode(self.currentCommand)
+		absTime = self.getAbsTime()
+		record = "DIAGLOG:\t" + str(absTime.day) + "/" + str(absTime.day) + "/" + str(absTime.day) + "\t,\t"
+		record += "".join([str(value) + "\t,\t" for value in values])
+		self.logs.write("diag", record + "\n")
+		self.storeReport(self, self.diagArchive, self.diagStatistics, self.diagLimitMonitor, absTime, decoder, values)
 		return
 
 	@staticmethod
@@ -269,46 +389,36 @@ class hkService(PUSService):
 		@Note:		The format of diag definitions should be known before changing the existing one.
 		@Note:		The new diagnostics parameter report should replace diagDefinition1.txt & have an sID of 1.
 		"""
-		defPath = "/housekeeping/definitions/diagDefinition1.txt"
-		if os.path.exists(defPath):
-			diagdef = open(defPath, "rb")
-			sID = int(diagdef.read(1))
-			if sID != 1:
-				self.printtoCLI("sID in diagDefinition1.txt was not 1, denying definition update")
-				self.logError("sID in diagDefinition1.txt was not 1, denying definition update\n")
-				return
+		try:
+			decoder = self.definitions.get("diag", 1)
+		except (IOError, ValueError) as e:
+			self.printToCLI("%s, denying definition update" %str(e))
+			self.logError("%s, denying definition update\n" %str(e))
+			return
+		if decoder is not None:
+			self.diagCollectionInterval1 = decoder.interval
+			self.diagNumParameters1 = decoder.numParameters
+			self.diagDefinition1 = [0] * self.dataLength
+			self.diagDefinition1[0:decoder.numParameters] = decoder.definition
 			self.diagDefinition1[136] = 1
-			diagdef.seek(1)
-			self.diagCollectionInterval1 = int(diagdef.read(2))
 			self.diagDefinition1[135] = self.diagCollectionInterval1
-			diagdef.seek(2)
-			diagNmParameters1 = int(diagdef.read(2))
-			if diagNmParameters1 > 64:
-				self.logError("Proposed alternate diagnostics definition has numParameters > 64, denying definition update\n")
-				return
-			self.diagNumParameters1 = diagNmParameters1
 			self.diagDefinition1[134] = self.diagNumParameters1
-			diagdef.seek(3)
-			# Read the diagnostics definition from the file.
-			for i in range((self.diagNumParameters1 * 2 - 1 ), 0, -1):
-				tempString = diagdef.readline()
-				tempString = tempString.rstrip()
-				paramNum = int(self.invParameters(tempString))
-				self.diagDefinition1[i] = paramNum
+			self.currentDiagDefinitionf = 1
+			self.diagDecoder = decoder
 
 			# Send a PUS Packet to the satellite setting the diag def to the alternate one
 			self.clearCurrentCommand()
 			self.currentCommand[146] = self.newDiagDefinition
 			for i in range(0, self.dataLength):
 				self.currentCommand[i] = self.diagDefinition1[i]
-			self.sendCurrentCommandToFifo(self.fifotoGPR)
+			self.sendCurrentCommandToFifo(self.fifoToGPR)
 			self.waitForTCVerification(5000, self.newDiagDefinition)
 			# Send a PUS packet to the satellite requesting a parameter report
-			self.requestDiagParamReport()
+			self.requestDiagParamReport(self)
 			return
 
 		else:
-			self.printtoCLI("diagDefinition1.txt does not exist, denying definition update")
+			self.printToCLI("diagDefinition1.txt does not exist, denying definition update")
 			self.logError("diagDefinition1.txt does not exist, denying definition update\n")
 		return
 
@@ -320,35 +430,26 @@ class hkService(PUSService):
 					followed by increasing order for sensors (starting at diagDefinition[numParameters - 1] and descending)
 		@Note:		Note: If the satellite experiences a reset, it will go back to this definition for diagnostics.
 		"""
-		paramNum = 0xFF
+		definition = self.defaultDefinition(self.diagNumVars0, self.diagNumParameters0)
+		self.diagDefinition0[0:self.diagNumParameters0] = definition
 		self.diagDefinition0[136] 	= 0
 		self.diagDefinition0[135] 	= self.diagCollectionInterval0
 		self.diagDefinition0[134] 	= self.diagNumParameters0
-		for i in range(0, self.diagNumVars0):
-			self.diagDefinition0[i] = paramNum - i
-		paramNum = 1
-		for i in range (self.diagNumVars0, self.diagNumParameters0):
-			self.diagDefinition0[i] = paramNum
-			paramNum += 1
+		decoder = self.definitions.setDefault("diag", self.diagCollectionInterval0, definition)
 		self.currentDiagDefinitionf = 0
-		defPath = "/housekeeping/definitions/diagDefinition0.txt"
+		self.diagDecoder = decoder
 
-		# Create the hkDefinition0.txt file if it doesn't exist yet.
+		# Create the diagDefinition0.txt file if it doesn't exist yet.
+		defPath = self.definitions.definitionPath("diag", 0)
 		if not os.path.exists(defPath):
-			diagdef = open(defPath, "ab")
-			diagdef.write(str(0))
-			diagdef.write(str(self.diagCollectionInterval0))
-			diagdef.write(str(self.diagNumParameters0))
-			for i in range((self.diagNumParameters0 * 2 - 1 ), 0, -1):
-				paramNum = self.diagDefinition0[i]
-				diagdef.write(self.parameters[paramNum])
+			writeDefinition(defPath, 0, self.diagCollectionInterval0, [self.parameters[paramID] for paramID in decoder.paramIDs])
 
 		# Send a PUS Packet to the satellite setting the diag def to default (clearDiagDefinition)
 		self.clearCurrentCommand()
 		self.currentCommand[146] = self.clearDiagDefinition
-		self.sendCurrentCommandToFifo(self.fifotoGPR)
+		self.sendCurrentCommandToFifo(self.fifoToGPR)
 		# Send a PUS packet to the satellite requesting a parameter report
-		self.requestDiagParamReport()
+		self.requestDiagParamReport(self)
 		return
 
 	@staticmethod
@@ -368,7 +469,7 @@ class hkService(PUSService):
 	@staticmethod
 	def requestDiagParamReport(self):
 		self.clearCurrentCommand()
-		self.clearCurrentCommand[146] = self.reportDiagDefinitions
+		self.currentCommand[146] = self.reportDiagDefinitions
 		self.sendCurrentCommandToFifo(self.fifoToGPR)
 		return
 
@@ -434,42 +535,99 @@ class hkService(PUSService):
 				self.currentCommand[146] = 3
 				self.sendCurrentCommandToFifo(self.fifotoFDIR)
 
-		self.hkDefLog.write("HK PARAMETER REPORT:\t")
-		self.hkDefLog.write(str(self.absTime.day) + "/" + str(self.absTime.day) + "/" + str(self.absTime.day) + "\t,\n")
+		record = "HK PARAMETER REPORT:\t"
+		absTime = self.getAbsTime()
+		record += str(absTime.day) + "/" + str(absTime.day) + "/" + str(absTime.day) + "\t,\n"
 		for i in range(numParameters - 1, -1, -1):
 			byte = self.currentCommand[i] & 0x000000FF
-			tempString = self.parameters(byte)
+			tempString = self.parameters.get(byte, hex(byte))
 			if not sID:
-				self.hkDefLog.write(tempString + "\n")
+				record += tempString + "\n"
 			if sID:
-				self.hkDefLog.write(tempString + "\n")
+				record += tempString + "\n"
+		self.logs.write("hkDef", record)
 		return
 
 	@staticmethod
 	def logHKReport(self):
 		"""
 		@purpose:   Used to log the housekeeping report which was received.
-		@Note:		Contains a mutex lock for exclusive access.
 		@Note:		Housekeeping reports are created in a manner that is more convenient
 					for excel or Matlab to parse but not really that great for human consumption.
 		@Note:		Each parameter in a housekeeping report gets 2 entries in the array,
 					which corresponds to being 16 bits on the satellite.
 		@Note:		We expect housekeeping report to located in currentCommand[] at this point.
+		@Note:		The report is decoded by the compiled current housekeeping definition (see HKDefinition.py),
+					the value of parameter j of the report belongs to the parameter in entry j of the definition.
+		@Note:		The report is also stored in the latest-value table and appended to the housekeeping archive.
 		"""
-		if self.currenthkdefinitionf:
-			numParameters = self.numParameters1
-		else:
-			numParameters = self.numParameters0
-
-		self.hkLock.acquire()
-		self.hkLog.write("HKLOG:\t")
-		self.hkLog.write(str(self.absTime.day) + "/" + str(self.absTime.day) + "/" + str(self.absTime.day) + "\t,\t")
-		for i in range(numParameters * 2 - 1, -1, -2):
-			param = self.currentCommand[i] << 8
-			param += self.currentCommand[i - 1]
-			self.hkLog.write(str(param) + "\t,\t")
-		self.hkLog.write("\n")
-		self.hkLock.release()
+		decoder = self.hkDecoder
+		values = decoder.decode(self.currentCommand)
+		absTime = self.getAbsTime()
+		record = "HKLOG:\t" + str(absTime.day) + "/" + str(absTime.day) + "/" + str(absTime.day) + "\t,\t"
+		record += "".join([str(value) + "\t,\t" for value in values])
+		self.logs.write("hk", record + "\n")
+		self.storeReport(self, self.hkArchive, self.hkStatistics, self.hkLimitMonitor, absTime, decoder, values)
+		return
+
+	@staticmethod
+	def defaultDefinition(numVars, numParameters):
+		"""
+		@return:	The default (sID 0) definition: numVars variables in decreasing order from 0xFF followed by the
+					sensors in increasing order from 0x01.
+		"""
+		definition = []
+		for i in range(0, numVars):
+			definition.append(0xFF - i)
+		for i in range(0, numParameters - numVars):
+			definition.append(i + 1)
+		return definition
+
+	@staticmethod
+	def storeReport(self, archive, statistics, limitMonitor, absTime, decoder, values):
+		"""
+		@purpose:   Stores a report decoded by 'decoder' in the latest-value table (see HKValueCache.py),
+					appends it to 'archive' (see HKArchive.py) and adds it to 'statistics' (see HKStatistics.py),
+					if there are, and checks it against the limits with 'limitMonitor' (the one of its kind).
+		@Note:		values[k] is the raw value of decoder.paramIDs[k], a numpy array when numpy is available (which
+					the archive, the statistics and the limit checking take as it is).
+		"""
+		timestamp = calendar.timegm(absTime.timetuple()) + absTime.microsecond / 1e6
+		if self.valueCache is not None:
+			for paramID, value in zip(decoder.paramIDs, values):
+				self.valueCache.update(paramID & 0xFF, int(value), timestamp)
+		if archive is not None:
+			archive.extend([timestamp], decoder.columns(values.reshape(1, -1), self.parameters))
+		if statistics is not None:
+			statistics.add(timestamp, decoder.paramIDs, values)
+		if limitMonitor is not None:
+			self.checkLimits(self, limitMonitor, decoder.paramIDs, values)
+		return
+
+	@staticmethod
+	def checkLimits(self, limitMonitor, paramIDs, values):
+		"""
+		@purpose:   Checks a report (values[k] is the raw value of paramIDs[k]) against the limits with
+					'limitMonitor' (see HKLimitMonitor.py) and tells the FDIR service about every parameter which changed limit level.
+		@Note:		The message to FDIR: [146] = hkLimitViolation, [145] = paramID, [144] = new level,
+					[143] = old level (0 = nominal, 1 = yellow, 2 = red), [1], [0] = raw value (MSB, LSB).
+		"""
+		# Every value of a live report is a reading, 0xFFFF is a saturated sensor and not 'missing'.
+		changes = limitMonitor.check(paramIDs, self.calibration.convertFrame(paramIDs, values, markMissing=False))
+		for paramID, oldLevel, newLevel, value in changes:
+			raw = int(values[paramIDs.index(paramID)])
+			alarm = [0] * (self.dataLength + 10)
+			alarm[146] = self.hkLimitViolation
+			alarm[145] = paramID
+			alarm[144] = newLevel
+			alarm[143] = oldLevel
+			alarm[1] = (raw >> 8) & 0xFF
+			alarm[0] = raw & 0xFF
+			try:
+				self.fifotoFDIR.writeCommandToFifo(alarm)
+			except (IOError, OSError):
+				self.logError("Could not write to %s, the limit alarm for %s was dropped"
+							  %(str(self.fifotoFDIR.fifoPath), self.parameters.get(paramID, hex(paramID))))
 		return
 
 	@staticmethod
@@ -480,35 +638,26 @@ class hkService(PUSService):
 					followed by increasing order for sensors (starting at hkDefinition[numParameters - 1] and descending)
 		@Note:		Note: If the satellite experiences a reset, it will go back to this definition for housekeeping.
 		"""
-		paramNum = 0xFF
+		definition = self.defaultDefinition(self.numVars0, self.numParameters0)
+		self.hkDefinition0[0:self.numParameters0] = definition
 		self.hkDefinition0[136] 	= 0
 		self.hkDefinition0[135] 	= self.collectionInterval0
 		self.hkDefinition0[134] 	= self.numParameters0
-		for i in range(0, self.numVars0):
-			self.hkDefinition0[i] = paramNum - i
-			paramNum = 1
-		for i in range (self.numVars0, self.numParameters0):
-			self.hkDefinition0[i] = paramNum
-			paramNum += 1
+		decoder = self.definitions.setDefault("hk", self.collectionInterval0, definition)
 		self.currenthkdefinitionf = 0
-		defPath = "/housekeeping/definitions/hkDefinition0.txt"
+		self.hkDecoder = decoder
 
 		# Create the hkDefinition0.txt file if it doesn't exist yet.
+		defPath = self.definitions.definitionPath("hk", 0)
 		if not os.path.exists(defPath):
-			hkdef = open(defPath, "ab")
-			hkdef.write(str(0))
-			hkdef.write(str(self.collectionInterval0))
-			hkdef.write(str(self.numParameters0))
-			for i in range((self.numParameters0 * 2 - 1 ), 0, -1):
-				paramNum = self.hkDefinition0[i]
-				hkdef.write(self.parameters[paramNum])
+			writeDefinition(defPath, 0, self.collectionInterval0, [self.parameters[paramID] for paramID in decoder.paramIDs])
 
 		# Send a PUS Packet to the satellite setting the hk def to default (clearHKDefinition)
 		self.clearCurrentCommand()
 		self.currentCommand[146] = self.clearHKDefinition
-		self.sendCurrentCommandToFifo(self.fifotoGPR)
+		self.sendCurrentCommandToFifo(self.fifoToGPR)
 		# Send a PUS packet to the satellite requesting a parameter report
-		self.requestHKParamReport()
+		self.requestHKParamReport(self)
 		return
 
 	@staticmethod
@@ -518,62 +667,49 @@ class hkService(PUSService):
 		@Note:		The format of hk definitions should be known before changing the existing one.
 		@Note:		The new housekeeping parameter report should replace hkDefinition1.txt & have an sID of 1.
 		"""
-		defPath = "/housekeeping/definitions/hkDefinition1.txt"
-		if os.path.exists(defPath):
-			hkdef = open(defPath, "rb")
-			sID = int(hkdef.read(1))
-			if sID != 1:
-				self.printtoCLI("sID in hkDefinition1.txt was not 1, denying definition update")
-				self.logError("sID in hkDefinition1.txt was not 1, denying definition update\n")
-				return
+		try:
+			decoder = self.definitions.get("hk", 1)
+		except (IOError, ValueError) as e:
+			self.printToCLI("%s, denying definition update" %str(e))
+			self.logError("%s, denying definition update\n" %str(e))
+			return
+		if decoder is not None:
+			self.collectionInterval1 = decoder.interval
+			self.numParameters1 = decoder.numParameters
+			self.hkDefinition1 = [0] * self.dataLength
+			self.hkDefinition1[0:decoder.numParameters] = decoder.definition
 			self.hkDefinition1[136] = 1
-			hkdef.seek(1)
-			self.collectionInterval1 = int(hkdef.read(2))
 			self.hkDefinition1[135] = self.collectionInterval1
-			hkdef.seek(2)
-			numParameters1 = int(hkdef.read(2))
-			if numParameters1 > 64:
-				self.logError("Proposed alternate HK definition has numParameters > 64, denying definition update\n")
-				return
-			self.numParameters1 = numParameters1
 			self.hkDefinition1[134] = self.numParameters1
-			hkdef.seek(3)
-			# Read the housekeeping definition from the file.
-			for i in range((self.numParameters1 * 2 - 1 ), 0, -1):
-				tempString = hkdef.readline()
-				tempString = tempString.rstrip()
-				paramNum = int(self.invParameters(tempString))
-				self.hkDefinition1[i] = paramNum
+			self.currenthkdefinitionf = 1
+			self.hkDecoder = decoder
 
 			# Send a PUS Packet to the satellite setting the hk def to the alternate one
 			self.clearCurrentCommand()
 			self.currentCommand[146] = self.newHKDefinition
 			for i in range(0, self.dataLength):
 				self.currentCommand[i] = self.hkDefinition1[i]
-			self.sendCurrentCommandToFifo(self.fifotoGPR)
+			self.sendCurrentCommandToFifo(self.fifoToGPR)
 			self.waitForTCVerification(5000, self.newHKDefinition)
 			# Send a PUS packet to the satellite requesting a parameter report
-			self.requestHKParamReport()
+			self.requestHKParamReport(self)
 			return
 
 		else:
-			self.printtoCLI("hkDefinition1.txt does not exist, denying definition update")
+			self.printToCLI("hkDefinition1.txt does not exist, denying definition update")
 			self.logError("hkDefinition1.txt does not exist, denying definition update\n")
 			return
 
-	@staticmethod
 	def waitForTCVerification(self, timeOut, operation):
 		"""
 		@purpose: 	This method is used to put the current service on hold until a successful TC Acceptance
 					report has been received.
-		@param:		timeOut: This method will wait for a maximum of 'timeOut' milliseconds for the verification to be
-					received.
+		@param:		timeOut: This method will wait for at least 'timeOut' milliseconds for the verification to be
+					received, longer if the GPR takes longer to time the TC out (see TCVerificationTracker.py).
 		@param:		operation: is the code for the operation to be completed
 		"""
-		waitTime = datetime.timedelta(0)
-		while (waitTime.milliseconds < timeOut) and (not self.tcAcceptVerification):
-			pass
-		if waitTime > timeOut:
+		status = self.waitForTCReport(operation, timeOut, 0)
+		if status != self.tcAccepted:
 			self.printToCLI("HOUSEKEEPING SERVICE OPERATION: %s HAS FAILED\n" %self.hkOperations[operation])
 			self.logError("HOUSEKEEPING SERVICE OPERATION: %s HAS FAILED" %self.hkOperations[operation])
 			self.currentCommand[146] = operation
@@ -582,26 +718,26 @@ class hkService(PUSService):
 		else:
 			self.logEventReport(1, operation, 0, 0,
 								"HOUSEKEEPING SERVICE OPERATION: %s HAS SUCCEEDED" %self.hkOperations[operation])
-			self.tcLock.acquire()
-			self.tcAcceptVerification = 0
-			self.tcExecuteVerification = 0
-			self.tcLock.release()
 			return 1
 
-	def __init__(self, path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock, cliLock, errorLock, day, hour, minute, second, hkDefPath, diagPath, diagDefPath):
+	def __init__(self, path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock=None,
+				 heartbeatBoard=None, heartbeatSlot=0, metrics=None, archivePath=None, valueCachePath=None):
+		"""
+		@param:		archivePath: directory of the link's housekeeping archives (see HKArchive.py), None = no archive.
+		@param:		valueCachePath: file of the link's latest-value table (see HKValueCache.py), None = no table.
+		"""
 		# Initialize this instance as a PUS service
 		print(path1)
 		self.p1 = path1
 		self.p2 = path2
-		super(hkService, self).__init__(path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock, cliLock, errorLock, day, hour, minute, second)
+		self.archivePath = archivePath
+		self.valueCachePath = valueCachePath
+		self.definitionsPath = os.path.join(os.path.dirname(os.path.realpath(__file__)), "housekeeping", "definitions")
+		super(hkService, self).__init__(path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock,
+										heartbeatBoard, heartbeatSlot, metrics)
 		self.processID = 0x10
 		self.serviceType = 3
 
-		# Log for Housekeeping Parameter Reports & diagnostics
-		self.hkDefLog = open(hkDefPath, "a+")
-		self.diagLog = open(diagPath, "a+")
-		self.diagDefLog = open(diagDefPath, "a+")
-
 		print("The path before forking: %s" %str(self.p1))
 		pID = os.fork()
 		if pID:
@@ -610,7 +746,7 @@ class hkService(PUSService):
 			return
 		else:
 			print("The path in the child: %s" %str(self.p1))
-			self.run1(self)
+			self.runForked()
 
 		# Acquire some values from the satellite.
 
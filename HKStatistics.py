@@ -0,0 +1,235 @@
+"""
+FILE_NAME:			HKStatistics.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the per-orbit and per-day statistics of the housekeeping / diagnostics parameters
+					(count, min, max, mean and standard deviation), which are updated as the reports come in, as
+					well as a small command line tool for reading them.
+
+FILE REFERENCES:	Written by HKService.py (/housekeeping/archive/hkStats, /housekeeping/archive/diagStats),
+					parameter names from PUSService.parameters, GroundClock.py (parseTime())
+
+LIBRARIES USED:		os, datetime, argparse, numpy
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Reports are added in time order. Statistics are of the raw values (like the
+					HK log and the archive), see HKCalibration.py for engineering units.
+
+NOTES:
+					Every parameter ID has running accumulators (Welford's method: count, mean and the sum of the
+					squared differences from the mean, plus min and max) which are updated for a whole report at
+					once with a few array operations. Nothing is kept per report.
+
+					Orbits are numbered from orbitEpoch (seconds since 1970 UTC) every orbitPeriod seconds, days
+					are UTC days. When a report belongs to a new orbit (day), the statistics of the one which
+					ended are appended to orbit.csv (day.csv) in the statistics directory, one row per parameter:
+
+					period, start, stop, parameter, count, min, max, mean, stddev
+
+					'period' is the orbit number or the date, start and stop are the times of the first and last
+					reports of the period. A trend over a month is then read from a few hundred rows:
+					python HKStatistics.py housekeeping/archive/hkStats/day.csv BATT_V --start 2026-10-01
+
+					The statistics of the period which is in progress are only in memory, if the HK service is
+					restarted that period only covers the reports received after the restart.
+
+REQUIREMENTS:		numpy
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			The command line tool uses HKArchive.parseTime() instead of a copy of it.
+
+10/19/2026			parseTime() is imported from GroundClock.py, where it moved.
+"""
+
+import os
+from datetime import datetime
+import numpy
+from GroundClock import parseTime
+
+class HKAccumulator:
+	"""
+	Author: agent
+	Running statistics of every parameter ID over one period.
+	"""
+	numIDs			= 256
+	period			= None			# Orbit number or date of the statistics, None = nothing added yet
+	startTime		= 0.0
+	stopTime		= 0.0
+	counts			= None
+	means			= None
+	squares			= None			# Sum of the squared differences from the mean (Welford's M2)
+	minimums		= None
+	maximums		= None
+
+	def add(self, timestamp, paramIDs, values):
+		"""
+		@purpose:	Adds a report to the statistics, paramIDs must not repeat (see HKStatistics.add()).
+		"""
+		if not self.counts.any():
+			self.startTime = timestamp
+		self.stopTime = timestamp
+		counts = self.counts[paramIDs] + 1
+		deltas = values - self.means[paramIDs]
+		means = self.means[paramIDs] + deltas / counts
+		self.squares[paramIDs] += deltas * (values - means)
+		self.means[paramIDs] = means
+		self.counts[paramIDs] = counts
+		self.minimums[paramIDs] = numpy.minimum(self.minimums[paramIDs], values)
+		self.maximums[paramIDs] = numpy.maximum(self.maximums[paramIDs], values)
+		return
+
+	def rows(self):
+		"""
+		@return:	[(paramID, count, min, max, mean, stddev)] of every parameter which was reported.
+		"""
+		rows = []
+		for paramID in numpy.nonzero(self.counts)[0].tolist():
+			count = int(self.counts[paramID])
+			stddev = 0.0
+			if count > 1:
+				stddev = float(numpy.sqrt(self.squares[paramID] / (count - 1)))
+			rows.append((paramID, count, float(self.minimums[paramID]), float(self.maximums[paramID]),
+						 float(self.means[paramID]), stddev))
+		return rows
+
+	def reset(self, period=None):
+		self.period = period
+		self.counts = numpy.zeros(self.numIDs, dtype=numpy.int64)
+		self.means = numpy.zeros(self.numIDs)
+		self.squares = numpy.zeros(self.numIDs)
+		self.minimums = numpy.zeros(self.numIDs) + numpy.inf
+		self.maximums = numpy.zeros(self.numIDs) - numpy.inf
+		return
+
+	def __init__(self):
+		self.reset()
+
+class HKStatistics:
+	"""
+	Author: agent
+	Per-orbit and per-day statistics of the housekeeping reports, written to CSV files as the periods end.
+	"""
+	orbitPeriod		= 5580.0		# Seconds per orbit
+	orbitEpoch		= 0.0			# Start of orbit 0 (seconds since 1970 UTC)
+	header			= "period,start,stop,parameter,count,min,max,mean,stddev\n"
+	directory		= None
+	parameters		= None			# paramID -> name
+	orbit			= None			# HKAccumulator of the current orbit
+	day				= None			# HKAccumulator of the current day
+
+	def orbitNumber(self, timestamp):
+		return int((timestamp - self.orbitEpoch) // self.orbitPeriod)
+
+	@staticmethod
+	def date(timestamp):
+		return datetime.utcfromtimestamp(timestamp).strftime("%Y-%m-%d")
+
+	def add(self, timestamp, paramIDs, values):
+		"""
+		@purpose:	Adds a report (values[i] is the value of paramIDs[i]) to the statistics of the current orbit
+					and day, writing those of the orbit / day which just ended first.
+		"""
+		paramIDs = numpy.asarray(paramIDs, dtype=numpy.intp) & (HKAccumulator.numIDs - 1)
+		values = numpy.asarray(values, dtype=numpy.float64)
+		# A parameter may appear more than once in a report, it is only counted once.
+		paramIDs, first = numpy.unique(paramIDs, return_index=True)
+		values = values[first]
+		for accumulator, name, period in ((self.orbit, "orbit", self.orbitNumber(timestamp)),
+										  (self.day, "day", self.date(timestamp))):
+			if accumulator.period != period:
+				self.write(name, accumulator)
+				accumulator.reset(period)
+			accumulator.add(timestamp, paramIDs, values)
+		return
+
+	def write(self, name, accumulator):
+		"""
+		@purpose:	Appends the statistics of 'accumulator' to <directory>/<name>.csv
+		"""
+		rows = accumulator.rows()
+		if not rows:
+			return
+		path = os.path.join(self.directory, name + ".csv")
+		lines = []
+		if not os.path.isfile(path):
+			lines.append(self.header)
+		for paramID, count, minimum, maximum, mean, stddev in rows:
+			lines.append("%s,%.3f,%.3f,%s,%d,%r,%r,%r,%r\n" %(accumulator.period, accumulator.startTime,
+						 accumulator.stopTime, self.parameters.get(paramID, hex(paramID)), count, minimum, maximum,
+						 mean, stddev))
+		statisticsFile = open(path, "a")
+		try:
+			statisticsFile.write("".join(lines))
+		finally:
+			statisticsFile.close()
+		return
+
+	def __init__(self, directory, parameters, orbitPeriod=None, orbitEpoch=None):
+		"""
+		@param:		directory: where orbit.csv and day.csv are written, created if it does not exist.
+		@param:		parameters: paramID -> name (PUSService.parameters)
+		"""
+		self.directory = directory
+		self.parameters = parameters
+		if orbitPeriod is not None:
+			self.orbitPeriod = orbitPeriod
+		if orbitEpoch is not None:
+			self.orbitEpoch = orbitEpoch
+		if not os.path.isdir(directory):
+			os.makedirs(directory)
+		self.orbit = HKAccumulator()
+		self.day = HKAccumulator()
+
+def readStatistics(path, names=None, startTime=None, stopTime=None):
+	"""
+	@purpose:	Reads the rows of a statistics file (orbit.csv or day.csv) for the parameters 'names' (all of them if
+				None) whose periods overlap startTime - stopTime (seconds since 1970 UTC).
+	@return:	[(period, start, stop, parameter, count, min, max, mean, stddev)]
+	"""
+	rows = []
+	statisticsFile = open(path, "r")
+	try:
+		statisticsFile.readline()							# Header
+		for line in statisticsFile:
+			fields = line.strip().split(",")
+			if len(fields) != 9:
+				continue
+			if (names is not None) and (fields[3] not in names):
+				continue
+			start = float(fields[1])
+			stop = float(fields[2])
+			if ((startTime is not None) and (stop < startTime)) or ((stopTime is not None) and (start > stopTime)):
+				continue
+			rows.append((fields[0], start, stop, fields[3], int(fields[4]), float(fields[5]), float(fields[6]),
+						 float(fields[7]), float(fields[8])))
+	finally:
+		statisticsFile.close()
+	return rows
+
+def main(argv=None):
+	import argparse
+	parser = argparse.ArgumentParser(description="Print the per-orbit / per-day statistics of housekeeping parameters.")
+	parser.add_argument("statistics", help="statistics file (ex: housekeeping/archive/hkStats/day.csv)")
+	parser.add_argument("names", nargs="*", help="parameters to print (ex: BATT_V EPS_TEMP), all of them by default")
+	parser.add_argument("--start", type=parseTime, default=None, help="earliest time (YYYY-MM-DDTHH:MM:SS or seconds)")
+	parser.add_argument("--stop", type=parseTime, default=None, help="latest time (YYYY-MM-DDTHH:MM:SS or seconds)")
+	args = parser.parse_args(argv)
+	names = None
+	if args.names:
+		names = args.names
+	print("PERIOD\t,\tSTART\t,\tPARAMETER\t,\tCOUNT\t,\tMIN\t,\tMAX\t,\tMEAN\t,\tSTDDEV")
+	for period, start, stop, name, count, minimum, maximum, mean, stddev in readStatistics(args.statistics, names,
+																							args.start, args.stop):
+		print("%s\t,\t%s\t,\t%s\t,\t%d\t,\t%g\t,\t%g\t,\t%g\t,\t%g" %(period,
+				datetime.utcfromtimestamp(start).strftime("%Y-%m-%d %H:%M:%S"), name, count, minimum, maximum, mean,
+				stddev))
+	return 0
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,173 @@
+"""
+FILE_NAME:			HKValueCache.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the latest-value table of the housekeeping and diagnostics parameters: the last
+					value received for every parameter ID, when it was received and how many times it changed.
+
+FILE REFERENCES:	Used by HKService.py, parameter names come from PUSService.parameters.
+
+LIBRARIES USED:		os, mmap, struct, time
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					IOError / OSError if the table can't be created (writer) or does not exist (readers).
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Only one process (the HK service of the link) writes to a table.
+
+NOTES:
+					The table is a small file (/housekeeping/hkValues.bin) which is memory-mapped by the HK service
+					and by whoever wants to read it, so the current value of BATT_V or OBC_MODE can be had without
+					going through the HK log. It has one slot per parameter ID (IDs are 8 bits, see
+					PUSService.parameters):
+
+					sequence (uint64), timestamp (double, seconds since the epoch), value (uint64),
+					changes (uint64, times the value was different from the one before)
+
+					Readers never take a lock, each slot is a sequence lock: the writer makes 'sequence' odd,
+					updates the slot and makes it even again. A reader which sees an odd sequence, or a sequence
+					which changed while it was reading the slot, reads it again. sequence / 2 is the number of
+					times the parameter was reported, a slot with sequence 0 was never written.
+
+					The table is kept across restarts (the last known values are still the last known values),
+					it is only cleared if its size does not match (ex: the slot layout changed).
+
+					ex: python HKValueCache.py housekeeping/hkValues.bin BATT_V BATT_TEMP OBC_MODE
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import mmap
+import struct
+import time
+from datetime import datetime
+
+class HKValueCache:
+	"""
+	Author: agent
+	Shared, lock-free table of the latest value of every housekeeping / diagnostics parameter.
+	"""
+	slotFormat		= "<QdQQ"		# sequence, timestamp, value, changes
+	slotSize		= struct.calcsize(slotFormat)
+	numSlots		= 256			# One per parameter ID
+	maxRetries		= 1000			# Reads of a slot before giving up on a writer which stopped halfway
+	path			= None
+	readOnly		= 0
+	segment			= None
+
+	def update(self, paramID, value, timestamp=None):
+		"""
+		@purpose:	Stores the value which was just received for 'paramID' (writer only).
+		"""
+		if timestamp is None:
+			timestamp = time.time()
+		offset = paramID * self.slotSize
+		sequence, lastTime, lastValue, changes = struct.unpack_from(self.slotFormat, self.segment, offset)
+		if sequence & 1:
+			sequence += 1			# The writer died halfway through this slot, it is being rewritten anyway.
+		if (sequence != 0) and (value != lastValue):
+			changes += 1
+		struct.pack_into("<Q", self.segment, offset, sequence + 1)
+		struct.pack_into("<dQQ", self.segment, offset + 8, timestamp, value, changes)
+		struct.pack_into("<Q", self.segment, offset, sequence + 2)
+		return
+
+	def read(self, paramID):
+		"""
+		@purpose:	Reads the slot of 'paramID' without taking a lock.
+		@return:	(value, timestamp, changes, updates), None if the parameter was never reported.
+		"""
+		offset = paramID * self.slotSize
+		for i in range(0, self.maxRetries):
+			sequence = struct.unpack_from("<Q", self.segment, offset)[0]
+			if sequence & 1:
+				continue
+			timestamp, value, changes = struct.unpack_from("<dQQ", self.segment, offset + 8)
+			if struct.unpack_from("<Q", self.segment, offset)[0] != sequence:
+				continue
+			if sequence == 0:
+				return None
+			return (value, timestamp, changes, sequence // 2)
+		return None
+
+	def snapshot(self):
+		"""
+		@return:	{paramID: (value, timestamp, changes, updates)} of every parameter which was reported.
+		"""
+		values = {}
+		for paramID in range(0, self.numSlots):
+			slot = self.read(paramID)
+			if slot is not None:
+				values[paramID] = slot
+		return values
+
+	def close(self):
+		if self.segment is not None:
+			self.segment.close()
+			self.segment = None
+		return
+
+	def __init__(self, path, readOnly=0):
+		"""
+		@param:		path: file of the table, created by the writer if it does not exist.
+		@param:		readOnly: 1 for readers (other processes), the file must already exist.
+		"""
+		self.path = path
+		self.readOnly = readOnly
+		size = self.numSlots * self.slotSize
+		if readOnly:
+			tableFile = open(path, "rb")
+			try:
+				self.segment = mmap.mmap(tableFile.fileno(), size, access=mmap.ACCESS_READ)
+			finally:
+				tableFile.close()
+			return
+		if os.path.isfile(path) and (os.path.getsize(path) == size):
+			tableFile = open(path, "r+b")
+		else:
+			tableFile = open(path, "w+b")
+			tableFile.write(b"\x00" * size)
+			tableFile.flush()
+		try:
+			self.segment = mmap.mmap(tableFile.fileno(), size)
+		finally:
+			tableFile.close()
+
+def main(argv=None):
+	import argparse
+	from PUSService import PUSService
+	parser = argparse.ArgumentParser(description="Print the latest value of housekeeping / diagnostics parameters.")
+	parser.add_argument("table", help="latest-value table (ex: housekeeping/hkValues.bin)")
+	parser.add_argument("names", nargs="*", help="parameters to print (ex: BATT_V OBC_MODE), all of them by default")
+	args = parser.parse_args(argv)
+	cache = HKValueCache(args.table, readOnly=1)
+	invParameters = dict((name, paramID) for paramID, name in PUSService.parameters.items())
+	if args.names:
+		paramIDs = []
+		for name in args.names:
+			if name not in invParameters:
+				print("%s is not a parameter" %name)
+			else:
+				paramIDs.append(invParameters[name])
+	else:
+		paramIDs = sorted(cache.snapshot())
+	for paramID in paramIDs:
+		name = PUSService.parameters.get(paramID, hex(paramID))
+		slot = cache.read(paramID)
+		if slot is None:
+			print("%s\t,\t-" %name)
+			continue
+		value, timestamp, changes, updates = slot
+		print("%s\t,\t%d\t,\t%s\t,\t%d changes\t,\t%d reports" %(name, value,
+				datetime.utcfromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S"), changes, updates))
+	cache.close()
+	return 0
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,140 @@
+"""
+FILE_NAME:			LinkContext.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the link context, which holds everything that is specific to one spacecraft /
+					transceiver link served by a ground packet router: its name, where its FIFOs and logs live,
+					its metrics port and the CPU it runs on.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py, CommandLineInterface.py
+
+LIBRARIES USED:		os
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Link names are used as directory names, so they may only contain letters,
+					digits, '-' and '_'.
+
+NOTES:
+					Every link is served by its own GPR process (a shard) with its own set of PUS services,
+					so nothing is shared between links except for the code and the HK definitions.
+
+					The default link (no name) keeps the original layout: /fifos, /events, /ground_errors,
+					/housekeeping/logs right next to the code. A named link gets the same layout under
+					/links/<name>/ ex: /links/SAT2/fifos/GPRtohk.fifo, /links/SAT2/events/eventLog2026-10-19.csv
+
+					ex: python GroundPacketRouter.py SAT1 SAT2			(one shard per link)
+						python CommandLineInterface.py SAT2				(CLI for the SAT2 shard)
+
+					Shard N serves its metrics on basePort + N and, when os.sched_setaffinity() is available
+					(Python 3.3+), is pinned to CPU N % (number of CPUs).
+
+REQUIREMENTS:		Linux
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+
+class LinkContext:
+	"""
+	Author: agent
+	Name, directories and resources of one link served by a ground packet router.
+	"""
+	name			= None			# None = the default (single) link
+	index			= 0				# Position of the link on the command line (shard number)
+	rootPath		= None			# Directory which houses the ground station software
+	basePath		= None			# Directory which houses the FIFOs and logs of this link
+	metricsPort		= 9150
+	cpu				= None			# CPU the shard is pinned to, None = not pinned
+	# Directories which every link needs (see Create_Directory_Structure_Unix.sh)
+	directories		= ["events", "fifos", "ground_errors", "housekeeping/logs", "telemetry"]
+
+	def path(self, *parts):
+		"""
+		@purpose:	Returns the path of 'parts' (ex: "events", "eventLog2026-10-19.csv") within this link's directory.
+		"""
+		return os.path.join(self.basePath, *parts)
+
+	def fifoPath(self, name):
+		return self.path("fifos", "%s.fifo" %name)
+
+	def label(self):
+		"""
+		@return:	The name used for this link in messages, ex: "SAT2".
+		"""
+		if self.name is None:
+			return "default"
+		return self.name
+
+	def ensureDirectories(self):
+		"""
+		@purpose:	Creates the directories of this link which do not exist yet.
+		"""
+		for directory in self.directories:
+			directory = self.path(directory)
+			if not os.path.isdir(directory):
+				os.makedirs(directory)
+		return
+
+	def pinToCPU(self):
+		"""
+		@purpose:	Pins the calling process to self.cpu (when it is set and the platform supports it).
+		@return:	1 if the process was pinned, 0 otherwise.
+		"""
+		if (self.cpu is None) or not hasattr(os, "sched_setaffinity"):
+			return 0
+		try:
+			os.sched_setaffinity(0, [self.cpu])
+		except OSError:
+			return 0
+		return 1
+
+	@staticmethod
+	def fromArguments(arguments, rootPath=None, basePort=9150):
+		"""
+		@purpose:	Creates one LinkContext per link name in 'arguments' (ex: sys.argv[1:]), or the default link
+					when no name is given.
+		@return:	The list of LinkContexts, -1 if one of the names is invalid.
+		"""
+		names = []
+		for argument in arguments:
+			for name in argument.split(","):
+				if name and (name not in names):
+					names.append(name)
+		if not names:
+			return [LinkContext(None, 0, rootPath, basePort)]
+		links = []
+		for index, name in enumerate(names):
+			if not name.replace("-", "").replace("_", "").isalnum():
+				return -1
+			links.append(LinkContext(name, index, rootPath, basePort + index))
+		if (len(links) > 1) and hasattr(os, "sched_getaffinity"):
+			cpus = sorted(os.sched_getaffinity(0))
+			if len(cpus) > 1:
+				for link in links:
+					link.cpu = cpus[link.index % len(cpus)]
+		return links
+
+	def __init__(self, name=None, index=0, rootPath=None, metricsPort=9150):
+		"""
+		@param:		name: name of the link (ex: "SAT2"), None for the default link.
+		@param:		rootPath: directory which houses the ground station software, defaults to this file's directory.
+		"""
+		if rootPath is None:
+			rootPath = os.path.dirname(os.path.realpath(__file__))
+		self.name = name
+		self.index = index
+		self.rootPath = rootPath
+		self.metricsPort = metricsPort
+		if name is None:
+			self.basePath = rootPath
+		else:
+			self.basePath = os.path.join(rootPath, "links", name)
+
+if __name__ == '__main__':
+	pass
@@ -0,0 +1,253 @@
+"""
+FILE_NAME:			LinkStatistics.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the link statistics kept by the GPR: packets received, corrupted and missing,
+					checksum error rate and throughput, over the last minute and for every pass.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py
+
+LIBRARIES USED:		time
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Sequence counts are only looked at for packets which passed verification,
+					the header of a corrupted packet can't be trusted.
+
+NOTES:
+					Memory use is constant: the rolling numbers are kept in one bucket per second for the last
+					windowSeconds seconds (a ring which is reused as time goes by), each pass only keeps totals and
+					only the last historyLength passes are remembered.
+
+					Missing packets are found from gaps in the sequence counts of each APID (8 bits, see
+					PUSPacket.parseDataArray()). A packet which arrives late (its sequence count is behind the last
+					one) was counted as missing when the gap was seen, so it is taken off the missing count.
+					A corrupted packet also leaves a gap (its sequence count can't be read), it is already counted
+					as corrupt so the next gap found is shortened by the corrupted packets which came before it.
+
+					A pass starts with the first packet received and ends once nothing has been received for
+					passGap seconds.
+
+					Corrupted packets are sorted by the reason they were rejected:
+					"checksum" (PEC mismatch), "length" (wrong packet length) and "header" (anything else).
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Corrupted packets are no longer counted a second time as missing (from the gap they leave).
+"""
+
+import time
+from GroundClock import monotonic
+
+class PassStatistics:
+	"""
+	Author: agent
+	Totals for a single pass.
+	"""
+	number			= 0
+	startTime		= 0				# monotonic()
+	endTime			= 0				# monotonic() of the last packet
+	startWallTime	= 0				# time.time(), for the pass log
+	received		= 0				# Every packet received (duplicates excluded), corrupted or not
+	corrupt			= 0
+	checksumErrors	= 0
+	lengthErrors	= 0
+	headerErrors	= 0
+	missing			= 0
+	late			= 0
+	numBytes		= 0
+
+	def duration(self):
+		return self.endTime - self.startTime
+
+	def throughput(self):
+		"""
+		@return:	Bytes per second received during the pass (which is taken to last at least a second).
+		"""
+		return self.numBytes / max(self.duration(), 1.0)
+
+	def checksumErrorRate(self):
+		if self.received == 0:
+			return 0.0
+		return float(self.checksumErrors) / self.received
+
+	def lossRate(self):
+		"""
+		@return:	The fraction of the packets sent by the satellite which were missed or corrupted.
+		"""
+		expected = self.received + self.missing
+		if expected == 0:
+			return 0.0
+		return float(self.corrupt + self.missing) / expected
+
+	def summary(self):
+		return ("PASS %d: %.1fs, %d packets received, %d corrupt (%d checksum, %d length, %d header), %d missing, "
+				"%d late, %.1f B/s, loss %.2f%%" %(self.number, self.duration(), self.received, self.corrupt,
+				self.checksumErrors, self.lengthErrors, self.headerErrors, self.missing, self.late, self.throughput(),
+				self.lossRate() * 100))
+
+	def __init__(self, number, now):
+		self.number = number
+		self.startTime = now
+		self.endTime = now
+		self.startWallTime = time.time()
+
+class LinkStatistics:
+	"""
+	Author: agent
+	Rolling and per-pass statistics of the telemetry received on a link.
+	"""
+	windowSeconds	= 60			# Length of the rolling window
+	passGap			= 120.0			# Seconds without a packet which end a pass
+	historyLength	= 16			# Number of finished passes which are remembered
+	sequenceModulo	= 256
+	buckets			= None			# [second, received, corrupt, bytes] for each of the last windowSeconds seconds
+	lastSequence	= None			# apid -> last sequence count received
+	unmatchedCorrupt = 0			# Corrupted packets which have not been matched with a gap yet
+	currentPass		= None
+	passes			= None			# The last historyLength finished passes, oldest first
+	passCount		= 0
+
+	def bucket(self, now):
+		second = int(now)
+		bucket = self.buckets[second % self.windowSeconds]
+		if bucket[0] != second:
+			bucket[0] = second
+			bucket[1] = 0
+			bucket[2] = 0
+			bucket[3] = 0
+		return bucket
+
+	def passAt(self, now):
+		if self.currentPass is None:
+			self.passCount += 1
+			self.currentPass = PassStatistics(self.passCount, now)
+		self.currentPass.endTime = now
+		return self.currentPass
+
+	def recordPacket(self, numBytes, now=None):
+		"""
+		@purpose:	Records a packet which was received (before it is verified).
+		"""
+		if now is None:
+			now = monotonic()
+		currentPass = self.passAt(now)
+		currentPass.received += 1
+		currentPass.numBytes += numBytes
+		bucket = self.bucket(now)
+		bucket[1] += 1
+		bucket[3] += numBytes
+		return
+
+	def recordCorrupt(self, reason, now=None):
+		"""
+		@purpose:	Records that the last packet received failed verification.
+		@param:		reason: "checksum", "length" or "header"
+		"""
+		if now is None:
+			now = monotonic()
+		currentPass = self.currentPass
+		if currentPass is None:
+			currentPass = self.passAt(now)
+		currentPass.corrupt += 1
+		if reason == "checksum":
+			currentPass.checksumErrors += 1
+		elif reason == "length":
+			currentPass.lengthErrors += 1
+		else:
+			currentPass.headerErrors += 1
+		self.bucket(now)[2] += 1
+		self.unmatchedCorrupt += 1
+		return
+
+	def recordSequence(self, apid, sequenceCount):
+		"""
+		@purpose:	Looks for a gap between the sequence count of a verified packet and the last one from 'apid'.
+		@return:	The number of packets which were found to be missing (not counting the corrupted ones).
+		"""
+		currentPass = self.currentPass
+		if currentPass is None:
+			currentPass = self.passAt(monotonic())
+		last = self.lastSequence.get(apid)
+		if last is None:
+			self.lastSequence[apid] = sequenceCount
+			return 0
+		gap = (sequenceCount - last - 1) % self.sequenceModulo
+		if gap >= self.sequenceModulo // 2:
+			# Behind the last one: a late packet which was already counted as missing.
+			currentPass.late += 1
+			if currentPass.missing > 0:
+				currentPass.missing -= 1
+			return 0
+		self.lastSequence[apid] = sequenceCount
+		corrupted = min(gap, self.unmatchedCorrupt)
+		self.unmatchedCorrupt -= corrupted
+		gap -= corrupted
+		currentPass.missing += gap
+		return gap
+
+	def checkPass(self, now=None):
+		"""
+		@purpose:	Ends the current pass if nothing has been received for passGap seconds.
+		@return:	The PassStatistics of the pass which just ended, None otherwise.
+		"""
+		if now is None:
+			now = monotonic()
+		if (self.currentPass is None) or (now - self.currentPass.endTime < self.passGap):
+			return None
+		finished = self.currentPass
+		self.currentPass = None
+		self.lastSequence = {}
+		self.unmatchedCorrupt = 0
+		self.passes.append(finished)
+		if len(self.passes) > self.historyLength:
+			self.passes.pop(0)
+		return finished
+
+	def rollingRates(self, now=None):
+		"""
+		@return:	(packets per second, bytes per second, fraction of the packets which were corrupt) over the
+					last windowSeconds seconds.
+		"""
+		if now is None:
+			now = monotonic()
+		oldest = int(now) - self.windowSeconds
+		received = 0
+		corrupt = 0
+		numBytes = 0
+		for bucket in self.buckets:
+			if bucket[0] > oldest:
+				received += bucket[1]
+				corrupt += bucket[2]
+				numBytes += bucket[3]
+		corruptRatio = 0.0
+		if received:
+			corruptRatio = float(corrupt) / received
+		return (float(received) / self.windowSeconds, float(numBytes) / self.windowSeconds, corruptRatio)
+
+	def quality(self, now=None):
+		"""
+		@return:	Fraction of the packets received over the last windowSeconds seconds which were good
+					(1.0 when nothing was received), ex: to pace the uplink.
+		"""
+		return 1.0 - self.rollingRates(now)[2]
+
+	def __init__(self, windowSeconds=None, passGap=None):
+		if windowSeconds is not None:
+			self.windowSeconds = windowSeconds
+		if passGap is not None:
+			self.passGap = passGap
+		self.buckets = []
+		for i in range(0, self.windowSeconds):
+			self.buckets.append([-1, 0, 0, 0])
+		self.lastSequence = {}
+		self.passes = []
+
+if __name__ == '__main__':
+	pass
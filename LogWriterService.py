@@ -0,0 +1,564 @@
+"""
+FILE_NAME:			LogWriterService.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the log writer, the only process which writes to the logs of a link (events,
+					housekeeping, diagnostics, ground errors, passes), and the channel used by the GPR and the PUS
+					services to send it log records.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py, PUSService.py, HKService.py. Writes EventLog.py's binary event log.
+
+LIBRARIES USED:		os, sys, struct, signal, errno, fcntl, select, time, datetime, gzip, shutil, threading, traceback,
+					Queue
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					A record which does not fit in maxRecord bytes is truncated (and marked as such).
+					Errors of the log writer (ex: a log which can't be written to) are printed to stderr, the records
+					of that batch for that log are lost and the log writer carries on with the next batch.
+					When the log writer is gone or stuck, LogChannel.send() drops records (printing a message to
+					stderr once) instead of failing or holding up the process which logs things.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: The LogWriterService must be created before the services are forked so that
+					they all inherit the write end of its pipe. Linux / POSIX pipes.
+
+NOTES:
+					Records are sent over a single pipe: [log number (uint8), length (uint16), text], each one with
+					a single os.write(). Writes of up to PIPE_BUF bytes (4096 on Linux) to a pipe are atomic, so the
+					records of several processes never interleave and no lock is needed. A producer only ever waits
+					if the pipe is full (the log writer has fallen more than a pipe's worth behind), and for no more
+					than sendTimeOut seconds: the records which don't fit are then dropped until the pipe has room.
+
+					The log writer is watched by the GPR's ServiceSupervisor like the services (it sends heartbeats
+					while it waits on the pipe). The GPR keeps the read end of the pipe open, so a restarted log
+					writer carries on with the same pipe and the other processes keep their LogChannel. Every record
+					starts with syncByte so that the restarted log writer can find the next record if the one which
+					died was in the middle of one.
+
+					The log writer reads whatever is in the pipe at once, groups the records by log and writes each
+					log once per batch, in the order the records were received. It stops once every process
+					holding the write end of the pipe has closed it, after writing what was left in the pipe.
+
+					Event reports go to the text event log and to the binary event log (see EventLog.py), the
+					record of the binary log is [time (uint32), severity, reportID, source, number of parameters
+					(uint8), param1, param0 (uint32)] followed by the message.
+
+					Rotation: logs are named after the UTC date, <prefix>YYYY-MM-DD<extension>
+					ex: events/eventLog2026-10-19.csv, housekeeping/logs/hkLog2026-10-19.csv
+					A log is rotated when the date changes or when it reaches maxSize bytes, in which case the
+					next segment of the day is numbered: hkLog2026-10-19.1.csv, hkLog2026-10-19.2.csv, ...
+					A restart appends to the last segment of the day, or starts the next one if the last one was
+					already compressed. The binary event log is rotated by date only.
+
+					Closed segments are compressed (<segment>.gz) by a background thread of the log writer, which
+					then applies the retention policy: closed segments older than retentionDays days are deleted,
+					then the oldest ones until the closed segments of the link take up less than maxTotalSize
+					bytes. Binary event logs are left uncompressed (they are queried in place) but are subject to
+					retention. Segments left uncompressed by a previous run are compressed at startup. An existing
+					<segment>.gz is never overwritten: the segment is then left uncompressed (and an error printed).
+
+REQUIREMENTS:		Linux
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Logs are now named after the UTC date and rotated by date and size, closed segments are
+					compressed in the background and deleted according to a retention policy.
+
+10/19/2026			The log writer no longer dies silently: errors are caught per batch and printed to stderr. It
+					is supervised (and restarted) by the ServiceSupervisor, and LogChannel.send() drops records
+					instead of raising EPIPE (or blocking) when the log writer is gone.
+
+10/19/2026			A restart no longer goes back to segment 0 when the segments of the day were compressed (the
+					next rotation used to overwrite <segment>.gz), compress() refuses to overwrite a .gz.
+
+10/19/2026			sendTimeOut and heartbeatInterval are now shorter than the supervisor's hangTimeOut (0.5 seconds),
+					so neither a producer waiting for room in the pipe nor the log writer is taken for hung.
+"""
+
+import os
+import sys
+import struct
+import signal
+import errno
+import fcntl
+import select
+import gzip
+import shutil
+import threading
+import traceback
+import time
+from time import sleep
+from datetime import datetime
+try:
+	import Queue as queue
+except ImportError:
+	import queue
+from EventLog import EventRecordLog
+from GroundClock import monotonic
+from GroundMetrics import closeInheritedServers
+
+class LogChannel:
+	"""
+	Author: agent
+	Write end of the log writer's pipe, used by every process which logs something.
+	"""
+	logNames		= ["event", "eventRecord", "hk", "hkDef", "error", "diag", "diagDef", "pass"]
+	headerFormat	= "<BBH"		# syncByte, log number, length
+	syncByte		= 0xA5
+	headerSize		= struct.calcsize(headerFormat)
+	eventFormat		= "<IBBBBII"
+	eventSize		= struct.calcsize(eventFormat)
+	maxRecord		= 4096			# PIPE_BUF on Linux, larger writes to a pipe are not atomic.
+	sendTimeOut		= 0.25			# Seconds send() waits for room in a full pipe before records are dropped (< hangTimeOut)
+	writeFD			= None
+	dropping		= 0				# 1 while records are being dropped (the log writer is gone or stuck)
+	dropped			= 0
+
+	@staticmethod
+	def encode(text):
+		if not isinstance(text, bytes):
+			text = text.encode("utf-8", "replace")
+		return text
+
+	def send(self, logName, data):
+		"""
+		@purpose:	Sends a record to the log writer.
+		@param:		logName: one of logNames, data: what to write to the log (bytes).
+		@Note:		Waits at most sendTimeOut seconds for room in the pipe, the record is dropped if the log writer
+					is gone (EPIPE) or stuck. While records are being dropped, send() does not wait at all.
+		"""
+		maxData = self.maxRecord - self.headerSize
+		if len(data) > maxData:
+			data = data[:maxData - 13] + b"[TRUNCATED]\n"
+		record = struct.pack(self.headerFormat, self.syncByte, self.logNames.index(logName), len(data)) + data
+		deadline = None
+		while 1:
+			try:
+				os.write(self.writeFD, record)
+				break
+			except OSError as e:
+				if e.errno == errno.EINTR:
+					continue
+				if e.errno not in (errno.EAGAIN, errno.EPIPE):
+					raise
+				if (e.errno == errno.EAGAIN) and not self.dropping:
+					if deadline is None:
+						deadline = monotonic() + self.sendTimeOut
+					if monotonic() < deadline:
+						try:
+							select.select([], [self.writeFD], [], max(deadline - monotonic(), 0))
+						except select.error:
+							pass
+						continue
+				if not self.dropping:
+					sys.stderr.write("LOG CHANNEL (PID %d): DROPPING LOG RECORDS: %s\n" %(os.getpid(), os.strerror(e.errno)))
+				self.dropping = 1
+				self.dropped += 1
+				return
+		if self.dropping:
+			sys.stderr.write("LOG CHANNEL (PID %d): %d LOG RECORD(S) WERE DROPPED\n" %(os.getpid(), self.dropped))
+			self.dropping = 0
+			self.dropped = 0
+		return
+
+	def write(self, logName, text):
+		"""
+		@purpose:	Appends 'text' to the log 'logName' (ex: "error").
+		"""
+		self.send(logName, self.encode(text))
+		return
+
+	def appendEvent(self, absTime, severity, reportID, source, param1=0, param0=0, message=None, numParams=0):
+		"""
+		@purpose:	Appends an event to the binary event log (see EventRecordLog.append()).
+		"""
+		data = struct.pack(self.eventFormat, EventRecordLog.timeToSeconds(absTime) & 0xFFFFFFFF, severity & 0xFF,
+						   reportID & 0xFF, source & 0xFF, numParams & 0xFF, param1 & 0xFFFFFFFF, param0 & 0xFFFFFFFF)
+		if message is not None:
+			data += self.encode(str(message))
+		self.send("eventRecord", data)
+		return
+
+	def close(self):
+		if self.writeFD is not None:
+			os.close(self.writeFD)
+			self.writeFD = None
+		return
+
+	def __init__(self, writeFD):
+		self.writeFD = writeFD
+		# Writes of up to PIPE_BUF bytes stay atomic, a full pipe makes os.write() fail instead of blocking.
+		fcntl.fcntl(writeFD, fcntl.F_SETFL, fcntl.fcntl(writeFD, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+class LogWriterService:
+	"""
+	Author: agent
+	Process which owns all the log files of a link and writes the records sent to it through a LogChannel.
+	"""
+	pID				= 0
+	readSize		= 1 << 16		# Bytes read from the pipe at once
+	stopTimeOut		= 5.0			# Seconds stop() waits for the log writer before killing it
+	heartbeatInterval	= 0.1		# Seconds between two heartbeats while the pipe is empty (< hangTimeOut)
+	maxSize			= 64 << 20		# Bytes after which a log is rotated
+	retentionDays	= 30
+	maxTotalSize	= 2 << 30		# Bytes which the closed segments of the link may take up
+	specs			= None			# log name -> (directory, prefix, extension)
+	files			= None			# log name -> file, in the log writer's process
+	paths			= None			# log name -> path of the open segment
+	sizes			= None			# log name -> size of the open segment
+	dates			= None			# log name -> UTC date of the open segment, "YYYY-MM-DD"
+	segments		= None			# log name -> number of the open segment within its day
+	eventRecords	= None
+	eventRecordDate	= None
+	compressQueue	= None			# Closed segments waiting to be compressed, None stops the compressor
+	compressor		= None
+	readFD			= None			# Kept open by the GPR as well, for a restarted log writer
+	channel			= None			# LogChannel for the processes which log things
+	heartbeatBoard	= None			# Where to send heartbeats for the GPR's ServiceSupervisor
+	heartbeatSlot	= 0
+	lastError		= None			# Last error printed by reportError()
+
+	def run(self):
+		"""
+		@purpose:	Main program of the log writer: writes the records from the pipe until every writer is gone.
+		"""
+		# Ctrl-C and SIGTERM are meant for the GPR, the log writer stops once everyone has closed the pipe.
+		# SIGUSR1 asks the services to print their trace, the log writer has none.
+		signal.signal(signal.SIGINT, signal.SIG_IGN)
+		signal.signal(signal.SIGTERM, signal.SIG_IGN)
+		signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+		self.files = {}
+		self.paths = {}
+		self.sizes = {}
+		self.dates = {}
+		self.segments = {}
+		today = self.today()
+		for logName in self.specs:
+			self.openLog(logName, today)
+		self.openEventRecords(today)
+		self.compressQueue = queue.Queue()
+		for path in self.closedSegments(compressed=0):
+			self.compressQueue.put(path)
+		self.compressor = threading.Thread(target=self.compressLoop)
+		self.compressor.daemon = True
+		self.compressor.start()
+		pending = b""
+		while 1:
+			if self.heartbeatBoard is not None:
+				self.heartbeatBoard.beat(self.heartbeatSlot)
+			try:
+				if not select.select([self.readFD], [], [], self.heartbeatInterval)[0]:
+					continue
+				data = os.read(self.readFD, self.readSize)
+			except (OSError, select.error) as e:
+				if e.args[0] == errno.EINTR:
+					continue
+				raise
+			if not data:
+				break
+			try:
+				pending = self.writeRecords(pending + data)
+			except Exception:
+				# The records of this batch are lost, the next one starts over at the next syncByte.
+				self.reportError("Could not write a batch of records")
+				pending = b""
+		for logName in self.files:
+			self.files[logName].close()
+		self.eventRecords.close()
+		self.compressQueue.put(None)
+		self.compressor.join()
+		return
+
+	def reportError(self, message):
+		"""
+		@purpose:	Prints an error of the log writer (and the exception being handled) to stderr, an error which
+					keeps happening is only printed once.
+		"""
+		error = message + ": " + str(sys.exc_info()[1])
+		if error == self.lastError:
+			return
+		self.lastError = error
+		sys.stderr.write("LOG WRITER: %s\n" %error)
+		traceback.print_exc()
+		return
+
+	@staticmethod
+	def today():
+		return time.strftime("%Y-%m-%d", time.gmtime())
+
+	def segmentPath(self, logName, date, segment, extension=None):
+		directory, prefix, logExtension = self.specs[logName]
+		if extension is None:
+			extension = logExtension
+		name = prefix + date
+		if segment:
+			name += ".%d" %segment
+		return os.path.join(directory, name + extension)
+
+	def openLog(self, logName, date):
+		"""
+		@purpose:	Opens the last segment of 'date' for 'logName' (appending to it) or creates the first one.
+		@Note:		The last segment is opened as long as it has not been compressed, the next one is created otherwise.
+		"""
+		segment = self.lastSegment(logName, date)
+		path = self.segmentPath(logName, date, segment)
+		if os.path.exists(path + ".gz"):
+			segment += 1
+			path = self.segmentPath(logName, date, segment)
+		self.files[logName] = open(path, "ab")
+		self.paths[logName] = path
+		self.sizes[logName] = os.path.getsize(path)
+		self.dates[logName] = date
+		self.segments[logName] = segment
+		return
+
+	def lastSegment(self, logName, date):
+		"""
+		@return:	The highest number of the segments of 'date' for 'logName', compressed or not (0 if there are none).
+		"""
+		directory, prefix, extension = self.specs[logName]
+		base = prefix + date
+		last = 0
+		if not os.path.isdir(directory):
+			return last
+		for name in os.listdir(directory):
+			if name.endswith(".gz"):
+				name = name[:-3]
+			if not name.startswith(base) or not name.endswith(extension):
+				continue
+			number = name[len(base):len(name) - len(extension)]
+			if number.startswith(".") and number[1:].isdigit():
+				last = max(last, int(number[1:]))
+		return last
+
+	def rotate(self, logName, date):
+		"""
+		@purpose:	Closes the open segment of 'logName' (it is handed to the compressor) and opens the next one.
+		"""
+		self.files[logName].close()
+		self.compressQueue.put(self.paths[logName])
+		if date == self.dates[logName]:
+			path = self.segmentPath(logName, date, self.segments[logName] + 1)
+			self.files[logName] = open(path, "ab")
+			self.paths[logName] = path
+			self.sizes[logName] = 0
+			self.segments[logName] += 1
+		else:
+			self.openLog(logName, date)
+		return
+
+	def openEventRecords(self, date):
+		if self.eventRecords is not None:
+			self.eventRecords.close()
+		self.eventRecords = EventRecordLog(self.segmentPath("event", date, 0, ".evt"))
+		self.eventRecordDate = date
+		return
+
+	def closedSegments(self, compressed):
+		"""
+		@return:	The paths of the segments which are no longer written to: the compressed ones (and the binary
+					event logs of previous days) if 'compressed', the ones which still have to be compressed otherwise.
+		"""
+		openPaths = set(self.paths.values())
+		eventBase = os.path.splitext(self.segmentPath("event", self.eventRecordDate, 0, ".evt"))[0]
+		closed = []
+		for logName in self.specs:
+			directory, prefix, extension = self.specs[logName]
+			if not os.path.isdir(directory):
+				continue
+			for name in os.listdir(directory):
+				path = os.path.join(directory, name)
+				if not name.startswith(prefix) or (path in openPaths):
+					continue
+				if compressed:
+					if name.endswith(extension + ".gz"):
+						closed.append(path)
+					elif (logName == "event") and (os.path.splitext(path)[1] in (".evt", ".msg", ".idx")) and \
+							(os.path.splitext(path)[0] != eventBase):
+						closed.append(path)
+				elif name.endswith(extension):
+					closed.append(path)
+		return closed
+
+	def compressLoop(self):
+		"""
+		@purpose:	Background thread of the log writer: compresses the closed segments and applies the retention
+					policy, so that the records keep being written in the meantime.
+		"""
+		while 1:
+			path = self.compressQueue.get()
+			if path is None:
+				return
+			try:
+				self.compress(path)
+				self.enforceRetention()
+			except (IOError, OSError):
+				self.reportError("Could not compress %s" %path)
+
+	@staticmethod
+	def compress(path):
+		"""
+		@purpose:	Replaces 'path' with 'path'.gz, the original is only removed once the compressed copy is complete.
+		@Note:		Raises OSError (EEXIST) and leaves 'path' alone if 'path'.gz already exists.
+		"""
+		temporaryPath = path + ".gz.tmp"
+		source = open(path, "rb")
+		destination = gzip.open(temporaryPath, "wb")
+		shutil.copyfileobj(source, destination, 1 << 16)
+		destination.close()
+		source.close()
+		try:
+			os.link(temporaryPath, path + ".gz")		# Unlike os.rename(), fails if the .gz already exists.
+		finally:
+			os.remove(temporaryPath)
+		os.remove(path)
+		return
+
+	def enforceRetention(self, now=None):
+		"""
+		@purpose:	Deletes the closed segments which are older than retentionDays, then the oldest ones until they
+					take up less than maxTotalSize bytes.
+		"""
+		if now is None:
+			now = time.time()
+		segments = []
+		totalSize = 0
+		for path in self.closedSegments(compressed=1):
+			try:
+				info = os.stat(path)
+			except OSError:
+				continue
+			segments.append((info.st_mtime, info.st_size, path))
+			totalSize += info.st_size
+		segments.sort()
+		for modified, size, path in segments:
+			if (now - modified < self.retentionDays * 86400) and (totalSize <= self.maxTotalSize):
+				break
+			try:
+				os.remove(path)
+			except OSError:
+				continue
+			totalSize -= size
+		return
+
+	def writeRecords(self, data):
+		"""
+		@purpose:	Writes every complete record in 'data', one write per log.
+		@return:	What is left of 'data' (the beginning of a record which has not been read completely yet).
+		@Note:		Bytes which are not a valid record header are skipped up to the next syncByte, and a log which
+					can't be written to only loses its own records (the error is printed by reportError()).
+		"""
+		batches = {}
+		today = self.today()
+		offset = 0
+		headerSize = LogChannel.headerSize
+		maxLength = LogChannel.maxRecord - headerSize
+		syncByte = struct.pack("<B", LogChannel.syncByte)
+		while offset + headerSize <= len(data):
+			sync, logNumber, length = struct.unpack_from(LogChannel.headerFormat, data, offset)
+			if (sync != LogChannel.syncByte) or (logNumber >= len(LogChannel.logNames)) or (length > maxLength):
+				offset = data.find(syncByte, offset + 1)
+				if offset < 0:
+					return b""
+				continue
+			if offset + headerSize + length > len(data):
+				break
+			record = data[offset + headerSize:offset + headerSize + length]
+			offset += headerSize + length
+			logName = LogChannel.logNames[logNumber]
+			if logName == "eventRecord":
+				try:
+					if today != self.eventRecordDate:
+						self.openEventRecords(today)
+					self.writeEventRecord(record)
+				except (IOError, OSError, struct.error):
+					self.reportError("Could not write to the binary event log")
+			elif logName in self.files:
+				batches.setdefault(logName, []).append(record)
+		for logName in batches:
+			try:
+				if (today != self.dates[logName]) or (self.sizes[logName] >= self.maxSize):
+					self.rotate(logName, today)
+				chunk = b"".join(batches[logName])
+				self.files[logName].write(chunk)
+				self.files[logName].flush()
+				self.sizes[logName] += len(chunk)
+			except (IOError, OSError, ValueError):
+				self.reportError("Could not write to the %s log (%s)" %(logName, str(self.paths.get(logName))))
+		return data[offset:]
+
+	def writeEventRecord(self, record):
+		fields = struct.unpack_from(LogChannel.eventFormat, record)
+		message = None
+		if len(record) > LogChannel.eventSize:
+			message = record[LogChannel.eventSize:]
+			if not isinstance(message, str):
+				message = message.decode("utf-8", "replace")
+		self.eventRecords.append(datetime.utcfromtimestamp(fields[0]), fields[1], fields[2], fields[3], fields[5],
+								 fields[6], message, fields[4])
+		return
+
+	def stop(self):
+		"""
+		@purpose:	Closes this process's end of the pipe and waits for the log writer to write what is left.
+		@Note:		The log writer only stops once the services (which also hold the pipe) are gone as well, it is
+					killed if it is still running after stopTimeOut seconds.
+		"""
+		self.channel.close()
+		if self.pID:
+			deadline = monotonic() + self.stopTimeOut
+			try:
+				while os.waitpid(self.pID, os.WNOHANG)[0] == 0:
+					if monotonic() > deadline:
+						os.kill(self.pID, signal.SIGKILL)
+						os.waitpid(self.pID, 0)
+						break
+					sleep(0.01)
+			except OSError:
+				pass
+			self.pID = 0
+		if self.readFD is not None:
+			os.close(self.readFD)
+			self.readFD = None
+		return
+
+	def __init__(self, specs, heartbeatBoard=None, heartbeatSlot=0, previous=None):
+		"""
+		@purpose:	Creates the pipe and forks the log writer.
+		@param:		specs: log name (see LogChannel.logNames) -> (directory, prefix, extension) of the log,
+					ex: "event": ("/events", "eventLog", ".csv"). "event" is required.
+		@param:		heartbeatBoard, heartbeatSlot: where to send heartbeats for the GPR's ServiceSupervisor
+		@param:		previous: the LogWriterService which died, when the log writer is restarted: its pipe (and
+					channel) are taken over instead of creating new ones.
+		"""
+		self.specs = specs
+		self.heartbeatBoard = heartbeatBoard
+		self.heartbeatSlot = heartbeatSlot
+		if previous is None:
+			readFD, writeFD = os.pipe()
+			channel = LogChannel(writeFD)
+		else:
+			readFD = previous.readFD
+			channel = previous.channel
+		self.readFD = readFD
+		pID = os.fork()
+		if pID:
+			self.pID = pID
+			self.channel = channel
+			return
+		channel.close()
+		closeInheritedServers()
+		status = 0
+		try:
+			self.run()
+		except BaseException:
+			self.reportError("The log writer stopped")
+			status = 1
+		finally:
+			os._exit(status)
+
+if __name__ == '__main__':
+	pass
@@ -33,9 +33,11 @@ NOTES:
 		To execute a memory load / dump, you may use the specified CLI command or command
 		file followed by the filename you placed in /memory/.. (filename should include the extension)
 
-		For TC verification, what we're going to do is use special .tcVerification attributes which the GPR has access to.
-		-Services can then loop on this attribute being 0 with a generous timeout
-		-GPR then inserts the PacketID/PSC into the attribute when a TC Acceptance/Execution Report is received.
+		For TC verification, the GPR keeps track of every outstanding TC (see TCVerificationTracker.py).
+		-When a TC Acceptance/Execution Report is received (or the TC times out) the GPR sends a
+		 tcVerificationReceived command to the service which requested the TC.
+		-Services wait on that command with waitForTCVerification(), other commands received in the meantime
+		 are executed afterwards.
 
 REQUIREMENTS:
 
@@ -47,6 +49,16 @@ DEVELOPMENT HISTORY:
 
 11/21/2015			Finished writing the majority of the code that was required for this service today.
 
+10/19/2026			waitForTCVerification() now waits on the TC verification reports sent by the GPR.
+					The main loop sends heartbeats to the GPR's ServiceSupervisor.
+
+10/19/2026			FIFOs are opened non-blocking (see FifoObject.py) so that the services no longer wait for
+					each other or the GPR, the main loop waits on the FIFO from the GPR instead of spinning.
+
+10/19/2026			Memory dumps are reassembled by the GPR (see ReassemblyBuffer.py) and received as a single
+					command, processMemoryDump() no longer keeps track of the sequence flags itself (it rejected
+					dumps which arrived out of order and never reached the end of a dump).
+
 """
 
 import os
@@ -59,11 +71,8 @@ class MemoryService(PUSService):
 	"""
 	This class is meant to represent the PUS Memory Management Service.
 	"""
-	localSequence 	= 0		# These shall be used to keep track of the sequence of incoming PUS dump packets.
-	localFlags	  	= -1
 	dumpCount	 	= 0		# Counter for the number of memory dumps that have been created so far.
 	checkCount		= 0
-	sequenceOffset	= 0
 	packetsRequested = 0
 	dumpFile		= None
 	checkFile		= None
@@ -85,12 +94,14 @@ class MemoryService(PUSService):
 		"""
 		print("The path in mem run: %s" %str(self.p1))
 		self.initializePUS(self)
+		self.watchFifos()									# The FIFOs send heartbeats while they wait
+		self.tracer.installSignalHandler()					# kill -USR1 <pid> dumps the trace
 		self.initialize(self)
 		while 1:
-			self.fifoFromGPR.readCommandFromFifo()		# If command in FIFO, places it in self.currentCommand[]
-			if self.fifofromFDIR.commandReady:
-				self.execCommands(self)								# Deals with commands from GPR
-				self.fifofromFDIR.commandReady = 0
+			self.heartbeat()
+			command = self.takeGPRCommand()		# Next command from the GPR (deferred commands first)
+			if command is not None:
+				self.executeGPRCommand(command)						# Deals with commands from GPR
 		return				# This should never be reached.
 
 	@staticmethod
@@ -105,13 +116,13 @@ class MemoryService(PUSService):
 	@staticmethod
 	def initializePUS(self):
 		# FIFOs Required for communication with the Ground Packet Router:
-		self.fifoFromGPR			= FifoObject(self.p2, 0)
-		self.fifoToGPR				= FifoObject(self.p1, 1)
+		self.fifoFromGPR			= FifoObject(self.p2, 0, 1)
+		self.fifoToGPR				= FifoObject(self.p1, 1, 1)
 		self.fifoToGPRPath			= self.p1
 		self.wait					= 1
 		self.fifoFromGPRPath		= self.p2
-		self.fifotoFDIR				= FifoObject(self.FDIROutPath, 1)
-		self.fifofromFDIR			= FifoObject(self.FDIRInPath, 0)
+		self.fifotoFDIR				= FifoObject(self.FDIROutPath, 1, 1)
+		self.fifofromFDIR			= FifoObject(self.FDIRInPath, 0, 1)
 		return
 
 	@staticmethod
@@ -121,15 +132,15 @@ class MemoryService(PUSService):
 					and performs different actions based on what is received.
 		"""
 		if self.currentCommand[146] == self.memoryLoadABS:
-			self.loadToSatelliteMemory()
+			self.loadToSatelliteMemory(self)
 		if self.currentCommand[146] == self.dumpRequestABS:
-			self.sendDumpRequest()
+			self.sendDumpRequest(self)
 		if self.currentCommand[146] == self.memoryDumpABS:
-			self.processMemoryDump()
+			self.processMemoryDump(self)
 		if self.currentCommand[146] == self.checkMemRequest:
-			self.sendCheckMemRequest()
+			self.sendCheckMemRequest(self)
 		if self.currentCommand[146] == self.memoryCheckABS:
-			self.processMemoryCheck()
+			self.processMemoryCheck(self)
 		self.clearCurrentCommand()
 		return
 
@@ -247,95 +258,43 @@ class MemoryService(PUSService):
 	@staticmethod
 	def processMemoryDump(self):
 		"""
-		@purpose: 	When a memory-dump packet is received, this method is tasked with checking if we can/should
-					store it in memory. Things that need be checked include the sequence flags / count.
+		@purpose: 	When a memory dump is received, this method is tasked with storing it in a new memory dump file.
+		@Note:		The GPR reassembles the dump packets (see ReassemblyBuffer.py) and sends them, in order, as the
+					payload of a single memoryDumpABS command (dataLength values per packet). The first packet holds
+					the memoryID, address and length of the dump.
 		"""
-		obcSequenceFlags	= self.currentCommand[143]
-		obcSequenceCount	= self.currentCommand[142]
-
-		if obcSequenceFlags == 0x01:
-			if self.localFlags == -1:	# The First packet of several.
-				self.localSequence = obcSequenceCount
-				self.sequenceOffset = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong				# Packet is rejected.
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return
-		if obcSequenceFlags == 0x11:
-			if self.localFlags == -1:	# The First packet of several.
-				self.localSequence = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return
-		if obcSequenceFlags == 0x00:
-			if (self.localFlags == 0x01) or (self.localFlags == 0x00) and (self.localSequence < obcSequenceCount):
-				self.localSequence = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return
-		if obcSequenceFlags == 0x11:
-			if (self.localFlags == 0x00) and (self.localSequence < obcSequenceCount):
-				self.localSequence = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return
-
-		# Print something meaningful to the CLI.
-		if self.localFlags == 0x01:
-			self.printToCLI("DOWNLOADING PACKET 1 OF %s FOR MEM DUMP\n" %str(self.packetsRequested))
-		if self.localFlags == 0x11:
-			self.printToCLI("DOWNLOADING PACKET 1 of 1 FOR MEM DUMP\n")
-		if self.localFlags == 0x00:
-			packetNum = obcSequenceCount - self.sequenceOffset + 1
-			self.printToCLI("DOWNLOADING PACKET %s OF %s FOR MEM DUMP\n" %str(packetNum) %str(self.packetsRequested))
-		if self.localFlags == 0x10:
-			packetNum = obcSequenceCount - self.sequenceOffset + 1
-			self.printToCLI("DOWNLOADING PACKET %s OF %s FOR MEM DUMP\n" %str(packetNum) %str(self.packetsRequested))
-			self.printToCLI("DOWNLOAD COMPLETE FOR MEM DUMP %s\n" %str(self.dumpCount))
-			self.logEventReport(1, self.dumpCompleted, 0, 0, "DOWNLOAD COMPLETE FOR MEM DUMP %s" %str(self.dumpCount))
-		# Write the contents of the incoming PUS packet into a memory dump file.
-		if self.localFlags == 0x01 or self.localFlags == 0x11:
-			memPath = "/memory/dumps/memdump%s" %str(self.dumpCount)		#Create a new file for the mem dump.
-			if os.path.exists(memPath):
-				self.dumpFile = open(memPath, "ab+")
-			else:
-				self.dumpFile = open(memPath, "ab")
-
-			self.dumpFile.write(str(self.currentCommand[136]) + "\n")		# The memoryID goes @ the top of the file
-			address = self.currentCommand[135] << 24
-			address += self.currentCommand[134] << 16
-			address += self.currentCommand[133] << 8
-			address += self.currentCommand[132]
-			length = self.currentCommand[131] << 24
-			length += self.currentCommand[130] << 16
-			length += self.currentCommand[129] << 8
-			length += self.currentCommand[128]
-			self.dumpFile.write(str(hex(address)) + "\n")					# Followed by address (in hex)
-			self.dumpFile.write(str(length) + "\n")							# And then length (in bytes, decimal)
-			for i in range(0, 128):
-				self.dumpFile.write(str(self.currentCommand[i]) + "\n")
-		if self.localFlags == 0x00 or self.localFlags == 0x10:
+		payload = self.currentPayload
+		if payload is None:
+			payload = self.currentCommand[0:self.dataLength]
+		numPackets = len(payload) // self.dataLength
+		if numPackets == 0:
+			self.currentCommand[146] = self.dumpPacketWrong				# Nothing to store.
+			self.sendCurrentCommandToFifo(self.fifotoFDIR)
+			return
+		first = payload[0:self.dataLength]
+		memPath = "/memory/dumps/memdump%s" %str(self.dumpCount)		#Create a new file for the mem dump.
+		self.dumpFile = open(memPath, "ab")
+
+		self.dumpFile.write(str(first[136]) + "\n")						# The memoryID goes @ the top of the file
+		address = first[135] << 24
+		address += first[134] << 16
+		address += first[133] << 8
+		address += first[132]
+		length = first[131] << 24
+		length += first[130] << 16
+		length += first[129] << 8
+		length += first[128]
+		self.dumpFile.write(str(hex(address)) + "\n")					# Followed by address (in hex)
+		self.dumpFile.write(str(length) + "\n")							# And then length (in bytes, decimal)
+		# Write the contents of every PUS packet of the dump into the memory dump file.
+		for packet in range(0, numPackets):
+			offset = packet * self.dataLength
 			for i in range(0, 128):
-				self.dumpFile.write(str(self.currentCommand[i]) + "\n")
-		if self.localFlags == 0x10:
-			self.localSequence = 0
-			self.localFlags = -1
-			self.dumpCount += 1
+				self.dumpFile.write(str(payload[offset + i]) + "\n")
+		self.dumpFile.close()
+		self.printToCLI("DOWNLOAD COMPLETE FOR MEM DUMP %s (%s PACKETS)\n" %(str(self.dumpCount), str(numPackets)))
+		self.logEventReport(1, self.dumpCompleted, 0, 0, "DOWNLOAD COMPLETE FOR MEM DUMP %s" %str(self.dumpCount))
+		self.dumpCount += 1
 		return
 
 	@staticmethod
@@ -387,19 +346,16 @@ class MemoryService(PUSService):
 		self.checkCount += 1
 		return
 
-	@staticmethod
 	def waitForTCVerification(self, timeOut, operation):
 		"""
 		@purpose: 	This method is used to put the current service on hold until a successful TC Acceptance
 					report and TC Execution report have been received.
-		@param:		timeOut: This method will wait for a maximum of 'timeOut' milliseconds for the verification to be
-					received.
+		@param:		timeOut: This method will wait for at least 'timeOut' milliseconds for the verification to be
+					received, longer if the GPR takes longer to time the TC out (see TCVerificationTracker.py).
 		@param:		operation: is the code for the operation to be completed
 		"""
-		waitTime = datetime.timedelta(0)
-		while (waitTime.milliseconds < timeOut) and (not self.tcAcceptVerification or not self.tcExecuteVerification):
-			pass
-		if waitTime > timeOut:
+		status = self.waitForTCReport(operation, timeOut, 1)
+		if status != self.tcExecuted:
 			self.printToCLI("MEMORY SERVICE OPERATION: %s HAS FAILED\n" %self.memoryOperations[operation])
 			self.logError("MEMORY SERVICE OPERATION: %s HAS FAILED" %self.memoryOperations[operation])
 			self.currentCommand[146] = operation
@@ -408,17 +364,11 @@ class MemoryService(PUSService):
 		else:
 			self.logEventReport(1, operation, 0, 0,
 								"MEMORY SERVICE OPERATION: %s HAS SUCCEEDED" %self.memoryOperations[operation])
-			self.tcLock.acquire()
-			self.tcAcceptVerification = 0
-			self.tcExecuteVerification = 0
-			self.tcLock.release()
 			return 1
 
-	def __init__(self, path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock, cliLock,
-				 	errorLock, day, hour, minute, second):
+	def __init__(self, path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock=None, heartbeatBoard=None, heartbeatSlot=0, metrics=None):
 		# Initialize this instance as a PUS service
-		super(MemoryService, self).__init__(path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock,
-					cliLock, errorLock, day, hour, minute, second)
+		super(MemoryService, self).__init__(path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock, heartbeatBoard, heartbeatSlot, metrics)
 		self.processID = 0x12
 		self.serviceType = 6
 		self.spiChip1 = 1
@@ -432,7 +382,7 @@ class MemoryService(PUSService):
 			self.pID = pID
 			return
 		else:
-			self.run1(self)
+			self.runForked()
 
 if __name__ == '__main__':
 	pass
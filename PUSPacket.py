@@ -29,6 +29,11 @@ DEVELOPMENT HISTORY:
 
                         I also added in the method formatDataArray() which uses the attributes which
                         should be set by the user in order to fill in the data array for this packet.
+
+10/19/2026              parseDataArray() can time fletcher16() with the GPR's PipelineTracer.
+
+10/19/2026              Added the attribute 'received', packets which were never filled in by the transceiver
+                        are skipped by the GPR.
 """
 
 class Puspacket:
@@ -69,6 +74,8 @@ class Puspacket:
     appData             = []    # This is the 137 bytes which belong to the application data.
     nextPacket          = None  # Pointer to the next packet in the linked list.
     prevPacket          = None  # Pointer to the previous packet int the linked list.
+    tracer              = None  # Optional PipelineTracer (set by the GPR) used to time fletcher16().
+    received            = 0     # Set to 1 once data[] holds a frame from the transceiver.
 
     @staticmethod
     def fletcher16(self, offset, count, data):
@@ -117,7 +124,12 @@ class Puspacket:
         cls.pec1 				= cls.data[1] << 8
         cls.pec1 				|= cls.data[0]
         # For Checking that the packet error control was correct
+        span = None
+        if cls.tracer is not None:
+            span = cls.tracer.start()
         cls.pec0 				= cls.fletcher16(cls, 2, 150, cls.data)
+        if span is not None:
+            cls.tracer.stop("fletcher16", span)
         return
 
     def formatDataArray(cls):
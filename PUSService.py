@@ -28,11 +28,67 @@ DEVELOPMENT HISTORY:
 					from a FIFO.
 
 01/22/2015			Updating PUS Service 'definitions' which are used on the OBC.
+
+10/19/2026			Event reports are now also written to the binary event log (see EventLog.py).
+
+10/19/2026			TC verification is now tracked by the GPR (see TCVerificationTracker.py), which tells
+					the services about the outcome of their TCs through their FIFO. Added waitForTCReport()
+					and takeGPRCommand() so that the services no longer spin on tcAcceptVerification.
+
+10/19/2026			Time now comes from the shared ground clock (see GroundClock.py) which is set by the GPR.
+					The logging methods are now regular methods so that they use this instance's logs, locks
+					and clock (as classmethods they only ever saw the class attributes, which are None).
+
+10/19/2026			Services now send heartbeats to the GPR's ServiceSupervisor (see ServiceSupervisor.py).
+
+10/19/2026			Command handling and log write latencies are recorded in the shared metrics registry
+					(see GroundMetrics.py), added executeGPRCommand() for the main loops of the services.
+
+10/19/2026			Command handlers and event logging can be traced with a PipelineTracer (see PipelineTracer.py).
+
+10/19/2026			The services now open their FIFOs non-blocking (see FifoObject.py), so they no longer have to
+					wait for each other or the GPR in a fixed order. takeGPRCommand() waits up to idleWait seconds
+					for the GPR when there is nothing to do instead of spinning.
+
+10/19/2026			runForked() never lets a SystemExit / KeyboardInterrupt unwind into the GPR's code either (a
+					service inherits the signal handlers of the GPR which forked it).
+
+10/19/2026			Commands from the GPR may carry a payload (see FifoObject.py), available in currentPayload while
+					the command is executed.
+
+10/19/2026			Logs are no longer opened by every service: records are sent to the LogWriterService of the link
+					(see LogWriterService.py) through its LogChannel, which replaces the log paths and the event, hk
+					and error locks.
+
+10/19/2026			TC verification reports are matched to the TC they belong to (its PacketID / PSC) instead of
+					being kept per operation: a report which no one is waiting for is dropped, as are the later
+					reports of a TC whose wait already returned (ex: on acceptance), so they can't be taken for
+					the outcome of the next TC of the same operation.
+
+10/19/2026			runForked() closes the socket of the GPR's metrics endpoint which the service inherits, so that
+					the port is not held by services which outlive the GPR.
+
+10/19/2026			waitForTCReport() waits for the reports of every packet of the TC, whose PacketID/PSC are sent
+					by the GPR along with the TC (tcSent), and drops any other report. It waits at least as long as
+					the GPR's own TC timeouts, so that a timeout report is never left for the next wait.
+
+10/19/2026			Added watchFifos(): the FIFOs of a service send heartbeats while they wait, as the supervisor's
+					hangTimeOut is back under a second.
+
+10/19/2026			Commands to the GPR carry the sequence number of the CLI command being executed ([141]) and the
+					GPR is told when a service is done with a CLI command (finishCLICommand()), so that the outcome of
+					its TCs can be sent back to the CLI.
 """
 
 import os
+import traceback
 from multiprocessing import *
 from datetime import *
+from GroundClock import monotonic
+from TCVerificationTracker import TCVerificationTracker
+from PipelineTracer import PipelineTracer
+from FifoObject import FifoObject, waitForFifos
+from GroundMetrics import closeInheritedServers
 
 class PUSService(Process):
 	"""
@@ -42,6 +98,7 @@ class PUSService(Process):
 	processID 				= 0
 	serviceType 			= 0
 	currentCommand 			= []
+	currentPayload			= None			# Payload of the command being executed (ex: a reassembled memory dump)
 	# FIFOs Required for communication with the Ground Packet Router:
 	fifoToGPR				= None
 	fifoToGPRPath			= None
@@ -172,6 +229,20 @@ class PUSService(Process):
 	diagParamIncorrect		= 0xEB
 	diagIntervalIncorrect	= 0xEA
 	diagNumParamsIncorrect  = 0xE9
+	serviceRestarted		= 0xE8
+	serviceFailed			= 0xE7
+	hkLimitViolation		= 0xE6
+	# TC VERIFICATION (GPR -> ground services, currentCommand[146])
+	tcVerificationReceived	= 0x81
+	tcSent					= 0x82			# PacketID/PSC of the packets of a TC which was just sent (payload)
+	# Ground services -> GPR: done with the CLI command whose sequence number is in [141]
+	cliCommandDone			= 0x83
+	# TC verification status (currentCommand[145]), same as in TCVerificationTracker
+	tcAccepted				= 1
+	tcAcceptFailed			= 2
+	tcExecuted				= 3
+	tcExecuteFailed			= 4
+	tcTimedOut				= 5
 	# IDs for Communication:
 	comsID					= 0x00
 	epsID					= 0x01
@@ -244,19 +315,17 @@ class PUSService(Process):
 	invParameters 			= None
 	# Global Variables for Time
 	absTime 				= datetime(2015, 1, 1, 0, 0, 0)# Set the absolute time to zero. (for now)
-	# Files to be used for logging and housekeeping
-	eventLog 				= None
-	hkLog 					= None
-	errorLog 				= None
-	# Mutex Locks for accessing logs and the CLI
-	eventLock 				= None
-	hkLock 					= None
+	groundClock				= None			# Shared clock set by the GPR, takes precedence over absTime
+	# Channel to the log writer, which owns every log file (see LogWriterService.py)
+	logs					= None
+	# Mutex Locks for accessing the CLI
 	cliLock 				= None
-	errorLock 				= None
 	tcLock 					= None
-	# TC Verification Attribute used for letting the services know when a TC verification was received.
-	tcAcceptVerification = 0			# 0 = None received, should be cleared by the service.
-	tcExecuteVerification = 0
+	# Commands from the GPR which arrived while waiting on TC verification, executed afterwards.
+	deferredCommands		= None
+	cliSequence				= 0				# Sequence number of the CLI command being executed ([141]), 0 = none
+	tcWaitMargin			= 1.0			# Seconds to wait past the GPR's own TC timeouts in case it never answers.
+	idleWait				= 0.05			# Seconds to wait for the GPR when there is nothing to do (< hangTimeOut)
 	# For synchronization with GPR
 	wait					= 0
 	FDIROutPath				= None
@@ -265,8 +334,14 @@ class PUSService(Process):
 	fifofromFDIR			= None
 	p1						= None
 	p2						= None
+	# Heartbeats for the GPR's ServiceSupervisor
+	heartbeatBoard			= None
+	heartbeatSlot			= 0
+	# This service's row of the GPR's metrics registry (MetricsView)
+	metrics					= None
+	# Optional tracing of the command handlers (see PipelineTracer.py)
+	tracer					= None
 
-	@classmethod
 	def clearCurrentCommand(self):
 		"""
 		@purpose:   Clears the array currentCommand[]
@@ -285,7 +360,14 @@ class PUSService(Process):
 			cls.commandLineCount.append(0)
 		return
 
-	@classmethod
+	def getAbsTime(self):
+		"""
+		@purpose:   Returns the current ground absolute time (from the shared ground clock when there is one).
+		"""
+		if self.groundClock is not None:
+			self.absTime = self.groundClock.now()
+		return self.absTime
+
 	def logEventReport(self, severity, reportID, param1, param0, message=None):
 		"""
 		@purpose: This method writes a event report to the event log.
@@ -303,50 +385,55 @@ class PUSService(Process):
 			tempString = "ERROR  REPORT (SEV 3)\t"
 		if severity == 4:
 			tempString = "ERROR  REPORT (SEV 4)\t"
-		self.eventLock.acquire()
-		self.eventLog.write(tempString)
-		self.eventLog.write(str(self.absTime.day) + "/" + str(self.absTime.hour) + "/" + str(self.absTime.minute) + "\t,\t")
-		self.eventLog.write(str(severity) + "\t,\t")
-		self.eventLog.write(str(reportID) + "\t,\t")
-		self.eventLog.write(str(param1) + "\t,\t")
-		self.eventLog.write(str(param0) + "\t,\t")
+		absTime = self.getAbsTime()
+		startTime = monotonic()
+		span = self.tracer.start()
+		record = tempString
+		record += str(absTime.day) + "/" + str(absTime.hour) + "/" + str(absTime.minute) + "\t,\t"
+		record += str(severity) + "\t,\t"
+		record += str(reportID) + "\t,\t"
+		record += str(param1) + "\t,\t"
+		record += str(param0) + "\t,\t"
 		if message is not None:
-			self.eventLog.write(str(message) + "\n")
+			record += str(message) + "\n"
 		if message is None:
-			self.eventLog.write("\n")
-		self.eventLock.release()
+			record += "\n"
+		self.logs.write("event", record)
+		self.logs.appendEvent(absTime, severity, reportID, self.processID, param1, param0, message, 2)
+		self.tracer.stop("logEventReport", span)
+		if self.metrics is not None:
+			self.metrics.increment("events_logged_total")
+			self.metrics.observe("log_write_seconds", monotonic() - startTime)
 		return
 
-	@classmethod
 	def logHKReport(self, *hkArray):
 		"""
 		@purpose:   Used to log the housekeeping report which was received.
-		@Note:		Contains a mutex lock for exclusive access.
 		@Note:		Housekeeping reports are created in a manner that is more convenient
 					for excel or Matlab to parse but not really that great for human consumption.
 		"""
-		self.hkLock.acquire()
-		self.hkLog.write("HKLOG:\t")
-		self.hkLog.write(str(self.absTime.day) + "/" + str(self.absTime.day) + "/" + str(self.absTime.day) + "\t,\t")
+		absTime = self.getAbsTime()
+		startTime = monotonic()
+		record = "HKLOG:\t"
+		record += str(absTime.day) + "/" + str(absTime.day) + "/" + str(absTime.day) + "\t,\t"
 		for byte in hkArray:
 			byte = byte & 0x000000FF
-			self.hkLog.write(str(byte) + "\t,\t")
-		self.hkLog.write("\n")
-		self.hkLock.release()
+			record += str(byte) + "\t,\t"
+		self.logs.write("hk", record + "\n")
+		if self.metrics is not None:
+			self.metrics.increment("hk_reports_logged_total")
+			self.metrics.observe("log_write_seconds", monotonic() - startTime)
 		return
 
-	@classmethod
 	def logError(self, errorString):
 		"""
-		@purpose:   Used to log an error report (ground errors), contains a mutex lock for exclusive access.
+		@purpose:   Used to log an error report (ground errors).
 		"""
-		self.errorLock.acquire()
-		self.errorLog.write("******************ERROR START****************\n")
-		self.errorLog.write("ERROR: " + str(errorString) + " \n")
-		self.errorLog.write("******************ERROR STOP****************\n")
+		self.logs.write("error", "******************ERROR START****************\n" +
+						"ERROR: " + str(errorString) + " \n" +
+						"******************ERROR STOP****************\n")
 		return
 
-	@classmethod
 	def printToCLI(self, stuff):
 		"""
 		@purpose:   Used to print something to the CLI, contains a mutex lock for exclusive access.
@@ -356,24 +443,198 @@ class PUSService(Process):
 		self.cliLock.release()
 		return
 
-	@classmethod
-	def sendCurrentCommandToFifo(cls, fifo):
+	def takeGPRCommand(self):
+		"""
+		@purpose:   Returns the next command from the GPR (commands deferred while waiting for TC verification
+					come first), or None if there is nothing to do.
+		@Note:		TC verification reports (and tcSent) are dropped here, no one is waiting for them.
+		"""
+		if self.deferredCommands:
+			return self.deferredCommands.pop(0)
+		self.fifoFromGPR.readCommandFromFifo()
+		if not self.fifoFromGPR.commandReady:
+			waitForFifos([self.fifoFromGPR], self.idleWait)
+			return None
+		command = self.receiveGPRCommand()
+		if (command[146] == self.tcVerificationReceived) or (command[146] == self.tcSent):
+			return None
+		return command
+
+	@staticmethod
+	def tcKey(command):
+		"""
+		@return:	(PacketID, PSC) of the TC a tcVerificationReceived command is about ([140]-[137]).
+		"""
+		return (((command[140] & 0xFF) << 8) | (command[139] & 0xFF), ((command[138] & 0xFF) << 8) | (command[137] & 0xFF))
+
+	def receiveGPRCommand(self):
+		"""
+		@purpose:   Takes the command which is ready in fifoFromGPR out of it.
+		@return:	A copy of the command, its payload (if it has one) is appended to it (command[147]).
+		"""
+		command = list(self.fifoFromGPR.command)
+		if self.fifoFromGPR.payload is not None:
+			command.append(self.fifoFromGPR.payload)
+			self.fifoFromGPR.payload = None
+		self.fifoFromGPR.commandReady = 0
+		return command
+
+	def executeGPRCommand(self, command):
+		"""
+		@purpose:   Executes a command which was taken from the GPR (see takeGPRCommand()) with execCommands().
+		@Note:		The time it took is recorded in the metrics registry.
+		"""
+		startTime = monotonic()
+		self.tracer.beginPacket()
+		span = self.tracer.start()
+		self.currentCommand[:] = command[0:147]
+		self.currentPayload = None
+		if len(command) > 147:
+			self.currentPayload = command[147]
+		self.cliSequence = command[141]
+		self.execCommands(self)
+		self.currentPayload = None
+		self.finishCLICommand(command[141])
+		if span is not None:
+			self.tracer.stop("execCommands(%d)" %command[146], span)
+		if self.metrics is not None:
+			self.metrics.increment("commands_processed_total")
+			self.metrics.observe("command_handling_seconds", monotonic() - startTime)
+		return
+
+	def finishCLICommand(self, sequenceNumber):
+		"""
+		@purpose:   Lets the GPR know that this service is done with the CLI command 'sequenceNumber' (cliCommandDone),
+					so that its outcome can be sent to the CLI once its TCs are finished.
+		@Note:		Nothing is sent for commands which did not come from the CLI (sequenceNumber = 0).
+		"""
+		self.cliSequence = 0
+		if not sequenceNumber:
+			return
+		command = [0] * 147
+		command[146] = self.cliCommandDone
+		command[141] = sequenceNumber
+		try:
+			self.fifoToGPR.writeCommandToFifo(command)
+		except (IOError, OSError):
+			self.logError("Could not tell the GPR that CLI command %s is done" %str(sequenceNumber))
+		return
+
+	def heartbeat(self):
+		"""
+		@purpose:   Lets the GPR's supervisor know that this service is still alive, to be called from the main loop
+					(and from anything which waits for a long time).
+		"""
+		if self.heartbeatBoard is not None:
+			self.heartbeatBoard.beat(self.heartbeatSlot)
+		if self.tracer.dumpRequested:
+			self.printToCLI(self.tracer.report())
+		return
+
+	def watchFifos(self):
+		"""
+		@purpose:   Has every FIFO of this service call heartbeat() while it waits (see FifoObject.heartbeat), so
+					that a write which waits for room in a full FIFO does not get the service killed as hung.
+		@Note:		To be called once the FIFOs of the service have been opened.
+		"""
+		for value in list(vars(self).values()):
+			if isinstance(value, FifoObject):
+				value.heartbeat = self.heartbeat
+		return
+
+	def waitForTCReport(self, operation, timeOut, needExecution=1):
+		"""
+		@purpose:   Waits until the GPR reports the outcome of every packet of the TC that was sent for 'operation'.
+		@param:		operation: service subtype of the TC which was sent.
+		@param:		timeOut: minimum time to wait in milliseconds. The GPR times every packet out itself (see
+					TCVerificationTracker.py), the wait is at least that long so that it never gives up first.
+		@param:		needExecution: 1 = wait for the TC execution reports, 0 = the acceptance reports are enough.
+		@return:	tcAccepted/tcExecuted on success, tcAcceptFailed/tcExecuteFailed/tcTimedOut otherwise.
+		@Note:		Other commands received from the GPR in the meantime are kept in deferredCommands[].
+		@Note:		The GPR sends the PacketID/PSC of every packet of the TC (tcSent) as soon as it is sent, the
+					wait is over once each of them has been accepted / executed or as soon as one of them failed.
+					Reports of any other packet (ex: the execution report of a TC whose wait returned on its
+					acceptance) are dropped.
+		"""
+		waitTime = TCVerificationTracker.acceptTimeOut
+		if needExecution:
+			waitTime += TCVerificationTracker.executeTimeOut
+		deadline = monotonic() + max(timeOut / 1000.0, waitTime) + self.tcWaitMargin
+		pending = None			# (PacketID, PSC) of the packets with no outcome yet, None until tcSent arrives.
+		while 1:
+			self.heartbeat()
+			if (pending is not None) and not pending:
+				if needExecution:
+					return self.tcExecuted
+				return self.tcAccepted
+			if monotonic() > deadline:
+				return self.tcTimedOut
+			self.fifoFromGPR.readCommandFromFifo()
+			if not self.fifoFromGPR.commandReady:
+				waitForFifos([self.fifoFromGPR], self.idleWait)
+				continue
+			command = self.receiveGPRCommand()
+			if command[146] == self.tcSent:
+				if (pending is None) and (command[144] == operation):
+					pending = set()
+					for i in range(0, command[145]):
+						pending.add((command[147][2 * i], command[147][2 * i + 1]))
+			elif command[146] != self.tcVerificationReceived:
+				self.deferredCommands.append(command)
+			elif (pending is not None) and (self.tcKey(command) in pending):
+				status = command[145]
+				if (status == self.tcAccepted) and needExecution:
+					continue		# Accepted, keep waiting for the execution report.
+				if (status != self.tcAccepted) and (status != self.tcExecuted):
+					return status
+				pending.discard(self.tcKey(command))
+
+	def sendCurrentCommandToFifo(self, fifo):
 		"""
 		@purpose:   This method is takes what is contained in currentCommand[] and
 		then place it in the given fifo "fifo".
 		@Note: We use a "START\n" code and "STOP\n" code to indicate where commands stop and start.
 		@Note: Each subsequent byte is then placed in the fifo followed by a newline character.
 		@param:		fifo: an instance of the FifoObject class.
+		@return:	-1 if the fifo is full (the other end is not reading it), the command is dropped.
+		@Note:		Commands to the GPR carry the sequence number of the CLI command being executed in [141], so that
+					the TCs they lead to can be reported to the CLI.
 		"""
-		fifo.writeCommandToFifo(cls.currentCommand)
-		return
+		if fifo is self.fifoToGPR:
+			self.currentCommand[141] = self.cliSequence
+		try:
+			fifo.writeCommandToFifo(self.currentCommand)
+		except (IOError, OSError):
+			self.logError("Could not write to %s, the command was dropped" %str(fifo.fifoPath))
+			return -1
+		return 1
+
+	def runForked(self):
+		"""
+		@purpose:   Runs the main program of the service (run1()) in the process which was just forked.
+		@Note:		The forked process never returns to the caller of __init__ (which is the GPR's code),
+					even if the service crashes. The supervisor sees the exit and restarts it.
+		@Note:		The metrics endpoint's socket which was inherited from the GPR is closed first.
+		"""
+		try:
+			closeInheritedServers()
+			self.run1(self)
+		except Exception:
+			traceback.print_exc()
+		finally:
+			os._exit(1)			# Also on SystemExit / KeyboardInterrupt (ex: the GPR's SIGTERM handler)
 
-	def __init__(self, path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock, cliLock, errorLock, day, hour, minute, second):
+	def __init__(self, path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock=None,
+				 heartbeatBoard=None, heartbeatSlot=0, metrics=None):
 		"""
 		@purpose: Initialization method for the PUS service class.
 		@param: path1: path to the file being used as a one-way fifo TO this PUS Service Instance
 		@param: path2: path to the file being used as a one-way fifo FROM this PUS service Instance
+		@param: logChannel: LogChannel of the link's log writer (see LogWriterService.py)
 		@param: day, hour, minute, second: Time to be set & subsequently updated by the Ground Packet Router
+		@param: groundClock: GroundClock shared with the GPR (used instead of day, hour, minute, second)
+		@param: heartbeatBoard, heartbeatSlot: where to send heartbeats for the GPR's ServiceSupervisor
+		@param: metrics: MetricsView (see GroundMetrics.py) to record this service's metrics in.
 		"""
 		super(PUSService, self).__init__()					# Initialize self as a process
 		print(path1)
@@ -381,19 +642,18 @@ class PUSService(Process):
 		self.p2 = path2
 		# Inverse Parameter dictionary of the one shown above
 		self.invParameters = {v : k for k,v in self.parameters.items()}
-		# Files to be used for logging and housekeeping
-		self.eventLog = open(eventPath, "a+")						# Open the logs for appending
-		self.hkLog = open(hkPath, "a+")
-		self.errorLog = open(errorPath, "a+")
-		# Mutex Locks for accessing logs and the CLI
-		self.eventLock = eventLock
-		self.hkLock = hkLock
+		# Logging goes through the log writer
+		self.logs = logChannel
+		# Mutex Locks for accessing the CLI
 		self.cliLock = cliLock
-		self.errorLock = errorLock
 		self.tcLock = tcLock
-		# TC Verification Attribute used for letting the services know when a TC verification was received.
-		self.tcAcceptVerification = 0			# 0 = None received, should be cleared by the service.
-		self.tcExecuteVerification = 0
+		self.groundClock = groundClock
+		self.heartbeatBoard = heartbeatBoard
+		self.heartbeatSlot = heartbeatSlot
+		self.metrics = metrics
+		self.tracer = PipelineTracer(type(self).__name__)
+		self.currentCommand = [0] * (self.dataLength + 10)
+		self.deferredCommands = []
 		self.FDIROutPath = path3
 		self.FDIRInPath = path4
 		return
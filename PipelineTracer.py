@@ -0,0 +1,196 @@
+"""
+FILE_NAME:			PipelineTracer.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the optional tracer used to find out where the time goes on the telemetry path
+					(parseDataArray, fletcher16, verifyTelemetry, logEventReport, FIFO writes, service handlers).
+
+FILE REFERENCES:	Used by GroundPacketRouter.py, PUSService.py, PUSPacket.py
+
+LIBRARIES USED:		os, signal
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Every process has its own tracer, a tracer is never shared between processes.
+
+NOTES:
+					Tracing is off unless the environment variable GROUNDSTATION_TRACE is set to N > 0, in which
+					case one packet (or command) out of every N is traced. When a packet is not sampled, start()
+					returns None and stop() returns right away, so the cost of the instrumentation is a couple of
+					attribute lookups per stage.
+
+					ex: GROUNDSTATION_TRACE=10 python GroundPacketRouter.py
+
+					Spans are measured with monotonic() (see GroundClock.py) and recorded in microseconds into
+					HDR-style histograms: 16 linear sub-buckets for every power of two, so every recorded value is
+					within 1/16 (~6%) of the value it represents no matter how large it is, and recording is O(1).
+
+					Stages nest (ex: logEventReport runs inside verifyTelemetry), the time of a stage always
+					includes the time of the stages it contains.
+
+					The per-stage breakdown is dumped at shutdown, or on demand with: kill -USR1 <pid>
+					(the signal handler only raises dumpRequested, the main loop does the actual dump).
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import signal
+from GroundClock import monotonic
+
+class HdrHistogram:
+	"""
+	Author: agent
+	Log-linear histogram of integer values (microseconds) with a bounded relative error.
+	"""
+	subBucketBits	= 4
+	subBuckets		= 1 << subBucketBits
+	counts			= None
+	totalCount		= 0
+	totalValue		= 0
+	maxValue		= 0
+
+	def bucketIndex(self, value):
+		if value < 2 * self.subBuckets:
+			return value
+		shift = value.bit_length() - self.subBucketBits - 1
+		return (shift * self.subBuckets) + (value >> shift)
+
+	def bucketValue(self, index):
+		"""
+		@return:	The lowest value which is recorded in the bucket 'index'.
+		"""
+		if index < 2 * self.subBuckets:
+			return index
+		shift = (index // self.subBuckets) - 1
+		return (index - shift * self.subBuckets) << shift
+
+	def record(self, value):
+		value = int(value)
+		if value < 0:
+			value = 0
+		index = self.bucketIndex(value)
+		if index >= len(self.counts):
+			self.counts.extend([0] * (index + 1 - len(self.counts)))
+		self.counts[index] += 1
+		self.totalCount += 1
+		self.totalValue += value
+		if value > self.maxValue:
+			self.maxValue = value
+		return
+
+	def percentile(self, percent):
+		"""
+		@return:	The value below which 'percent' % of the recorded values fall.
+		"""
+		if self.totalCount == 0:
+			return 0
+		target = max(1, int(round(self.totalCount * percent / 100.0)))
+		seen = 0
+		for index, count in enumerate(self.counts):
+			seen += count
+			if seen >= target:
+				return min(self.bucketValue(index), self.maxValue)
+		return self.maxValue
+
+	def mean(self):
+		if self.totalCount == 0:
+			return 0.0
+		return float(self.totalValue) / self.totalCount
+
+	def __init__(self):
+		self.counts = []
+
+class PipelineTracer:
+	"""
+	Author: agent
+	Samples spans of the stages of the telemetry path into one HdrHistogram per stage.
+	"""
+	sampleEvery		= 0			# 0 = tracing disabled, N = trace one packet out of every N
+	sampleCounter	= 0
+	active			= 0			# Is the packet currently going through the pipeline being traced?
+	histograms		= None
+	name			= None
+	dumpRequested	= 0
+
+	def beginPacket(self):
+		"""
+		@purpose:	Called when a new packet (or command) enters the pipeline, decides whether it is traced.
+		"""
+		if not self.sampleEvery:
+			return
+		self.sampleCounter += 1
+		self.active = (self.sampleCounter >= self.sampleEvery)
+		if self.active:
+			self.sampleCounter = 0
+		return
+
+	def start(self):
+		"""
+		@return:	The start time of a span, None if the current packet is not being traced.
+		"""
+		if not self.active:
+			return None
+		return monotonic()
+
+	def stop(self, stage, startTime):
+		"""
+		@purpose:	Ends the span which was started at 'startTime' and records it for 'stage'.
+		"""
+		if startTime is None:
+			return
+		elapsed = (monotonic() - startTime) * 1e6
+		histogram = self.histograms.get(stage)
+		if histogram is None:
+			histogram = HdrHistogram()
+			self.histograms[stage] = histogram
+		histogram.record(elapsed)
+		return
+
+	def requestDump(self, signum=None, frame=None):
+		self.dumpRequested = 1
+		return
+
+	def installSignalHandler(self):
+		"""
+		@purpose:	Dumps the breakdown on SIGUSR1 (the next time the main loop checks dumpRequested).
+		"""
+		if self.sampleEvery:
+			signal.signal(signal.SIGUSR1, self.requestDump)
+		return
+
+	def report(self):
+		"""
+		@return:	The per-stage breakdown as text (times in microseconds).
+		"""
+		self.dumpRequested = 0
+		lines = ["PIPELINE TRACE: %s (PID %d, 1 out of %d sampled)" %(self.name, os.getpid(), self.sampleEvery)]
+		lines.append("%-32s%10s%10s%10s%10s%10s%10s" %("STAGE", "COUNT", "MEAN", "P50", "P90", "P99", "MAX"))
+		for stage in sorted(self.histograms):
+			histogram = self.histograms[stage]
+			lines.append("%-32s%10d%10.1f%10d%10d%10d%10d" %(stage, histogram.totalCount, histogram.mean(),
+						histogram.percentile(50), histogram.percentile(90), histogram.percentile(99), histogram.maxValue))
+		return "\n".join(lines) + "\n"
+
+	def __init__(self, name, sampleEvery=None):
+		"""
+		@param:		name: name of the process being traced (used in the report).
+		@param:		sampleEvery: trace one packet out of every 'sampleEvery', defaults to GROUNDSTATION_TRACE.
+		"""
+		self.name = name
+		self.histograms = {}
+		if sampleEvery is None:
+			try:
+				sampleEvery = int(os.environ.get("GROUNDSTATION_TRACE", "0"))
+			except ValueError:
+				sampleEvery = 0
+		self.sampleEvery = max(sampleEvery, 0)
+
+if __name__ == '__main__':
+	pass
@@ -0,0 +1,218 @@
+"""
+FILE_NAME:			ReassemblyBuffer.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the buffer used by the GPR to put segmented telemetry (memory dumps, schedule
+					reports) back together before it is handed to the service it is intended for.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py
+
+LIBRARIES USED:		None
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					A transfer which has not received anything for timeOut seconds is given up on, expire()
+					returns it along with the segments which are missing so that they can be requested again.
+					A transfer which turns out to be longer than sequenceModulo segments is dropped, takeRejected()
+					returns it.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: There is at most one transfer in progress per APID. A transfer can't be longer
+					than sequenceModulo segments: the sequence count of its next segment would be the one of its first.
+
+NOTES:
+					Sequence flags (2 bits, see PUSPacket.py):
+					0x01 = first segment, 0x00 = continuation, 0x02 = last segment, 0x03 = standalone packet
+
+					Segments are stored by APID and sequence count, in whatever order they arrive in. Each segment
+					is placed at its offset from the first segment (sequence counts wrap around after
+					sequenceModulo), a transfer is complete once its first and last segments have been received
+					along with everything in between.
+
+					Segments may arrive up to 'window' positions ahead of the first one which is still missing,
+					anything further ahead (or more than 'window' segments received before the first one) means
+					the transfer is too far gone to be tolerated and is dropped.
+
+					Segments which are not in the window yet (ex: the first segment is missing) are kept, so the
+					transfer can still be completed when it finally arrives.
+
+					Each transfer keeps the offset of its first missing segment and the number of segments missing
+					up to the furthest one received, so adding a segment does not go through the whole transfer.
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Transfers which are longer than sequenceModulo segments are rejected (see takeRejected()), they
+					used to stall with their next segments dropped as duplicates. add() keeps a running count of the
+					missing segments of a transfer instead of calling missingSegments() for every segment.
+"""
+
+from GroundClock import monotonic
+
+class Transfer:
+	"""
+	Author: agent
+	The segments of a single segmented transfer which have been received so far.
+	"""
+	apid			= 0
+	firstSequence	= None			# Sequence count of the first segment (once it has arrived)
+	lastSequence	= None			# Sequence count of the last segment (once it has arrived)
+	segments		= None			# sequence count -> data of the segment
+	lastTime		= 0				# monotonic() of the last segment
+	nextMissing		= 0				# Offset of the first segment which has not been received (once the first has)
+	furthest		= 0				# Offset of the furthest segment received (once the first has arrived)
+	missing			= 0				# Segments missing up to the furthest one received (once the first has arrived)
+
+	def __init__(self, apid, now):
+		self.apid = apid
+		self.segments = {}
+		self.lastTime = now
+
+class ReassemblyBuffer:
+	"""
+	Author: agent
+	Buffers the segments of segmented telemetry by APID and hands back complete payloads.
+	"""
+	firstSegment	= 0x01
+	continuation	= 0x00
+	lastSegment		= 0x02
+	standalone		= 0x03
+	sequenceModulo	= 256			# Sequence counts are 8 bits (see PUSPacket.parseDataArray())
+	window			= 32			# How far ahead of the first missing segment a segment may arrive
+	timeOut			= 30.0			# Seconds without a new segment before a transfer is given up on
+	transfers		= None			# apid -> Transfer
+	completed		= 0
+	dropped			= 0				# Segments which were dropped (out of the window, duplicates)
+	expired			= 0
+	rejected		= None			# (apid, number of segments received) of the transfers which were too long
+
+	def offset(self, transfer, sequenceCount):
+		return (sequenceCount - transfer.firstSequence) % self.sequenceModulo
+
+	def missingSegments(self, transfer):
+		"""
+		@return:	The sequence counts of the segments of 'transfer' which have not been received yet, as far as
+					we know (segments after the last one received cannot be known before the last segment arrives).
+		"""
+		if transfer.firstSequence is None:
+			return []
+		if transfer.lastSequence is not None:
+			end = self.offset(transfer, transfer.lastSequence)
+		else:
+			end = transfer.furthest
+		missing = []
+		for i in range(transfer.nextMissing, end + 1):
+			sequenceCount = (transfer.firstSequence + i) % self.sequenceModulo
+			if sequenceCount not in transfer.segments:
+				missing.append(sequenceCount)
+		return missing
+
+	def add(self, apid, sequenceFlags, sequenceCount, data, now=None):
+		"""
+		@purpose:	Adds a segment to the transfer of 'apid'.
+		@param:		data: application data of the segment (a copy is kept).
+		@return:	The list of segment data in order once the transfer is complete, None otherwise.
+		"""
+		if now is None:
+			now = monotonic()
+		if sequenceFlags == self.standalone:
+			self.completed += 1
+			return [list(data)]
+		transfer = self.transfers.get(apid)
+		if transfer is None:
+			transfer = Transfer(apid, now)
+			self.transfers[apid] = transfer
+		if (sequenceFlags == self.firstSegment) and (transfer.firstSequence is not None) and (transfer.firstSequence != sequenceCount):
+			# A new transfer started before the previous one was complete, the previous one is lost.
+			self.dropped += len(transfer.segments)
+			transfer = Transfer(apid, now)
+			self.transfers[apid] = transfer
+		if sequenceCount in transfer.segments:
+			self.dropped += 1
+			return None
+		if sequenceFlags == self.firstSegment:
+			transfer.firstSequence = sequenceCount
+			# Segments which arrived before the first one and are out of the window can't be part of it.
+			for early in list(transfer.segments):
+				if self.offset(transfer, early) > self.window:
+					del transfer.segments[early]
+					self.dropped += 1
+					if early == transfer.lastSequence:
+						transfer.lastSequence = None
+				else:
+					transfer.furthest = max(transfer.furthest, self.offset(transfer, early))
+		if transfer.firstSequence is not None:
+			lowest = (transfer.firstSequence + transfer.nextMissing) % self.sequenceModulo
+			if ((sequenceCount - lowest) % self.sequenceModulo) > self.window:
+				self.dropped += 1
+				return None
+		elif len(transfer.segments) >= self.window:
+			self.dropped += 1
+			return None
+		if sequenceFlags == self.lastSegment:
+			transfer.lastSequence = sequenceCount
+		transfer.segments[sequenceCount] = list(data)
+		transfer.lastTime = now
+		if transfer.firstSequence is None:
+			return None
+		transfer.furthest = max(transfer.furthest, self.offset(transfer, sequenceCount))
+		transfer.missing = transfer.furthest + 1 - len(transfer.segments)
+		while (transfer.nextMissing < self.sequenceModulo) and \
+				(((transfer.firstSequence + transfer.nextMissing) % self.sequenceModulo) in transfer.segments):
+			transfer.nextMissing += 1
+		if (transfer.lastSequence is None) or transfer.missing or (transfer.furthest != self.offset(transfer, transfer.lastSequence)):
+			if transfer.nextMissing >= self.sequenceModulo:
+				# Every sequence count has been used and the transfer is still not complete.
+				del self.transfers[apid]
+				self.dropped += len(transfer.segments)
+				self.rejected.append((apid, len(transfer.segments)))
+			return None
+		del self.transfers[apid]
+		self.completed += 1
+		segments = []
+		for i in range(0, self.offset(transfer, transfer.lastSequence) + 1):
+			segments.append(transfer.segments[(transfer.firstSequence + i) % self.sequenceModulo])
+		return segments
+
+	def expire(self, now=None):
+		"""
+		@purpose:	Gives up on every transfer which has not received anything for timeOut seconds.
+		@return:	A list of (apid, missing sequence counts, number of segments received) for those transfers.
+		"""
+		if now is None:
+			now = monotonic()
+		expiredTransfers = []
+		for apid in list(self.transfers):
+			transfer = self.transfers[apid]
+			if (now - transfer.lastTime) < self.timeOut:
+				continue
+			del self.transfers[apid]
+			self.expired += 1
+			expiredTransfers.append((apid, self.missingSegments(transfer), len(transfer.segments)))
+		return expiredTransfers
+
+	def takeRejected(self):
+		"""
+		@return:	A list of (apid, number of segments received) for the transfers which were dropped since the last
+					call because they were longer than sequenceModulo segments.
+		"""
+		rejected = self.rejected
+		self.rejected = []
+		return rejected
+
+	def __len__(self):
+		return len(self.transfers)
+
+	def __init__(self, window=None, timeOut=None):
+		if window is not None:
+			self.window = window
+		if timeOut is not None:
+			self.timeOut = timeOut
+		self.transfers = {}
+		self.rejected = []
+
+if __name__ == '__main__':
+	pass
@@ -93,6 +93,21 @@ DEVELOPMENT HISTORY:
 					first 4 bits of the command will correspond to the service_type (except for FDIR which is not supported
 					and K-Service shall simply take a zero as the first 4 bits) The last 4 bits shall be the sub-type.
 
+10/19/2026			waitForTCVerification() now waits on the TC verification reports sent by the GPR.
+					The main loop sends heartbeats to the GPR's ServiceSupervisor.
+
+10/19/2026			FIFOs are opened non-blocking (see FifoObject.py) so that the services no longer wait for
+					each other or the GPR, the main loop waits on the FIFO from the GPR instead of spinning.
+					initialize() creates incomingSatelliteSchedule[] before clearing it (clearing the empty list
+					crashed the service on startup).
+
+10/19/2026			Schedule reports are reassembled by the GPR (see ReassemblyBuffer.py) and received as a single
+					command, processSchedReportH() no longer keeps track of the sequence flags itself (it rejected
+					reports which arrived out of order and never reached the end of a report).
+
+10/19/2026			TCs are sent to fifoToGPR (fifotoGPR does not exist, requesting a schedule report crashed the
+					service) and the misspelled calls to waitForTCVerification() were fixed.
+
 """
 
 import os
@@ -109,10 +124,7 @@ class schedulingService(PUSService):
 	"""
 	maxCommands = 511
 	numCommands = 0
-	localSequence = 0
-	localFlags = -1
 	packetsRequested = 0
-	sequenceOffset = 0
 	schedReportCount = 0
 	hSchedFile	= None
 	cSchedFile	= None
@@ -140,12 +152,14 @@ class schedulingService(PUSService):
 		"""
 		print("The path in sched run: %s" %str(self.p1))
 		self.initializePUS(self)
+		self.watchFifos()									# The FIFOs send heartbeats while they wait
+		self.tracer.installSignalHandler()					# kill -USR1 <pid> dumps the trace
 		self.initialize(self)
 		while 1:
-			self.fifoFromGPR.readCommandFromFifo()		# If command in FIFO, places it in self.currentCommand[]
-			if self.fifofromFDIR.commandReady:
-				self.execCommands(self)								# Deals with commands from GPR
-				self.fifofromFDIR.commandReady = 0
+			self.heartbeat()
+			command = self.takeGPRCommand()		# Next command from the GPR (deferred commands first)
+			if command is not None:
+				self.executeGPRCommand(command)						# Deals with commands from GPR
 		return
 
 	@staticmethod
@@ -154,7 +168,8 @@ class schedulingService(PUSService):
 		@purpose:   - Initializes required variables for the scheduling service
 		"""
 		self.clearCurrentCommand()
-		self.clearIncomingSatSchedule()
+		self.incomingSatelliteSchedule = [0] * self.maxCommands
+		self.clearIncomingSatSchedule(self)
 		self.logEventReport(1, self.schedGroundInitialized, 0, 0, "Ground Scheduling Service Initialized Correctly.")
 		return
 
@@ -165,19 +180,19 @@ class schedulingService(PUSService):
 					and performs different actions based on what is received.
 		"""
 		if self.currentCommand[146] == self.addSchedule:
-			self.addToSchedule()
+			self.addToSchedule(self)
 		if self.currentCommand[146] == self.clearSchedule:
-			self.clearTheSchedule()
+			self.clearTheSchedule(self)
 		if self.currentCommand[146] == self.schedReportRequest:
-			self.requestSchedReport()
+			self.requestSchedReport(self)
 		if self.currentCommand[146] == self.schedReport:
-			self.processSchedReport()
+			self.processSchedReport(self)
 		if self.currentCommand[146] == self.updatingSchedule:		# Event reports on completed command should be going here.
-			self.updateScheduleWithCommandStatus()
+			self.updateScheduleWithCommandStatus(self)
 		if self.currentCommand[146] == self.pauseScheduling:
-			self.pauseTheDamnScheduling()
+			self.pauseTheDamnScheduling(self)
 		if self.currentCommand[146] == self.resumeScheduling:
-			self.resumeTheDamnScheduling()
+			self.resumeTheDamnScheduling(self)
 		self.clearCurrentCommand()
 		return
 
@@ -189,17 +204,17 @@ class schedulingService(PUSService):
 					DOES NOT EXECUTE THE CLEAR COMMAND
 		"""
 		if self.currentCommand[146] == self.addSchedule:
-			self.addToSchedule()
+			self.addToSchedule(self)
 		if self.currentCommand[146] == self.schedReportRequest:
-			self.requestSchedReport()
+			self.requestSchedReport(self)
 		if self.currentCommand[146] == self.schedReport:
-			self.processSchedReport()
+			self.processSchedReport(self)
 		if self.currentCommand[146] == self.schedCommandCompleted:		# Event reports on completed command should be going here.
-			self.updateScheduleWithCommandStatus()
+			self.updateScheduleWithCommandStatus(self)
 		if self.currentCommand[146] == self.pauseScheduling:
-			self.pauseTheDamnScheduling()
+			self.pauseTheDamnScheduling(self)
 		if self.currentCommand[146] == self.resumeScheduling:
-			self.resumeTheDamnScheduling()
+			self.resumeTheDamnScheduling(self)
 		self.clearCurrentCommand()
 		return
 
@@ -267,7 +282,7 @@ class schedulingService(PUSService):
 				commandParam = long(items1[5], 16)
 				commandStatus = 0
 				# Add the command to the computer schedule
-				self.addCommandToSchedule(commandTime, commandAPID, commandID, commandSeverity, cID, commandStatus, commandParam)
+				self.addCommandToSchedule(self, commandTime, commandAPID, commandID, commandSeverity, cID, commandStatus, commandParam)
 				# Put the command in an array for sending to the OBC.
 				newCommandArray[(numNewCommands * 2) - (i * 2)] = commandTime
 				newCommandArray[(numNewCommands * 2) - (i * 2 + 1)] = (commandAPID << 24) + (commandID << 16) + (commandSeverity << 8) + ((cID & 0xFF00) >> 8)
@@ -277,7 +292,7 @@ class schedulingService(PUSService):
 				items1[6] = "W"
 
 		#Send the commands to the OBC, one packet @ a time.
-		self.sendCommandsToOBC(numNewCommands, newCommandArray)
+		self.sendCommandsToOBC(self, numNewCommands, newCommandArray)
 		return
 
 	@staticmethod
@@ -353,7 +368,7 @@ class schedulingService(PUSService):
 					for j in range(127, -1, -16):
 						cID = self.currentCommand[j - 7] << 8
 						cID += self.currentCommand[j - 8]
-						self.updateScheduleWithCommandStatus(cID, 0)
+						self.updateScheduleWithCommandStatus(self, cID, 0)
 					return
 			if leftOver:
 				self.printToCLI("SENDING COMMAND PACKET %s OF %s\n" %str(numPackets) %str(numPackets))
@@ -384,7 +399,7 @@ class schedulingService(PUSService):
 					self.currentCommand[j - 15] = tempInt4 & 0xFF000000
 					# Send the command to the GPR to be sent to the OBC
 				self.sendCurrentCommandToFifo(self.fifoToGPR)
-				if self.waitforTCVerification(1000, self.addSchedule) < 0:
+				if self.waitForTCVerification(1000, self.addSchedule) < 0:
 					return
 		else:
 			self.printToCLI("SENDING COMMAND PACKET %s OF %s\n" %str(1) %str(1))
@@ -415,7 +430,7 @@ class schedulingService(PUSService):
 				self.currentCommand[j - 15] = tempInt4 & 0xFF000000
 				# Send the command to the GPR to be sent to the OBC
 			self.sendCurrentCommandToFifo(self.fifoToGPR)
-			if self.waitforTCVerication(1000, self.addSchedule) < 0:
+			if self.waitForTCVerification(1000, self.addSchedule) < 0:
 				return
 
 		self.printToCLI("UPLOADING NEW SCHEDULE COMPLETED\n")
@@ -430,30 +445,30 @@ class schedulingService(PUSService):
 		"""
 		tempWait = datetime.timedelta(0)
 		# First get a schedule report from the satellite in case some actions were completed very recently.
-		self.requestSchedReport()
+		self.requestSchedReport(self)
 		self.clearCurrentCommand()
 		# Continue on with regular operation here for a maximum of one minute.
 		while (tempWait.seconds < 59) and (self.currentCommand[146] != self.schedReport):
 			self.receiveCommandFromFifo(self.fifoFromGPR)
-			self.execCommandsExceptClear()
+			self.execCommandsExceptClear(self)
 
 		if self.currentCommand[146] != self.schedReport:
 			self.printToCLI("CANNOT CLEAR SCHEDULE, SCHEDULE REPORT TOOK TOO LONG TO COME BACK.\n")
 			self.logError("CANNOT CLEAR SCHEDULE, SCHEDULE REPORT TOOK TOO LONG TO COME BACK.")
-			self.execCommands() # run1 the command which we might currently have.
+			self.execCommands(self) # run1 the command which we might currently have.
 			self.clearCurrentCommand()
 			self.currentCommand[146] = self.clearSchedule
 			self.sendCurrentCommandToFifo(self.fifotoFDIR)		# Send the command to the FDIR task.
 		# Next, update the schedule.
 		elif self.currentCommand[146] == self.schedReport:
-				self.processSchedReport()						# Updates the schedule with the incoming schedule report
+				self.processSchedReport(self)						# Updates the schedule with the incoming schedule report
 		# Next, attempt to clear the schedule on the satellite.
-		if self.clearTheScheduleH() < 0:
+		if self.clearTheScheduleH(self) < 0:
 			return
 		# Next, erase all the commands from the computer schedule
-		self.clearComputerSchedule()
+		self.clearComputerSchedule(self)
 		# Next, set all commands which haven't been completed yet to E in the schedule
-		self.eraseCommandsInHumanSchedule()
+		self.eraseCommandsInHumanSchedule(self)
 		# Lastly, send a command to the satellite to clear the schedule.
 		self.currentCommand[146] = self.clearSchedule
 		self.sendCurrentCommandToFifo()
@@ -500,7 +515,7 @@ class schedulingService(PUSService):
 		@reeturn:	1 is success, -1 = failure
 		"""
 		self.currentCommand[146] = self.clearSchedule
-		self.sendCurrentCommandToFifo(self.fifotoGPR)
+		self.sendCurrentCommandToFifo(self.fifoToGPR)
 		if self.waitForTCVerification(5000, self.clearSchedule) < 0:	# Wait max of 5s for the TC verification
 			return -1
 		else:
@@ -513,7 +528,7 @@ class schedulingService(PUSService):
 					If this command is followed through, a schedule report should be downlinked by the satellite.
 		"""
 		self.currentCommand[146] = self.schedReportRequest
-		self.sendCurrentCommandToFifo(self.fifotoGPR)
+		self.sendCurrentCommandToFifo(self.fifoToGPR)
 		self.waitForTCVerification(5000, self.schedReportRequest)
 		return
 
@@ -534,7 +549,7 @@ class schedulingService(PUSService):
 		"""
 		if self.schedWaitTime.seconds > 60:
 			self.schedWaitTime = timedelta(0)
-			self.requestSchedReport()
+			self.requestSchedReport(self)
 			if self.waitForTCVerification(5000, self.updatingSchedule) < 0:
 				return
 			self.printToCLI("SCHEDULE TO BE UPDATED AUTOMATICALLY\n")
@@ -556,7 +571,7 @@ class schedulingService(PUSService):
 		tempString = self.cSchedFile.readline()
 		tempString = tempString.rstrip()
 		self.packetsRequested = int(tempString) / 8
-		if self.processSchedReportH() < 1:
+		if self.processSchedReportH(self) < 1:
 			return
 		elif self.numIncomingCommands != self.numCommands:
 			# Satellite schedule and ground schedule are out of sync, fix it.
@@ -566,7 +581,7 @@ class schedulingService(PUSService):
 			self.sendCurrentCommandToFifo(self.fifoToFDIR)
 			# Attempting to Fix it: (Essentially just rewrite the entire schedule on the OBC.):
 			# 1. Clear the schedule on the satellite
-			self.clearTheSchedule()
+			self.clearTheSchedule(self)
 			newArray = []
 			i = 0
 			# 2. Load the computer schedule into an array.
@@ -575,11 +590,11 @@ class schedulingService(PUSService):
 				newArray[self.numCommands - i] = int(tempString)
 				i += 1
 			# 3. use the method sendCommandsToOBC()
-			self.sendCommandsToOBC(self.numCommands, newArray)
+			self.sendCommandsToOBC(self, self.numCommands, newArray)
 		else:
 			self.printTOCLI("SCHEDULE REPORT RECEIVED, MATCHES UP WITH SATELLITE.\n")
 			# Now we want to store the report which was retrieved in a report file.
-			self.turnCommandArrayIntoSchedReport()
+			self.turnCommandArrayIntoSchedReport(self)
 
 	@staticmethod
 	def turnCommandArrayIntoSchedReport(self, numCommands, commandArray):
@@ -617,84 +632,30 @@ class schedulingService(PUSService):
 	@staticmethod
 	def processSchedReportH(self):
 		"""
-		@purpose: 	This method is a helper to processSchedControl(), this method does the actual work of keeping
-					track of sequence control on the incoming packets and letting the main method know when an
-					entire schedule report has been received.
-
-		"""
-		# This array is going to contain all the commands currently being stored on the schedule in the satellite.
-		obcSequenceFlags	= (self.currentCommand[143] & 0xC0) >> 6
-		obcSequenceCount	= self.currentCommand[142]
-
-		if obcSequenceFlags == 0x01:
-			if self.localFlags == -1:	# The First packet of several.
-				self.localSequence = obcSequenceCount
-				self.sequenceOffset = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong				# Packet is rejected.
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return -1
-		if obcSequenceFlags == 0x11:
-			if self.localFlags == -1:	# The First packet of several.
-				self.localSequence = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return -1
-		if obcSequenceFlags == 0x00:
-			if (self.localFlags == 0x01) or (self.localFlags == 0x00) and (self.localSequence < obcSequenceCount):
-				self.localSequence = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return -1
-		if obcSequenceFlags == 0x11:
-			if (self.localFlags == 0x00) and (self.localSequence < obcSequenceCount):
-				self.localSequence = obcSequenceCount
-				self.localFlags = obcSequenceFlags
-			else:
-				self.currentCommand[146] = self.dumpPacketWrong
-				self.sendCurrentCommandToFifo(self.fifotoFDIR)
-				self.localSequence = 0
-				self.localFlags = -1
-				return -1
-		# Print something meaningful to the CLI.
-		if self.localFlags == 0x01:
-			self.printToCLI("DOWNLOADING PACKET 1 OF %s FOR SCHEDULE\n" %str(self.packetsRequested))
-		if self.localFlags == 0x11:
-			self.printToCLI("DOWNLOADING PACKET 1 of 1 FOR SCHEDULE\n")
-		if self.localFlags == 0x00:
-			packetNum = obcSequenceCount - self.sequenceOffset + 1
-			self.printToCLI("DOWNLOADING PACKET %s OF %s FOR SCHEDULE\n" %str(packetNum) %str(self.packetsRequested))
-		if self.localFlags == 0x10:
-			packetNum = obcSequenceCount - self.sequenceOffset + 1
-			self.printToCLI("DOWNLOADING PACKET %s OF %s FOR SCHEDULE\n" %str(packetNum) %str(self.packetsRequested))
-			self.printToCLI("DOWNLOAD COMPLETE FOR SCHEDULE %s\n" %str(self.dumpCount))
-			self.logEventReport(1, self.dumpCompleted, 0, 0, "DOWNLOAD COMPLETE FOR SCHEDULE %s" %str(self.dumpCount))
-		# Put the contents of the incoming PUS packet into the array.
-		numNewCommands = self.currentCommand[136]
-		for i in range (0, numNewCommands):
-			self.incomingSatelliteSchedule[self.numIncomingCommands + i] = self.currentCommand[i]
-		self.numIncomingCommands += numNewCommands
-
-		if self.localFlags == 0x10:
-			self.localSequence = 0
-			self.localFlags = -1
-			self.dumpCount += 1
-			self.numIncomingCommands = 0
-			self.clearIncomingSatSchedule()
-			return 2
-		else:
-			return 1
+		@purpose: 	This method is a helper to processSchedControl(), it puts the commands of the schedule report
+					which was received into incomingSatelliteSchedule[].
+		@Note:		The GPR reassembles the packets of the report (see ReassemblyBuffer.py) and sends them, in order,
+					as the payload of a single schedReport command (dataLength values per packet).
+		@return:	2 once the report has been stored, -1 if there was nothing to store.
+		"""
+		payload = self.currentPayload
+		if payload is None:
+			payload = self.currentCommand[0:self.dataLength]
+		if not payload:
+			return -1
+		self.numIncomingCommands = 0
+		self.clearIncomingSatSchedule(self)
+		numPackets = len(payload) // self.dataLength
+		# Put the contents of every PUS packet of the report into the array.
+		for packet in range(0, numPackets):
+			segment = payload[packet * self.dataLength:(packet + 1) * self.dataLength]
+			numNewCommands = segment[136]
+			for i in range (0, numNewCommands):
+				self.incomingSatelliteSchedule[self.numIncomingCommands + i] = segment[i]
+			self.numIncomingCommands += numNewCommands
+		self.printToCLI("DOWNLOAD COMPLETE FOR SCHEDULE REPORT %s (%s PACKETS)\n" %(str(self.schedReportCount), str(numPackets)))
+		self.logEventReport(1, self.dumpCompleted, 0, 0, "DOWNLOAD COMPLETE FOR SCHEDULE REPORT %s" %str(self.schedReportCount))
+		return 2
 
 	@staticmethod
 	def clearIncomingSatSchedule(self):
@@ -769,19 +730,16 @@ class schedulingService(PUSService):
 				self.cSchedFile.write(str(status) + "\n")
 		return
 
-	@staticmethod
 	def waitForTCVerification(self, timeOut, operation):
 		"""
 		@purpose: 	This method is used to put the current service on hold until a successful TC Acceptance
 					report and TC Execution report have been received.
-		@param:		timeOut: This method will wait for a maximum of 'timeOut' milliseconds for the verification to be
-					received.
+		@param:		timeOut: This method will wait for at least 'timeOut' milliseconds for the verification to be
+					received, longer if the GPR takes longer to time the TC out (see TCVerificationTracker.py).
 		@param:		operation: is the code for the operation to be completed
 		"""
-		waitTime = datetime.timedelta(0)
-		while (waitTime.milliseconds < timeOut) and not self.tcAcceptVerification:
-			pass
-		if waitTime > timeOut:
+		status = self.waitForTCReport(operation, timeOut, 0)
+		if status != self.tcAccepted:
 			self.printToCLI("SCHEDULING SERVICE OPERATION: %s HAS FAILED\n" %self.schedOperations[operation])
 			self.logError("SCHEDULING SERVICE OPERATION: %s HAS FAILED" %self.schedOperations[operation])
 			self.currentCommand[146] = operation
@@ -790,10 +748,6 @@ class schedulingService(PUSService):
 		else:
 			self.logEventReport(1, operation, 0, 0,
 								"SCHEDULING SERVICE OPERATION: %s HAS SUCCEEDED" %self.schedOperations[operation])
-			self.tcLock.acquire()
-			self.tcAcceptVerification = 0
-			self.tcExecuteVerification = 0
-			self.tcLock.release()
 			return 1
 
 	@staticmethod
@@ -803,7 +757,7 @@ class schedulingService(PUSService):
 					command is that scheduled operations on the satellite are temporarily paused.
 		"""
 		self.currentCommand[146] = self.pauseScheduling
-		self.sendCurrentCommandToFifo(self.fifotoGPR)
+		self.sendCurrentCommandToFifo(self.fifoToGPR)
 		self.waitForTCVerification(5000, self.schedReportRequest)
 		return
 
@@ -814,27 +768,25 @@ class schedulingService(PUSService):
 					command is that scheduled operations on the satellite are resumed. (No effect if already running)
 		"""
 		self.currentCommand[146] = self.resumeScheduling
-		self.sendCurrentCommandToFifo(self.fifotoGPR)
+		self.sendCurrentCommandToFifo(self.fifoToGPR)
 		self.waitForTCVerification(5000, self.schedReportRequest)
 		return
 
 	@staticmethod
 	def initializePUS(self):
 		# FIFOs Required for communication with the Ground Packet Router:
-		self.fifoFromGPR			= FifoObject(self.p2, 0)
-		self.fifoToGPR				= FifoObject(self.p1, 1)
+		self.fifoFromGPR			= FifoObject(self.p2, 0, 1)
+		self.fifoToGPR				= FifoObject(self.p1, 1, 1)
 		self.fifoToGPRPath			= self.p1
 		self.wait					= 1
 		self.fifoFromGPRPath		= self.p2
-		self.fifotoFDIR				= FifoObject(self.FDIROutPath, 1)
-		self.fifofromFDIR			= FifoObject(self.FDIRInPath, 0)
+		self.fifotoFDIR				= FifoObject(self.FDIROutPath, 1, 1)
+		self.fifofromFDIR			= FifoObject(self.FDIRInPath, 0, 1)
 		return
 
-	def __init__(self, path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock, cliLock,
-							errorLock, day, hour, minute, second):
+	def __init__(self, path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock=None, heartbeatBoard=None, heartbeatSlot=0, metrics=None):
 		# Initialize this instance as a PUS service
-		super(schedulingService, self).__init__(path1, path2, path3, path4, tcLock, eventPath, hkPath, errorPath, eventLock, hkLock,
-							cliLock, errorLock, day, hour, minute, second)
+		super(schedulingService, self).__init__(path1, path2, path3, path4, tcLock, logChannel, cliLock, day, hour, minute, second, groundClock, heartbeatBoard, heartbeatSlot, metrics)
 		self.p1 = path1
 		self.p2 = path2
 		pID = os.fork()
@@ -842,7 +794,7 @@ class schedulingService(PUSService):
 			self.pID = pID
 			return
 		else:
-			self.run1(self)
+			self.runForked()
 
 if __name__ == '__main__':
 	pass
@@ -0,0 +1,242 @@
+"""
+FILE_NAME:			ServiceSupervisor.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the supervisor which makes sure that all the subsidiary services of the GPR are
+					still running and restarts them if necessary.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py, PUSService.py (heartbeats)
+
+LIBRARIES USED:		os, signal, mmap, struct
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES:
+					A service which has to be restarted more than maxRestarts times within restartWindow seconds
+					is given up on, check() reports it so that the GPR can alert the operator.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: The HeartbeatBoard must be created before the services are forked.
+					Every service must call heartbeat() at least once every hangTimeOut seconds from its main loop,
+					so no command may run for longer than that without a heartbeat: the long waits (writes to a full
+					FIFO, see FifoObject.heartbeat, and waits for TC verification) send heartbeats while they wait.
+
+NOTES:
+					Heartbeats are written into a small shared memory segment with one slot (double, seconds of
+					monotonic()) per service, so beating costs a single write and checking costs a single read.
+
+					A service is considered:
+					- crashed: when waitpid() says that its process has exited.
+					- hung: when its last heartbeat is older than hangTimeOut seconds (after a startGrace period
+					  which lets it open its FIFOs and initialize).
+
+					In either case the process is killed (if needed) and restarted with the factory which was given
+					to register(). The reset callback is used first to clear what the dead service left behind (ex:
+					frames in its FIFOs which the new one must not get), and the reconnect callback then hands the new
+					service over to the GPR. The other services and the GPR itself are left alone.
+
+					responsive() tells whether a service is worth waiting for (ex: for room in its FIFO): it is not
+					once it has been given up on or has not sent a heartbeat for responsiveTimeOut seconds.
+
+REQUIREMENTS:		Linux
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			Added the reset callback and responsive().
+
+10/19/2026			stop() can leave some services running (ex: the log writer, which stops on its own).
+
+10/19/2026			hangTimeOut raised from 0.5 to 15 seconds and startGrace from 2 to 10 seconds: a command which
+					took more than 0.5 seconds between two heartbeats (ex: a write to a full FIFO, which may take up
+					to 5 seconds) had its service killed as hung.
+
+10/19/2026			hangTimeOut and startGrace are back to 0.5 and 2 seconds (responsiveTimeOut is 0.25 seconds): the
+					long waits of the services now send heartbeats (see FifoObject.heartbeat and
+					PUSService.waitForTCReport()), so a hung service is restarted within a second again.
+"""
+
+import os
+import signal
+import mmap
+import struct
+from GroundClock import monotonic
+
+class HeartbeatBoard:
+	"""
+	Author: agent
+	Shared memory table of the last heartbeat of each service.
+	"""
+	slotFormat		= "<d"
+	slotSize		= struct.calcsize(slotFormat)
+	numSlots		= 0
+	segment			= None
+
+	def beat(self, slot, now=None):
+		if now is None:
+			now = monotonic()
+		struct.pack_into(self.slotFormat, self.segment, slot * self.slotSize, now)
+		return
+
+	def lastBeat(self, slot):
+		return struct.unpack_from(self.slotFormat, self.segment, slot * self.slotSize)[0]
+
+	def __init__(self, numSlots):
+		self.numSlots = numSlots
+		self.segment = mmap.mmap(-1, max(numSlots, 1) * self.slotSize)
+
+class SupervisedService:
+	"""
+	Author: agent
+	Bookkeeping for a single service watched by the ServiceSupervisor.
+	"""
+	name			= None
+	slot			= 0
+	factory			= None		# Callable which (re)creates the service and returns the new service object.
+	reconnect		= None		# Callable(service) which hands the restarted service over to the GPR.
+	reset			= None		# Callable() which clears what the dead service left behind, before it is restarted.
+	service			= None
+	pid				= 0
+	startTime		= 0
+	restartTimes	= None
+	failed			= 0
+
+	def __init__(self, name, slot, factory, reconnect, reset=None):
+		self.name = name
+		self.slot = slot
+		self.factory = factory
+		self.reconnect = reconnect
+		self.reset = reset
+		self.restartTimes = []
+
+class ServiceSupervisor:
+	"""
+	Author: agent
+	Watches the PIDs and heartbeats of the subsidiary services and restarts them when they crash or hang.
+	"""
+	hangTimeOut		= 0.5		# Seconds without a heartbeat before a service is considered hung
+	startGrace		= 2.0		# Seconds a (re)started service has before it must start sending heartbeats
+	responsiveTimeOut	= 0.25	# Seconds without a heartbeat after which a service is no longer waited for
+	checkInterval	= 0.1		# Minimum number of seconds between two checks
+	maxRestarts		= 5
+	restartWindow	= 60.0
+	board			= None
+	services		= None
+	lastCheck		= 0
+	restartCount	= 0
+
+	def register(self, name, factory, reconnect=None, reset=None):
+		"""
+		@purpose:	Starts a service with 'factory' and starts watching it.
+		@param:		name: name of the service (used in reports)
+		@param:		factory: callable(slot) which creates the service (forking it) and returns the service object,
+					'slot' is the heartbeat slot which the service has to beat on.
+		@param:		reconnect: callable(service) which hands the restarted service over to the GPR.
+		@param:		reset: callable() which clears what the service left behind when it died, before it is restarted.
+		@return:	The service object which was created.
+		"""
+		slot = len(self.services)
+		if slot >= self.board.numSlots:
+			return None
+		watched = SupervisedService(name, slot, factory, reconnect, reset)
+		self.services.append(watched)
+		self.start(watched)
+		return watched.service
+
+	def start(self, watched):
+		now = monotonic()
+		self.board.beat(watched.slot, now)
+		watched.startTime = now
+		watched.service = watched.factory(watched.slot)
+		watched.pid = watched.service.pID
+		return
+
+	def check(self, now=None):
+		"""
+		@purpose:	Checks every service for a crash or a hang and restarts it if necessary.
+		@return:	List of (name, reason) for every service which was restarted or given up on during this check.
+					reason is one of "crashed", "hung" or "failed" (too many restarts, no longer supervised).
+		"""
+		if now is None:
+			now = monotonic()
+		if now - self.lastCheck < self.checkInterval:
+			return []
+		self.lastCheck = now
+		events = []
+		for watched in self.services:
+			if watched.failed:
+				continue
+			reason = None
+			try:
+				pid, status = os.waitpid(watched.pid, os.WNOHANG)
+			except OSError:
+				pid = watched.pid				# Not our child anymore / already reaped.
+			if pid == watched.pid:
+				reason = "crashed"
+			elif (now - watched.startTime > self.startGrace) and (now - self.board.lastBeat(watched.slot) > self.hangTimeOut):
+				reason = "hung"
+				self.kill(watched.pid)
+			if reason is None:
+				continue
+			watched.restartTimes = [t for t in watched.restartTimes if now - t < self.restartWindow]
+			if len(watched.restartTimes) >= self.maxRestarts:
+				watched.failed = 1
+				events.append((watched.name, "failed"))
+				continue
+			watched.restartTimes.append(now)
+			self.restartCount += 1
+			if watched.reset is not None:
+				watched.reset()
+			self.start(watched)
+			if watched.reconnect is not None:
+				watched.reconnect(watched.service)
+			events.append((watched.name, reason))
+		return events
+
+	def responsive(self, name, now=None):
+		"""
+		@return:	1 if the service 'name' is running and sent a heartbeat in the last responsiveTimeOut seconds
+					(or is still starting), 0 otherwise. Services which are not supervised are taken as responsive.
+		"""
+		if now is None:
+			now = monotonic()
+		for watched in self.services:
+			if watched.name != name:
+				continue
+			if watched.failed:
+				return 0
+			if now - watched.startTime <= self.startGrace:
+				return 1
+			if now - self.board.lastBeat(watched.slot) > self.responsiveTimeOut:
+				return 0
+			return 1
+		return 1
+
+	@staticmethod
+	def kill(pid):
+		try:
+			os.kill(pid, signal.SIGKILL)
+			os.waitpid(pid, 0)
+		except OSError:
+			pass
+		return
+
+	def stop(self, keep=()):
+		"""
+		@purpose:	Terminates every supervised service (used when the GPR shuts down).
+		@param:		keep: names of the services which are no longer supervised but are left running.
+		"""
+		for watched in self.services:
+			watched.failed = 1
+			if watched.name not in keep:
+				self.kill(watched.pid)
+		return
+
+	def __init__(self, numSlots, hangTimeOut=None):
+		self.board = HeartbeatBoard(numSlots)
+		self.services = []
+		if hangTimeOut is not None:
+			self.hangTimeOut = hangTimeOut
+
+if __name__ == '__main__':
+	pass
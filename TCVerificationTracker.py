@@ -0,0 +1,264 @@
+"""
+FILE_NAME:			TCVerificationTracker.py
+
+AUTHOR:				agent
+
+PURPOSE:			This file houses the class which keeps track of every telecommand which is waiting on
+					TC verification from the satellite.
+
+FILE REFERENCES:	Used by GroundPacketRouter.py
+
+LIBRARIES USED:		heapq
+
+SUPERCLASS:			None
+
+ABNORMAL TERMINATION CONDITIONS, ERROR AND WARNING MESSAGES: None yet.
+
+ASSUMPTIONS, CONSTRAINTS, CONDITIONS: Only the GPR should use this class, the subsidiary services are told about the
+					outcome of their telecommands through their FIFO from the GPR.
+
+NOTES:
+					Every TC which is sent is registered here with its PacketID/PSC, the service which asked for it
+					(owner) and the operation (service subtype) it carries. A min-heap of deadlines is kept next to
+					the table so that expired TCs can be found without scanning all of them.
+
+					Entries which are completed before their deadline are left in the heap and simply skipped when
+					they reach the top (their generation number no longer matches the table).
+
+					Deadlines are in seconds of monotonic() (see GroundClock.py).
+
+					Status codes passed on to the services:
+					1 = TC accepted, 2 = TC acceptance failed, 3 = TC executed, 4 = TC execution failed, 5 = timed out
+
+					A TC may be tagged with the command which led to it (ex: the sequence number of a CLI command,
+					see openCommand()). Once the service is done with that command (closeCommand()) and none of its
+					TCs are outstanding, the command is finished: its status is statusExecuted if every TC was
+					executed, the status of the first TC which failed or timed out otherwise, 0 if it sent no TC.
+
+REQUIREMENTS:
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+
+10/19/2026			TCs can be tagged with the command which led to them (openCommand() / closeCommand()), so that
+					the outcome of a CLI command can be sent back to the CLI.
+"""
+
+import heapq
+from GroundClock import monotonic
+
+class OutstandingTC:
+	"""
+	Author: agent
+	A single telecommand which is waiting on TC verification.
+	"""
+	packetID		= 0
+	psc				= 0
+	owner			= 0			# Ground service ID which requested the TC (ex: HKGroundID)
+	operation		= 0			# Service subtype of the TC (ex: newHKDefinition)
+	sentTime		= 0
+	deadline		= 0
+	generation		= 0
+	accepted		= 0
+	status			= 0
+	tag				= 0			# Command which led to the TC (see TCVerificationTracker.openCommand()), 0 = none
+
+	def __init__(self, packetID, psc, owner, operation, sentTime, tag=0):
+		self.packetID = packetID
+		self.psc = psc
+		self.owner = owner
+		self.operation = operation
+		self.sentTime = sentTime
+		self.tag = tag
+
+class TaggedCommand:
+	"""
+	Author: agent
+	A command (ex: from the CLI) whose TCs are followed together.
+	"""
+	tag				= 0
+	startTime		= 0
+	outstanding		= 0			# TCs of the command which have no outcome yet
+	status			= 0			# statusExecuted, the status of the first TC which failed, 0 = no TC has finished
+	done			= 0			# 1 once the service is done with the command (it won't send more TCs for it)
+
+	def __init__(self, tag, startTime):
+		self.tag = tag
+		self.startTime = startTime
+
+class TCVerificationTracker:
+	"""
+	Author: agent
+	Table of outstanding telecommands keyed by (PacketID, PSC) with a heap of deadlines.
+	"""
+	statusAccepted			= 1
+	statusAcceptFailed		= 2
+	statusExecuted			= 3
+	statusExecuteFailed		= 4
+	statusTimedOut			= 5
+	acceptTimeOut			= 5.0		# Seconds to wait for a TC acceptance report
+	executeTimeOut			= 10.0		# Seconds to wait for a TC execution report once accepted
+	commandTimeOut			= 600.0		# Seconds after which a command which was never closed is forgotten
+	outstanding				= None
+	deadlines				= None
+	generation				= 0
+	commands				= None		# tag -> TaggedCommand
+	finishedCommands		= None		# TaggedCommands which were finished by the outcome of their last TC
+
+	def register(self, packetID, psc, owner, operation, now=None, tag=0):
+		"""
+		@purpose:	Adds a TC which was just sent to the table of outstanding TCs.
+		@param:		packetID, psc: the PacketID/PSC of the TC as it will appear in the verification report.
+		@param:		owner: the ground service which should be notified of the outcome.
+		@param:		operation: service subtype of the TC.
+		@param:		tag: the command which led to the TC (see openCommand()), 0 = none.
+		@Note:		If a TC with the same PacketID/PSC is still outstanding, it is replaced.
+		"""
+		if now is None:
+			now = monotonic()
+		tc = OutstandingTC(packetID, psc, owner, operation, now, tag)
+		if tag in self.commands:
+			self.commands[tag].outstanding += 1
+		self.outstanding[(packetID, psc)] = tc
+		self.schedule(tc, now + self.acceptTimeOut)
+		return tc
+
+	def schedule(self, tc, deadline):
+		self.generation += 1
+		tc.generation = self.generation
+		tc.deadline = deadline
+		heapq.heappush(self.deadlines, (deadline, tc.generation, tc))
+		return
+
+	def accept(self, packetID, psc, success, now=None):
+		"""
+		@purpose:	Records a TC acceptance report.
+		@return:	The OutstandingTC which was accepted / rejected, None if the TC is unknown.
+		@Note:		A TC which is accepted stays outstanding until it is executed, a failed one is removed.
+		"""
+		tc = self.outstanding.get((packetID, psc))
+		if tc is None:
+			return None
+		if now is None:
+			now = monotonic()
+		if success:
+			tc.accepted = 1
+			tc.status = self.statusAccepted
+			self.schedule(tc, now + self.executeTimeOut)
+		else:
+			tc.status = self.statusAcceptFailed
+			del self.outstanding[(packetID, psc)]
+			self.finishTC(tc)
+		return tc
+
+	def execute(self, packetID, psc, success):
+		"""
+		@purpose:	Records a TC execution report, the TC is no longer outstanding after this.
+		@return:	The OutstandingTC which was executed, None if the TC is unknown.
+		"""
+		tc = self.outstanding.pop((packetID, psc), None)
+		if tc is None:
+			return None
+		if success:
+			tc.status = self.statusExecuted
+		else:
+			tc.status = self.statusExecuteFailed
+		self.finishTC(tc)
+		return tc
+
+	def expire(self, now=None):
+		"""
+		@purpose:	Removes every TC whose deadline has passed.
+		@return:	List of the OutstandingTCs which timed out (usually empty).
+		"""
+		if now is None:
+			now = monotonic()
+		expired = []
+		while self.deadlines and self.deadlines[0][0] <= now:
+			deadline, generation, tc = heapq.heappop(self.deadlines)
+			if tc.generation != generation:
+				continue			# This deadline was superseded (TC accepted in the meantime)
+			if self.outstanding.get((tc.packetID, tc.psc)) is not tc:
+				continue			# TC was already completed.
+			del self.outstanding[(tc.packetID, tc.psc)]
+			tc.status = self.statusTimedOut
+			self.finishTC(tc)
+			expired.append(tc)
+		for tag in list(self.commands):
+			if now - self.commands[tag].startTime > self.commandTimeOut:
+				del self.commands[tag]
+		return expired
+
+	def openCommand(self, tag, now=None):
+		"""
+		@purpose:	Starts following the TCs which will be registered with 'tag' (ex: a CLI sequence number).
+		@Note:		A command which is still open with the same tag is replaced.
+		"""
+		if now is None:
+			now = monotonic()
+		self.commands[tag] = TaggedCommand(tag, now)
+		return
+
+	def closeCommand(self, tag):
+		"""
+		@purpose:	Records that the service is done with the command 'tag', no more TCs will be registered for it.
+		@return:	The TaggedCommand if it is finished (none of its TCs are outstanding), None otherwise.
+		"""
+		command = self.commands.get(tag)
+		if command is None:
+			return None
+		command.done = 1
+		if command.outstanding:
+			return None
+		del self.commands[tag]
+		return command
+
+	def finishTC(self, tc):
+		"""
+		@purpose:	Passes the outcome of a TC on to the command which led to it.
+		"""
+		command = self.commands.get(tc.tag)
+		if command is None:
+			return
+		command.outstanding -= 1
+		if (command.status == 0) or (command.status == self.statusExecuted):
+			command.status = tc.status
+		if command.done and (command.outstanding <= 0):
+			del self.commands[tc.tag]
+			self.finishedCommands.append(command)
+		return
+
+	def takeFinishedCommands(self):
+		"""
+		@return:	The TaggedCommands which were finished by the outcome of their last TC since the last call.
+		"""
+		finished = self.finishedCommands
+		self.finishedCommands = []
+		return finished
+
+	def nextDeadline(self):
+		"""
+		@return:	The time of the next deadline or None if nothing is outstanding.
+		"""
+		while self.deadlines:
+			deadline, generation, tc = self.deadlines[0]
+			if (tc.generation == generation) and (self.outstanding.get((tc.packetID, tc.psc)) is tc):
+				return deadline
+			heapq.heappop(self.deadlines)
+		return None
+
+	def __len__(self):
+		return len(self.outstanding)
+
+	def __init__(self, acceptTimeOut=None, executeTimeOut=None):
+		self.outstanding = {}
+		self.deadlines = []
+		self.commands = {}
+		self.finishedCommands = []
+		if acceptTimeOut is not None:
+			self.acceptTimeOut = acceptTimeOut
+		if executeTimeOut is not None:
+			self.executeTimeOut = executeTimeOut
+
+if __name__ == '__main__':
+	pass
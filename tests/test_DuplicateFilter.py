@@ -0,0 +1,65 @@
+"""
+FILE_NAME:			test_DuplicateFilter.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of DuplicateFilter.py.
+
+FILE REFERENCES:	DuplicateFilter.py
+
+LIBRARIES USED:		os, sys, unittest
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DuplicateFilter import DuplicateFilter
+
+class DuplicateFilterTests(unittest.TestCase):
+
+	def packet(self, seed):
+		return [(seed + i) & 0xFF for i in range(0, 152)]
+
+	def testCopyIsDropped(self):
+		duplicates = DuplicateFilter()
+		self.assertEqual(duplicates.isDuplicate(0x0812, 0xC001, self.packet(1)), 0)
+		self.assertEqual(duplicates.isDuplicate(0x0812, 0xC001, self.packet(1)), 1)
+		self.assertEqual(duplicates.passed, 1)
+		self.assertEqual(duplicates.suppressed, 1)
+		self.assertEqual(len(duplicates), 1)
+
+	def testRecycledPSCWithNewDataIsKept(self):
+		duplicates = DuplicateFilter()
+		self.assertEqual(duplicates.isDuplicate(0x0812, 0xC001, self.packet(1)), 0)
+		self.assertEqual(duplicates.isDuplicate(0x0812, 0xC001, self.packet(2)), 0)
+		self.assertEqual(duplicates.isDuplicate(0x0813, 0xC001, self.packet(1)), 0)
+		self.assertEqual(duplicates.suppressed, 0)
+
+	def testOldPacketsLeaveTheWindow(self):
+		duplicates = DuplicateFilter(2)
+		for seed in (1, 2, 3):
+			self.assertEqual(duplicates.isDuplicate(0x0812, seed, self.packet(seed)), 0)
+		self.assertEqual(len(duplicates), 2)
+		# The first packet was pushed out by the third one, the last two are still remembered.
+		self.assertEqual(duplicates.isDuplicate(0x0812, 1, self.packet(1)), 0)
+		self.assertEqual(duplicates.isDuplicate(0x0812, 3, self.packet(3)), 1)
+
+	def testClear(self):
+		duplicates = DuplicateFilter()
+		duplicates.isDuplicate(0x0812, 0xC001, self.packet(1))
+		duplicates.clear()
+		self.assertEqual(len(duplicates), 0)
+		self.assertEqual(duplicates.isDuplicate(0x0812, 0xC001, self.packet(1)), 0)
+
+	def testWindowSizeIsAtLeastOne(self):
+		self.assertEqual(DuplicateFilter(0).windowSize, 1)
+
+if __name__ == '__main__':
+	unittest.main()
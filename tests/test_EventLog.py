@@ -0,0 +1,95 @@
+"""
+FILE_NAME:			test_EventLog.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of EventLog.py.
+
+FILE REFERENCES:	EventLog.py
+
+LIBRARIES USED:		os, sys, shutil, tempfile, unittest, datetime
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from EventLog import EventRecordLog, EventLogReader
+
+START = datetime(2026, 10, 19, 12, 0, 0)
+
+class EventLogTests(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.path = os.path.join(self.directory, "eventLog2026-10-19.evt")
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def writeEvents(self, count):
+		log = EventRecordLog(self.path)
+		for i in range(0, count):
+			severity = 3 if i % 100 == 0 else 1
+			log.append(START + timedelta(seconds=i), severity, i % 16, 0x02, i, 0, message="event %d" %i, numParams=1)
+		log.close()
+
+	def testWriteAndQuery(self):
+		self.writeEvents(10)
+		records = list(EventLogReader(self.path).query())
+		self.assertEqual(len(records), 10)
+		timeStamp = EventRecordLog.timeToSeconds(START + timedelta(seconds=4))
+		self.assertEqual(records[4], (timeStamp, 1, 4, 0x02, 1, 4, 0, "event 4"))
+		self.assertEqual(os.path.getsize(self.path), 10 * EventRecordLog.recordSize)
+
+	def testFilters(self):
+		self.writeEvents(300)
+		reader = EventLogReader(self.path)
+		startTime = EventRecordLog.timeToSeconds(START + timedelta(seconds=10))
+		stopTime = EventRecordLog.timeToSeconds(START + timedelta(seconds=19))
+		self.assertEqual([r[5] for r in reader.query(startTime, stopTime)], list(range(10, 20)))
+		self.assertEqual([r[5] for r in reader.query(minSeverity=3)], [0, 100, 200])
+		self.assertEqual([r[5] for r in reader.query(reportIDs=[5], stopTime=stopTime)], [5])
+
+	def testAppendAfterReopen(self):
+		self.writeEvents(3)
+		log = EventRecordLog(self.path)
+		log.append(START, 2, 0x0B, 0x03)
+		log.close()
+		records = list(EventLogReader(self.path).query())
+		self.assertEqual(len(records), 4)
+		self.assertEqual(records[3][1:4], (2, 0x0B, 0x03))
+		self.assertEqual(records[3][7], "")
+
+	def testIndexSkipsBlocks(self):
+		blocks = 3
+		self.writeEvents(blocks * EventRecordLog.recordsPerBlock + 10)
+		self.assertEqual(os.path.getsize(os.path.splitext(self.path)[0] + ".idx"), blocks * EventRecordLog.indexSize)
+		reader = EventLogReader(self.path)
+		# Only the tail of the file (which is not indexed yet) can hold records this late.
+		startTime = EventRecordLog.timeToSeconds(START + timedelta(seconds=blocks * EventRecordLog.recordsPerBlock))
+		self.assertEqual(reader.candidateBlocks(blocks, startTime, 0xFFFFFFFF, 0xFF, None), [])
+		# Every block holds a severity 3 event, but only the first one holds reportID 0 at second 0.
+		self.assertEqual(reader.candidateBlocks(blocks, 0, 0xFFFFFFFF, 0xFF, set([0x20])), [])
+		stopTime = EventRecordLog.timeToSeconds(START)
+		self.assertEqual(reader.candidateBlocks(blocks, 0, stopTime, 0xFF, None), [0])
+		self.assertEqual(len(list(reader.query(startTime))), 10)
+
+	def testMissingIndexIsRead(self):
+		self.writeEvents(EventRecordLog.recordsPerBlock)
+		os.remove(os.path.splitext(self.path)[0] + ".idx")
+		reader = EventLogReader(self.path)
+		self.assertEqual(reader.candidateBlocks(1, 0, 0, 0xFF, None), [0])
+		self.assertEqual(len(list(reader.query())), EventRecordLog.recordsPerBlock)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,46 @@
+"""
+FILE_NAME:			test_GroundClock.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of GroundClock.py (the shared clock and parseTime()).
+
+FILE REFERENCES:	GroundClock.py
+
+LIBRARIES USED:		os, sys, unittest, datetime
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GroundClock import GroundClock, parseTime
+
+class GroundClockTests(unittest.TestCase):
+
+	def testSetAndRead(self):
+		clock = GroundClock(datetime(1970, 1, 2))
+		try:
+			seconds = clock.readSeconds()
+			self.assertTrue(86400 <= seconds < 86401)
+			clock.set(datetime(2026, 10, 19, 12, 0, 0))
+			self.assertEqual(clock.now().replace(microsecond=0), datetime(2026, 10, 19, 12, 0, 0))
+		finally:
+			clock.close()
+
+	def testParseTime(self):
+		self.assertEqual(parseTime("1.5"), 1.5)
+		self.assertEqual(parseTime("1970-01-02"), 86400)
+		self.assertEqual(parseTime("1970-01-01T01:00"), 3600)
+		self.assertEqual(parseTime("1970-01-01T00:00:30"), 30)
+		self.assertRaises(ValueError, parseTime, "yesterday")
+
+if __name__ == '__main__':
+	unittest.main()
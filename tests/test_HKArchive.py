@@ -0,0 +1,114 @@
+"""
+FILE_NAME:			test_HKArchive.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of HKArchive.py (the archive and its tiers).
+
+FILE REFERENCES:	HKArchive.py
+
+LIBRARIES USED:		os, sys, shutil, tempfile, unittest, numpy
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+					The tests are skipped if numpy is not installed.
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+	import numpy
+	from HKArchive import HKArchive, HKArchiveTiers
+except ImportError:
+	numpy = None
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class HKArchiveTests(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.path = os.path.join(self.directory, "hk")
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def testAppendAndRead(self):
+		archive = HKArchive(self.path)
+		archive.append(100.0, {"BATT_V": 10, "BATT_TEMP": 20})
+		archive.append(101.0, {"BATT_V": 11})
+		self.assertEqual(len(archive), 2)
+		self.assertEqual(archive.names(), ["BATT_TEMP", "BATT_V"])
+		times, values = archive.read("BATT_V")
+		self.assertEqual(times.tolist(), [100.0, 101.0])
+		self.assertEqual(values.tolist(), [10, 11])
+		self.assertEqual(archive.read("BATT_TEMP")[1].tolist(), [20, HKArchive.missing])
+		self.assertEqual(archive.read("UNKNOWN"), None)
+
+	def testColumnAddedLaterIsFilledWithMissing(self):
+		archive = HKArchive(self.path)
+		archive.append(100.0, {"BATT_V": 10})
+		archive.extend([101.0, 102.0], {"BATT_V": [11, 12], "PANEL_I": [1, 2]})
+		self.assertEqual(archive.read("PANEL_I")[1].tolist(), [HKArchive.missing, 1, 2])
+
+	def testRangeLookupAcrossBlocks(self):
+		archive = HKArchive(self.path)
+		numRows = HKArchive.blockSize * 3 + 10
+		archive.extend(numpy.arange(numRows, dtype=numpy.float64), {"BATT_V": numpy.arange(numRows) % 1000})
+		times, columns = archive.query(["BATT_V", "UNKNOWN"], 1000.0, 2100.5)
+		self.assertEqual(times[0], 1000.0)
+		self.assertEqual(times[-1], 2100.0)
+		self.assertEqual(len(times), 1101)
+		self.assertEqual(list(columns), ["BATT_V"])
+		self.assertEqual(archive.rowRange(numRows + 1.0, None), (numRows, numRows))
+		self.assertEqual(archive.rowRange(None, -1.0), (0, 0))
+
+	def testReaderSeesWhatWasWritten(self):
+		archive = HKArchive(self.path)
+		archive.append(100.0, {"BATT_V": 10})
+		archive.flush()
+		reader = HKArchive(self.path, readOnly=1)
+		self.assertEqual(reader.read("BATT_V")[1].tolist(), [10])
+		archive.append(101.0, {"BATT_V": 11, "PANEL_I": 3})
+		archive.flush()
+		self.assertEqual(reader.read("BATT_V")[1].tolist(), [10, 11])
+		self.assertEqual(reader.read("PANEL_I")[1].tolist(), [HKArchive.missing, 3])
+
+	def testReopenKeepsTheRows(self):
+		archive = HKArchive(self.path)
+		archive.extend([100.0, 101.0], {"BATT_V": [10, 11]})
+		archive.flush()
+		del archive
+		archive = HKArchive(self.path)
+		archive.append(102.0, {"BATT_V": 12})
+		self.assertEqual(archive.read("BATT_V")[1].tolist(), [10, 11, 12])
+
+	def testTiers(self):
+		archive = HKArchive(self.path)
+		values = numpy.arange(100, dtype=numpy.uint16)
+		values[10:20] = HKArchive.missing
+		archive.extend(numpy.arange(100, dtype=numpy.float64), {"BATT_V": values})
+		archive.flush()
+		tiers = HKArchiveTiers(self.path, factors=[10, 50])
+		self.assertEqual(tiers.update(), 12)
+		self.assertEqual(tiers.update(), 0)
+		factor, times, columns = tiers.query(["BATT_V"], resolution=10)
+		self.assertEqual(factor, 10)
+		self.assertEqual(times.tolist(), [float(t) for t in range(0, 100, 10)])
+		minimums, maximums, means = columns["BATT_V"]
+		self.assertEqual((minimums[0], maximums[0], means[0]), (0, 9, 4))
+		self.assertEqual((minimums[1], maximums[1], means[1]), (HKArchive.missing,) * 3)
+		factor, times, columns = tiers.query(["BATT_V"], resolution=50)
+		self.assertEqual(factor, 50)
+		factor, times, columns = tiers.query(["BATT_V"], resolution=1)
+		self.assertEqual(factor, 1)
+		self.assertEqual(len(times), 100)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,106 @@
+"""
+FILE_NAME:			test_HKCalibration.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of HKCalibration.py.
+
+FILE REFERENCES:	HKCalibration.py
+
+LIBRARIES USED:		os, sys, shutil, tempfile, unittest, numpy
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+					The tests are skipped if numpy is not installed.
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+	import numpy
+	from HKCalibration import HKCalibration
+except ImportError:
+	numpy = None
+
+PARAMETERS = {0x01: "BATT_V", 0x02: "BATT_TEMP", 0x03: "PANEL_I"}
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class HKCalibrationTests(unittest.TestCase):
+
+	def calibration(self):
+		calibration = HKCalibration(PARAMETERS)
+		calibration.setPolynomial(0x01, [1.0, 0.5, 0.25])
+		calibration.setTable(0x02, [4095.0, 0.0, 2048.0], [85.0, -40.0, 25.0])
+		return calibration
+
+	def testPolynomial(self):
+		values = self.calibration().convert("BATT_V", [0, 2, 4])
+		self.assertEqual(values.tolist(), [1.0, 3.0, 7.0])
+
+	def testLookupTableIsInterpolatedAndClamped(self):
+		values = self.calibration().convert("BATT_TEMP", [0, 1024, 2048, 5000])
+		self.assertEqual(values.tolist(), [-40.0, -7.5, 25.0, 85.0])
+
+	def testUncalibratedParameterIsLeftAsIs(self):
+		values = self.calibration().convert("PANEL_I", [3, 4])
+		self.assertEqual(values.dtype, numpy.float64)
+		self.assertEqual(values.tolist(), [3.0, 4.0])
+
+	def testMissingValuesBecomeNaN(self):
+		values = self.calibration().convert("BATT_V", [0, HKCalibration.missing])
+		self.assertEqual(values[0], 1.0)
+		self.assertTrue(numpy.isnan(values[1]))
+
+	def testConvertFrame(self):
+		calibration = self.calibration()
+		paramIDs = [0x01, 0x02, 0x03, 0x01]
+		raws = numpy.array([[2, 2048, 7, HKCalibration.missing], [4, 0, 8, 0]], dtype=numpy.uint16)
+		values = calibration.convertFrame(numpy.tile(paramIDs, (2, 1)), raws)
+		self.assertEqual(values.shape, (2, 4))
+		self.assertEqual(values[0, 0:3].tolist(), [3.0, 25.0, 7.0])
+		self.assertTrue(numpy.isnan(values[0, 3]))
+		self.assertEqual(values[1].tolist(), [7.0, -40.0, 8.0, 1.0])
+
+	def testSaturatedValuesOfALiveReport(self):
+		calibration = self.calibration()
+		raws = numpy.array([HKCalibration.missing] * 3, dtype=numpy.uint16)
+		values = calibration.convertFrame([0x01, 0x02, 0x03], raws, markMissing=False)
+		self.assertEqual(values.tolist(), [1.0 + 0.5 * 0xFFFF + 0.25 * 0xFFFF ** 2, 85.0, float(0xFFFF)])
+
+	def testConvertColumns(self):
+		converted = self.calibration().convertColumns({"BATT_V": [2], "PANEL_I": [5]})
+		self.assertEqual(converted["BATT_V"].tolist(), [3.0])
+		self.assertEqual(converted["PANEL_I"].tolist(), [5.0])
+
+	def testLoad(self):
+		directory = tempfile.mkdtemp()
+		try:
+			path = os.path.join(directory, "calibration.txt")
+			calibrationFile = open(path, "w")
+			calibrationFile.write("# parameter\tconversion\tunit\tvalues\n\n"
+								  "BATT_V\t\tpoly\tV\t0.0 0.5\n"
+								  "0x02\t\tlut\t\tC\t0:-40.0 100:60.0\t\t# by ID\n")
+			calibrationFile.close()
+			calibration = HKCalibration(PARAMETERS, path)
+			self.assertEqual(calibration.convert("BATT_V", [10]).tolist(), [5.0])
+			self.assertEqual(calibration.convert("BATT_TEMP", [50]).tolist(), [10.0])
+			self.assertEqual(calibration.unit("BATT_V"), "V")
+			self.assertEqual(calibration.unit("BATT_TEMP"), "C")
+			self.assertEqual(calibration.unit("PANEL_I"), "")
+			for line in ("UNKNOWN\tpoly\tV\t0.0 1.0\n", "BATT_V\tspline\tV\t0.0\n", "BATT_V\tlut\tV\t1-2\n"):
+				calibrationFile = open(path, "w")
+				calibrationFile.write(line)
+				calibrationFile.close()
+				self.assertRaises(ValueError, HKCalibration, PARAMETERS, path)
+		finally:
+			shutil.rmtree(directory)
+
+if __name__ == '__main__':
+	unittest.main()
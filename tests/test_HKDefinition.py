@@ -0,0 +1,163 @@
+"""
+FILE_NAME:			test_HKDefinition.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of HKDefinition.py (definition files, HKDecoder and HKDefinitionCache).
+
+FILE REFERENCES:	HKDefinition.py
+
+LIBRARIES USED:		os, sys, time, shutil, tempfile, unittest, numpy (optional)
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+					The numpy decoding is only tested if numpy is installed, the struct decoding always is.
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HKDefinition
+from HKDefinition import readDefinition, writeDefinition, HKDecoder, HKDefinitionCache
+
+PARAMETERS = {0x01: "BATT_V", 0x02: "BATT_TEMP", 0x03: "PANEL_I"}
+
+def report(values):
+	"""
+	@return:	The bytes of a report in which parameter j of the definition has the value values[j].
+	"""
+	command = []
+	for value in values:
+		command.append(value & 0xFF)
+		command.append(value >> 8)
+	return command + [0] * 10
+
+class DefinitionFileTests(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.path = os.path.join(self.directory, "hkDefinition1.txt")
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def write(self, text):
+		definitionFile = open(self.path, "w")
+		definitionFile.write(text)
+		definitionFile.close()
+
+	def testWriteAndRead(self):
+		writeDefinition(self.path, 1, 5, ["BATT_V", "PANEL_I"])
+		self.assertEqual(readDefinition(self.path), (1, 5, ["BATT_V", "PANEL_I"]))
+
+	def testNamesOnce(self):
+		self.write("1\n5\n2\nBATT_V\n\nPANEL_I\n")
+		self.assertEqual(readDefinition(self.path), (1, 5, ["BATT_V", "PANEL_I"]))
+
+	def testBadFiles(self):
+		for text in ("1\n5\n", "1\nfive\n1\nBATT_V\n", "1\n5\n3\nBATT_V\nPANEL_I\n"):
+			self.write(text)
+			self.assertRaises(ValueError, readDefinition, self.path)
+
+class HKDecoderTests(unittest.TestCase):
+
+	def testDecodeWithStruct(self):
+		decoder = HKDecoder(1, 5, [0x01, 0x02, 0x03])
+		self.assertEqual(decoder.paramIDs, [0x03, 0x02, 0x01])
+		savedNumpy = HKDefinition.numpy
+		HKDefinition.numpy = None
+		try:
+			values = decoder.decode(report([0x1234, 0x0001, 0xFFFF]))
+		finally:
+			HKDefinition.numpy = savedNumpy
+		self.assertEqual(tuple(values), (0xFFFF, 0x0001, 0x1234))
+
+	@unittest.skipIf(HKDefinition.numpy is None, "numpy is not installed")
+	def testDecodeWithNumpy(self):
+		decoder = HKDecoder(1, 5, [0x01, 0x02, 0x03])
+		values = decoder.decode(report([0x1234, 0x0001, 0xFFFF]))
+		self.assertEqual(values.tolist(), [0xFFFF, 0x0001, 0x1234])
+
+	@unittest.skipIf(HKDefinition.numpy is None, "numpy is not installed")
+	def testDecodeFramesAndColumns(self):
+		decoder = HKDecoder(1, 5, [0x01, 0x02])
+		frames = bytearray(report([1, 2])[0:6] + report([3, 4])[0:6])
+		values = decoder.decodeFrames(bytes(frames), 6)
+		self.assertEqual(values.tolist(), [[2, 1], [4, 3]])
+		columns = decoder.columns(values, {0x01: "BATT_V"})
+		self.assertEqual(list(columns), ["BATT_V"])
+		self.assertEqual(columns["BATT_V"].tolist(), [1, 3])
+
+class HKDefinitionCacheTests(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.cache = HKDefinitionCache(self.directory, PARAMETERS)
+		self.cache.pollInterval = 0.05
+
+	def tearDown(self):
+		self.cache.stop()
+		shutil.rmtree(self.directory)
+
+	def write(self, fileName, sID, names):
+		path = os.path.join(self.directory, fileName)
+		writeDefinition(path, sID, 5, names)
+		# Make sure that the change is seen even if it happens within the resolution of the modification time.
+		modified = time.time() + len(names) + 10 * sID
+		os.utime(path, (modified, modified))
+
+	def testDefault(self):
+		decoder = self.cache.setDefault("diag", 3, [0x01, 0x02])
+		self.assertTrue(self.cache.get("diag", 0) is decoder)
+		self.assertEqual(decoder.interval, 3)
+
+	def testCompileAndRecompile(self):
+		self.assertEqual(self.cache.get("hk", 1), None)
+		self.write("hkDefinition1.txt", 1, ["BATT_V", "PANEL_I"])
+		decoder = self.cache.get("hk", 1)
+		self.assertEqual(decoder.paramIDs, [0x01, 0x03])
+		self.assertEqual(decoder.definition, [0x03, 0x01])
+		self.assertTrue(self.cache.get("hk", 1) is decoder)
+		self.write("hkDefinition1.txt", 1, ["BATT_TEMP"])
+		self.assertEqual(self.cache.get("hk", 1).paramIDs, [0x02])
+
+	def testFileNamesIgnoreCase(self):
+		self.write("hkdefinition1.txt", 1, ["BATT_V"])
+		self.assertEqual(self.cache.get("hk", 1).paramIDs, [0x01])
+
+	def testBadDefinitions(self):
+		self.write("hkDefinition1.txt", 1, ["UNKNOWN"])
+		self.assertRaises(ValueError, self.cache.get, "hk", 1)
+		self.write("hkDefinition1.txt", 2, ["BATT_V"])
+		self.assertRaises(ValueError, self.cache.get, "hk", 1)
+		self.cache.maxParameters = 1
+		self.write("hkDefinition1.txt", 1, ["BATT_V", "PANEL_I"])
+		self.assertRaises(ValueError, self.cache.get, "hk", 1)
+
+	def testBackgroundCompilation(self):
+		self.write("diagDefinition1.txt", 1, ["BATT_V"])
+		self.write("hkDefinition1.txt", 1, ["UNKNOWN"])
+		self.cache.start()
+		self.assertEqual(self.cache.get("diag", 1).paramIDs, [0x01])
+		self.assertRaises(ValueError, self.cache.get, "hk", 1)
+		self.write("hkDefinition1.txt", 1, ["BATT_V", "BATT_TEMP"])
+		deadline = time.time() + 5.0
+		while time.time() < deadline:
+			try:
+				decoder = self.cache.get("hk", 1)
+			except ValueError:
+				decoder = None
+			if decoder is not None:
+				break
+			time.sleep(0.05)
+		self.assertEqual(decoder.paramIDs, [0x01, 0x02])
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,116 @@
+"""
+FILE_NAME:			test_HKLimitMonitor.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of HKLimitMonitor.py.
+
+FILE REFERENCES:	HKLimitMonitor.py, HKCalibration.py
+
+LIBRARIES USED:		os, sys, shutil, tempfile, unittest, numpy
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+					The tests are skipped if numpy is not installed.
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+	import numpy
+	from HKLimitMonitor import HKLimitMonitor
+	from HKCalibration import HKCalibration
+except ImportError:
+	numpy = None
+
+PARAMETERS = {0x01: "BATT_V", 0x02: "BATT_TEMP", 0x03: "PANEL_I"}
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class HKLimitMonitorTests(unittest.TestCase):
+
+	def monitor(self, persistence=1, hysteresis=0.0):
+		monitor = HKLimitMonitor(PARAMETERS)
+		monitor.setLimits(0x01, 6.0, 6.5, 8.4, 8.6, persistence, hysteresis)
+		return monitor
+
+	def testLevels(self):
+		monitor = self.monitor()
+		self.assertEqual(monitor.check([0x01], [7.0]), [])
+		self.assertEqual(monitor.check([0x01], [8.5]), [(0x01, 0, 1, 8.5)])
+		self.assertEqual(monitor.check([0x01], [8.7]), [(0x01, 1, 2, 8.7)])
+		self.assertEqual(monitor.check([0x01], [5.0]), [])
+		self.assertEqual(monitor.check([0x01], [7.0]), [(0x01, 2, 0, 7.0)])
+
+	def testUnmonitoredParametersAreIgnored(self):
+		monitor = self.monitor()
+		self.assertEqual(monitor.check([0x02, 0x03], [1000.0, -1000.0]), [])
+
+	def testPersistence(self):
+		monitor = self.monitor(persistence=3)
+		self.assertEqual(monitor.check([0x01], [8.5]), [])
+		self.assertEqual(monitor.check([0x01], [8.5]), [])
+		self.assertEqual(monitor.check([0x01], [8.5]), [(0x01, 0, 1, 8.5)])
+		# A single nominal report does not bring it back.
+		self.assertEqual(monitor.check([0x01], [7.0]), [])
+		self.assertEqual(monitor.check([0x01], [8.5]), [])
+
+	def testHysteresis(self):
+		monitor = self.monitor(hysteresis=0.1)
+		self.assertEqual(monitor.check([0x01], [8.5]), [(0x01, 0, 1, 8.5)])
+		# Back inside the yellow limit, but by less than the hysteresis.
+		self.assertEqual(monitor.check([0x01], [8.35]), [])
+		self.assertEqual(monitor.check([0x01], [8.25]), [(0x01, 1, 0, 8.25)])
+
+	def testMissingValueLeavesTheLevelAlone(self):
+		monitor = self.monitor()
+		monitor.check([0x01], [8.5])
+		self.assertEqual(monitor.check([0x01], [numpy.nan]), [])
+		self.assertEqual(monitor.levels[0x01], 1)
+
+	def testSaturatedSensorRaisesAnAlarm(self):
+		monitor = self.monitor()
+		calibration = HKCalibration(PARAMETERS)
+		calibration.setPolynomial(0x01, [0.0, 0.001])
+		raws = numpy.array([HKCalibration.missing], dtype=numpy.uint16)
+		values = calibration.convertFrame([0x01], raws, markMissing=False)
+		self.assertEqual(monitor.check([0x01], values), [(0x01, 0, 2, 0xFFFF * 0.001)])
+
+	def testReset(self):
+		monitor = self.monitor()
+		monitor.check([0x01], [8.7])
+		monitor.reset()
+		self.assertEqual(monitor.levels[0x01], 0)
+		self.assertEqual(monitor.check([0x01], [8.7]), [(0x01, 0, 2, 8.7)])
+
+	def testLoad(self):
+		directory = tempfile.mkdtemp()
+		try:
+			path = os.path.join(directory, "limits.txt")
+			limitsFile = open(path, "w")
+			limitsFile.write("# parameter\tredLow\tyellowLow\tyellowHigh\tredHigh\tpersistence\thysteresis\n\n"
+							 "BATT_V\t6.0\t6.5\t8.4\t8.6\t1\t0.0\n"
+							 "0x02\t-\t0.0\t40.0\t50.0\t2\t1.0\t\t# by ID\n")
+			limitsFile.close()
+			monitor = HKLimitMonitor(PARAMETERS, path)
+			self.assertEqual(monitor.check([0x01, 0x02], [8.5, -100.0]), [(0x01, 0, 1, 8.5)])
+			self.assertEqual(monitor.check([0x01, 0x02], [8.5, -100.0]), [(0x02, 0, 1, -100.0)])
+			limitsFile = open(path, "w")
+			limitsFile.write("UNKNOWN\t6.0\t6.5\t8.4\t8.6\t1\t0.0\n")
+			limitsFile.close()
+			self.assertRaises(ValueError, HKLimitMonitor, PARAMETERS, path)
+			limitsFile = open(path, "w")
+			limitsFile.write("BATT_V\t6.0\t6.5\t8.4\n")
+			limitsFile.close()
+			self.assertRaises(ValueError, HKLimitMonitor, PARAMETERS, path)
+		finally:
+			shutil.rmtree(directory)
+
+if __name__ == '__main__':
+	unittest.main()
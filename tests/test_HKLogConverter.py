@@ -0,0 +1,78 @@
+"""
+FILE_NAME:			test_HKLogConverter.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of HKLogConverter.py.
+
+FILE REFERENCES:	HKLogConverter.py, HKArchive.py
+
+LIBRARIES USED:		os, sys, shutil, tempfile, unittest, numpy
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+					The tests are skipped if numpy is not installed.
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+	import numpy
+	from HKArchive import HKArchive
+	from HKLogConverter import convert
+except ImportError:
+	numpy = None
+
+DAY = 1792368000.0				# 2026-10-19 00:00:00 UTC
+NAMES = ["BATT_V", "BATT_TEMP"]
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class HKLogConverterTests(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.messages = []
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def writeLog(self, name, numReports):
+		path = os.path.join(self.directory, name)
+		logFile = open(path, "w")
+		for i in range(numReports):
+			logFile.write("HKLOG:\t19/19/19\t,\t%d\t,\t%d\t,\t\n" %(i, 100 + i))
+		logFile.close()
+		return path
+
+	def convert(self, archive, paths):
+		return convert(archive, paths, NAMES, 60.0, workers=1, report=self.messages.append)
+
+	def testConvert(self):
+		archive = HKArchive(os.path.join(self.directory, "hk"))
+		path = self.writeLog("hkLog2026-10-19.csv", 3)
+		self.assertEqual(self.convert(archive, [path]), (3, 0))
+		times, columns = archive.query(NAMES)
+		self.assertEqual(times.tolist(), [DAY, DAY + 3600, DAY + 7200])
+		self.assertEqual(columns["BATT_TEMP"].tolist(), [100, 101, 102])
+
+	def testPartOfADayAlreadyInTheArchive(self):
+		archive = HKArchive(os.path.join(self.directory, "hk"))
+		archive.append(DAY + 10 * 3600, {"BATT_V": 10, "BATT_TEMP": 110})
+		older = self.writeLog("hkLog2026-10-18.csv", 24)
+		path = self.writeLog("hkLog2026-10-19.csv", 24)
+		self.assertEqual(self.convert(archive, [older, path]), (13, 0))
+		times, columns = archive.query(NAMES)
+		self.assertEqual(len(times), 14)
+		self.assertEqual(times[1], DAY + 11 * 3600)
+		self.assertEqual(columns["BATT_V"][1:].tolist(), list(range(11, 24)))
+		self.assertEqual(len(self.messages), 2)
+
+if __name__ == '__main__':
+	unittest.main()
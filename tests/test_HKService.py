@@ -0,0 +1,72 @@
+"""
+FILE_NAME:			test_HKService.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of HKService.py (definition updates which are denied).
+
+FILE REFERENCES:	HKService.py, HKDefinition.py
+
+LIBRARIES USED:		os, sys, shutil, tempfile, threading, unittest
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+					The service is not started, the methods under test are called on a bare instance.
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+try:
+	from StringIO import StringIO
+except ImportError:
+	from io import StringIO
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from HKService import hkService
+from HKDefinition import HKDefinitionCache, writeDefinition
+
+class RecordedLogs:
+	"""
+	Stands in for the log writer channel, keeps what was written.
+	"""
+	def write(self, kind, text):
+		self.records.append((kind, text))
+
+	def __init__(self):
+		self.records = []
+
+class HKServiceDefinitionTests(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.service = hkService.__new__(hkService)
+		self.service.definitions = HKDefinitionCache(self.directory, hkService.parameters)
+		self.service.cliLock = threading.Lock()
+		self.service.logs = RecordedLogs()
+		self.stdout = sys.stdout
+		sys.stdout = StringIO()
+
+	def tearDown(self):
+		sys.stdout = self.stdout
+		shutil.rmtree(self.directory)
+
+	def testInvalidAlternateHKDefinitionIsDenied(self):
+		writeDefinition(os.path.join(self.directory, "hkDefinition1.txt"), 1, 5, ["NOT_A_PARAMETER"])
+		self.service.setAlternateHKDefinition(self.service)
+		self.assertTrue(self.service.hkDecoder is None)
+		self.assertTrue("denying definition update" in sys.stdout.getvalue())
+		self.assertEqual([kind for kind, text in self.service.logs.records], ["error"])
+
+	def testMissingAlternateDiagDefinitionIsDenied(self):
+		self.service.setAlternateDiagDefinition(self.service)
+		self.assertTrue(self.service.diagDecoder is None)
+		self.assertTrue("diagDefinition1.txt does not exist" in sys.stdout.getvalue())
+
+if __name__ == '__main__':
+	unittest.main()
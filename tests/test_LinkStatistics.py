@@ -0,0 +1,111 @@
+"""
+FILE_NAME:			test_LinkStatistics.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of LinkStatistics.py.
+
+FILE REFERENCES:	LinkStatistics.py
+
+LIBRARIES USED:		os, sys, unittest
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from LinkStatistics import LinkStatistics
+
+class LinkStatisticsTests(unittest.TestCase):
+
+	def receive(self, stats, apid, sequenceCount, now, corrupt=None):
+		stats.recordPacket(152, now=now)
+		if corrupt is not None:
+			stats.recordCorrupt(corrupt, now=now)
+			return 0
+		return stats.recordSequence(apid, sequenceCount)
+
+	def testCleanPass(self):
+		stats = LinkStatistics()
+		for i in range(0, 10):
+			self.receive(stats, 0x10, i, 100 + i)
+		currentPass = stats.currentPass
+		self.assertEqual(currentPass.received, 10)
+		self.assertEqual(currentPass.missing, 0)
+		self.assertEqual(currentPass.numBytes, 1520)
+		self.assertEqual(currentPass.lossRate(), 0.0)
+
+	def testGapIsCountedAsMissing(self):
+		stats = LinkStatistics()
+		self.receive(stats, 0x10, 1, 100)
+		self.assertEqual(self.receive(stats, 0x10, 4, 101), 2)
+		self.assertEqual(stats.currentPass.missing, 2)
+
+	def testCorruptPacketIsNotAlsoMissing(self):
+		stats = LinkStatistics()
+		for i in range(0, 10):
+			if i == 4:
+				self.receive(stats, 0x10, i, 100 + i, corrupt="checksum")
+			else:
+				self.receive(stats, 0x10, i, 100 + i)
+		currentPass = stats.currentPass
+		self.assertEqual(currentPass.corrupt, 1)
+		self.assertEqual(currentPass.checksumErrors, 1)
+		self.assertEqual(currentPass.missing, 0)
+		self.assertAlmostEqual(currentPass.lossRate(), 0.1)
+
+	def testLatePacketIsTakenOffMissing(self):
+		stats = LinkStatistics()
+		self.receive(stats, 0x10, 1, 100)
+		self.receive(stats, 0x10, 3, 101)
+		self.assertEqual(stats.currentPass.missing, 1)
+		self.assertEqual(self.receive(stats, 0x10, 2, 102), 0)
+		self.assertEqual(stats.currentPass.missing, 0)
+		self.assertEqual(stats.currentPass.late, 1)
+
+	def testSequenceCountWrapsAround(self):
+		stats = LinkStatistics()
+		self.receive(stats, 0x10, 255, 100)
+		self.assertEqual(self.receive(stats, 0x10, 0, 101), 0)
+
+	def testAPIDsAreCountedSeparately(self):
+		stats = LinkStatistics()
+		self.receive(stats, 0x10, 1, 100)
+		self.receive(stats, 0x20, 50, 100)
+		self.assertEqual(self.receive(stats, 0x10, 2, 101), 0)
+		self.assertEqual(self.receive(stats, 0x20, 51, 101), 0)
+
+	def testPassEndsAfterPassGap(self):
+		stats = LinkStatistics(passGap=120.0)
+		self.receive(stats, 0x10, 1, 100)
+		self.receive(stats, 0x10, 2, 110)
+		self.assertEqual(stats.checkPass(now=229), None)
+		finished = stats.checkPass(now=230)
+		self.assertEqual(finished.number, 1)
+		self.assertEqual(finished.duration(), 10)
+		self.assertEqual(stats.passes, [finished])
+		self.assertEqual(stats.currentPass, None)
+		# The sequence counts of the next pass start over.
+		self.assertEqual(self.receive(stats, 0x10, 200, 1000), 0)
+		self.assertEqual(stats.currentPass.number, 2)
+
+	def testRollingRates(self):
+		stats = LinkStatistics(windowSeconds=10)
+		for i in range(0, 10):
+			self.receive(stats, 0x10, i, 100 + i, corrupt="length" if i < 2 else None)
+		packetRate, byteRate, corruptRatio = stats.rollingRates(now=109.5)
+		self.assertAlmostEqual(packetRate, 1.0)
+		self.assertAlmostEqual(byteRate, 152.0)
+		self.assertAlmostEqual(corruptRatio, 0.2)
+		self.assertAlmostEqual(stats.quality(now=109.5), 0.8)
+		# Buckets older than the window are left out.
+		self.assertAlmostEqual(stats.rollingRates(now=200)[0], 0.0)
+
+if __name__ == '__main__':
+	unittest.main()
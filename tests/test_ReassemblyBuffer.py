@@ -0,0 +1,136 @@
+"""
+FILE_NAME:			test_ReassemblyBuffer.py
+
+AUTHOR:				agent
+
+PURPOSE:			Unit tests of ReassemblyBuffer.py.
+
+FILE REFERENCES:	ReassemblyBuffer.py
+
+LIBRARIES USED:		os, sys, unittest
+
+NOTES:
+					Run from the top of the repository: python -m unittest discover tests
+
+DEVELOPMENT HISTORY:
+10/19/2026			Created.
+"""
+
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ReassemblyBuffer import ReassemblyBuffer
+
+FIRST = ReassemblyBuffer.firstSegment
+CONTINUATION = ReassemblyBuffer.continuation
+LAST = ReassemblyBuffer.lastSegment
+STANDALONE = ReassemblyBuffer.standalone
+
+class ReassemblyBufferTests(unittest.TestCase):
+
+	def testStandalonePacket(self):
+		buffer = ReassemblyBuffer()
+		self.assertEqual(buffer.add(0x10, STANDALONE, 7, [1, 2], now=0), [[1, 2]])
+		self.assertEqual(buffer.completed, 1)
+		self.assertEqual(len(buffer), 0)
+
+	def testSegmentsInOrder(self):
+		buffer = ReassemblyBuffer()
+		self.assertEqual(buffer.add(0x10, FIRST, 5, [1], now=0), None)
+		self.assertEqual(buffer.add(0x10, CONTINUATION, 6, [2], now=0), None)
+		self.assertEqual(len(buffer), 1)
+		self.assertEqual(buffer.add(0x10, LAST, 7, [3], now=0), [[1], [2], [3]])
+		self.assertEqual(buffer.completed, 1)
+		self.assertEqual(len(buffer), 0)
+
+	def testSegmentsOutOfOrder(self):
+		buffer = ReassemblyBuffer()
+		self.assertEqual(buffer.add(0x10, LAST, 8, [4], now=0), None)
+		self.assertEqual(buffer.add(0x10, CONTINUATION, 6, [2], now=0), None)
+		self.assertEqual(buffer.add(0x10, FIRST, 5, [1], now=0), None)
+		self.assertEqual(buffer.add(0x10, CONTINUATION, 7, [3], now=0), [[1], [2], [3], [4]])
+
+	def testSequenceCountWrapsAround(self):
+		buffer = ReassemblyBuffer()
+		buffer.add(0x10, FIRST, 254, [1], now=0)
+		buffer.add(0x10, CONTINUATION, 255, [2], now=0)
+		self.assertEqual(buffer.add(0x10, LAST, 0, [3], now=0), [[1], [2], [3]])
+
+	def testTransfersOfSeveralAPIDs(self):
+		buffer = ReassemblyBuffer()
+		buffer.add(0x10, FIRST, 1, [1], now=0)
+		buffer.add(0x20, FIRST, 1, [10], now=0)
+		self.assertEqual(buffer.add(0x20, LAST, 2, [20], now=0), [[10], [20]])
+		self.assertEqual(buffer.add(0x10, LAST, 2, [2], now=0), [[1], [2]])
+
+	def testDataIsCopied(self):
+		buffer = ReassemblyBuffer()
+		data = [1]
+		buffer.add(0x10, FIRST, 1, data, now=0)
+		data[0] = 99
+		self.assertEqual(buffer.add(0x10, LAST, 2, [2], now=0), [[1], [2]])
+
+	def testDuplicateSegmentIsDropped(self):
+		buffer = ReassemblyBuffer()
+		buffer.add(0x10, FIRST, 1, [1], now=0)
+		self.assertEqual(buffer.add(0x10, FIRST, 1, [1], now=0), None)
+		self.assertEqual(buffer.dropped, 1)
+
+	def testSegmentOutOfTheWindowIsDropped(self):
+		buffer = ReassemblyBuffer(window=4)
+		buffer.add(0x10, FIRST, 1, [1], now=0)
+		self.assertEqual(buffer.add(0x10, CONTINUATION, 7, [7], now=0), None)
+		self.assertEqual(buffer.dropped, 1)
+		self.assertEqual(buffer.missingSegments(buffer.transfers[0x10]), [])
+		self.assertEqual(buffer.add(0x10, CONTINUATION, 6, [6], now=0), None)
+		self.assertEqual(buffer.missingSegments(buffer.transfers[0x10]), [2, 3, 4, 5])
+		self.assertEqual(buffer.transfers[0x10].missing, 4)
+
+	def testWindowMovesWithTheTransfer(self):
+		buffer = ReassemblyBuffer(window=4)
+		buffer.add(0x10, FIRST, 0, [0], now=0)
+		for sequenceCount in range(1, 99):
+			self.assertEqual(buffer.add(0x10, CONTINUATION, sequenceCount, [sequenceCount], now=0), None)
+		self.assertEqual(len(buffer.add(0x10, LAST, 99, [99], now=0)), 100)
+		self.assertEqual(buffer.dropped, 0)
+
+	def testLongestTransfer(self):
+		buffer = ReassemblyBuffer()
+		buffer.add(0x10, FIRST, 10, [0], now=0)
+		for i in range(1, ReassemblyBuffer.sequenceModulo - 1):
+			buffer.add(0x10, CONTINUATION, (10 + i) % ReassemblyBuffer.sequenceModulo, [i], now=0)
+		segments = buffer.add(0x10, LAST, 9, [255], now=0)
+		self.assertEqual(len(segments), ReassemblyBuffer.sequenceModulo)
+		self.assertEqual(segments[-1], [255])
+		self.assertEqual(buffer.takeRejected(), [])
+
+	def testTransferLongerThanTheSequenceCountIsRejected(self):
+		buffer = ReassemblyBuffer()
+		buffer.add(0x10, FIRST, 10, [0], now=0)
+		for i in range(1, ReassemblyBuffer.sequenceModulo):
+			buffer.add(0x10, CONTINUATION, (10 + i) % ReassemblyBuffer.sequenceModulo, [i], now=0)
+		self.assertEqual(len(buffer), 0)
+		self.assertEqual(buffer.takeRejected(), [(0x10, ReassemblyBuffer.sequenceModulo)])
+		self.assertEqual(buffer.takeRejected(), [])
+		self.assertEqual(buffer.dropped, ReassemblyBuffer.sequenceModulo)
+
+	def testNewTransferReplacesIncompleteOne(self):
+		buffer = ReassemblyBuffer()
+		buffer.add(0x10, FIRST, 1, [1], now=0)
+		buffer.add(0x10, CONTINUATION, 2, [2], now=0)
+		buffer.add(0x10, FIRST, 10, [10], now=0)
+		self.assertEqual(buffer.dropped, 2)
+		self.assertEqual(buffer.add(0x10, LAST, 11, [11], now=0), [[10], [11]])
+
+	def testExpire(self):
+		buffer = ReassemblyBuffer(timeOut=30.0)
+		buffer.add(0x10, FIRST, 1, [1], now=0)
+		buffer.add(0x10, LAST, 4, [4], now=10)
+		self.assertEqual(buffer.expire(now=39), [])
+		self.assertEqual(buffer.expire(now=40), [(0x10, [2, 3], 2)])
+		self.assertEqual(buffer.expired, 1)
+		self.assertEqual(len(buffer), 0)
+
+if __name__ == '__main__':
+	unittest.main()